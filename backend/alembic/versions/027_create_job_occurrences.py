@@ -0,0 +1,44 @@
+"""027_create_job_occurrences
+
+Create idempotency ledger for scheduled background jobs
+
+Revision ID: 027_create_job_occurrences
+Revises: 026_create_person_profile_tables
+Create Date: 2025-01-20 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '027_create_job_occurrences'
+down_revision: Union[str, None] = '026_create_person_profile_tables'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'job_occurrences',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('tenant_id', sa.Integer(), nullable=False),
+        sa.Column('job_type', sa.String(50), nullable=False),
+        sa.Column('source_id', sa.Integer(), nullable=False),
+        sa.Column('occurrence_date', sa.Date(), nullable=False),
+        sa.Column('result_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('job_type', 'source_id', 'occurrence_date', name='uq_job_occurrences_job_source_date')
+    )
+    op.create_index('ix_job_occurrences_id', 'job_occurrences', ['id'])
+    op.create_index('ix_job_occurrences_tenant_id', 'job_occurrences', ['tenant_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_job_occurrences_tenant_id', 'job_occurrences')
+    op.drop_index('ix_job_occurrences_id', 'job_occurrences')
+    op.drop_table('job_occurrences')
@@ -0,0 +1,86 @@
+"""028_create_account_ledger
+
+Create account ledger and monthly balance snapshot tables
+
+Revision ID: 028_create_account_ledger
+Revises: 027_create_job_occurrences
+Create Date: 2025-01-27 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '028_create_account_ledger'
+down_revision: Union[str, None] = '027_create_job_occurrences'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'account_ledger_entries',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('tenant_id', sa.Integer(), nullable=False),
+        sa.Column('account_id', sa.Integer(), nullable=False),
+        sa.Column('transaction_id', sa.Integer(), nullable=True),
+        sa.Column('entry_type', sa.String(20), nullable=False),
+        sa.Column('amount', sa.Numeric(15, 2), nullable=False),
+        sa.Column('entry_date', sa.Date(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
+        sa.ForeignKeyConstraint(['account_id'], ['financial_accounts.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_account_ledger_entries_id', 'account_ledger_entries', ['id'])
+    op.create_index('ix_account_ledger_entries_account_date', 'account_ledger_entries', ['account_id', 'entry_date'])
+
+    op.create_table(
+        'account_balance_snapshots',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('tenant_id', sa.Integer(), nullable=False),
+        sa.Column('account_id', sa.Integer(), nullable=False),
+        sa.Column('snapshot_date', sa.Date(), nullable=False),
+        sa.Column('balance', sa.Numeric(15, 2), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
+        sa.ForeignKeyConstraint(['account_id'], ['financial_accounts.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('account_id', 'snapshot_date', name='uq_account_balance_snapshots_account_date')
+    )
+    op.create_index('ix_account_balance_snapshots_id', 'account_balance_snapshots', ['id'])
+
+    # Backfill: one entry per existing transaction on an account...
+    op.execute("""
+        INSERT INTO account_ledger_entries (tenant_id, account_id, transaction_id, entry_type, amount, entry_date)
+        SELECT t.tenant_id, t.account_id, t.id, 'transaction',
+               CASE WHEN t.type = 'credit' THEN t.amount ELSE -t.amount END,
+               t.transaction_date
+        FROM transactions t
+        JOIN financial_accounts a ON a.id = t.account_id
+        WHERE t.user_id = a.user_id
+    """)
+    # ...plus an opening entry that reconciles the ledger with each stored balance
+    op.execute("""
+        INSERT INTO account_ledger_entries (tenant_id, account_id, transaction_id, entry_type, amount, entry_date)
+        SELECT a.tenant_id, a.id, NULL, 'opening',
+               COALESCE(a.current_balance, 0) - COALESCE(s.total, 0),
+               LEAST(COALESCE(s.first_date, CAST(a.created_at AS DATE)), CAST(COALESCE(a.created_at, now()) AS DATE))
+        FROM financial_accounts a
+        LEFT JOIN (
+            SELECT account_id, SUM(amount) AS total, MIN(entry_date) AS first_date
+            FROM account_ledger_entries
+            GROUP BY account_id
+        ) s ON s.account_id = a.id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_account_balance_snapshots_id', 'account_balance_snapshots')
+    op.drop_table('account_balance_snapshots')
+    op.drop_index('ix_account_ledger_entries_account_date', 'account_ledger_entries')
+    op.drop_index('ix_account_ledger_entries_id', 'account_ledger_entries')
+    op.drop_table('account_ledger_entries')
@@ -0,0 +1,73 @@
+"""029_create_monthly_transaction_rollups
+
+Create monthly transaction rollups for cash flow and spending analytics
+
+Revision ID: 029_create_monthly_transaction_rollups
+Revises: 028_create_account_ledger
+Create Date: 2025-02-03 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '029_create_monthly_transaction_rollups'
+down_revision: Union[str, None] = '028_create_account_ledger'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'monthly_transaction_rollups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('tenant_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('account_id', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('category_id', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('year', sa.Integer(), nullable=False),
+        sa.Column('month', sa.Integer(), nullable=False),
+        sa.Column('total_credits', sa.Numeric(15, 2), nullable=False, server_default='0'),
+        sa.Column('total_debits', sa.Numeric(15, 2), nullable=False, server_default='0'),
+        sa.Column('transaction_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint(
+            'tenant_id', 'user_id', 'account_id', 'category_id', 'year', 'month',
+            name='uq_monthly_transaction_rollups_key'
+        )
+    )
+    op.create_index('ix_monthly_transaction_rollups_id', 'monthly_transaction_rollups', ['id'])
+    op.create_index(
+        'ix_monthly_transaction_rollups_user_month',
+        'monthly_transaction_rollups',
+        ['tenant_id', 'user_id', 'year', 'month']
+    )
+
+    # Backfill from existing transactions
+    op.execute("""
+        INSERT INTO monthly_transaction_rollups
+            (tenant_id, user_id, account_id, category_id, year, month,
+             total_credits, total_debits, transaction_count)
+        SELECT tenant_id, user_id, COALESCE(account_id, 0), COALESCE(category_id, 0),
+               CAST(EXTRACT(YEAR FROM transaction_date) AS INTEGER),
+               CAST(EXTRACT(MONTH FROM transaction_date) AS INTEGER),
+               COALESCE(SUM(CASE WHEN type = 'credit' THEN amount ELSE 0 END), 0),
+               COALESCE(SUM(CASE WHEN type = 'debit' THEN amount ELSE 0 END), 0),
+               COUNT(id)
+        FROM transactions
+        GROUP BY tenant_id, user_id, COALESCE(account_id, 0), COALESCE(category_id, 0),
+                 CAST(EXTRACT(YEAR FROM transaction_date) AS INTEGER),
+                 CAST(EXTRACT(MONTH FROM transaction_date) AS INTEGER)
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_monthly_transaction_rollups_user_month', 'monthly_transaction_rollups')
+    op.drop_index('ix_monthly_transaction_rollups_id', 'monthly_transaction_rollups')
+    op.drop_table('monthly_transaction_rollups')
@@ -0,0 +1,41 @@
+"""030_create_exchange_rates
+
+Create exchange rates table for cross-currency totals
+
+Revision ID: 030_create_exchange_rates
+Revises: 029_create_monthly_transaction_rollups
+Create Date: 2025-02-10 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '030_create_exchange_rates'
+down_revision: Union[str, None] = '029_create_monthly_transaction_rollups'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'exchange_rates',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('base_currency', sa.String(length=3), nullable=False),
+        sa.Column('quote_currency', sa.String(length=3), nullable=False),
+        sa.Column('rate_date', sa.Date(), nullable=False),
+        sa.Column('rate', sa.Numeric(20, 10), nullable=False),
+        sa.Column('source', sa.String(length=100), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('base_currency', 'quote_currency', 'rate_date', name='uq_exchange_rates_pair_date')
+    )
+    op.create_index('ix_exchange_rates_id', 'exchange_rates', ['id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_exchange_rates_id', 'exchange_rates')
+    op.drop_table('exchange_rates')
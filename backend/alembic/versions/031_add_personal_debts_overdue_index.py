@@ -0,0 +1,31 @@
+"""031_add_personal_debts_overdue_index
+
+Add composite index for overdue debt scans and summaries
+
+Revision ID: 031_add_personal_debts_overdue_index
+Revises: 030_create_exchange_rates
+Create Date: 2025-02-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '031_add_personal_debts_overdue_index'
+down_revision: Union[str, None] = '030_create_exchange_rates'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_personal_debts_tenant_status_due',
+        'personal_debts',
+        ['tenant_id', 'status', 'due_date']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_personal_debts_tenant_status_due', 'personal_debts')
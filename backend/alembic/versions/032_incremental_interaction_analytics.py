@@ -0,0 +1,137 @@
+"""032_incremental_interaction_analytics
+
+Replace the unused interaction_analytics event table with per-contact counters
+and add per-tenant interaction totals, both maintained on interaction writes
+
+Revision ID: 032_incremental_interaction_analytics
+Revises: 031_add_personal_debts_overdue_index
+Create Date: 2025-02-24 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+# revision identifiers, used by Alembic.
+revision: str = '032_incremental_interaction_analytics'
+down_revision: Union[str, None] = '031_add_personal_debts_overdue_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTER_COLUMNS = (
+    'total_interactions', 'in_person_meetings', 'phone_calls', 'emails', 'text_messages',
+    'interactions_last_30_days', 'interactions_initiated_by_user', 'interactions_initiated_by_contact'
+)
+
+
+def _counters():
+    return [sa.Column(name, sa.Integer(), nullable=False, server_default='0') for name in COUNTER_COLUMNS]
+
+
+def upgrade() -> None:
+    # The event-shaped table from 005 was never written to
+    op.drop_table('interaction_analytics')
+
+    op.create_table(
+        'interaction_analytics',
+        sa.Column('contact_id', sa.Integer(), nullable=False),
+        sa.Column('tenant_id', sa.Integer(), nullable=False),
+        *_counters(),
+        sa.Column('quality_total', sa.Numeric(12, 1), nullable=False, server_default='0'),
+        sa.Column('quality_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('duration_total', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('duration_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('avg_interaction_quality', sa.Numeric(4, 2), nullable=True),
+        sa.Column('avg_interaction_duration', sa.Numeric(8, 2), nullable=True),
+        sa.Column('last_interaction_date', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['contact_id'], ['contacts.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
+        sa.PrimaryKeyConstraint('contact_id')
+    )
+    op.create_index('ix_interaction_analytics_contact_id', 'interaction_analytics', ['contact_id'])
+    op.create_index('ix_interaction_analytics_tenant_id', 'interaction_analytics', ['tenant_id'])
+
+    op.create_table(
+        'interaction_analytics_totals',
+        sa.Column('tenant_id', sa.Integer(), nullable=False),
+        *_counters(),
+        sa.Column('contact_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('quality_average_total', sa.Numeric(14, 2), nullable=False, server_default='0'),
+        sa.Column('duration_average_total', sa.Numeric(18, 2), nullable=False, server_default='0'),
+        sa.Column('high_quality_contacts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
+        sa.PrimaryKeyConstraint('tenant_id')
+    )
+
+    # Backfill from existing interactions
+    op.execute("""
+        INSERT INTO interaction_analytics
+            (contact_id, tenant_id, total_interactions, in_person_meetings, phone_calls, emails, text_messages,
+             quality_total, quality_count, duration_total, duration_count,
+             avg_interaction_quality, avg_interaction_duration, last_interaction_date,
+             interactions_last_30_days, interactions_initiated_by_user, interactions_initiated_by_contact)
+        SELECT i.contact_id, c.tenant_id, COUNT(i.id),
+               SUM(CASE WHEN i.interaction_type = 'meeting' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN i.interaction_type = 'call' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN i.interaction_type = 'email' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN i.interaction_type = 'text' THEN 1 ELSE 0 END),
+               COALESCE(SUM(i.interaction_quality), 0), COUNT(i.interaction_quality),
+               COALESCE(SUM(i.duration_minutes), 0), COUNT(i.duration_minutes),
+               ROUND(AVG(i.interaction_quality), 2), ROUND(AVG(i.duration_minutes), 2),
+               MAX(i.interaction_date),
+               SUM(CASE WHEN i.interaction_date >= now() - INTERVAL '30 days' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN i.initiated_by = 'me' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN i.initiated_by = 'them' THEN 1 ELSE 0 END)
+        FROM contact_interactions i
+        JOIN contacts c ON c.id = i.contact_id
+        GROUP BY i.contact_id, c.tenant_id
+    """)
+    op.execute("""
+        INSERT INTO interaction_analytics_totals
+            (tenant_id, total_interactions, in_person_meetings, phone_calls, emails, text_messages,
+             interactions_last_30_days, interactions_initiated_by_user, interactions_initiated_by_contact,
+             contact_count, quality_average_total, duration_average_total, high_quality_contacts)
+        SELECT tenant_id, SUM(total_interactions), SUM(in_person_meetings), SUM(phone_calls), SUM(emails),
+               SUM(text_messages), SUM(interactions_last_30_days), SUM(interactions_initiated_by_user),
+               SUM(interactions_initiated_by_contact), COUNT(contact_id),
+               COALESCE(SUM(avg_interaction_quality), 0), COALESCE(SUM(avg_interaction_duration), 0),
+               SUM(CASE WHEN avg_interaction_quality >= 8 THEN 1 ELSE 0 END)
+        FROM interaction_analytics
+        GROUP BY tenant_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('interaction_analytics_totals')
+    op.drop_index('ix_interaction_analytics_tenant_id', 'interaction_analytics')
+    op.drop_index('ix_interaction_analytics_contact_id', 'interaction_analytics')
+    op.drop_table('interaction_analytics')
+
+    op.create_table(
+        'interaction_analytics',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('tenant_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('contact_id', sa.Integer(), nullable=True),
+        sa.Column('interaction_type', sa.String(50), nullable=False),
+        sa.Column('interaction_date', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('quality_score', sa.Float(), nullable=True),
+        sa.Column('response_time_hours', sa.Float(), nullable=True),
+        sa.Column('initiated_by_user', sa.Boolean(), nullable=False),
+        sa.Column('metadata', JSONB(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], name=op.f('fk_interaction_analytics_tenant_id_tenants')),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], name=op.f('fk_interaction_analytics_user_id_users')),
+        sa.ForeignKeyConstraint(['contact_id'], ['contacts.id'], name=op.f('fk_interaction_analytics_contact_id_contacts'), ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_interaction_analytics_id'), 'interaction_analytics', ['id'], unique=False)
+    op.create_index(op.f('ix_interaction_analytics_tenant_id'), 'interaction_analytics', ['tenant_id'], unique=False)
+    op.create_index(op.f('ix_interaction_analytics_user_id'), 'interaction_analytics', ['user_id'], unique=False)
+    op.create_index(op.f('ix_interaction_analytics_contact_id'), 'interaction_analytics', ['contact_id'], unique=False)
+    op.create_index(op.f('ix_interaction_analytics_interaction_date'), 'interaction_analytics', ['interaction_date'], unique=False)
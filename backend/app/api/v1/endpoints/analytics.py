@@ -38,7 +38,14 @@ from app.schemas.analytics import (
     PeriodComparisonRequest,
     GroupComparisonRequest
 )
-from app.crud.analytics import AnalyticsService
+from app.crud.analytics import (
+    AnalyticsService,
+    interaction_types,
+    interactions_overview,
+    key_performance_indicators,
+    overdue_follow_ups,
+    response_rates
+)
 from app.models.analytics import (
     ContactAnalyticsSummary,
     InteractionAnalytics,
@@ -48,6 +55,7 @@ from app.models.analytics import (
     DailyNetworkMetric
 )
 from app.models.contact import Contact
+from app.services.analytics_dashboard import dashboard_cache
 
 router = APIRouter()
 
@@ -237,20 +245,43 @@ def get_key_performance_indicators(
     tenant_id = get_tenant_context(request)
     analytics_service = AnalyticsService(db, tenant_id)
     
-    overview = analytics_service.get_overview_analytics()
+    return key_performance_indicators(analytics_service.get_overview_analytics())
+
+@router.get("/dashboard", response_model=Dict[str, Any])
+def get_dashboard_bundle(
+    request: Request,
+    refresh: bool = Query(default=False, description="Recompute instead of serving the cached bundle"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get every dashboard panel in one response
     
-    return {
-        "network_size": overview["summary"]["total_contacts"],
-        "network_health_score": overview["network_health"]["overall_score"],
-        "engagement_rate": overview["network_health"]["engagement_rate"],
-        "growth_rate": overview["network_health"]["growth_rate"],
-        "response_rate": overview["network_health"]["response_rate"],
-        "strong_relationships_ratio": (
-            overview["summary"]["strong_relationships"] / 
-            max(overview["summary"]["total_contacts"], 1)
-        ),
-        "follow_up_completion_rate": 0.85  # Mock - would calculate from actual data
-    }
+    This endpoint replaces the separate dashboard calls (overview, KPIs,
+    network health, interaction panels, overdue follow-ups). All panels are
+    computed from one snapshot of tenant data loaded in a single session,
+    so contacts and interaction totals are read once rather than per panel.
+    
+    Returns:
+        Dict containing:
+        - generated_at: When the bundle was computed (ISO 8601, UTC)
+        - overview: Same shape as /overview
+        - kpis: Same shape as /kpis
+        - network_health: Same shape as /network/health
+        - interactions_overview: Same shape as /interactions/overview
+        - interaction_types: Same shape as /interactions/types
+        - response_rate: Same shape as /interactions/response-rate
+        - follow_ups_overdue: Same shape as /follow-ups/overdue
+    
+    Performance Note:
+        Bundles are cached per tenant for ANALYTICS_DASHBOARD_CACHE_TTL_SECONDS
+        and dropped when the tenant's contacts or interactions change.
+        Pass refresh=true to recompute.
+    
+    Use Case:
+        Initial dashboard load, replacing five or more round trips with one.
+    """
+    tenant_id = get_tenant_context(request)
+    return dashboard_cache.get_bundle(db, tenant_id, refresh=refresh)
 
 # =============================================================================
 # NETWORK ANALYTICS ENDPOINTS
@@ -460,30 +491,7 @@ def get_interactions_overview(
     tenant_id = get_tenant_context(request)
     analytics_service = AnalyticsService(db, tenant_id)
     
-    interactions = analytics_service.get_interaction_analytics()
-    
-    if not interactions:
-        return {
-            "total_interactions": 0,
-            "avg_quality": 0.0,
-            "avg_duration": 0.0,
-            "interaction_frequency": 0.0,
-            "recent_activity": 0
-        }
-    
-    # Calculate aggregate metrics across all contacts
-    total_interactions = sum(i["total_interactions"] for i in interactions)
-    avg_quality = sum(i["avg_interaction_quality"] for i in interactions) / len(interactions)
-    avg_duration = sum(i["avg_interaction_duration"] for i in interactions) / len(interactions)
-    recent_activity = sum(i["interactions_last_30_days"] for i in interactions)
-    
-    return {
-        "total_interactions": total_interactions,
-        "avg_quality": avg_quality,
-        "avg_duration": avg_duration,
-        "interaction_frequency": total_interactions / max(len(interactions), 1),
-        "recent_activity": recent_activity
-    }
+    return interactions_overview(analytics_service.get_interaction_totals())
 
 @router.get("/interactions/types", response_model=Dict[str, Any])
 def get_interaction_types_breakdown(
@@ -520,14 +528,7 @@ def get_interaction_types_breakdown(
     tenant_id = get_tenant_context(request)
     analytics_service = AnalyticsService(db, tenant_id)
     
-    interactions = analytics_service.get_interaction_analytics()
-    
-    return {
-        "meetings": sum(i["in_person_meetings"] for i in interactions),
-        "calls": sum(i["phone_calls"] for i in interactions),
-        "emails": sum(i["emails"] for i in interactions),
-        "texts": sum(i["text_messages"] for i in interactions)
-    }
+    return interaction_types(analytics_service.get_interaction_totals())
 
 @router.get("/interactions/quality", response_model=Dict[str, Any])
 def get_interaction_quality_trends(
@@ -562,18 +563,15 @@ def get_interaction_quality_trends(
     tenant_id = get_tenant_context(request)
     analytics_service = AnalyticsService(db, tenant_id)
     
-    interactions = analytics_service.get_interaction_analytics()
+    totals = analytics_service.get_interaction_totals()
     
-    if not interactions:
+    if not totals["contact_count"]:
         return {"avg_quality": 0.0, "quality_trend": "stable", "high_quality_interactions": 0}
     
-    avg_quality = sum(i["avg_interaction_quality"] for i in interactions) / len(interactions)
-    high_quality = sum(1 for i in interactions if i["avg_interaction_quality"] >= 8.0)
-    
     return {
-        "avg_quality": avg_quality,
+        "avg_quality": totals["avg_interaction_quality"],
         "quality_trend": "improving",  # Would calculate from historical data
-        "high_quality_interactions": high_quality
+        "high_quality_interactions": totals["high_quality_contacts"]
     }
 
 @router.get("/interactions/frequency", response_model=Dict[str, Any])
@@ -610,12 +608,12 @@ def get_interaction_frequency_analysis(
     tenant_id = get_tenant_context(request)
     analytics_service = AnalyticsService(db, tenant_id)
     
-    interactions = analytics_service.get_interaction_analytics()
-    recent_interactions = sum(i["interactions_last_30_days"] for i in interactions)
+    totals = analytics_service.get_interaction_totals()
+    recent_interactions = totals["interactions_last_30_days"]
     
     return {
         "interactions_last_30_days": recent_interactions,
-        "avg_interactions_per_contact": recent_interactions / max(len(interactions), 1),
+        "avg_interactions_per_contact": recent_interactions / max(totals["contact_count"], 1),
         "frequency_trend": "stable",  # Would calculate from historical data
         "most_active_period": "Tuesday afternoons"  # Mock data
     }
@@ -662,19 +660,7 @@ def get_response_rate_analysis(
     tenant_id = get_tenant_context(request)
     analytics_service = AnalyticsService(db, tenant_id)
     
-    interactions = analytics_service.get_interaction_analytics()
-    
-    user_initiated = sum(i["interactions_initiated_by_user"] for i in interactions)
-    contact_initiated = sum(i["interactions_initiated_by_contact"] for i in interactions)
-    total = user_initiated + contact_initiated
-    
-    return {
-        "overall_response_rate": contact_initiated / max(total, 1),
-        "user_initiated": user_initiated,
-        "contact_initiated": contact_initiated,
-        "response_time_avg": "2.5 hours",  # Mock data
-        "best_response_days": ["Tuesday", "Wednesday"]  # Mock data
-    }
+    return response_rates(analytics_service.get_interaction_totals())
 
 # Relationship Analytics Endpoints
 @router.get("/relationships/strength", response_model=Dict[str, Any])
@@ -1043,25 +1029,7 @@ def get_overdue_follow_ups(
         )
     ).all()
     
-    return {
-        "total_overdue": len(overdue_contacts),
-        "overdue_by_urgency": {
-            "high": sum(1 for c in overdue_contacts if c.follow_up_urgency == 'high'),
-            "medium": sum(1 for c in overdue_contacts if c.follow_up_urgency == 'medium'),
-            "low": sum(1 for c in overdue_contacts if c.follow_up_urgency == 'low')
-        },
-        "avg_days_overdue": 7.5,  # Mock calculation
-        "overdue_contacts": [
-            {
-                "contact_id": c.id,
-                "name": f"{c.first_name} {c.last_name}",
-                "days_overdue": (date.today() - (c.next_suggested_contact_date or date.today())).days,
-                "urgency": c.follow_up_urgency,
-                "connection_strength": float(c.connection_strength or 0)
-            }
-            for c in overdue_contacts[:10]  # Limit to top 10
-        ]
-    }
+    return overdue_follow_ups(overdue_contacts, date.today())
 
 @router.get("/engagement/patterns", response_model=Dict[str, Any])
 def get_engagement_patterns(
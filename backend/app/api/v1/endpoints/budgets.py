@@ -39,14 +39,12 @@ def read_budgets(
 ) -> Any:
     """Retrieve budgets with spending summaries."""
     tenant_id = current_user.tenant_id
-    budgets = crud.budget.get_by_user(db, user_id=current_user.id, tenant_id=tenant_id)
-    
-    # Add spending summaries
     service = BudgetService(db)
+    budgets = service.get_budget_summaries(user_id=current_user.id, tenant_id=tenant_id)
+    
     budgets_with_summary = []
-    for budget in budgets:
+    for budget, summary in budgets:
         budget_dict = schemas.Budget.from_orm(budget).dict()
-        summary = service.get_budget_summary(budget, current_user.id)
         budget_dict.update(summary)
         budgets_with_summary.append(schemas.BudgetWithSummary(**budget_dict))
     
@@ -1,10 +1,17 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Request
+from datetime import date
+from decimal import Decimal
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db, get_current_user
+from app.core.money import currency_exponents, sum_amounts
 from app.crud import currency as crud_currency
-from app.schemas.currency import Currency, CurrencyCreate, CurrencyUpdate, CurrencyList
+from app.crud import exchange_rate as crud_exchange_rate
+from app.schemas.currency import (
+    Currency, CurrencyCreate, CurrencyUpdate, CurrencyList, CurrencyConversion, ExchangeRate
+)
+from app.services.fx_rates import fx_rates
 from app.models.user import User
 
 router = APIRouter()
@@ -69,6 +76,47 @@ def get_currencies_by_country(
     
     return crud_currency.get_currencies_by_country(db, country_code)
 
+@router.get("/rates", response_model=List[ExchangeRate])
+def get_exchange_rates(
+    request: Request,
+    base: Optional[str] = None,
+    quote: Optional[str] = None,
+    skip: int = 0,
+    limit: int = Query(100, le=1000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get stored exchange rates, newest first"""
+    return crud_exchange_rate.get_rates(
+        db, base=base.upper() if base else None, quote=quote.upper() if quote else None, skip=skip, limit=limit
+    )
+
+@router.get("/convert", response_model=CurrencyConversion)
+def convert_amount(
+    amount: Decimal,
+    from_currency: str,
+    to_currency: str,
+    request: Request,
+    on: Optional[date] = Query(None, description="Rate date (default today); the latest rate on or before it is used"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Convert an amount between currencies"""
+    from_currency, to_currency = from_currency.upper(), to_currency.upper()
+    rate_date = on or date.today()
+    rate = fx_rates.get_rate(db, from_currency, to_currency, rate_date)
+    if rate is None:
+        raise HTTPException(status_code=404, detail=f"No exchange rate for {from_currency} to {to_currency}")
+    
+    return CurrencyConversion(
+        amount=amount,
+        from_currency=from_currency,
+        to_currency=to_currency,
+        rate_date=rate_date,
+        rate=rate,
+        converted_amount=sum_amounts([amount * rate], currency_exponents.get(db, to_currency))
+    )
+
 @router.get("/{currency_code}", response_model=Currency)
 def get_currency_by_code(
     currency_code: str,
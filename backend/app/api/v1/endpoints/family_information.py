@@ -13,7 +13,9 @@ from app.schemas.family_information import (
     BirthdayReminder,
     EmergencyContact,
     FamilySummary,
-    FamilyInformationFilter
+    FamilyInformationFilter,
+    RelativeInfo,
+    RelationshipPath
 )
 from app.crud.family_information import FamilyInformationService
 
@@ -43,6 +45,55 @@ def get_family_members(
     )
 
 
+@router.get("/members/{contact_id}/relatives", response_model=List[RelativeInfo])
+def get_relatives(
+    contact_id: int,
+    request: Request,
+    depth: int = Query(2, ge=1, le=10, description="Maximum number of relationship hops"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get contacts related to a contact through family relationships, nearest first.
+    """
+    tenant_id = request.state.tenant.id
+    family_service = FamilyInformationService(db)
+    
+    return family_service.get_relatives(
+        user_id=current_user.id,
+        tenant_id=tenant_id,
+        contact_id=contact_id,
+        depth=depth
+    )
+
+
+@router.get("/relationship-path", response_model=RelationshipPath)
+def get_relationship_path(
+    request: Request,
+    from_contact_id: int = Query(..., description="Contact to start from"),
+    to_contact_id: int = Query(..., description="Contact to reach"),
+    family_only: bool = Query(False, description="Only follow family relationships"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Find how two contacts are related: the shortest chain of relationships between them.
+    """
+    tenant_id = request.state.tenant.id
+    family_service = FamilyInformationService(db)
+    
+    path = family_service.find_relationship_path(
+        user_id=current_user.id,
+        tenant_id=tenant_id,
+        from_contact_id=from_contact_id,
+        to_contact_id=to_contact_id,
+        category='family' if family_only else None
+    )
+    if path is None:
+        raise HTTPException(status_code=404, detail="No relationship path found between these contacts")
+    return path
+
+
 @router.get("/birthdays", response_model=List[BirthdayReminder])
 def get_upcoming_birthdays(
     request: Request,
@@ -1,9 +1,13 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, List, Optional
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from app import crud, models
-from app.schemas.financial_account import FinancialAccount, FinancialAccountCreate, FinancialAccountUpdate, FinancialAccountWithSummary
+from app.crud import account_ledger
+from app.schemas.financial_account import (
+    AccountBalance, FinancialAccount, FinancialAccountCreate, FinancialAccountUpdate, FinancialAccountWithSummary
+)
 from app.api import deps
 
 router = APIRouter()
@@ -33,22 +37,28 @@ def create_financial_account(
 @router.get("/", response_model=List[FinancialAccountWithSummary])
 def read_financial_accounts(
     db: Session = Depends(deps.get_db),
+    as_of: Optional[date] = Query(None, description="Report balances at the end of this date instead of now"),
     current_user: models.User = Depends(deps.get_current_active_user),
     
 ) -> Any:
     """Retrieve financial accounts with transaction summaries."""
     tenant_id = current_user.tenant_id
-    accounts = crud.financial_account.get_financial_accounts_by_user(
+    accounts = crud.financial_account.get_financial_accounts_with_summaries(
         db, user_id=current_user.id, tenant_id=tenant_id
     )
     
-    # Add transaction summaries
+    historical_balances = None
+    if as_of:
+        historical_balances = account_ledger.get_balances_as_of(
+            db, account_ids=[account.id for account, _ in accounts], as_of=as_of
+        )
+    
     accounts_with_summary = []
-    for account in accounts:
-        # Get transaction summary for this account
-        summary = crud.transaction.get_account_summary(db, account_id=account.id, user_id=current_user.id)
+    for account, summary in accounts:
         account_dict = FinancialAccount.from_orm(account).dict()
         account_dict.update(summary)
+        if historical_balances is not None:
+            account_dict["current_balance"] = historical_balances[account.id]
         accounts_with_summary.append(FinancialAccountWithSummary(**account_dict))
     
     return accounts_with_summary
@@ -70,6 +80,31 @@ def read_financial_account(
         raise HTTPException(status_code=404, detail="Financial account not found")
     return account
 
+@router.get("/{id}/balance", response_model=AccountBalance)
+def read_account_balance(
+    *,
+    db: Session = Depends(deps.get_db),
+    id: int,
+    as_of: Optional[date] = Query(None, description="Defaults to today"),
+    current_user: models.User = Depends(deps.get_current_active_user),
+    
+) -> Any:
+    """Get an account's balance at the end of a date, from its latest snapshot and ledger."""
+    tenant_id = current_user.tenant_id
+    account = crud.financial_account.get_financial_account_by_user(
+        db=db, account_id=id, user_id=current_user.id, tenant_id=tenant_id
+    )
+    if not account:
+        raise HTTPException(status_code=404, detail="Financial account not found")
+    
+    as_of = as_of or date.today()
+    return AccountBalance(
+        account_id=account.id,
+        as_of=as_of,
+        balance=account_ledger.get_balance_as_of(db, account_id=account.id, as_of=as_of),
+        currency=account.currency
+    )
+
 @router.put("/{id}", response_model=FinancialAccount)
 def update_financial_account(
     *,
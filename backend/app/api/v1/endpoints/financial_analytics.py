@@ -1,26 +1,33 @@
 from typing import Any, Optional
 from datetime import date, datetime, timedelta
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from app import crud, models
 from app.api import deps
+from app.core.currency_validator import validate_currency_code
 from app.services.financial_analytics_service import FinancialAnalyticsService
 
 router = APIRouter()
 
+def _validate_currency(db: Session, currency: Optional[str]) -> None:
+    if currency is not None and not validate_currency_code(db, currency.upper()):
+        raise HTTPException(status_code=400, detail=f"Invalid currency code: {currency}")
+
 @router.get("/dashboard-summary")
 def get_dashboard_summary(
     *,
     db: Session = Depends(deps.get_db),
+    currency: Optional[str] = Query(None, description="Currency to total balances in (default currency if omitted)"),
     current_user: models.User = Depends(deps.get_current_active_user),
     
 ) -> Any:
     """Get financial dashboard summary."""
     tenant_id = current_user.tenant_id
+    _validate_currency(db, currency)
     service = FinancialAnalyticsService(db)
     
-    summary = service.get_dashboard_summary(user_id=current_user.id, tenant_id=tenant_id)
+    summary = service.get_dashboard_summary(user_id=current_user.id, tenant_id=tenant_id, currency=currency)
     return summary
 
 @router.get("/cash-flow")
@@ -67,14 +74,16 @@ def get_spending_trends(
 def get_net_worth_tracking(
     *,
     db: Session = Depends(deps.get_db),
+    currency: Optional[str] = Query(None, description="Currency to total balances in (default currency if omitted)"),
     current_user: models.User = Depends(deps.get_current_active_user),
     
 ) -> Any:
     """Get net worth tracking data."""
     tenant_id = current_user.tenant_id
+    _validate_currency(db, currency)
     service = FinancialAnalyticsService(db)
     
-    net_worth = service.calculate_net_worth(user_id=current_user.id, tenant_id=tenant_id)
+    net_worth = service.calculate_net_worth(user_id=current_user.id, tenant_id=tenant_id, currency=currency)
     return net_worth
 
 @router.get("/category-analysis")
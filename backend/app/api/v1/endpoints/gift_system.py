@@ -6,6 +6,7 @@ from decimal import Decimal
 
 from app.api import deps
 from app.api.deps import get_tenant_context
+from app.core.currency_validator import validate_currency_code
 from app.core.enhanced_settings import get_settings
 from app.models.user import User
 from app.crud import gift as gift_crud
@@ -864,7 +865,8 @@ def get_gift_financial_summary(
     request: Request,
     db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_active_user),
-    year: Optional[int] = Query(None, description="Year for financial summary")
+    year: Optional[int] = Query(None, description="Year for financial summary"),
+    currency: Optional[str] = Query(None, description="Currency to total amounts in (default currency if omitted)")
 ) -> Any:
     """
     Get financial summary of gift spending (financial system integration).
@@ -872,11 +874,13 @@ def get_gift_financial_summary(
     settings = get_settings()
     if not settings.GIFT_SYSTEM_ENABLED:
         raise HTTPException(status_code=404, detail="Gift system is not enabled")
+    if currency is not None and not validate_currency_code(db, currency.upper()):
+        raise HTTPException(status_code=400, detail=f"Invalid currency code: {currency}")
     
     integration_service = GiftIntegrationService(
         db, current_user.id, current_user.tenant_id
     )
-    summary = integration_service.get_financial_summary(year)
+    summary = integration_service.get_financial_summary(year, currency)
     return summary
 
 
@@ -7,7 +7,8 @@ from app.api import deps
 from app.models.personal_debt import DebtStatus, PaymentStatus
 from app.crud import personal_debt as debt_crud
 from app.schemas.personal_debt import (
-    PersonalDebt, PersonalDebtCreate, PersonalDebtUpdate, PersonalDebtWithPayments, PersonalDebtSummary,
+    PersonalDebt, PersonalDebtCreate, PersonalDebtUpdate, PersonalDebtWithPayments, PersonalDebtWithBalance,
+    PersonalDebtSummary,
     DebtPayment, DebtPaymentCreate, DebtPaymentUpdate
 )
 
@@ -91,15 +92,20 @@ def get_debt_summary(
     return summary
 
 
-@router.get("/overdue", response_model=List[PersonalDebt])
+@router.get("/overdue", response_model=List[PersonalDebtWithBalance])
 def get_overdue_debts(
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
-    """Get overdue debts for current user."""
+    """Get overdue debts for current user, with amounts paid and outstanding."""
     tenant_id = current_user.tenant_id
-    overdue_debts = debt_crud.get_overdue_debts(db, current_user.id, tenant_id)
-    return overdue_debts
+    overdue_debts = debt_crud.get_overdue_debts_with_balances(db, current_user.id, tenant_id)
+    return [
+        PersonalDebtWithBalance(
+            **PersonalDebt.model_validate(debt).model_dump(), total_paid=total_paid, remaining_balance=remaining
+        )
+        for debt, total_paid, remaining in overdue_debts
+    ]
 
 
 @router.get("/owed-to-me", response_model=List[PersonalDebt])
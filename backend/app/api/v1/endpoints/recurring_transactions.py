@@ -100,18 +100,6 @@ def generate_transaction_from_recurring(
     service = RecurringTransactionService(db)
     transaction = service.generate_transaction_from_template(recurring)
     
-    # Update account balance if account is specified
-    if transaction.account_id:
-        account = crud.financial_account.get_financial_account_by_user(
-            db=db, account_id=transaction.account_id, user_id=current_user.id, tenant_id=tenant_id
-        )
-        if account:
-            if transaction.type == "credit":
-                new_balance = float(account.current_balance) + float(transaction.amount)
-            else:
-                new_balance = float(account.current_balance) - float(transaction.amount)
-            crud.financial_account.update_account_balance(db=db, db_obj=account, new_balance=new_balance)
-    
     # Update next due date
     next_due = service.calculate_next_due_date_from_recurring(recurring)
     crud.recurring_transaction.update(
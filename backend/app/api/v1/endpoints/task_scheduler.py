@@ -8,6 +8,7 @@ from typing import Any, Dict
 from app.api import deps
 from app.models.user import User
 from app.services.task_scheduler import task_scheduler_service
+from app.services.leader_election import scheduler_leader_election
 
 router = APIRouter()
 
@@ -47,6 +48,7 @@ def get_scheduler_status(
         return {
             "is_running": task_scheduler_service.is_running,
             "scheduler_state": "running" if task_scheduler_service.is_running else "stopped",
+            "is_leader": scheduler_leader_election.is_leader,
             "jobs": [
                 {
                     "id": job.id,
@@ -1,6 +1,6 @@
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import date
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from app import crud, models
@@ -8,6 +8,7 @@ from app.schemas import transaction as transaction_schemas
 from app.schemas import financial_account as financial_account_schemas
 from app.api import deps
 from app.core.config import settings
+from app.services.transaction_import import TransactionImportService
 
 router = APIRouter()
 
@@ -31,18 +32,6 @@ def create_transaction(
         tenant_id=tenant_id
     )
     
-    # Update account balance if account is specified
-    if transaction.account_id:
-        account = crud.financial_account.get_financial_account_by_user(
-            db=db, account_id=transaction.account_id, user_id=current_user.id, tenant_id=tenant_id
-        )
-        if account:
-            if transaction.type == "credit":
-                new_balance = float(account.current_balance) + float(transaction.amount)
-            else:
-                new_balance = float(account.current_balance) - float(transaction.amount)
-            crud.financial_account.update_account_balance(db=db, db_obj=account, new_balance=new_balance)
-    
     return transaction
 
 @router.get("/", response_model=List[transaction_schemas.Transaction])
@@ -119,35 +108,9 @@ def update_transaction(
     if not transaction:
         raise HTTPException(status_code=404, detail="Transaction not found")
     
-    # Handle account balance updates
-    old_amount = float(transaction.amount)
-    old_type = transaction.type
-    old_account_id = transaction.account_id
-    
+    # Balance changes are posted to the account ledger by the CRUD layer
     transaction = crud.transaction.update_transaction(db=db, db_obj=transaction, obj_in=transaction_in)
     
-    # Update account balances if needed
-    if old_account_id or transaction.account_id:
-        # Revert old transaction effect
-        if old_account_id:
-            old_account = crud.financial_account.get_financial_account_by_user(
-                db=db, account_id=old_account_id, user_id=current_user.id, tenant_id=tenant_id
-            )
-            if old_account:
-                revert_amount = old_amount if old_type == "debit" else -old_amount
-                new_balance = float(old_account.current_balance) + revert_amount
-                crud.financial_account.update_account_balance(db=db, db_obj=old_account, new_balance=new_balance)
-        
-        # Apply new transaction effect
-        if transaction.account_id:
-            account = crud.financial_account.get_financial_account_by_user(
-                db=db, account_id=transaction.account_id, user_id=current_user.id, tenant_id=tenant_id
-            )
-            if account:
-                effect_amount = float(transaction.amount) if transaction.type == "credit" else -float(transaction.amount)
-                new_balance = float(account.current_balance) + effect_amount
-                crud.financial_account.update_account_balance(db=db, db_obj=account, new_balance=new_balance)
-    
     return transaction
 
 @router.delete("/{id}")
@@ -166,16 +129,6 @@ def delete_transaction(
     if not transaction:
         raise HTTPException(status_code=404, detail="Transaction not found")
     
-    # Revert account balance if needed
-    if transaction.account_id:
-        account = crud.financial_account.get_financial_account_by_user(
-            db=db, account_id=transaction.account_id, user_id=current_user.id, tenant_id=tenant_id
-        )
-        if account:
-            revert_amount = float(transaction.amount) if transaction.type == "debit" else -float(transaction.amount)
-            new_balance = float(account.current_balance) + revert_amount
-            crud.financial_account.update_account_balance(db=db, db_obj=account, new_balance=new_balance)
-    
     transaction = crud.transaction.delete_transaction(
         db=db, transaction_id=id, user_id=current_user.id, tenant_id=tenant_id
     )
@@ -217,46 +170,10 @@ def get_category_breakdown(
 def bulk_create_transactions(
     *,
     db: Session = Depends(deps.get_db),
-    transactions_in: List[transaction_transaction_schemas.TransactionCreate],
+    transactions_in: List[Dict[str, Any]] = Body(...),
     current_user: models.User = Depends(deps.get_current_active_user),
     
 ) -> Any:
     """Bulk create transactions (for import)."""
-    tenant_id = current_user.tenant_id
-    created_transactions = []
-    failed_transactions = []
-    
-    for transaction_data in transactions_in:
-        try:
-            transaction_dict = transaction_data.dict()
-            transaction_dict["user_id"] = current_user.id
-            transaction_dict["tenant_id"] = tenant_id
-            
-            transaction = crud.transaction.create_transaction(
-                db=db, 
-                obj_in=transaction_transaction_schemas.TransactionCreate(**transaction_dict),
-                user_id=current_user.id,
-                tenant_id=tenant_id
-            )
-            created_transactions.append(transaction)
-            
-            # Update account balance
-            if transaction.account_id:
-                account = crud.financial_account.get_financial_account_by_user(
-                    db=db, account_id=transaction.account_id, user_id=current_user.id, tenant_id=tenant_id
-                )
-                if account:
-                    if transaction.type == "credit":
-                        new_balance = float(account.current_balance) + float(transaction.amount)
-                    else:
-                        new_balance = float(account.current_balance) - float(transaction.amount)
-                    crud.financial_account.update_account_balance(db=db, db_obj=account, new_balance=new_balance)
-        except Exception as e:
-            failed_transactions.append({"data": transaction_data.dict(), "error": str(e)})
-    
-    return {
-        "created": len(created_transactions),
-        "failed": len(failed_transactions),
-        "transactions": created_transactions,
-        "errors": failed_transactions
-    }
\ No newline at end of file
+    service = TransactionImportService(db, user_id=current_user.id, tenant_id=current_user.tenant_id)
+    return service.import_rows(transactions_in)
@@ -1,11 +1,13 @@
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import date
-from fastapi import APIRouter, Depends, HTTPException, Query
+import io
+from fastapi import APIRouter, Body, Depends, File, HTTPException, Query, UploadFile
 from sqlalchemy.orm import Session
 
 from app import crud
 from app.models.user import User
 from app.schemas.transaction import Transaction, TransactionCreate, TransactionUpdate, TransactionWithDetails
+from app.services.transaction_import import TransactionImportService, iter_csv_rows, iter_ofx_rows
 from app.api import deps
 
 router = APIRouter()
@@ -45,6 +47,41 @@ def read_transactions(
     )
     return transactions
 
+@router.post("/bulk")
+def bulk_create_transactions(
+    *,
+    db: Session = Depends(deps.get_db),
+    transactions_in: List[Dict[str, Any]] = Body(...),
+    current_user: User = Depends(deps.get_current_active_user)
+) -> Any:
+    """
+    Bulk create transactions (for import).
+    Rows are validated individually; invalid rows are reported in errors without failing the import.
+    """
+    service = TransactionImportService(db, user_id=current_user.id, tenant_id=current_user.tenant_id)
+    return service.import_rows(transactions_in)
+
+@router.post("/import")
+def import_transactions(
+    *,
+    db: Session = Depends(deps.get_db),
+    file: UploadFile = File(...),
+    file_format: Optional[str] = Query(None, pattern="^(csv|ofx)$", description="Defaults to the file extension"),
+    account_id: Optional[int] = Query(None, description="Account for rows that do not specify one"),
+    current_user: User = Depends(deps.get_current_active_user)
+) -> Any:
+    """Import transactions from a CSV or OFX bank export, streamed row by row."""
+    file_format = file_format or (file.filename or "").rsplit(".", 1)[-1].lower()
+    if file_format == "csv":
+        rows = iter_csv_rows(io.TextIOWrapper(file.file, encoding="utf-8-sig", newline=""), account_id)
+    elif file_format in ("ofx", "qfx"):
+        rows = iter_ofx_rows(io.TextIOWrapper(file.file, encoding="utf-8", errors="replace"), account_id)
+    else:
+        raise HTTPException(status_code=400, detail="Unsupported file format, expected csv or ofx")
+
+    service = TransactionImportService(db, user_id=current_user.id, tenant_id=current_user.tenant_id)
+    return service.import_rows(rows)
+
 @router.get("/{id}", response_model=Transaction)
 def read_transaction(
     *,
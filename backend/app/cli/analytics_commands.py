@@ -0,0 +1,62 @@
+"""
+Analytics maintenance CLI commands for Recaller backend.
+
+This module provides CLI commands for maintaining derived analytics data:
+- Rebuilding monthly transaction rollups from the transactions table
+- Rebuilding contact interaction analytics from the interactions table
+"""
+
+import click
+from typing import Optional
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.crud import interaction_analytics, transaction_rollup
+
+
+def get_db_session() -> Session:
+    """Get database session for CLI operations."""
+    return SessionLocal()
+
+
+@click.group()
+def analytics():
+    """Analytics maintenance commands."""
+    pass
+
+
+@analytics.command()
+@click.option('--tenant-id', type=int, default=None, help='Only rebuild this tenant (default: all tenants)')
+@click.option('--user-id', type=int, default=None, help='Only rebuild this user')
+def rebuild_rollups(tenant_id: Optional[int], user_id: Optional[int]):
+    """Rebuild monthly transaction rollups from transactions."""
+    db = get_db_session()
+    try:
+        count = transaction_rollup.rebuild(db, tenant_id=tenant_id, user_id=user_id)
+        scope = "all tenants" if tenant_id is None else f"tenant {tenant_id}"
+        if user_id is not None:
+            scope += f", user {user_id}"
+        click.echo(f"✅ Rebuilt {count} monthly rollup row(s) for {scope}")
+        
+    except Exception as e:
+        db.rollback()
+        click.echo(f"❌ Error: {str(e)}")
+    finally:
+        db.close()
+
+
+@analytics.command()
+@click.option('--tenant-id', type=int, default=None, help='Only rebuild this tenant (default: all tenants)')
+def rebuild_interactions(tenant_id: Optional[int]):
+    """Rebuild contact interaction analytics and tenant totals from interactions."""
+    db = get_db_session()
+    try:
+        count = interaction_analytics.rebuild(db, tenant_id=tenant_id)
+        scope = "all tenants" if tenant_id is None else f"tenant {tenant_id}"
+        click.echo(f"✅ Rebuilt interaction analytics for {count} contact(s) in {scope}")
+        
+    except Exception as e:
+        db.rollback()
+        click.echo(f"❌ Error: {str(e)}")
+    finally:
+        db.close()
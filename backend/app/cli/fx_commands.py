@@ -0,0 +1,47 @@
+"""
+Exchange rate CLI commands for Recaller backend.
+
+This module provides CLI commands for maintaining the local exchange rate table:
+- Loading rates from a CSV or JSON file
+"""
+
+import click
+from typing import Optional
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.fx_rates import load_rates_file
+
+
+def get_db_session() -> Session:
+    """Get database session for CLI operations."""
+    return SessionLocal()
+
+
+@click.group()
+def fx():
+    """Exchange rate commands."""
+    pass
+
+
+@fx.command()
+@click.argument('path', required=False, type=click.Path(exists=True, dir_okay=False))
+@click.option('--source', default=None, help='Source recorded with each rate (default: the file name)')
+def load_rates(path: Optional[str], source: Optional[str]):
+    """Load exchange rates from PATH (default: FX_RATES_FILE)."""
+    path = path or settings.FX_RATES_FILE
+    if not path:
+        click.echo("❌ Error: no rates file given and FX_RATES_FILE is not set")
+        return
+    
+    db = get_db_session()
+    try:
+        count = load_rates_file(db, path, source)
+        click.echo(f"✅ Loaded {count} exchange rate(s) from {path}")
+        
+    except Exception as e:
+        db.rollback()
+        click.echo(f"❌ Error: {str(e)}")
+    finally:
+        db.close()
@@ -106,9 +106,18 @@ class Settings(BaseSettings):
     # Redis Configuration
     REDIS_URL: str = "redis://localhost:6379/0"
     
+    # Leader election for per-cluster background services (task scheduler, hot reload).
+    # Needs Redis; enable it when running more than one worker.
+    SCHEDULER_LEADER_ELECTION_ENABLED: bool = False
+    SCHEDULER_LEADER_LOCK_KEY: str = "recaller:leader:scheduler"
+    SCHEDULER_LEADER_LEASE_SECONDS: int = 30
+    SCHEDULER_LEADER_RENEW_INTERVAL_SECONDS: int = 10
+    
     # Celery Configuration
     CELERY_BROKER_URL: str = "redis://localhost:6379/0"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/0"
+    # Users per fan-out chunk for the reminder and recurring transaction jobs
+    BACKGROUND_TASK_CHUNK_SIZE: int = 100
     
     # CORS Configuration
     CORS_ALLOWED_ORIGINS: str = "http://localhost:3000"
@@ -123,6 +132,26 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: Optional[str] = None
     SMTP_TLS: bool = True
     SMTP_FROM_EMAIL: str = "noreply@recaller.com"
+    SMTP_POOL_SIZE: int = 4
+    EMAIL_BACKEND: str = "smtp"  # smtp, file, stdout
+    EMAIL_FILE_PATH: str = "/tmp/recaller-emails"
+    EMAIL_MAX_PENDING: int = 100
+    EMAIL_MAX_RETRIES: int = 3
+    
+    # Bulk transaction import: rows validated and inserted per batch
+    TRANSACTION_IMPORT_BATCH_SIZE: int = 1000
+    
+    # Keep running per-budget spending totals in memory, updated on transaction writes
+    BUDGET_SPENDING_CACHE_ENABLED: bool = False
+    BUDGET_SPENDING_CACHE_TTL_SECONDS: int = 300
+    
+    # Exchange rates: file loaded by `cli.py fx load-rates`, and (from, to, date) lookups kept in memory
+    FX_RATES_FILE: Optional[str] = None
+    FX_RATE_CACHE_SIZE: int = 4096
+    
+    # Analytics dashboard bundle: panel worker threads and how long a tenant's bundle is reused
+    ANALYTICS_DASHBOARD_WORKERS: int = 4
+    ANALYTICS_DASHBOARD_CACHE_TTL_SECONDS: int = 60
     
     def get_cors_origins(self) -> List[str]:
         """Parse CORS allowed origins from comma-separated string."""
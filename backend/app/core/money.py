@@ -0,0 +1,187 @@
+"""
+Exact money arithmetic in integer minor units.
+
+Amounts are stored as Numeric columns and arrive from the database as Decimal.
+Aggregation happens in SQL where possible; whatever has to be combined in Python
+is added up exactly and held as integer minor units of its currency (cents for
+USD, yen for JPY, fils for KWD) using the exponent from the currencies table, and
+turned back into a Decimal with the currency's number of places only when a
+response is built. Nothing goes through float.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from decimal import ROUND_HALF_EVEN, Decimal, localcontext
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+from sqlalchemy.orm import Session
+
+from app.models.currency import Currency
+
+# Exponent for currencies missing from the currencies table
+DEFAULT_EXPONENT = 2
+
+# Scale of the Numeric(15, 2) amount and balance columns, for totals not tied to one currency
+AMOUNT_EXPONENT = 2
+
+# Digits kept while adding amounts up; Numeric(15, 2) sums stay exact far beyond any real row count
+SUM_PRECISION = 38
+
+Amount = Union[Decimal, int, str]
+
+
+def _decimal(amount: Amount) -> Decimal:
+    if isinstance(amount, Decimal):
+        return amount
+    if isinstance(amount, float):
+        raise TypeError("Money amounts must be Decimal, int or str, not float")
+    return Decimal(amount)
+
+
+def to_minor(amount: Amount, exponent: int = DEFAULT_EXPONENT) -> int:
+    """Convert an amount to integer minor units, rounding half to even past the exponent."""
+    return int(_decimal(amount).scaleb(exponent).to_integral_value(rounding=ROUND_HALF_EVEN))
+
+
+def _total_minor(amounts: Iterable[Optional[Amount]], exponent: int) -> Tuple[int, int]:
+    """Exact total of amounts in minor units, and how many there were (None counts as zero)."""
+    total = Decimal(0)
+    count = 0
+    with localcontext() as context:
+        context.prec = SUM_PRECISION
+        # Decimal addition is exact at this precision, so the sum is rounded only once
+        for amount in amounts:
+            count += 1
+            if amount is not None:
+                total += _decimal(amount)
+    return to_minor(total, exponent), count
+
+
+def from_minor(minor: int, exponent: int = DEFAULT_EXPONENT) -> Decimal:
+    """Decimal amount with exactly `exponent` places for a number of minor units."""
+    return Decimal(minor).scaleb(-exponent)
+
+
+def divide_minor(minor: int, divisor: int) -> int:
+    """Integer division of minor units, rounding half to even."""
+    quotient, remainder = divmod(minor, divisor)
+    doubled = 2 * remainder
+    if doubled > divisor or (doubled == divisor and quotient % 2):
+        quotient += 1
+    return quotient
+
+
+def sum_amounts(amounts: Iterable[Optional[Amount]], exponent: int = AMOUNT_EXPONENT) -> Decimal:
+    """Exact total of amounts, formatted with `exponent` places; None counts as zero."""
+    total, _ = _total_minor(amounts, exponent)
+    return from_minor(total, exponent)
+
+
+def mean_amount(amounts: Iterable[Optional[Amount]], exponent: int = AMOUNT_EXPONENT) -> Decimal:
+    """Average of amounts, rounded half to even to the exponent. Zero for no amounts."""
+    total, count = _total_minor(amounts, exponent)
+    if not count:
+        return from_minor(0, exponent)
+    return from_minor(divide_minor(total, count), exponent)
+
+
+def percentage(part: Amount, whole: Amount, places: int = 2) -> float:
+    """part as a percentage of whole, rounded to places; 0.0 when whole is not positive."""
+    part, whole = _decimal(part), _decimal(whole)
+    if whole <= 0:
+        return 0.0
+    return float((part * 100 / whole).quantize(Decimal(1).scaleb(-places), rounding=ROUND_HALF_EVEN))
+
+
+@dataclass(frozen=True)
+class Money:
+    """An amount of one currency, held as integer minor units."""
+    minor: int
+    currency: str
+    exponent: int = DEFAULT_EXPONENT
+
+    @classmethod
+    def of(cls, amount: Amount, currency: str, exponent: int = DEFAULT_EXPONENT) -> "Money":
+        return cls(to_minor(amount, exponent), currency, exponent)
+
+    @property
+    def amount(self) -> Decimal:
+        return from_minor(self.minor, self.exponent)
+
+    def _check(self, other: "Money"):
+        if (self.currency, self.exponent) != (other.currency, other.exponent):
+            raise ValueError(f"Cannot combine {self.currency} and {other.currency} amounts")
+
+    def __add__(self, other: "Money") -> "Money":
+        self._check(other)
+        return Money(self.minor + other.minor, self.currency, self.exponent)
+
+    def __sub__(self, other: "Money") -> "Money":
+        self._check(other)
+        return Money(self.minor - other.minor, self.currency, self.exponent)
+
+    def __neg__(self) -> "Money":
+        return Money(-self.minor, self.currency, self.exponent)
+
+    def __abs__(self) -> "Money":
+        return Money(abs(self.minor), self.currency, self.exponent)
+
+    def __str__(self) -> str:
+        return f"{self.amount} {self.currency}"
+
+
+class CurrencyTotals:
+    """Running per-currency totals in minor units."""
+
+    def __init__(self):
+        self._totals: Dict[str, Money] = {}
+
+    def add(self, money: Money):
+        current = self._totals.get(money.currency)
+        self._totals[money.currency] = money if current is None else current + money
+
+    def amounts(self) -> Dict[str, Decimal]:
+        """Totals formatted per currency, in currency code order."""
+        return {code: self._totals[code].amount for code in sorted(self._totals)}
+
+
+class CurrencyExponents:
+    """
+    Minor unit exponents (currencies.decimal_places) by currency code. The whole table
+    is small, so it is read in one query and kept for ttl_seconds; currency writes
+    call invalidate().
+    """
+
+    def __init__(self, ttl_seconds: int = 3600):
+        self.ttl_seconds = ttl_seconds
+        self._exponents: Optional[Dict[str, int]] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def load(self, db: Session) -> Dict[str, int]:
+        with self._lock:
+            if self._exponents is not None and time.monotonic() - self._loaded_at < self.ttl_seconds:
+                return self._exponents
+        exponents = {code: places for code, places in db.query(Currency.code, Currency.decimal_places)}
+        self.prime(exponents)
+        return exponents
+
+    def prime(self, exponents: Dict[str, int]):
+        """Replace the cached exponents, e.g. at startup or in tests."""
+        with self._lock:
+            self._exponents = dict(exponents)
+            self._loaded_at = time.monotonic()
+
+    def get(self, db: Session, currency: Optional[str]) -> int:
+        return self.load(db).get(currency or "", DEFAULT_EXPONENT)
+
+    def money(self, db: Session, amount: Optional[Amount], currency: str) -> Money:
+        """Money for a stored amount in the given currency; None counts as zero."""
+        return Money.of(amount or 0, currency, self.get(db, currency))
+
+    def invalidate(self):
+        with self._lock:
+            self._exponents = None
+
+
+currency_exponents = CurrencyExponents()
@@ -0,0 +1,245 @@
+from typing import Dict, Iterable, List, Optional
+from datetime import date
+from decimal import Decimal
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, case, func, insert, literal, select, update
+
+from app.models.account_ledger import AccountLedgerEntry, AccountBalanceSnapshot
+from app.models.financial_account import FinancialAccount
+from app.models.transaction import Transaction
+
+OPENING = "opening"
+TRANSACTION = "transaction"
+REVERSAL = "reversal"
+ADJUSTMENT = "adjustment"
+
+
+def transaction_effect(transaction_type: str, amount) -> Decimal:
+    """Signed effect of a transaction on its account balance."""
+    amount = Decimal(str(amount))
+    return amount if transaction_type == "credit" else -amount
+
+
+def post_entry(
+    db: Session,
+    *,
+    account_id: int,
+    tenant_id: int,
+    amount,
+    entry_date: date,
+    entry_type: str,
+    transaction_id: Optional[int] = None,
+    user_id: Optional[int] = None
+) -> Optional[Decimal]:
+    """
+    Append a ledger entry and apply it to the account with an atomic
+    ``current_balance = current_balance + :amount`` update.
+
+    If user_id is given, the entry is only posted when the account belongs to that
+    user. Returns the new balance, or None if no matching account exists. Does not
+    commit; the entry becomes durable with the caller's commit.
+    """
+    amount = Decimal(str(amount))
+    conditions = [FinancialAccount.id == account_id, FinancialAccount.tenant_id == tenant_id]
+    if user_id is not None:
+        conditions.append(FinancialAccount.user_id == user_id)
+
+    new_balance = db.execute(
+        update(FinancialAccount)
+        .where(and_(*conditions))
+        .values(current_balance=func.coalesce(FinancialAccount.current_balance, 0) + amount)
+        .returning(FinancialAccount.current_balance)
+    ).scalar_one_or_none()
+    if new_balance is None:
+        return None
+
+    db.add(AccountLedgerEntry(
+        tenant_id=tenant_id,
+        account_id=account_id,
+        transaction_id=transaction_id,
+        entry_type=entry_type,
+        amount=amount,
+        entry_date=entry_date
+    ))
+    # A backdated entry changes every snapshot taken on or after its date
+    db.execute(
+        update(AccountBalanceSnapshot)
+        .where(
+            and_(
+                AccountBalanceSnapshot.account_id == account_id,
+                AccountBalanceSnapshot.snapshot_date >= entry_date
+            )
+        )
+        .values(balance=AccountBalanceSnapshot.balance + amount)
+        .execution_options(synchronize_session=False)
+    )
+    return new_balance
+
+
+def post_transaction(db: Session, transaction: Transaction, reverse: bool = False) -> Optional[Decimal]:
+    """Post (or reverse) a transaction's effect on its account, if it has one owned by its user."""
+    if not transaction.account_id:
+        return None
+    amount = transaction_effect(transaction.type, transaction.amount)
+    return post_entry(
+        db,
+        account_id=transaction.account_id,
+        tenant_id=transaction.tenant_id,
+        amount=-amount if reverse else amount,
+        entry_date=transaction.transaction_date,
+        entry_type=REVERSAL if reverse else TRANSACTION,
+        transaction_id=transaction.id,
+        user_id=transaction.user_id
+    )
+
+
+def record_transactions(db: Session, *, transaction_ids: List[int]):
+    """
+    Append ledger entries for already inserted transactions with one INSERT ... SELECT.
+    Balances are not touched; apply the matching deltas with apply_deltas. Does not commit.
+    """
+    if not transaction_ids:
+        return
+    db.execute(
+        insert(AccountLedgerEntry).from_select(
+            ["tenant_id", "account_id", "transaction_id", "entry_type", "amount", "entry_date"],
+            select(
+                Transaction.tenant_id,
+                Transaction.account_id,
+                Transaction.id,
+                literal(TRANSACTION),
+                case((Transaction.type == "credit", Transaction.amount), else_=-Transaction.amount),
+                Transaction.transaction_date
+            ).where(
+                and_(
+                    Transaction.id.in_(transaction_ids),
+                    Transaction.account_id.isnot(None)
+                )
+            )
+        )
+    )
+
+
+def apply_deltas(db: Session, deltas: Dict[int, Dict[date, Decimal]]):
+    """
+    Apply summed balance changes, keyed by account and entry date, with one UPDATE per
+    account. The matching ledger entries must be recorded separately. Does not commit.
+    """
+    for account_id, deltas_by_date in deltas.items():
+        total = sum(deltas_by_date.values(), Decimal("0"))
+        if total:
+            db.execute(
+                update(FinancialAccount)
+                .where(FinancialAccount.id == account_id)
+                .values(current_balance=func.coalesce(FinancialAccount.current_balance, 0) + total)
+                .execution_options(synchronize_session=False)
+            )
+        _shift_snapshots(db, account_id, deltas_by_date)
+
+
+def _shift_snapshots(db: Session, account_id: int, deltas: Dict[date, Decimal]):
+    """Apply backdated deltas to the snapshots they fall before."""
+    snapshots = db.query(AccountBalanceSnapshot.id, AccountBalanceSnapshot.snapshot_date).filter(
+        and_(
+            AccountBalanceSnapshot.account_id == account_id,
+            AccountBalanceSnapshot.snapshot_date >= min(deltas)
+        )
+    ).all()
+    for snapshot_id, snapshot_date in snapshots:
+        shift = sum((amount for entry_date, amount in deltas.items() if entry_date <= snapshot_date), Decimal("0"))
+        if shift:
+            db.execute(
+                update(AccountBalanceSnapshot)
+                .where(AccountBalanceSnapshot.id == snapshot_id)
+                .values(balance=AccountBalanceSnapshot.balance + shift)
+                .execution_options(synchronize_session=False)
+            )
+
+
+def get_balance_as_of(db: Session, *, account_id: int, as_of: date) -> Decimal:
+    """Balance at the end of as_of: the latest snapshot on or before it plus later entries."""
+    return get_balances_as_of(db, account_ids=[account_id], as_of=as_of).get(account_id, Decimal("0"))
+
+
+def get_balances_as_of(db: Session, *, account_ids: Iterable[int], as_of: date) -> Dict[int, Decimal]:
+    """Balances of several accounts at the end of as_of, in two queries."""
+    account_ids = list(account_ids)
+    if not account_ids:
+        return {}
+
+    latest = db.query(
+        AccountBalanceSnapshot.account_id,
+        func.max(AccountBalanceSnapshot.snapshot_date).label("snapshot_date")
+    ).filter(
+        and_(
+            AccountBalanceSnapshot.account_id.in_(account_ids),
+            AccountBalanceSnapshot.snapshot_date <= as_of
+        )
+    ).group_by(AccountBalanceSnapshot.account_id).subquery()
+
+    snapshots = {
+        account_id: (snapshot_date, balance)
+        for account_id, snapshot_date, balance in db.query(
+            AccountBalanceSnapshot.account_id,
+            AccountBalanceSnapshot.snapshot_date,
+            AccountBalanceSnapshot.balance
+        ).join(
+            latest,
+            and_(
+                AccountBalanceSnapshot.account_id == latest.c.account_id,
+                AccountBalanceSnapshot.snapshot_date == latest.c.snapshot_date
+            )
+        )
+    }
+
+    # Entries after each account's snapshot (or all entries if it has none), up to as_of
+    since_snapshot = db.query(
+        AccountLedgerEntry.account_id,
+        func.sum(AccountLedgerEntry.amount)
+    ).outerjoin(
+        latest, AccountLedgerEntry.account_id == latest.c.account_id
+    ).filter(
+        and_(
+            AccountLedgerEntry.account_id.in_(account_ids),
+            AccountLedgerEntry.entry_date <= as_of,
+            (latest.c.snapshot_date == None) | (AccountLedgerEntry.entry_date > latest.c.snapshot_date)
+        )
+    ).group_by(AccountLedgerEntry.account_id).all()
+    deltas = {account_id: Decimal(str(total)) for account_id, total in since_snapshot}
+
+    return {
+        account_id: Decimal(str(snapshots[account_id][1])) + deltas.get(account_id, Decimal("0"))
+        if account_id in snapshots else deltas.get(account_id, Decimal("0"))
+        for account_id in account_ids
+    }
+
+
+def create_snapshots(db: Session, *, snapshot_date: date) -> int:
+    """
+    Snapshot every account's balance at the end of snapshot_date, skipping accounts
+    that already have one. Returns the number of snapshots created.
+    """
+    existing = {
+        account_id for (account_id,) in db.query(AccountBalanceSnapshot.account_id).filter(
+            AccountBalanceSnapshot.snapshot_date == snapshot_date
+        )
+    }
+    accounts = [
+        (account_id, tenant_id)
+        for account_id, tenant_id in db.query(FinancialAccount.id, FinancialAccount.tenant_id)
+        if account_id not in existing
+    ]
+    balances = get_balances_as_of(db, account_ids=[account_id for account_id, _ in accounts], as_of=snapshot_date)
+
+    if accounts:
+        db.execute(insert(AccountBalanceSnapshot), [
+            {
+                "tenant_id": tenant_id,
+                "account_id": account_id,
+                "snapshot_date": snapshot_date,
+                "balance": balances[account_id]
+            }
+            for account_id, tenant_id in accounts
+        ])
+    db.commit()
+    return len(accounts)
@@ -1,4 +1,4 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, NamedTuple, Optional
 from datetime import date, datetime, timedelta
 from sqlalchemy.orm import Session
 from sqlalchemy import text, func, and_, or_
@@ -11,10 +11,208 @@ from app.models.analytics import (
     DailyNetworkMetric
 )
 from app.models.contact import Contact, ContactInteraction
+from app.crud import interaction_analytics
 from app.models.organization import Organization
 from app.models.social_group import SocialGroup
 import json
 
+
+class DashboardSnapshot(NamedTuple):
+    """Tenant data shared by every dashboard panel, loaded once per bundle."""
+    summary: Dict[str, Any]
+    active_contacts: List[Contact]
+    interaction_totals: Dict[str, Any]
+    recent_activity: Dict[str, Any]
+    top_insights: List[Dict[str, Any]]
+    today: date
+
+
+def network_health_scores(contacts: List[Contact]) -> Dict[str, Any]:
+    """Network health scores from a tenant's active contacts"""
+    if not contacts:
+        return {
+            "overall_score": 0.0,
+            "relationship_strength_avg": 0.0,
+            "engagement_rate": 0.0,
+            "response_rate": 0.0,
+            "growth_rate": 0.0
+        }
+    
+    # Calculate averages
+    avg_strength = sum(c.connection_strength or 0 for c in contacts) / len(contacts)
+    
+    # Mock other metrics (would calculate from real data)
+    return {
+        "overall_score": min(avg_strength, 10.0),
+        "relationship_strength_avg": float(avg_strength),
+        "engagement_rate": 0.72,  # Mock
+        "response_rate": 0.84,    # Mock
+        "growth_rate": 0.08       # Mock
+    }
+
+
+def relationship_health(contacts: List[Contact]) -> Dict[str, Any]:
+    """Relationship health distribution and recommendations from a tenant's active contacts"""
+    if not contacts:
+        return _empty_health_response()
+    
+    # Calculate health distribution
+    thriving = sum(1 for c in contacts if c.connection_strength and c.connection_strength >= 8.5)
+    healthy = sum(1 for c in contacts if c.connection_strength and 7.0 <= c.connection_strength < 8.5)
+    stable = sum(1 for c in contacts if c.connection_strength and 5.0 <= c.connection_strength < 7.0)
+    needs_attention = sum(1 for c in contacts if c.connection_strength and 3.0 <= c.connection_strength < 5.0)
+    at_risk = sum(1 for c in contacts if c.connection_strength and c.connection_strength < 3.0)
+    
+    # Calculate overall health score
+    total_contacts = len(contacts)
+    health_score = (thriving * 10 + healthy * 8 + stable * 6 + needs_attention * 4 + at_risk * 2) / max(total_contacts, 1)
+    
+    # Generate recommendations
+    recommendations = []
+    if at_risk > 0:
+        recommendations.append({
+            "type": "immediate_action",
+            "title": f"{at_risk} relationships need immediate attention",
+            "description": "These contacts haven't been reached in 60+ days and showed declining engagement",
+            "contact_ids": [c.id for c in contacts if c.connection_strength and c.connection_strength < 3.0][:8],
+            "priority": "high"
+        })
+    
+    if needs_attention > 0:
+        recommendations.append({
+            "type": "opportunity",
+            "title": f"Strengthen {min(needs_attention, 12)} promising relationships",
+            "description": "These contacts show high engagement potential based on recent interactions",
+            "contact_ids": [c.id for c in contacts if c.connection_strength and 3.0 <= c.connection_strength < 5.0][:12],
+            "priority": "medium"
+        })
+    
+    return {
+        "overall_health": {
+            "score": round(health_score, 1),
+            "trend": "improving",  # Would calculate from historical data
+            "distribution": {
+                "thriving": thriving,
+                "healthy": healthy,
+                "stable": stable,
+                "needs_attention": needs_attention,
+                "at_risk": at_risk
+            }
+        },
+        "health_factors": {
+            "interaction_frequency": 8.2,  # Would calculate from interaction data
+            "interaction_quality": 7.8,
+            "follow_up_consistency": 6.9,
+            "mutual_engagement": 7.4
+        },
+        "recommendations": recommendations
+    }
+
+
+def _empty_health_response() -> Dict[str, Any]:
+    """Return empty health response when no data available"""
+    return {
+        "overall_health": {
+            "score": 0.0,
+            "trend": "stable",
+            "distribution": {
+                "thriving": 0,
+                "healthy": 0,
+                "stable": 0,
+                "needs_attention": 0,
+                "at_risk": 0
+            }
+        },
+        "health_factors": {
+            "interaction_frequency": 0.0,
+            "interaction_quality": 0.0,
+            "follow_up_consistency": 0.0,
+            "mutual_engagement": 0.0
+        },
+        "recommendations": []
+    }
+
+
+def key_performance_indicators(overview: Dict[str, Any]) -> Dict[str, Any]:
+    """KPIs derived from an analytics overview"""
+    return {
+        "network_size": overview["summary"]["total_contacts"],
+        "network_health_score": overview["network_health"]["overall_score"],
+        "engagement_rate": overview["network_health"]["engagement_rate"],
+        "growth_rate": overview["network_health"]["growth_rate"],
+        "response_rate": overview["network_health"]["response_rate"],
+        "strong_relationships_ratio": (
+            overview["summary"]["strong_relationships"] / 
+            max(overview["summary"]["total_contacts"], 1)
+        ),
+        "follow_up_completion_rate": 0.85  # Mock - would calculate from actual data
+    }
+
+
+def interactions_overview(totals: Dict[str, Any]) -> Dict[str, Any]:
+    """Interaction overview from a tenant's interaction totals"""
+    return {
+        "total_interactions": totals["total_interactions"],
+        "avg_quality": totals["avg_interaction_quality"],
+        "avg_duration": totals["avg_interaction_duration"],
+        "interaction_frequency": totals["total_interactions"] / max(totals["contact_count"], 1),
+        "recent_activity": totals["interactions_last_30_days"]
+    }
+
+
+def interaction_types(totals: Dict[str, Any]) -> Dict[str, Any]:
+    """Interaction counts per channel from a tenant's interaction totals"""
+    return {
+        "meetings": totals["in_person_meetings"],
+        "calls": totals["phone_calls"],
+        "emails": totals["emails"],
+        "texts": totals["text_messages"]
+    }
+
+
+def response_rates(totals: Dict[str, Any]) -> Dict[str, Any]:
+    """Initiation split and response rate from a tenant's interaction totals"""
+    user_initiated = totals["interactions_initiated_by_user"]
+    contact_initiated = totals["interactions_initiated_by_contact"]
+    total = user_initiated + contact_initiated
+    
+    return {
+        "overall_response_rate": contact_initiated / max(total, 1),
+        "user_initiated": user_initiated,
+        "contact_initiated": contact_initiated,
+        "response_time_avg": "2.5 hours",  # Mock data
+        "best_response_days": ["Tuesday", "Wednesday"]  # Mock data
+    }
+
+
+def overdue_follow_ups(contacts: List[Contact], today: date) -> Dict[str, Any]:
+    """Overdue follow-up analysis from a tenant's active contacts"""
+    overdue_contacts = [
+        c for c in contacts
+        if c.next_suggested_contact_date is not None and c.next_suggested_contact_date < today
+    ]
+    
+    return {
+        "total_overdue": len(overdue_contacts),
+        "overdue_by_urgency": {
+            "high": sum(1 for c in overdue_contacts if c.follow_up_urgency == 'high'),
+            "medium": sum(1 for c in overdue_contacts if c.follow_up_urgency == 'medium'),
+            "low": sum(1 for c in overdue_contacts if c.follow_up_urgency == 'low')
+        },
+        "avg_days_overdue": 7.5,  # Mock calculation
+        "overdue_contacts": [
+            {
+                "contact_id": c.id,
+                "name": f"{c.first_name} {c.last_name}",
+                "days_overdue": (today - c.next_suggested_contact_date).days,
+                "urgency": c.follow_up_urgency,
+                "connection_strength": float(c.connection_strength or 0)
+            }
+            for c in overdue_contacts[:10]  # Limit to top 10
+        ]
+    }
+
+
 class AnalyticsService:
     """Core analytics service for calculating and retrieving metrics"""
     
@@ -24,28 +222,7 @@ class AnalyticsService:
     
     def get_overview_analytics(self) -> Dict[str, Any]:
         """Get high-level analytics overview"""
-        # Get summary from materialized view
-        summary = self.db.query(ContactAnalyticsSummary).filter(
-            ContactAnalyticsSummary.tenant_id == self.tenant_id
-        ).first()
-        
-        if not summary:
-            # If no summary, create empty response
-            summary_data = {
-                "total_contacts": 0,
-                "active_contacts": 0,
-                "strong_relationships": 0,
-                "pending_follow_ups": 0,
-                "overdue_follow_ups": 0
-            }
-        else:
-            summary_data = {
-                "total_contacts": summary.total_contacts or 0,
-                "active_contacts": summary.active_contacts or 0,
-                "strong_relationships": summary.strong_relationships or 0,
-                "pending_follow_ups": 0,  # Calculate separately
-                "overdue_follow_ups": summary.overdue_follow_ups or 0
-            }
+        summary_data = self._get_summary_counts()
         
         # Calculate network health score
         network_health = self._calculate_network_health()
@@ -123,68 +300,7 @@ class AnalyticsService:
     
     def get_relationship_health_analytics(self) -> Dict[str, Any]:
         """Analyze overall relationship health"""
-        # Get contact distribution by connection strength
-        contacts = self.db.query(Contact).filter(
-            and_(
-                Contact.tenant_id == self.tenant_id,
-                Contact.is_active == True
-            )
-        ).all()
-        
-        if not contacts:
-            return self._empty_health_response()
-        
-        # Calculate health distribution
-        thriving = sum(1 for c in contacts if c.connection_strength and c.connection_strength >= 8.5)
-        healthy = sum(1 for c in contacts if c.connection_strength and 7.0 <= c.connection_strength < 8.5)
-        stable = sum(1 for c in contacts if c.connection_strength and 5.0 <= c.connection_strength < 7.0)
-        needs_attention = sum(1 for c in contacts if c.connection_strength and 3.0 <= c.connection_strength < 5.0)
-        at_risk = sum(1 for c in contacts if c.connection_strength and c.connection_strength < 3.0)
-        
-        # Calculate overall health score
-        total_contacts = len(contacts)
-        health_score = (thriving * 10 + healthy * 8 + stable * 6 + needs_attention * 4 + at_risk * 2) / max(total_contacts, 1)
-        
-        # Generate recommendations
-        recommendations = []
-        if at_risk > 0:
-            recommendations.append({
-                "type": "immediate_action",
-                "title": f"{at_risk} relationships need immediate attention",
-                "description": "These contacts haven't been reached in 60+ days and showed declining engagement",
-                "contact_ids": [c.id for c in contacts if c.connection_strength and c.connection_strength < 3.0][:8],
-                "priority": "high"
-            })
-        
-        if needs_attention > 0:
-            recommendations.append({
-                "type": "opportunity",
-                "title": f"Strengthen {min(needs_attention, 12)} promising relationships",
-                "description": "These contacts show high engagement potential based on recent interactions",
-                "contact_ids": [c.id for c in contacts if c.connection_strength and 3.0 <= c.connection_strength < 5.0][:12],
-                "priority": "medium"
-            })
-        
-        return {
-            "overall_health": {
-                "score": round(health_score, 1),
-                "trend": "improving",  # Would calculate from historical data
-                "distribution": {
-                    "thriving": thriving,
-                    "healthy": healthy,
-                    "stable": stable,
-                    "needs_attention": needs_attention,
-                    "at_risk": at_risk
-                }
-            },
-            "health_factors": {
-                "interaction_frequency": 8.2,  # Would calculate from interaction data
-                "interaction_quality": 7.8,
-                "follow_up_consistency": 6.9,
-                "mutual_engagement": 7.4
-            },
-            "recommendations": recommendations
-        }
+        return relationship_health(self._get_active_contacts())
     
     def get_interaction_analytics(self, contact_id: Optional[int] = None) -> List[Dict[str, Any]]:
         """Get interaction analytics for contacts"""
@@ -215,6 +331,26 @@ class AnalyticsService:
             for a in analytics
         ]
     
+    def get_interaction_totals(self) -> Dict[str, Any]:
+        """Get tenant-wide interaction totals from the incrementally maintained totals row"""
+        totals = interaction_analytics.get_totals(self.db, tenant_id=self.tenant_id)
+        contacts = totals["contact_count"]
+        return {
+            "contact_count": contacts,
+            "total_interactions": totals["total_interactions"],
+            "in_person_meetings": totals["in_person_meetings"],
+            "phone_calls": totals["phone_calls"],
+            "emails": totals["emails"],
+            "text_messages": totals["text_messages"],
+            # Averages of the per-contact averages
+            "avg_interaction_quality": float(totals["quality_average_total"]) / contacts if contacts else 0.0,
+            "avg_interaction_duration": float(totals["duration_average_total"]) / contacts if contacts else 0.0,
+            "high_quality_contacts": totals["high_quality_contacts"],
+            "interactions_last_30_days": totals["interactions_last_30_days"],
+            "interactions_initiated_by_user": totals["interactions_initiated_by_user"],
+            "interactions_initiated_by_contact": totals["interactions_initiated_by_contact"]
+        }
+    
     def generate_insights(self, insight_types: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """Generate AI-powered networking insights"""
         insights = []
@@ -253,47 +389,68 @@ class AnalyticsService:
         
         return insights
     
+    def load_dashboard_snapshot(self) -> "DashboardSnapshot":
+        """Load everything the dashboard panels are computed from, one query per source"""
+        interaction_totals = self.get_interaction_totals()
+        return DashboardSnapshot(
+            summary=self._get_summary_counts(),
+            active_contacts=self._get_active_contacts(),
+            interaction_totals=interaction_totals,
+            recent_activity=self._get_recent_activity(
+                recent_interactions=interaction_totals["interactions_last_30_days"]
+            ),
+            top_insights=self._get_top_insights(limit=3),
+            today=date.today()
+        )
+    
+    def _get_summary_counts(self) -> Dict[str, Any]:
+        """Summary counts from the materialized view"""
+        summary = self.db.query(ContactAnalyticsSummary).filter(
+            ContactAnalyticsSummary.tenant_id == self.tenant_id
+        ).first()
+        
+        if not summary:
+            # If no summary, create empty response
+            return {
+                "total_contacts": 0,
+                "active_contacts": 0,
+                "strong_relationships": 0,
+                "pending_follow_ups": 0,
+                "overdue_follow_ups": 0
+            }
+        return {
+            "total_contacts": summary.total_contacts or 0,
+            "active_contacts": summary.active_contacts or 0,
+            "strong_relationships": summary.strong_relationships or 0,
+            "pending_follow_ups": 0,  # Calculate separately
+            "overdue_follow_ups": summary.overdue_follow_ups or 0
+        }
+    
     def _calculate_network_health(self) -> Dict[str, Any]:
         """Calculate overall network health metrics"""
-        contacts = self.db.query(Contact).filter(
+        return network_health_scores(self._get_active_contacts())
+    
+    def _get_active_contacts(self) -> List[Contact]:
+        """Active contacts of the tenant"""
+        return self.db.query(Contact).filter(
             and_(
                 Contact.tenant_id == self.tenant_id,
                 Contact.is_active == True
             )
         ).all()
-        
-        if not contacts:
-            return {
-                "overall_score": 0.0,
-                "relationship_strength_avg": 0.0,
-                "engagement_rate": 0.0,
-                "response_rate": 0.0,
-                "growth_rate": 0.0
-            }
-        
-        # Calculate averages
-        avg_strength = sum(c.connection_strength or 0 for c in contacts) / len(contacts)
-        
-        # Mock other metrics (would calculate from real data)
-        return {
-            "overall_score": min(avg_strength, 10.0),
-            "relationship_strength_avg": float(avg_strength),
-            "engagement_rate": 0.72,  # Mock
-            "response_rate": 0.84,    # Mock
-            "growth_rate": 0.08       # Mock
-        }
     
-    def _get_recent_activity(self) -> Dict[str, Any]:
-        """Get recent activity metrics"""
+    def _get_recent_activity(self, recent_interactions: Optional[int] = None) -> Dict[str, Any]:
+        """Get recent activity metrics, reusing an already known 30-day interaction count"""
         thirty_days_ago = datetime.now() - timedelta(days=30)
         
         # Get recent interactions
-        recent_interactions = self.db.query(ContactInteraction).join(Contact).filter(
-            and_(
-                Contact.tenant_id == self.tenant_id,
-                ContactInteraction.interaction_date >= thirty_days_ago
-            )
-        ).count()
+        if recent_interactions is None:
+            recent_interactions = self.db.query(ContactInteraction).join(Contact).filter(
+                and_(
+                    Contact.tenant_id == self.tenant_id,
+                    ContactInteraction.interaction_date >= thirty_days_ago
+                )
+            ).count()
         
         # Get new contacts
         new_contacts = self.db.query(Contact).filter(
@@ -417,26 +574,3 @@ class AnalyticsService:
                 "factors": []
             }
         }
-    
-    def _empty_health_response(self) -> Dict[str, Any]:
-        """Return empty health response when no data available"""
-        return {
-            "overall_health": {
-                "score": 0.0,
-                "trend": "stable",
-                "distribution": {
-                    "thriving": 0,
-                    "healthy": 0,
-                    "stable": 0,
-                    "needs_attention": 0,
-                    "at_risk": 0
-                }
-            },
-            "health_factors": {
-                "interaction_frequency": 0.0,
-                "interaction_quality": 0.0,
-                "follow_up_consistency": 0.0,
-                "mutual_engagement": 0.0
-            },
-            "recommendations": []
-        }
\ No newline at end of file
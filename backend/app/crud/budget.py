@@ -1,11 +1,14 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import date, datetime
+from decimal import Decimal
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from sqlalchemy import Date, and_, case, func, literal, or_
 
+from app.core.config import settings
 from app.models.budget import Budget
 from app.models.transaction import Transaction
 from app.schemas.budget import BudgetCreate, BudgetUpdate
+from app.services.budget_spending_cache import BudgetWindow, budget_spending_cache
 
 def get(db: Session, id: int) -> Optional[Budget]:
     """Get a single budget by ID"""
@@ -69,23 +72,15 @@ def get_budgets_by_user(
     """Get budgets for a user"""
     return get_by_user(db, user_id=user_id, tenant_id=tenant_id, active_only=active_only)
 
-def get_budget_spending_summary(
-    db: Session,
-    budget: Budget,
-    current_date: date = None
-) -> dict:
-    """Calculate spending summary for a budget"""
-    if current_date is None:
-        current_date = date.today()
-    
-    # Calculate the current period based on budget period
-    if budget.period == 'monthly':
+def _fixed_period(period: str, current_date: date) -> Optional[Tuple[date, date]]:
+    """Window of a monthly, quarterly or yearly period containing current_date"""
+    if period == 'monthly':
         start_date = date(current_date.year, current_date.month, 1)
         if current_date.month == 12:
             end_date = date(current_date.year + 1, 1, 1)
         else:
             end_date = date(current_date.year, current_date.month + 1, 1)
-    elif budget.period == 'quarterly':
+    elif period == 'quarterly':
         quarter = (current_date.month - 1) // 3 + 1
         start_month = (quarter - 1) * 3 + 1
         start_date = date(current_date.year, start_month, 1)
@@ -94,32 +89,87 @@ def get_budget_spending_summary(
             end_date = date(current_date.year + 1, end_month - 12, 1)
         else:
             end_date = date(current_date.year, end_month, 1)
-    elif budget.period == 'yearly':
+    elif period == 'yearly':
         start_date = date(current_date.year, 1, 1)
         end_date = date(current_date.year + 1, 1, 1)
     else:
+        return None
+    return start_date, end_date
+
+def get_budget_period(budget: Budget, current_date: date) -> Tuple[date, date]:
+    """Start (inclusive) and end (exclusive) of a budget's period containing current_date"""
+    window = _fixed_period(budget.period, current_date)
+    if window is None:
         # Use budget dates if period is custom
-        start_date = budget.start_date
-        end_date = budget.end_date or current_date
+        window = (budget.start_date, budget.end_date or current_date)
+    return window
+
+def _period_window_columns(current_date: date):
+    """
+    SQL expressions for every budget's period start and end on current_date.
+    Fixed periods share one window per period type, so they are bound parameters;
+    custom periods use the budget's own dates.
+    """
+    windows = {period: _fixed_period(period, current_date) for period in ('monthly', 'quarterly', 'yearly')}
+    period_start = case(
+        *[(Budget.period == period, literal(start, Date)) for period, (start, _) in windows.items()],
+        else_=Budget.start_date
+    )
+    period_end = case(
+        *[(Budget.period == period, literal(end, Date)) for period, (_, end) in windows.items()],
+        else_=func.coalesce(Budget.end_date, literal(current_date, Date))
+    )
+    return period_start, period_end
+
+def get_budgets_with_spending(
+    db: Session,
+    *,
+    tenant_id: int,
+    user_id: Optional[int] = None,
+    budget_ids: Optional[List[int]] = None,
+    active_only: bool = True,
+    current_date: date = None
+) -> List[Tuple[Budget, Decimal]]:
+    """
+    Evaluate spending for many budgets in one query: budgets are joined to their
+    user's debit transactions inside each budget's current period window and
+    category/subcategory, then summed per budget. Without a user_id every user's
+    budgets in the tenant are evaluated.
+    """
+    if current_date is None:
+        current_date = date.today()
     
-    # Query transactions for the budget period
-    query = db.query(func.sum(Transaction.amount)).filter(
+    period_start, period_end = _period_window_columns(current_date)
+    spent = func.coalesce(func.sum(Transaction.amount), 0).label('spent_amount')
+    query = db.query(Budget, spent).outerjoin(
+        Transaction,
         and_(
-            Transaction.user_id == budget.user_id,
-            Transaction.tenant_id == budget.tenant_id,
+            Transaction.user_id == Budget.user_id,
+            Transaction.tenant_id == Budget.tenant_id,
             Transaction.type == 'debit',  # Only debits count toward budget spending
-            Transaction.transaction_date >= start_date,
-            Transaction.transaction_date < end_date
+            Transaction.transaction_date >= period_start,
+            Transaction.transaction_date < period_end,
+            or_(Budget.category_id.is_(None), Transaction.category_id == Budget.category_id),
+            or_(Budget.subcategory_id.is_(None), Transaction.subcategory_id == Budget.subcategory_id)
         )
-    )
+    ).filter(Budget.tenant_id == tenant_id)
+    
+    if user_id is not None:
+        query = query.filter(Budget.user_id == user_id)
+    if budget_ids is not None:
+        query = query.filter(Budget.id.in_(budget_ids))
+    if active_only:
+        query = query.filter(Budget.is_active == True)
     
-    # Filter by category/subcategory if specified
-    if budget.category_id:
-        query = query.filter(Transaction.category_id == budget.category_id)
-    if budget.subcategory_id:
-        query = query.filter(Transaction.subcategory_id == budget.subcategory_id)
+    rows = query.group_by(Budget.id).order_by(Budget.user_id, Budget.name).all()
+    return [(budget, Decimal(str(spent_amount))) for budget, spent_amount in rows]
+
+def summarize_budget(budget: Budget, spent_amount, current_date: date = None) -> dict:
+    """Build a budget's spending summary from its spent amount"""
+    if current_date is None:
+        current_date = date.today()
     
-    spent_amount = query.scalar() or 0
+    start_date, end_date = get_budget_period(budget, current_date)
     remaining_amount = budget.budget_amount - spent_amount
     spent_percentage = (spent_amount / budget.budget_amount) * 100 if budget.budget_amount > 0 else 0
     is_over_budget = spent_amount > budget.budget_amount
@@ -137,6 +187,61 @@ def get_budget_spending_summary(
         'period_end': end_date
     }
 
+def get_budget_spending_summary(
+    db: Session,
+    budget: Budget,
+    current_date: date = None
+) -> dict:
+    """Calculate spending summary for a budget"""
+    if current_date is None:
+        current_date = date.today()
+    
+    rows = get_budgets_with_spending(
+        db, tenant_id=budget.tenant_id, budget_ids=[budget.id], active_only=False, current_date=current_date
+    )
+    spent_amount = rows[0][1] if rows else Decimal('0')
+    return summarize_budget(budget, spent_amount, current_date)
+
+def get_budget_summaries(
+    db: Session,
+    *,
+    user_id: int,
+    tenant_id: int,
+    current_date: date = None
+) -> List[Tuple[Budget, dict]]:
+    """
+    Get a user's active budgets with their spending summaries. Spent amounts come from
+    the running-total cache when BUDGET_SPENDING_CACHE_ENABLED is set, and otherwise
+    from one grouped query.
+    """
+    if current_date is None:
+        current_date = date.today()
+    
+    if not settings.BUDGET_SPENDING_CACHE_ENABLED:
+        rows = get_budgets_with_spending(db, tenant_id=tenant_id, user_id=user_id, current_date=current_date)
+        return [(budget, summarize_budget(budget, spent, current_date)) for budget, spent in rows]
+    
+    cached = budget_spending_cache.get(tenant_id, user_id, current_date)
+    if cached is not None:
+        budgets = get_by_user(db, user_id=user_id, tenant_id=tenant_id)
+        if all(budget.id in cached for budget in budgets):
+            return [(budget, summarize_budget(budget, cached[budget.id], current_date)) for budget in budgets]
+    
+    generation = budget_spending_cache.generation(tenant_id, user_id)
+    rows = get_budgets_with_spending(db, tenant_id=tenant_id, user_id=user_id, current_date=current_date)
+    budget_spending_cache.store(
+        tenant_id,
+        user_id,
+        current_date,
+        windows={
+            budget.id: BudgetWindow(*get_budget_period(budget, current_date), budget.category_id, budget.subcategory_id)
+            for budget, _ in rows
+        },
+        spent={budget.id: spent for budget, spent in rows},
+        generation=generation
+    )
+    return [(budget, summarize_budget(budget, spent, current_date)) for budget, spent in rows]
+
 def create(
     db: Session,
     *,
@@ -153,6 +258,7 @@ def create(
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    budget_spending_cache.invalidate(tenant_id, user_id)
     return db_obj
 
 def create_budget(
@@ -179,6 +285,7 @@ def update(
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    budget_spending_cache.invalidate(db_obj.tenant_id, db_obj.user_id)
     return db_obj
 
 def update_budget(
@@ -196,6 +303,7 @@ def remove(db: Session, *, id: int) -> Optional[Budget]:
     if obj:
         db.delete(obj)
         db.commit()
+        budget_spending_cache.invalidate(obj.tenant_id, obj.user_id)
     return obj
 
 def delete_budget(
@@ -219,9 +327,13 @@ def delete_budget(
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
+        budget_spending_cache.invalidate(tenant_id, user_id)
         return db_obj
     return None
 
+def _over_alert_threshold(budget: Budget, summary: dict) -> bool:
+    return summary['spent_percentage'] >= budget.alert_percentage
+
 def get_budgets_over_alert_threshold(
     db: Session,
     *,
@@ -230,15 +342,10 @@ def get_budgets_over_alert_threshold(
     current_date: date = None
 ) -> List[tuple[Budget, dict]]:
     """Get budgets that have exceeded their alert threshold"""
-    if current_date is None:
-        current_date = date.today()
-    
-    budgets = get_budgets_by_user(db, user_id=user_id, tenant_id=tenant_id, active_only=True)
-    alert_budgets = []
-    
-    for budget in budgets:
-        summary = get_budget_spending_summary(db, budget, current_date)
-        if summary['spent_percentage'] >= budget.alert_percentage:
-            alert_budgets.append((budget, summary))
-    
-    return alert_budgets
\ No newline at end of file
+    return [
+        (budget, summary)
+        for budget, summary in get_budget_summaries(
+            db, user_id=user_id, tenant_id=tenant_id, current_date=current_date
+        )
+        if _over_alert_threshold(budget, summary)
+    ]
@@ -2,8 +2,11 @@ from typing import Any, Dict, Optional, Union, List
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_
 
+from app.crud import interaction_analytics
 from app.models.contact import Contact, ContactVisibility
 from app.schemas.contact import ContactCreate, ContactUpdate
+from app.services.analytics_dashboard import dashboard_cache
+from app.services.relationship_graph import relationship_graph_cache
 
 def get_contact(db: Session, contact_id: int, tenant_id: int) -> Optional[Contact]:
     return db.query(Contact).filter(
@@ -130,6 +133,7 @@ def create_contact(
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    dashboard_cache.invalidate(tenant_id)
     return db_obj
 
 def update_contact(
@@ -148,14 +152,20 @@ def update_contact(
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    dashboard_cache.invalidate(db_obj.tenant_id)
     return db_obj
 
 
 def delete_contact(db: Session, contact_id: int, tenant_id: int) -> Optional[Contact]:
     contact = get_contact(db, contact_id=contact_id, tenant_id=tenant_id)
     if contact:
+        # Its interactions go with it, so its analytics leave the tenant totals too
+        interaction_analytics.remove_contact(db, tenant_id=tenant_id, contact_id=contact_id)
         db.delete(contact)
         db.commit()
+        # Deleting a contact cascades to its relationships
+        relationship_graph_cache.invalidate(tenant_id)
+        dashboard_cache.invalidate(tenant_id)
     return contact
 
 
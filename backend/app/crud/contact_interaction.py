@@ -0,0 +1,78 @@
+from typing import List, Optional
+from sqlalchemy.orm import Session
+
+from app.crud import interaction_analytics
+from app.models.contact import Contact, ContactInteraction
+from app.schemas.contact import ContactInteractionCreate, ContactInteractionUpdate
+from app.services.analytics_dashboard import dashboard_cache
+
+
+def get_interaction(db: Session, interaction_id: int, tenant_id: int) -> Optional[ContactInteraction]:
+    return db.query(ContactInteraction).join(Contact).filter(
+        ContactInteraction.id == interaction_id,
+        Contact.tenant_id == tenant_id
+    ).first()
+
+
+def get_contact_interactions(
+    db: Session,
+    contact_id: int,
+    tenant_id: int,
+    skip: int = 0,
+    limit: int = 100
+) -> List[ContactInteraction]:
+    """Get a contact's interactions, newest first"""
+    return db.query(ContactInteraction).join(Contact).filter(
+        ContactInteraction.contact_id == contact_id,
+        Contact.tenant_id == tenant_id
+    ).order_by(ContactInteraction.interaction_date.desc()).offset(skip).limit(limit).all()
+
+
+def create_interaction(db: Session, obj_in: ContactInteractionCreate, tenant_id: int) -> ContactInteraction:
+    """Record an interaction and add it to the contact's interaction analytics"""
+    db_obj = ContactInteraction(**obj_in.dict(exclude_unset=True))
+    db.add(db_obj)
+    db.flush()
+    interaction_analytics.apply_interaction(
+        db, tenant_id=tenant_id, new=interaction_analytics.analytics_values(db_obj)
+    )
+    db.commit()
+    db.refresh(db_obj)
+    dashboard_cache.invalidate(tenant_id)
+    return db_obj
+
+
+def update_interaction(
+    db: Session,
+    db_obj: ContactInteraction,
+    obj_in: ContactInteractionUpdate,
+    tenant_id: int
+) -> ContactInteraction:
+    """Update an interaction, moving its contribution to the interaction analytics"""
+    old_values = interaction_analytics.analytics_values(db_obj)
+    update_data = obj_in.dict(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(db_obj, field, value)
+
+    db.add(db_obj)
+    db.flush()
+    interaction_analytics.apply_interaction(
+        db, tenant_id=tenant_id, old=old_values, new=interaction_analytics.analytics_values(db_obj)
+    )
+    db.commit()
+    db.refresh(db_obj)
+    dashboard_cache.invalidate(tenant_id)
+    return db_obj
+
+
+def delete_interaction(db: Session, interaction_id: int, tenant_id: int) -> Optional[ContactInteraction]:
+    """Delete an interaction and remove it from the interaction analytics"""
+    db_obj = get_interaction(db, interaction_id=interaction_id, tenant_id=tenant_id)
+    if db_obj:
+        old_values = interaction_analytics.analytics_values(db_obj)
+        db.delete(db_obj)
+        db.flush()
+        interaction_analytics.apply_interaction(db, tenant_id=tenant_id, old=old_values)
+        db.commit()
+        dashboard_cache.invalidate(tenant_id)
+    return db_obj
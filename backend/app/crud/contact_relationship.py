@@ -1,4 +1,5 @@
 from typing import List, Optional, Dict, Any
+from itertools import groupby
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_
 
@@ -9,6 +10,7 @@ from app.schemas.contact_relationship import (
     ContactRelationshipUpdate,
     ContactRelationshipPair
 )
+from app.services.relationship_graph import relationship_graph_cache
 from app.services.relationship_mapping import relationship_mapping_service
 
 
@@ -166,6 +168,7 @@ def create_contact_relationship(
     db.add(relationship_a_to_b)
     db.add(relationship_b_to_a)
     db.commit()
+    relationship_graph_cache.invalidate(tenant_id)
     db.refresh(relationship_a_to_b)
     db.refresh(relationship_b_to_a)
     
@@ -198,6 +201,7 @@ def update_contact_relationship(
     
     db.add(relationship)
     db.commit()
+    relationship_graph_cache.invalidate(tenant_id)
     db.refresh(relationship)
     return relationship
 
@@ -268,6 +272,7 @@ def update_bidirectional_relationship(
         db.add(rel)
     
     db.commit()
+    relationship_graph_cache.invalidate(tenant_id)
     
     return ContactRelationshipPair(
         contact_a_id=contact_a_id,
@@ -296,6 +301,7 @@ def delete_contact_relationship(
         db.delete(rel)
     
     db.commit()
+    relationship_graph_cache.invalidate(tenant_id)
     return True
 
 
@@ -304,29 +310,51 @@ def get_relationship_summary(
     contact_id: int,
     tenant_id: int
 ) -> Dict[str, List[Dict[str, Any]]]:
-    """Get a summary of relationships grouped by category."""
-    relationships = get_contact_relationships(db, contact_id, tenant_id)
+    """
+    Get a summary of relationships grouped by category.
+    
+    Relationships are stored in both directions, so the contact's outgoing rows
+    (contact_a_id == contact_id) cover each relationship exactly once. The counterpart's
+    name fields are fetched in the same query and rows arrive ordered by category,
+    so the whole summary costs a single round trip.
+    """
+    rows = db.query(
+        ContactRelationship.id,
+        ContactRelationship.relationship_type,
+        ContactRelationship.relationship_category,
+        ContactRelationship.contact_b_id,
+        ContactRelationship.is_gender_resolved,
+        ContactRelationship.original_relationship_type,
+        ContactRelationship.notes,
+        ContactRelationship.created_at,
+        Contact.first_name,
+        Contact.last_name
+    ).outerjoin(
+        Contact, Contact.id == ContactRelationship.contact_b_id
+    ).filter(
+        ContactRelationship.tenant_id == tenant_id,
+        ContactRelationship.contact_a_id == contact_id,
+        ContactRelationship.is_active == True
+    ).order_by(
+        ContactRelationship.relationship_category,
+        ContactRelationship.id
+    ).all()
     
     summary = {}
     
-    for rel in relationships:
-        category = rel.relationship_category
-        if category not in summary:
-            summary[category] = []
-        
-        # Determine the other contact
-        other_contact_id = rel.contact_b_id if rel.contact_a_id == contact_id else rel.contact_a_id
-        other_contact = db.query(Contact).filter(Contact.id == other_contact_id).first()
-        
-        summary[category].append({
-            'relationship_id': rel.id,
-            'relationship_type': rel.relationship_type,
-            'other_contact_id': other_contact_id,
-            'other_contact_name': f"{other_contact.first_name} {other_contact.last_name or ''}".strip() if other_contact else "Unknown",
-            'is_gender_resolved': rel.is_gender_resolved,
-            'original_relationship_type': rel.original_relationship_type,
-            'notes': rel.notes,
-            'created_at': rel.created_at
-        })
-    
-    return summary
\ No newline at end of file
+    for category, category_rows in groupby(rows, key=lambda row: row.relationship_category):
+        summary[category] = [
+            {
+                'relationship_id': row.id,
+                'relationship_type': row.relationship_type,
+                'other_contact_id': row.contact_b_id,
+                'other_contact_name': f"{row.first_name} {row.last_name or ''}".strip() if row.first_name is not None else "Unknown",
+                'is_gender_resolved': row.is_gender_resolved,
+                'original_relationship_type': row.original_relationship_type,
+                'notes': row.notes,
+                'created_at': row.created_at
+            }
+            for row in category_rows
+        ]
+    
+    return summary
@@ -2,6 +2,7 @@ from typing import List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, func
 
+from app.core.money import currency_exponents
 from app.models.currency import Currency
 from app.schemas.currency import CurrencyCreate, CurrencyUpdate
 
@@ -44,6 +45,7 @@ def create_currency(db: Session, currency: CurrencyCreate) -> Currency:
     db.add(db_currency)
     db.commit()
     db.refresh(db_currency)
+    currency_exponents.invalidate()
     return db_currency
 
 def update_currency(db: Session, currency_id: int, currency_update: CurrencyUpdate) -> Optional[Currency]:
@@ -59,6 +61,7 @@ def update_currency(db: Session, currency_id: int, currency_update: CurrencyUpda
     db.add(db_currency)
     db.commit()
     db.refresh(db_currency)
+    currency_exponents.invalidate()
     return db_currency
 
 def set_default_currency(db: Session, currency_id: int) -> Optional[Currency]:
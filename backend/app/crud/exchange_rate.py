@@ -0,0 +1,110 @@
+from typing import Any, Dict, List, Optional
+from datetime import date
+from decimal import Decimal
+from sqlalchemy.orm import Session
+from sqlalchemy import Numeric, and_, case, func, insert, literal, select, type_coerce, update
+
+from app.models.exchange_rate import ExchangeRate
+
+KEY_COLUMNS = ['base_currency', 'quote_currency', 'rate_date']
+
+
+def _latest_rate(base, quote, as_of: date):
+    """Scalar subquery: the latest base -> quote rate on or before as_of."""
+    return select(ExchangeRate.rate).where(
+        and_(
+            ExchangeRate.base_currency == base,
+            ExchangeRate.quote_currency == quote,
+            ExchangeRate.rate_date <= as_of
+        )
+    ).order_by(ExchangeRate.rate_date.desc()).limit(1).scalar_subquery()
+
+
+def rate_expression(currency, target: str, as_of: date):
+    """
+    SQL expression for the rate converting amounts in the `currency` column to target
+    on as_of: 1 for the same currency, otherwise the direct rate or the inverse of
+    the opposite one. NULL when neither is known.
+    """
+    rate = case(
+        (currency == target, literal(1)),
+        else_=func.coalesce(_latest_rate(currency, target, as_of), 1 / _latest_rate(target, currency, as_of))
+    )
+    # Keep results Decimal on backends that divide in floating point
+    return type_coerce(rate, Numeric(20, 10))
+
+
+def convert_expression(amount, currency, target: str, as_of: date):
+    """SQL expression converting the amount column from the currency column to target."""
+    return amount * rate_expression(currency, target, as_of)
+
+
+def get_rate(db: Session, *, base: str, quote: str, as_of: date) -> Optional[Decimal]:
+    """Rate converting base to quote on as_of, direct or inverted, or None if unknown."""
+    if base == quote:
+        return Decimal('1')
+    direct, inverse = db.execute(
+        select(_latest_rate(base, quote, as_of), _latest_rate(quote, base, as_of))
+    ).one()
+    if direct is not None:
+        return Decimal(str(direct))
+    if inverse:
+        return 1 / Decimal(str(inverse))
+    return None
+
+
+def get_rates(db: Session, *, base: Optional[str] = None, quote: Optional[str] = None,
+              skip: int = 0, limit: int = 100) -> List[ExchangeRate]:
+    """Stored rates, newest first, optionally for one base and/or quote currency."""
+    query = db.query(ExchangeRate)
+    if base:
+        query = query.filter(ExchangeRate.base_currency == base)
+    if quote:
+        query = query.filter(ExchangeRate.quote_currency == quote)
+    return query.order_by(
+        ExchangeRate.rate_date.desc(), ExchangeRate.base_currency, ExchangeRate.quote_currency
+    ).offset(skip).limit(limit).all()
+
+
+def upsert_rates(db: Session, rows: List[Dict[str, Any]]) -> int:
+    """
+    Insert rates, replacing any already stored for the same pair and date, with one
+    statement. Commits and returns the number of rows written.
+    """
+    # A pair and date listed twice keeps its last rate; one statement cannot upsert a row twice
+    rows = list({tuple(row[column] for column in KEY_COLUMNS): row for row in rows}.values())
+    if not rows:
+        return 0
+
+    dialect = db.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        dialect_insert = None
+
+    if dialect_insert is None:
+        for row in rows:
+            _update_then_insert(db, row)
+    else:
+        stmt = dialect_insert(ExchangeRate)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=KEY_COLUMNS,
+            set_={'rate': stmt.excluded.rate, 'source': stmt.excluded.source}
+        )
+        db.execute(stmt, rows)
+    db.commit()
+    return len(rows)
+
+
+def _update_then_insert(db: Session, row: Dict[str, Any]):
+    """Portable upsert for databases without ON CONFLICT."""
+    result = db.execute(
+        update(ExchangeRate)
+        .where(and_(*[getattr(ExchangeRate, column) == row[column] for column in KEY_COLUMNS]))
+        .values(rate=row['rate'], source=row.get('source'))
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        db.execute(insert(ExchangeRate), [row])
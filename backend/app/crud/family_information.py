@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Optional, Set, Tuple
 from datetime import date, datetime, timedelta
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_
@@ -7,8 +7,12 @@ from app.models.contact import Contact
 from app.models.contact_relationship import ContactRelationship
 from app.schemas.family_information import (
     FamilyMemberInfo, BirthdayReminder, EmergencyContact, 
-    FamilyTreeNode, FamilySummary, FamilyInformationFilter
+    FamilyTreeNode, FamilySummary, FamilyInformationFilter,
+    RelativeInfo, RelationshipPath, RelationshipPathStep
 )
+from app.services.relationship_graph import relationship_graph_cache
+
+IMMEDIATE_FAMILY_TYPES = {'parent', 'child', 'sibling', 'brother', 'sister', 'spouse', 'partner'}
 
 
 class FamilyInformationService:
@@ -25,52 +29,26 @@ class FamilyInformationService:
     ) -> List[FamilyMemberInfo]:
         """Get all family members with relationship information"""
         
-        # Base query for family relationships
-        family_relationships_query = self.db.query(ContactRelationship).filter(
-            and_(
-                ContactRelationship.tenant_id == tenant_id,
-                ContactRelationship.relationship_category == 'family',
-                ContactRelationship.is_active == True,
-                or_(
-                    ContactRelationship.contact_a_id.in_(
-                        self.db.query(Contact.id).filter(
-                            and_(
-                                Contact.tenant_id == tenant_id,
-                                Contact.created_by_user_id == user_id
-                            )
-                        )
-                    ),
-                    ContactRelationship.contact_b_id.in_(
-                        self.db.query(Contact.id).filter(
-                            and_(
-                                Contact.tenant_id == tenant_id,
-                                Contact.created_by_user_id == user_id
-                            )
-                        )
-                    )
-                )
-            )
-        )
-        
-        if not include_extended:
-            # Only immediate family (parent, child, sibling, spouse)
-            immediate_family_types = ['parent', 'child', 'sibling', 'brother', 'sister', 'spouse', 'partner']
-            family_relationships_query = family_relationships_query.filter(
-                ContactRelationship.relationship_type.in_(immediate_family_types)
-            )
+        graph = relationship_graph_cache.get_graph(self.db, tenant_id, user_id)
         
-        family_relationships = family_relationships_query.all()
+        # Only immediate family (parent, child, sibling, spouse) unless extended is requested
+        relationship_types = None if include_extended else IMMEDIATE_FAMILY_TYPES
+        family_relationships = graph.edges(category='family', relationship_types=relationship_types)
+        if not family_relationships:
+            return []
         
-        # Collect all family contact IDs
-        family_contact_ids = set()
+        # Map each contact to its relationship in one pass, preferring the row that
+        # describes the contact itself (contact is the source, "A is B's <type>")
+        relationships_as_source = {}
+        relationships_as_target = {}
         for rel in family_relationships:
-            family_contact_ids.add(rel.contact_a_id)
-            family_contact_ids.add(rel.contact_b_id)
+            relationships_as_source.setdefault(rel.source_id, rel)
+            relationships_as_target.setdefault(rel.target_id, rel)
         
         # Get all family contacts
         family_contacts = self.db.query(Contact).filter(
             and_(
-                Contact.id.in_(family_contact_ids),
+                Contact.id.in_(relationships_as_source.keys() | relationships_as_target.keys()),
                 Contact.tenant_id == tenant_id,
                 Contact.is_active == True
             )
@@ -79,12 +57,7 @@ class FamilyInformationService:
         # Build family member info list
         family_members = []
         for contact in family_contacts:
-            # Find the relationship for this contact
-            relationship = None
-            for rel in family_relationships:
-                if rel.contact_a_id == contact.id or rel.contact_b_id == contact.id:
-                    relationship = rel
-                    break
+            relationship = relationships_as_source.get(contact.id) or relationships_as_target.get(contact.id)
             
             # Calculate age if birth date is available
             age = None
@@ -279,8 +252,12 @@ class FamilyInformationService:
         
         emergency_contacts = self.get_emergency_contacts(user_id, tenant_id)
         
-        # Build a simple family tree (could be enhanced further)
-        family_tree = self._build_family_tree(family_members, filter_params.generation_depth)
+        graph = relationship_graph_cache.get_graph(self.db, tenant_id, user_id)
+        family_tree = self._build_family_tree(
+            family_members,
+            filter_params.generation_depth,
+            parent_child_pairs=graph.parent_child_pairs()
+        )
         
         return FamilySummary(
             total_family_members=len(family_members),
@@ -290,26 +267,112 @@ class FamilyInformationService:
             emergency_contacts=emergency_contacts
         )
 
+    def get_relatives(
+        self,
+        user_id: int,
+        tenant_id: int,
+        contact_id: int,
+        depth: int = 2
+    ) -> List[RelativeInfo]:
+        """Get contacts related to a contact through family relationships within depth hops"""
+        
+        graph = relationship_graph_cache.get_graph(self.db, tenant_id, user_id)
+        distances = graph.bfs(contact_id, depth, category='family')
+        distances.pop(contact_id, None)
+        if not distances:
+            return []
+        
+        contacts = self.db.query(Contact).filter(
+            and_(
+                Contact.id.in_(distances.keys()),
+                Contact.tenant_id == tenant_id,
+                Contact.is_active == True
+            )
+        ).all()
+        
+        relatives = [RelativeInfo(contact=contact, distance=distances[contact.id]) for contact in contacts]
+        relatives.sort(key=lambda x: (x.distance, x.contact.id))
+        return relatives
+
+    def find_relationship_path(
+        self,
+        user_id: int,
+        tenant_id: int,
+        from_contact_id: int,
+        to_contact_id: int,
+        category: Optional[str] = None
+    ) -> Optional[RelationshipPath]:
+        """Find the shortest chain of relationships between two contacts, or None if unrelated"""
+        
+        graph = relationship_graph_cache.get_graph(self.db, tenant_id, user_id)
+        path = graph.shortest_path(from_contact_id, to_contact_id, category=category)
+        if path is None:
+            return None
+        
+        contact_ids = {from_contact_id, to_contact_id}
+        for edge in path:
+            contact_ids.add(edge.target_id)
+        names = {
+            contact_id: f"{first_name} {last_name or ''}".strip()
+            for contact_id, first_name, last_name in self.db.query(
+                Contact.id, Contact.first_name, Contact.last_name
+            ).filter(
+                and_(
+                    Contact.id.in_(contact_ids),
+                    Contact.tenant_id == tenant_id
+                )
+            )
+        }
+        
+        steps = [
+            RelationshipPathStep(
+                from_contact_id=edge.source_id,
+                from_contact_name=names.get(edge.source_id, "Unknown"),
+                to_contact_id=edge.target_id,
+                to_contact_name=names.get(edge.target_id, "Unknown"),
+                relationship_type=edge.relationship_type,
+                relationship_category=edge.relationship_category
+            )
+            for edge in path
+        ]
+        return RelationshipPath(
+            from_contact_id=from_contact_id,
+            to_contact_id=to_contact_id,
+            degrees=len(steps),
+            steps=steps
+        )
+
     def _build_family_tree(
         self, 
         family_members: List[FamilyMemberInfo], 
-        depth: int
+        depth: int,
+        parent_child_pairs: Optional[Set[Tuple[int, int]]] = None
     ) -> List[FamilyTreeNode]:
-        """Build a basic family tree structure"""
-        
-        tree_nodes = []
+        """
+        Build the family tree. Members are nested under their parents using the
+        (parent_id, child_id) pairs from the relationship graph; members without a
+        parent in the family become roots.
+        """
         
         # Group by relationship types to determine generation
         generation_map = {
             'grandparent': -2,
+            'grandfather': -2,
+            'grandmother': -2,
             'parent': -1,
+            'father': -1,
+            'mother': -1,
             'sibling': 0,
             'brother': 0,
             'sister': 0,
             'spouse': 0,
             'partner': 0,
             'child': 1,
+            'son': 1,
+            'daughter': 1,
             'grandchild': 2,
+            'grandson': 2,
+            'granddaughter': 2,
             'uncle': -1,
             'aunt': -1,
             'nephew': 1,
@@ -317,20 +380,44 @@ class FamilyInformationService:
             'cousin': 0
         }
         
+        nodes = {}
         for family_member in family_members:
             generation = generation_map.get(family_member.relationship_type, 0)
             
             if abs(generation) <= depth:
-                node = FamilyTreeNode(
+                nodes[family_member.contact.id] = FamilyTreeNode(
                     contact_id=family_member.contact.id,
                     contact_name=f"{family_member.contact.first_name} {family_member.contact.last_name or ''}".strip(),
                     family_nickname=family_member.contact.family_nickname,
                     relationship_to_user=family_member.relationship_type,
                     generation=generation,
-                    children=[]  # Simplified - not building actual parent-child hierarchy
+                    children=[]
                 )
-                tree_nodes.append(node)
+        
+        # Attach each child to a single parent so the result stays a tree
+        children_by_parent = {}
+        has_parent = set()
+        for parent_id, child_id in sorted(parent_child_pairs or ()):
+            if parent_id in nodes and child_id in nodes and child_id not in has_parent:
+                children_by_parent.setdefault(parent_id, []).append(child_id)
+                has_parent.add(child_id)
+        
+        placed = set()
+        
+        def attach(contact_id: int) -> FamilyTreeNode:
+            placed.add(contact_id)
+            node = nodes[contact_id]
+            for child_id in children_by_parent.get(contact_id, []):
+                if child_id not in placed:
+                    node.children.append(attach(child_id))
+            return node
+        
+        tree_nodes = [attach(contact_id) for contact_id in nodes if contact_id not in has_parent]
+        # Parent cycles have no root; break them at the first unplaced member
+        for contact_id in nodes:
+            if contact_id not in placed:
+                tree_nodes.append(attach(contact_id))
         
         # Sort by generation for display
         tree_nodes.sort(key=lambda x: x.generation)
-        return tree_nodes
\ No newline at end of file
+        return tree_nodes
@@ -1,10 +1,18 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
+from datetime import date
+from decimal import Decimal
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, func
 
+from app.crud import account_ledger
+from app.crud import exchange_rate as crud_exchange_rate
+from app.crud import transaction as crud_transaction
 from app.models.financial_account import FinancialAccount
 from app.schemas.financial_account import FinancialAccountCreate, FinancialAccountUpdate
 
+# Account types whose balances are owed rather than owned
+LIABILITY_ACCOUNT_TYPES = ('credit_card', 'loan', 'mortgage')
+
 def get_financial_account(
     db: Session,
     account_id: int,
@@ -53,6 +61,80 @@ def get_financial_accounts_by_user(
     
     return query.order_by(FinancialAccount.account_name).all()
 
+def get_financial_accounts_with_summaries(
+    db: Session,
+    *,
+    user_id: int,
+    tenant_id: int,
+    active_only: bool = True
+) -> List[Tuple[FinancialAccount, Dict[str, Any]]]:
+    """
+    Get a user's financial accounts, each paired with its transaction summary,
+    in one query: the accounts are outer-joined to the grouped transaction totals.
+    """
+    summaries = crud_transaction.account_summaries_subquery(user_id=user_id, tenant_id=tenant_id)
+    query = db.query(
+        FinancialAccount,
+        summaries.c.total_credits,
+        summaries.c.total_debits,
+        summaries.c.transaction_count,
+        summaries.c.last_transaction_date
+    ).outerjoin(
+        summaries, summaries.c.account_id == FinancialAccount.id
+    ).filter(
+        and_(
+            FinancialAccount.user_id == user_id,
+            FinancialAccount.tenant_id == tenant_id
+        )
+    )
+    
+    if active_only:
+        query = query.filter(FinancialAccount.is_active == True)
+    
+    return [
+        (account, crud_transaction.summary_from_row(*summary))
+        for account, *summary in query.order_by(FinancialAccount.account_name).all()
+    ]
+
+def get_balance_totals(
+    db: Session,
+    *,
+    user_id: int,
+    tenant_id: int,
+    currency: str,
+    as_of: date,
+    active_only: bool = True
+) -> List[Any]:
+    """
+    A user's account balances summed per (is_liability, account currency) in one
+    query, with each group also converted to `currency` at the latest rate on or
+    before as_of. Rows carry account_count, total, absolute_total (sum of absolute
+    balances) and their converted_ counterparts, which are None without a rate.
+    """
+    is_liability = FinancialAccount.account_type.in_(LIABILITY_ACCOUNT_TYPES)
+    rate = crud_exchange_rate.rate_expression(FinancialAccount.currency, currency, as_of)
+    total = func.coalesce(func.sum(FinancialAccount.current_balance), 0)
+    absolute_total = func.coalesce(func.sum(func.abs(FinancialAccount.current_balance)), 0)
+    query = db.query(
+        is_liability.label('is_liability'),
+        FinancialAccount.currency,
+        func.count(FinancialAccount.id).label('account_count'),
+        total.label('total'),
+        absolute_total.label('absolute_total'),
+        (total * rate).label('converted_total'),
+        (absolute_total * rate).label('converted_absolute_total')
+    ).filter(
+        and_(
+            FinancialAccount.user_id == user_id,
+            FinancialAccount.tenant_id == tenant_id
+        )
+    )
+    
+    if active_only:
+        query = query.filter(FinancialAccount.is_active == True)
+    
+    return query.group_by(is_liability, FinancialAccount.currency).all()
+
 def create_financial_account(
     db: Session,
     *,
@@ -60,13 +142,26 @@ def create_financial_account(
     user_id: int,
     tenant_id: int
 ) -> FinancialAccount:
-    """Create a new financial account"""
+    """Create a new financial account, recording its starting balance as an opening ledger entry"""
+    account_data = obj_in.dict()
+    opening_balance = account_data.pop('current_balance', None) or 0
     db_obj = FinancialAccount(
-        **obj_in.dict(),
+        **account_data,
+        current_balance=0,
         user_id=user_id,
         tenant_id=tenant_id
     )
     db.add(db_obj)
+    db.flush()
+    if opening_balance:
+        account_ledger.post_entry(
+            db,
+            account_id=db_obj.id,
+            tenant_id=tenant_id,
+            amount=opening_balance,
+            entry_date=date.today(),
+            entry_type=account_ledger.OPENING
+        )
     db.commit()
     db.refresh(db_obj)
     return db_obj
@@ -77,25 +172,46 @@ def update_financial_account(
     db_obj: FinancialAccount,
     obj_in: FinancialAccountUpdate
 ) -> FinancialAccount:
-    """Update an existing financial account"""
+    """Update an existing financial account. A new balance is recorded as a ledger adjustment."""
     update_data = obj_in.dict(exclude_unset=True)
+    new_balance = update_data.pop('current_balance', None)
     for field, value in update_data.items():
         setattr(db_obj, field, value)
     
     db.add(db_obj)
+    if new_balance is not None:
+        _post_adjustment(db, db_obj, new_balance)
     db.commit()
     db.refresh(db_obj)
     return db_obj
 
+def _post_adjustment(db: Session, db_obj: FinancialAccount, new_balance) -> None:
+    """Post the difference between the stored and the requested balance as an adjustment."""
+    current_balance = db.query(FinancialAccount.current_balance).filter(
+        FinancialAccount.id == db_obj.id
+    ).with_for_update().scalar() or 0
+    delta = Decimal(str(new_balance)) - Decimal(str(current_balance))
+    if delta:
+        account_ledger.post_entry(
+            db,
+            account_id=db_obj.id,
+            tenant_id=db_obj.tenant_id,
+            amount=delta,
+            entry_date=date.today(),
+            entry_type=account_ledger.ADJUSTMENT
+        )
+
 def update_account_balance(
     db: Session,
     *,
     db_obj: FinancialAccount,
     new_balance: float
 ) -> FinancialAccount:
-    """Update account balance"""
-    db_obj.current_balance = new_balance
-    db.add(db_obj)
+    """
+    Set the account balance, e.g. after reconciling with a bank statement.
+    Transaction writes post to the ledger themselves and must not call this.
+    """
+    _post_adjustment(db, db_obj, new_balance)
     db.commit()
     db.refresh(db_obj)
     return db_obj
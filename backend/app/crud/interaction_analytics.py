@@ -0,0 +1,325 @@
+from typing import Any, Dict, Mapping, Optional
+from datetime import datetime, timedelta, timezone
+from decimal import ROUND_HALF_UP, Decimal
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, case, delete, func, insert, select, update
+
+from app.models.analytics import InteractionAnalytics, InteractionAnalyticsTotals
+from app.models.contact import Contact, ContactInteraction
+
+# Interaction fields that decide what an interaction adds to its contact's counters
+ANALYTICS_FIELDS = (
+    'contact_id', 'interaction_type', 'interaction_date', 'duration_minutes', 'interaction_quality', 'initiated_by'
+)
+
+# Counter for each interaction type and initiator; other values only count towards the totals
+TYPE_COLUMNS = {'meeting': 'in_person_meetings', 'call': 'phone_calls', 'email': 'emails', 'text': 'text_messages'}
+INITIATOR_COLUMNS = {'me': 'interactions_initiated_by_user', 'them': 'interactions_initiated_by_contact'}
+
+# Counters kept both per contact and per tenant
+COUNTER_COLUMNS = (
+    'total_interactions', 'in_person_meetings', 'phone_calls', 'emails', 'text_messages',
+    'interactions_last_30_days', 'interactions_initiated_by_user', 'interactions_initiated_by_contact'
+)
+
+# Per-contact sums behind the stored averages
+AVERAGE_SOURCE_COLUMNS = ('quality_total', 'quality_count', 'duration_total', 'duration_count')
+
+# Per-tenant sums over the contact rows
+SUMMARY_COLUMNS = ('contact_count', 'quality_average_total', 'duration_average_total', 'high_quality_contacts')
+
+TOTALS_COLUMNS = COUNTER_COLUMNS + SUMMARY_COLUMNS
+
+RECENT_DAYS = 30
+
+# Contacts averaging at least this quality count as high quality
+HIGH_QUALITY = Decimal('8')
+
+
+def analytics_values(interaction: ContactInteraction) -> Dict[str, Any]:
+    """Snapshot of the fields an interaction contributes to its contact's counters."""
+    return {field: getattr(interaction, field) for field in ANALYTICS_FIELDS}
+
+
+def recent_since(now: Optional[datetime] = None) -> datetime:
+    """Start of the rolling window; interactions on or after it count as recent."""
+    return (now or datetime.now(timezone.utc)) - timedelta(days=RECENT_DAYS)
+
+
+def _aware(moment: datetime) -> datetime:
+    # sqlite hands back naive datetimes; stored dates are UTC
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+def _average(total, count: int) -> Optional[Decimal]:
+    if not count:
+        return None
+    # Same rounding as SQL round(), which rebuild() uses
+    return (Decimal(str(total)) / count).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
+
+def _empty_delta() -> Dict[str, Any]:
+    delta: Dict[str, Any] = dict.fromkeys(COUNTER_COLUMNS + AVERAGE_SOURCE_COLUMNS, 0)
+    delta['quality_total'] = Decimal('0')
+    return delta
+
+
+def _accumulate(delta: Dict[str, Any], values: Mapping, since: datetime, sign: int):
+    """Add (or with sign=-1, remove) an interaction's contribution to its contact's delta."""
+    delta['total_interactions'] += sign
+    for column in (TYPE_COLUMNS.get(values['interaction_type']), INITIATOR_COLUMNS.get(values['initiated_by'])):
+        if column:
+            delta[column] += sign
+    if _aware(values['interaction_date']) >= since:
+        delta['interactions_last_30_days'] += sign
+    if values['interaction_quality'] is not None:
+        delta['quality_total'] += Decimal(str(values['interaction_quality'])) * sign
+        delta['quality_count'] += sign
+    if values['duration_minutes'] is not None:
+        delta['duration_total'] += values['duration_minutes'] * sign
+        delta['duration_count'] += sign
+
+
+def _contribution(row: Optional[InteractionAnalytics]) -> Dict[str, Any]:
+    """What a contact row adds to its tenant's summary columns."""
+    if row is None:
+        return {'contact_count': 0, 'quality_average_total': Decimal('0'),
+                'duration_average_total': Decimal('0'), 'high_quality_contacts': 0}
+    quality = Decimal(str(row.avg_interaction_quality or 0))
+    return {
+        'contact_count': 1,
+        'quality_average_total': quality,
+        'duration_average_total': Decimal(str(row.avg_interaction_duration or 0)),
+        'high_quality_contacts': 1 if quality >= HIGH_QUALITY else 0
+    }
+
+
+def _locked_row(db: Session, contact_id: int) -> Optional[InteractionAnalytics]:
+    return db.query(InteractionAnalytics).filter(
+        InteractionAnalytics.contact_id == contact_id
+    ).populate_existing().with_for_update().first()
+
+
+def apply_interaction(
+    db: Session,
+    *,
+    tenant_id: int,
+    old: Optional[Mapping] = None,
+    new: Optional[Mapping] = None,
+    now: Optional[datetime] = None
+):
+    """
+    Move an interaction write into the analytics: `old` holds the ANALYTICS_FIELDS
+    values before the write (None on create), `new` the values after it (None on
+    delete). Call once the write is flushed. Touches the affected contact rows and
+    the tenant's totals row only. Does not commit.
+    """
+    if old is not None and new is not None and dict(old) == dict(new):
+        return
+    since = recent_since(now)
+    deltas: Dict[int, Dict[str, Any]] = {}
+    if old is not None:
+        _accumulate(deltas.setdefault(old['contact_id'], _empty_delta()), old, since, sign=-1)
+    if new is not None:
+        _accumulate(deltas.setdefault(new['contact_id'], _empty_delta()), new, since, sign=1)
+
+    totals: Dict[str, Any] = dict.fromkeys(TOTALS_COLUMNS, 0)
+    for contact_id, delta in deltas.items():
+        row = _locked_row(db, contact_id)
+        before = _contribution(row)
+        if row is None:
+            row = InteractionAnalytics(contact_id=contact_id, tenant_id=tenant_id, **_empty_delta())
+            db.add(row)
+        for column, value in delta.items():
+            setattr(row, column, getattr(row, column) + value)
+        row.avg_interaction_quality = _average(row.quality_total, row.quality_count)
+        row.avg_interaction_duration = _average(row.duration_total, row.duration_count)
+
+        added = new['interaction_date'] if new is not None and new['contact_id'] == contact_id else None
+        removed = old['interaction_date'] if old is not None and old['contact_id'] == contact_id else None
+        if added is not None and (row.last_interaction_date is None
+                                  or _aware(added) > _aware(row.last_interaction_date)):
+            row.last_interaction_date = added
+        if removed is not None and row.last_interaction_date is not None \
+                and _aware(removed) >= _aware(row.last_interaction_date):
+            # The latest interaction moved or went away; look up the new latest by contact
+            row.last_interaction_date = db.query(func.max(ContactInteraction.interaction_date)).filter(
+                ContactInteraction.contact_id == contact_id
+            ).scalar()
+
+        if row.total_interactions <= 0:
+            if row in db.new:
+                db.expunge(row)
+            else:
+                db.delete(row)
+            row = None
+        after = _contribution(row)
+
+        for column in COUNTER_COLUMNS:
+            totals[column] += delta[column]
+        for column in SUMMARY_COLUMNS:
+            totals[column] += after[column] - before[column]
+    apply_totals(db, tenant_id, totals)
+
+
+def remove_contact(db: Session, *, tenant_id: int, contact_id: int):
+    """Take a contact's row out of its tenant's totals and delete it, before the contact goes. Does not commit."""
+    row = _locked_row(db, contact_id)
+    if row is None:
+        return
+    totals = {column: -getattr(row, column) for column in COUNTER_COLUMNS}
+    totals.update({column: -value for column, value in _contribution(row).items()})
+    db.delete(row)
+    apply_totals(db, tenant_id, totals)
+
+
+def apply_totals(db: Session, tenant_id: int, totals: Mapping[str, Any]):
+    """Add deltas to a tenant's totals row with one upsert statement. Does not commit."""
+    if not any(totals.values()):
+        return
+    row = dict(totals, tenant_id=tenant_id)
+
+    dialect = db.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        _update_then_insert(db, row)
+        return
+
+    stmt = dialect_insert(InteractionAnalyticsTotals)
+    set_ = {
+        column: getattr(InteractionAnalyticsTotals, column) + getattr(stmt.excluded, column)
+        for column in TOTALS_COLUMNS
+    }
+    set_['updated_at'] = func.now()
+    db.execute(stmt.on_conflict_do_update(index_elements=['tenant_id'], set_=set_), [row])
+
+
+def _update_then_insert(db: Session, row: Dict[str, Any]):
+    """Portable upsert for databases without ON CONFLICT."""
+    result = db.execute(
+        update(InteractionAnalyticsTotals)
+        .where(InteractionAnalyticsTotals.tenant_id == row['tenant_id'])
+        .values({column: getattr(InteractionAnalyticsTotals, column) + row[column] for column in TOTALS_COLUMNS})
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        db.execute(insert(InteractionAnalyticsTotals), [row])
+
+
+def decay_recent_windows(db: Session, *, tenant_id: Optional[int] = None, now: Optional[datetime] = None) -> int:
+    """
+    Recount interactions_last_30_days for contacts that still have recent
+    interactions, dropping those that aged out of the window, and refresh the
+    affected tenant totals. Commits and returns the number of contact rows checked.
+    """
+    since = recent_since(now)
+    contact_scope = [InteractionAnalytics.interactions_last_30_days > 0]
+    totals_scope = [InteractionAnalyticsTotals.interactions_last_30_days > 0]
+    if tenant_id is not None:
+        contact_scope.append(InteractionAnalytics.tenant_id == tenant_id)
+        totals_scope.append(InteractionAnalyticsTotals.tenant_id == tenant_id)
+
+    recent = select(func.count(ContactInteraction.id)).where(
+        and_(
+            ContactInteraction.contact_id == InteractionAnalytics.contact_id,
+            ContactInteraction.interaction_date >= since
+        )
+    ).scalar_subquery()
+    result = db.execute(
+        update(InteractionAnalytics)
+        .where(*contact_scope)
+        .values(interactions_last_30_days=recent)
+        .execution_options(synchronize_session=False)
+    )
+
+    tenant_recent = select(
+        func.coalesce(func.sum(InteractionAnalytics.interactions_last_30_days), 0)
+    ).where(
+        InteractionAnalytics.tenant_id == InteractionAnalyticsTotals.tenant_id
+    ).scalar_subquery()
+    db.execute(
+        update(InteractionAnalyticsTotals)
+        .where(*totals_scope)
+        .values(interactions_last_30_days=tenant_recent)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
+
+
+def _count(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def rebuild(db: Session, *, tenant_id: Optional[int] = None) -> int:
+    """
+    Recompute interaction analytics and tenant totals from the interactions table,
+    for one tenant or everything. Commits and returns the number of contact rows written.
+    """
+    contact_scope = []
+    totals_scope = []
+    interaction_scope = []
+    if tenant_id is not None:
+        contact_scope.append(InteractionAnalytics.tenant_id == tenant_id)
+        totals_scope.append(InteractionAnalyticsTotals.tenant_id == tenant_id)
+        interaction_scope.append(Contact.tenant_id == tenant_id)
+
+    db.execute(delete(InteractionAnalytics).where(*contact_scope))
+    db.execute(delete(InteractionAnalyticsTotals).where(*totals_scope))
+
+    interaction = ContactInteraction
+    per_contact = select(
+        interaction.contact_id,
+        Contact.tenant_id,
+        func.count(interaction.id),
+        *[_count(interaction.interaction_type == type_) for type_ in TYPE_COLUMNS],
+        func.coalesce(func.sum(interaction.interaction_quality), 0),
+        func.count(interaction.interaction_quality),
+        func.coalesce(func.sum(interaction.duration_minutes), 0),
+        func.count(interaction.duration_minutes),
+        func.round(func.avg(interaction.interaction_quality), 2),
+        func.round(func.avg(interaction.duration_minutes), 2),
+        func.max(interaction.interaction_date),
+        _count(interaction.interaction_date >= recent_since()),
+        *[_count(interaction.initiated_by == initiator) for initiator in INITIATOR_COLUMNS]
+    ).join(
+        Contact, Contact.id == interaction.contact_id
+    ).where(
+        *interaction_scope
+    ).group_by(interaction.contact_id, Contact.tenant_id)
+    db.execute(
+        insert(InteractionAnalytics).from_select(
+            ['contact_id', 'tenant_id', 'total_interactions', *TYPE_COLUMNS.values(),
+             *AVERAGE_SOURCE_COLUMNS, 'avg_interaction_quality', 'avg_interaction_duration',
+             'last_interaction_date', 'interactions_last_30_days', *INITIATOR_COLUMNS.values()],
+            per_contact
+        )
+    )
+
+    row = InteractionAnalytics
+    per_tenant = select(
+        row.tenant_id,
+        *[func.sum(getattr(row, column)) for column in COUNTER_COLUMNS],
+        func.count(row.contact_id),
+        func.coalesce(func.sum(row.avg_interaction_quality), 0),
+        func.coalesce(func.sum(row.avg_interaction_duration), 0),
+        _count(row.avg_interaction_quality >= HIGH_QUALITY)
+    ).where(
+        *contact_scope
+    ).group_by(row.tenant_id)
+    db.execute(insert(InteractionAnalyticsTotals).from_select(['tenant_id', *TOTALS_COLUMNS], per_tenant))
+    db.commit()
+    return db.query(func.count(InteractionAnalytics.contact_id)).filter(*contact_scope).scalar()
+
+
+def get_totals(db: Session, *, tenant_id: int) -> Dict[str, Any]:
+    """A tenant's interaction totals, zero when it has no interactions."""
+    row = db.query(InteractionAnalyticsTotals).filter(
+        InteractionAnalyticsTotals.tenant_id == tenant_id
+    ).populate_existing().first()
+    if row is None:
+        return {column: 0 for column in TOTALS_COLUMNS}
+    return {column: getattr(row, column) for column in TOTALS_COLUMNS}
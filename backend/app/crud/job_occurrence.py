@@ -0,0 +1,54 @@
+from typing import Optional
+from datetime import date
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+
+from app.models.job_occurrence import JobOccurrence
+
+PERSONAL_REMINDER = "personal_reminder"
+RECURRING_TRANSACTION = "recurring_transaction"
+
+
+def claim(
+    db: Session,
+    *,
+    job_type: str,
+    source_id: int,
+    occurrence_date: date,
+    tenant_id: int
+) -> Optional[JobOccurrence]:
+    """
+    Claim an occurrence of a scheduled job before doing its work.
+
+    The claim is flushed inside a savepoint and becomes durable together with the
+    caller's next commit. Returns None if the occurrence was already claimed, in
+    which case the caller must skip the work.
+    """
+    occurrence = JobOccurrence(
+        job_type=job_type,
+        source_id=source_id,
+        occurrence_date=occurrence_date,
+        tenant_id=tenant_id
+    )
+    try:
+        with db.begin_nested():
+            db.add(occurrence)
+            db.flush()
+    except IntegrityError:
+        return None
+    return occurrence
+
+
+def get_occurrence(
+    db: Session,
+    *,
+    job_type: str,
+    source_id: int,
+    occurrence_date: date
+) -> Optional[JobOccurrence]:
+    """Get a claimed occurrence by its idempotency key"""
+    return db.query(JobOccurrence).filter(
+        JobOccurrence.job_type == job_type,
+        JobOccurrence.source_id == source_id,
+        JobOccurrence.occurrence_date == occurrence_date
+    ).first()
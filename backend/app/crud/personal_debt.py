@@ -1,8 +1,8 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import date
 from decimal import Decimal
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, desc
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import and_, or_, case, func, desc, select
 
 from app.models.personal_debt import PersonalDebt, DebtPayment, DebtStatus, PaymentStatus
 from app.schemas.personal_debt import PersonalDebtCreate, PersonalDebtUpdate, DebtPaymentCreate, DebtPaymentUpdate
@@ -94,52 +94,136 @@ def get_debts_where_user_is_debtor(
     return query.all()
 
 
-def get_overdue_debts(
+def payments_subquery(*, tenant_id: int):
+    """Total paid per debt in a tenant, from one grouped pass over debt_payments."""
+    return select(
+        DebtPayment.debt_id,
+        func.sum(DebtPayment.amount).label('total_paid')
+    ).join(
+        PersonalDebt, PersonalDebt.id == DebtPayment.debt_id
+    ).where(
+        PersonalDebt.tenant_id == tenant_id
+    ).group_by(DebtPayment.debt_id).subquery()
+
+
+def _balance_columns(payments):
+    """Total paid and outstanding balance (never negative) for debts joined to payments_subquery."""
+    total_paid = func.coalesce(payments.c.total_paid, 0)
+    remaining = case((PersonalDebt.amount > total_paid, PersonalDebt.amount - total_paid), else_=0)
+    return total_paid, remaining
+
+
+def _overdue_condition(as_of_date: date):
+    # Column order matches ix_personal_debts_tenant_status_due
+    return and_(
+        PersonalDebt.status == DebtStatus.ACTIVE,
+        PersonalDebt.due_date < as_of_date,
+        PersonalDebt.payment_status != PaymentStatus.PAID
+    )
+
+
+def get_overdue_debts_with_balances(
     db: Session,
     user_id: int,
     tenant_id: int,
     as_of_date: Optional[date] = None
-) -> List[PersonalDebt]:
-    """Get overdue debts for a user."""
+) -> List[Tuple[PersonalDebt, Decimal, Decimal]]:
+    """
+    Overdue debts for a user, each with its total paid and outstanding balance, in
+    one query: the debts are outer-joined to the grouped payment totals.
+    """
     if as_of_date is None:
         as_of_date = date.today()
-        
-    return db.query(PersonalDebt).filter(
+    
+    payments = payments_subquery(tenant_id=tenant_id)
+    total_paid, remaining = _balance_columns(payments)
+    rows = db.query(PersonalDebt, total_paid, remaining).outerjoin(
+        payments, payments.c.debt_id == PersonalDebt.id
+    ).filter(
         and_(
-            PersonalDebt.user_id == user_id,
             PersonalDebt.tenant_id == tenant_id,
-            PersonalDebt.due_date < as_of_date,
-            PersonalDebt.status == DebtStatus.ACTIVE,
-            PersonalDebt.payment_status != PaymentStatus.PAID
+            _overdue_condition(as_of_date),
+            PersonalDebt.user_id == user_id
         )
-    ).all()
+    ).order_by(PersonalDebt.due_date, PersonalDebt.id).all()
+    
+    return [(debt, Decimal(str(paid)), Decimal(str(balance))) for debt, paid, balance in rows]
+
+
+def get_overdue_debts(
+    db: Session,
+    user_id: int,
+    tenant_id: int,
+    as_of_date: Optional[date] = None
+) -> List[PersonalDebt]:
+    """Get overdue debts for a user."""
+    return [debt for debt, _, _ in get_overdue_debts_with_balances(db, user_id, tenant_id, as_of_date)]
 
 
 def get_debt_summary(
     db: Session,
     user_id: int,
-    tenant_id: int
+    tenant_id: int,
+    as_of_date: Optional[date] = None
 ) -> dict:
-    """Get summary statistics for user's debts."""
-    # Get debts where user is creditor (money owed TO user)
-    creditor_debts = get_debts_where_user_is_creditor(db, user_id, tenant_id, DebtStatus.ACTIVE)
+    """
+    Get summary statistics for user's debts in one query. Amounts are outstanding
+    balances, i.e. the debt amount less payments made so far.
+    """
+    if as_of_date is None:
+        as_of_date = date.today()
+    
+    creditor = aliased(Contact)
+    debtor = aliased(Contact)
+    payments = payments_subquery(tenant_id=tenant_id)
+    _, remaining = _balance_columns(payments)
+    
+    is_active = PersonalDebt.status == DebtStatus.ACTIVE
+    unpaid = PersonalDebt.payment_status != PaymentStatus.PAID
+    # Money owed TO the user, and money the user OWES
+    owed_to_me = and_(is_active, creditor.created_by_user_id == user_id)
+    i_owe = and_(is_active, debtor.created_by_user_id == user_id)
+    overdue = and_(PersonalDebt.user_id == user_id, _overdue_condition(as_of_date))
+    
+    def count_where(condition):
+        return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
     
-    # Get debts where user is debtor (money user OWES)
-    debtor_debts = get_debts_where_user_is_debtor(db, user_id, tenant_id, DebtStatus.ACTIVE)
+    def balance_where(condition):
+        return func.coalesce(func.sum(case((condition, remaining), else_=0)), 0)
     
-    # Calculate totals
-    total_owed_to_me = sum(debt.amount for debt in creditor_debts if debt.payment_status != PaymentStatus.PAID)
-    total_i_owe = sum(debt.amount for debt in debtor_debts if debt.payment_status != PaymentStatus.PAID)
+    row = db.query(
+        count_where(owed_to_me),
+        count_where(i_owe),
+        balance_where(and_(owed_to_me, unpaid)),
+        balance_where(and_(i_owe, unpaid)),
+        count_where(overdue)
+    ).select_from(PersonalDebt).join(
+        creditor, PersonalDebt.creditor_contact_id == creditor.id
+    ).join(
+        debtor, PersonalDebt.debtor_contact_id == debtor.id
+    ).outerjoin(
+        payments, payments.c.debt_id == PersonalDebt.id
+    ).filter(
+        and_(
+            PersonalDebt.tenant_id == tenant_id,
+            or_(
+                creditor.created_by_user_id == user_id,
+                debtor.created_by_user_id == user_id,
+                PersonalDebt.user_id == user_id
+            )
+        )
+    ).one()
     
-    # Count overdue debts
-    overdue_count = len(get_overdue_debts(db, user_id, tenant_id))
+    creditor_count, debtor_count, total_owed_to_me, total_i_owe, overdue_count = row
+    # A debt between two of the user's contacts counts on both sides, as before
+    total_debts = int(creditor_count) + int(debtor_count)
     
     return {
-        "total_debts": len(creditor_debts) + len(debtor_debts),
-        "total_amount_owed_to_me": total_owed_to_me,
-        "total_amount_i_owe": total_i_owe,
-        "active_debts": len([d for d in creditor_debts + debtor_debts if d.status == DebtStatus.ACTIVE]),
-        "overdue_debts": overdue_count
+        "total_debts": total_debts,
+        "total_amount_owed_to_me": Decimal(str(total_owed_to_me)),
+        "total_amount_i_owe": Decimal(str(total_i_owe)),
+        "active_debts": total_debts,
+        "overdue_debts": int(overdue_count)
     }
 
 
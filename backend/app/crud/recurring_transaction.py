@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import date, timedelta
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, func
@@ -98,6 +98,22 @@ def get_all_due(
         )
     ).all()
 
+def get_users_with_due(
+    db: Session,
+    *,
+    reminder_date: date
+) -> List[Tuple[int, int]]:
+    """Get distinct (user_id, tenant_id) pairs that have due recurring transactions"""
+    return db.query(
+        RecurringTransaction.user_id,
+        RecurringTransaction.tenant_id
+    ).filter(
+        and_(
+            RecurringTransaction.is_active == True,
+            RecurringTransaction.next_due_date <= reminder_date
+        )
+    ).distinct().all()
+
 def increment_occurrences(
     db: Session,
     *,
@@ -1,10 +1,19 @@
 from typing import List, Optional, Dict, Any
 from datetime import date, datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, desc, asc
+from sqlalchemy import and_, or_, func, desc, asc, case, select
 
+from app.crud import account_ledger
+from app.crud import transaction_rollup
 from app.models.transaction import Transaction
 from app.schemas.transaction import TransactionCreate, TransactionUpdate
+from app.services.budget_spending_cache import BUDGET_FIELDS, budget_spending_cache
+
+# Fields that change a transaction's effect on its account balance
+BALANCE_FIELDS = ('account_id', 'type', 'amount', 'transaction_date')
+
+def _budget_values(transaction: Transaction) -> Dict[str, Any]:
+    return {field: getattr(transaction, field) for field in BUDGET_FIELDS}
 
 def get_transaction(db: Session, transaction_id: int, tenant_id: int) -> Optional[Transaction]:
     """Get a single transaction by ID"""
@@ -82,35 +91,9 @@ def get_monthly_summary(
     month: int
 ) -> Dict[str, Any]:
     """Get monthly transaction summary for a user"""
-    start_date = date(year, month, 1)
-    if month == 12:
-        end_date = date(year + 1, 1, 1)
-    else:
-        end_date = date(year, month + 1, 1)
-    
-    query = db.query(Transaction).filter(
-        and_(
-            Transaction.user_id == user_id,
-            Transaction.tenant_id == tenant_id,
-            Transaction.transaction_date >= start_date,
-            Transaction.transaction_date < end_date
-        )
-    )
-    
-    total_credits = query.filter(Transaction.type == 'credit').with_entities(
-        func.sum(Transaction.amount)
-    ).scalar() or 0
-    
-    total_debits = query.filter(Transaction.type == 'debit').with_entities(
-        func.sum(Transaction.amount)
-    ).scalar() or 0
-    
-    return {
-        'total_credits': total_credits,
-        'total_debits': total_debits,
-        'net_amount': total_credits - total_debits,
-        'transaction_count': query.count()
-    }
+    return transaction_rollup.get_monthly_totals(
+        db, user_id=user_id, tenant_id=tenant_id, months=[(year, month)]
+    )[(year, month)]
 
 def get_category_breakdown(
     db: Session,
@@ -139,6 +122,64 @@ def get_category_breakdown(
     
     return query.group_by(Transaction.category_id).all()
 
+def _account_summary_select(*conditions):
+    """Per-account transaction totals in a single GROUP BY account_id pass."""
+    return select(
+        Transaction.account_id.label('account_id'),
+        func.sum(case((Transaction.type == 'credit', Transaction.amount), else_=0)).label('total_credits'),
+        func.sum(case((Transaction.type == 'debit', Transaction.amount), else_=0)).label('total_debits'),
+        func.count(Transaction.id).label('transaction_count'),
+        func.max(Transaction.transaction_date).label('last_transaction_date')
+    ).where(
+        and_(Transaction.account_id.isnot(None), *conditions)
+    ).group_by(Transaction.account_id)
+
+def account_summaries_subquery(*, user_id: int, tenant_id: int):
+    """
+    A user's per-account transaction summaries as a subquery, for joining onto
+    financial_accounts. Columns: account_id, total_credits, total_debits,
+    transaction_count and last_transaction_date.
+    """
+    return _account_summary_select(
+        Transaction.user_id == user_id,
+        Transaction.tenant_id == tenant_id
+    ).subquery()
+
+def summary_from_row(total_credits, total_debits, transaction_count, last_transaction_date) -> Dict[str, Any]:
+    """Build a summary dict from summary columns, which are NULL for accounts without transactions."""
+    return {
+        'transaction_count': transaction_count or 0,
+        'total_credits': total_credits or 0,
+        'total_debits': total_debits or 0,
+        'last_transaction_date': last_transaction_date
+    }
+
+def get_account_summaries(
+    db: Session,
+    *,
+    user_id: int,
+    account_ids: List[int]
+) -> Dict[int, Dict[str, Any]]:
+    """Get transaction summaries for several accounts in one query"""
+    if not account_ids:
+        return {}
+    rows = db.execute(
+        _account_summary_select(
+            Transaction.user_id == user_id,
+            Transaction.account_id.in_(account_ids)
+        )
+    ).all()
+    found = {
+        row.account_id: summary_from_row(
+            row.total_credits, row.total_debits, row.transaction_count, row.last_transaction_date
+        )
+        for row in rows
+    }
+    return {
+        account_id: found.get(account_id) or summary_from_row(None, None, None, None)
+        for account_id in account_ids
+    }
+
 def get_account_summary(
     db: Session,
     *,
@@ -146,32 +187,7 @@ def get_account_summary(
     user_id: int
 ) -> Dict[str, Any]:
     """Get transaction summary for a specific account"""
-    query = db.query(Transaction).filter(
-        and_(
-            Transaction.account_id == account_id,
-            Transaction.user_id == user_id
-        )
-    )
-    
-    total_credits = query.filter(Transaction.type == 'credit').with_entities(
-        func.sum(Transaction.amount)
-    ).scalar() or 0
-    
-    total_debits = query.filter(Transaction.type == 'debit').with_entities(
-        func.sum(Transaction.amount)
-    ).scalar() or 0
-    
-    transaction_count = query.count()
-    
-    last_transaction = query.order_by(desc(Transaction.transaction_date)).first()
-    last_transaction_date = last_transaction.transaction_date if last_transaction else None
-    
-    return {
-        'transaction_count': transaction_count,
-        'total_credits': total_credits,
-        'total_debits': total_debits,
-        'last_transaction_date': last_transaction_date
-    }
+    return get_account_summaries(db, user_id=user_id, account_ids=[account_id])[account_id]
 
 def count_by_account(db: Session, account_id: int) -> int:
     """Count transactions for a specific account"""
@@ -184,27 +200,48 @@ def create_transaction(
     user_id: int,
     tenant_id: int
 ) -> Transaction:
-    """Create a new transaction"""
+    """Create a new transaction and post it to its account's ledger"""
     db_obj = Transaction(
         **obj_in.dict(),
         user_id=user_id,
         tenant_id=tenant_id
     )
     db.add(db_obj)
+    db.flush()
+    account_ledger.post_transaction(db, db_obj)
+    transaction_rollup.apply_transaction(db, new=transaction_rollup.rollup_values(db_obj))
     db.commit()
     db.refresh(db_obj)
+    budget_spending_cache.apply_transaction(tenant_id, user_id, new=_budget_values(db_obj))
     return db_obj
 
-def create(
+def add_transaction(
     db: Session,
     *,
     obj_in: TransactionCreate
 ) -> Transaction:
-    """Create a new transaction (alternative method)"""
+    """
+    Add a transaction with its ledger and rollup entries, without committing, so
+    callers can commit it together with their own writes. Once committed, the
+    caller must invalidate the user's budget_spending_cache entry.
+    """
     db_obj = Transaction(**obj_in.dict())
     db.add(db_obj)
+    db.flush()
+    account_ledger.post_transaction(db, db_obj)
+    transaction_rollup.apply_transaction(db, new=transaction_rollup.rollup_values(db_obj))
+    return db_obj
+
+def create(
+    db: Session,
+    *,
+    obj_in: TransactionCreate
+) -> Transaction:
+    """Create a new transaction (alternative method)"""
+    db_obj = add_transaction(db, obj_in=obj_in)
     db.commit() 
     db.refresh(db_obj)
+    budget_spending_cache.apply_transaction(db_obj.tenant_id, db_obj.user_id, new=_budget_values(db_obj))
     return db_obj
 
 def get_by_recurring_and_date(
@@ -227,14 +264,34 @@ def update_transaction(
     db_obj: Transaction,
     obj_in: TransactionUpdate
 ) -> Transaction:
-    """Update an existing transaction"""
+    """Update an existing transaction, reversing and re-posting its ledger entry if needed"""
+    old_values = {field: getattr(db_obj, field) for field in BALANCE_FIELDS}
+    old_budget_values = _budget_values(db_obj)
+    old_rollup_values = transaction_rollup.rollup_values(db_obj)
     update_data = obj_in.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_obj, field, value)
     
     db.add(db_obj)
+    if any(getattr(db_obj, field) != old_values[field] for field in BALANCE_FIELDS):
+        if old_values['account_id']:
+            account_ledger.post_entry(
+                db,
+                account_id=old_values['account_id'],
+                tenant_id=db_obj.tenant_id,
+                amount=-account_ledger.transaction_effect(old_values['type'], old_values['amount']),
+                entry_date=old_values['transaction_date'],
+                entry_type=account_ledger.REVERSAL,
+                transaction_id=db_obj.id,
+                user_id=db_obj.user_id
+            )
+        account_ledger.post_transaction(db, db_obj)
+    transaction_rollup.apply_transaction(db, old=old_rollup_values, new=transaction_rollup.rollup_values(db_obj))
     db.commit()
     db.refresh(db_obj)
+    budget_spending_cache.apply_transaction(
+        db_obj.tenant_id, db_obj.user_id, old=old_budget_values, new=_budget_values(db_obj)
+    )
     return db_obj
 
 def delete_transaction(
@@ -254,7 +311,11 @@ def delete_transaction(
     ).first()
     
     if db_obj:
+        account_ledger.post_transaction(db, db_obj, reverse=True)
+        old_budget_values = _budget_values(db_obj)
+        transaction_rollup.apply_transaction(db, old=transaction_rollup.rollup_values(db_obj))
         db.delete(db_obj)
         db.commit()
+        budget_spending_cache.apply_transaction(tenant_id, user_id, old=old_budget_values)
         return db_obj
     return None
\ No newline at end of file
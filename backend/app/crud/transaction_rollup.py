@@ -0,0 +1,238 @@
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+from datetime import date
+from decimal import Decimal
+from sqlalchemy.orm import Session
+from sqlalchemy import Integer, and_, case, cast, delete, func, insert, select, tuple_, update
+
+from app.models.monthly_transaction_rollup import MonthlyTransactionRollup
+from app.models.transaction import Transaction
+
+# Transaction fields that decide which rollup row a transaction counts towards, and by how much
+ROLLUP_FIELDS = ('tenant_id', 'user_id', 'account_id', 'category_id', 'type', 'amount', 'transaction_date')
+
+KEY_COLUMNS = ['tenant_id', 'user_id', 'account_id', 'category_id', 'year', 'month']
+
+# (tenant_id, user_id, account_id, category_id, year, month)
+RollupKey = Tuple[int, int, int, int, int, int]
+
+
+def rollup_values(transaction: Transaction) -> Dict[str, Any]:
+    """Snapshot of the fields a transaction contributes to its rollup row."""
+    return {field: getattr(transaction, field) for field in ROLLUP_FIELDS}
+
+
+def accumulate(deltas: Dict[RollupKey, List], values: Mapping, sign: int = 1):
+    """Add (or with sign=-1, remove) a transaction's contribution to a dict of rollup deltas."""
+    transaction_date = values['transaction_date']
+    key = (
+        values['tenant_id'],
+        values['user_id'],
+        values['account_id'] or 0,
+        values['category_id'] or 0,
+        transaction_date.year,
+        transaction_date.month
+    )
+    amount = Decimal(str(values['amount'])) * sign
+    delta = deltas.setdefault(key, [Decimal('0'), Decimal('0'), 0])
+    if values['type'] == 'credit':
+        delta[0] += amount
+    elif values['type'] == 'debit':
+        delta[1] += amount
+    delta[2] += sign
+
+
+def apply_transaction(db: Session, *, old: Optional[Mapping] = None, new: Optional[Mapping] = None):
+    """
+    Move a transaction write into the rollups: `old` holds the ROLLUP_FIELDS values
+    before the write (None on create), `new` the values after it (None on delete).
+    Does not commit.
+    """
+    if old is not None and new is not None and dict(old) == dict(new):
+        return
+    deltas: Dict[RollupKey, List] = {}
+    if old is not None:
+        accumulate(deltas, old, sign=-1)
+    if new is not None:
+        accumulate(deltas, new)
+    apply_deltas(db, deltas)
+
+
+def apply_deltas(db: Session, deltas: Dict[RollupKey, List]):
+    """Add summed deltas to their rollup rows with one upsert statement. Does not commit."""
+    rows = [
+        dict(zip(KEY_COLUMNS, key), total_credits=credits, total_debits=debits, transaction_count=count)
+        for key, (credits, debits, count) in deltas.items()
+        if credits or debits or count
+    ]
+    if not rows:
+        return
+
+    dialect = db.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        for row in rows:
+            _update_then_insert(db, row)
+        return
+
+    stmt = dialect_insert(MonthlyTransactionRollup)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=KEY_COLUMNS,
+        set_={
+            'total_credits': MonthlyTransactionRollup.total_credits + stmt.excluded.total_credits,
+            'total_debits': MonthlyTransactionRollup.total_debits + stmt.excluded.total_debits,
+            'transaction_count': MonthlyTransactionRollup.transaction_count + stmt.excluded.transaction_count,
+            'updated_at': func.now()
+        }
+    )
+    db.execute(stmt, rows)
+
+
+def _update_then_insert(db: Session, row: Dict[str, Any]):
+    """Portable upsert for databases without ON CONFLICT."""
+    result = db.execute(
+        update(MonthlyTransactionRollup)
+        .where(and_(*[getattr(MonthlyTransactionRollup, column) == row[column] for column in KEY_COLUMNS]))
+        .values(
+            total_credits=MonthlyTransactionRollup.total_credits + row['total_credits'],
+            total_debits=MonthlyTransactionRollup.total_debits + row['total_debits'],
+            transaction_count=MonthlyTransactionRollup.transaction_count + row['transaction_count']
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        db.execute(insert(MonthlyTransactionRollup), [row])
+
+
+def rebuild(db: Session, *, tenant_id: Optional[int] = None, user_id: Optional[int] = None) -> int:
+    """
+    Recompute rollups from the transactions table, for one user, one tenant or
+    everything. Commits and returns the number of rollup rows written.
+    """
+    rollup_scope = []
+    transaction_scope = []
+    if tenant_id is not None:
+        rollup_scope.append(MonthlyTransactionRollup.tenant_id == tenant_id)
+        transaction_scope.append(Transaction.tenant_id == tenant_id)
+    if user_id is not None:
+        rollup_scope.append(MonthlyTransactionRollup.user_id == user_id)
+        transaction_scope.append(Transaction.user_id == user_id)
+
+    db.execute(delete(MonthlyTransactionRollup).where(*rollup_scope))
+
+    account_id = func.coalesce(Transaction.account_id, 0)
+    category_id = func.coalesce(Transaction.category_id, 0)
+    year = cast(func.extract('year', Transaction.transaction_date), Integer)
+    month = cast(func.extract('month', Transaction.transaction_date), Integer)
+    grouped = select(
+        Transaction.tenant_id,
+        Transaction.user_id,
+        account_id,
+        category_id,
+        year,
+        month,
+        func.coalesce(func.sum(case((Transaction.type == 'credit', Transaction.amount), else_=0)), 0),
+        func.coalesce(func.sum(case((Transaction.type == 'debit', Transaction.amount), else_=0)), 0),
+        func.count(Transaction.id)
+    ).where(
+        *transaction_scope
+    ).group_by(
+        Transaction.tenant_id, Transaction.user_id, account_id, category_id, year, month
+    )
+    db.execute(
+        insert(MonthlyTransactionRollup).from_select(
+            KEY_COLUMNS + ['total_credits', 'total_debits', 'transaction_count'], grouped
+        )
+    )
+    db.commit()
+    return db.query(func.count(MonthlyTransactionRollup.id)).filter(*rollup_scope).scalar()
+
+
+def month_range(end: date, months: int) -> List[Tuple[int, int]]:
+    """The `months` consecutive (year, month) pairs ending with end's month, oldest first."""
+    index = end.year * 12 + end.month - 1
+    return [(i // 12, i % 12 + 1) for i in range(index - months + 1, index + 1)]
+
+
+def _summary(credits, debits, count) -> Dict[str, Any]:
+    credits = Decimal(str(credits or 0))
+    debits = Decimal(str(debits or 0))
+    return {
+        'total_credits': credits,
+        'total_debits': debits,
+        'net_amount': credits - debits,
+        'transaction_count': int(count or 0)
+    }
+
+
+def _range_rows(db: Session, *, user_id: int, tenant_id: int, months: List[Tuple[int, int]], by_category: bool):
+    """Rollups for a user between the first and last of months, summed per month (and category)."""
+    columns = [MonthlyTransactionRollup.year, MonthlyTransactionRollup.month]
+    if by_category:
+        columns.append(MonthlyTransactionRollup.category_id)
+    period = tuple_(MonthlyTransactionRollup.year, MonthlyTransactionRollup.month)
+    return db.query(
+        *columns,
+        func.sum(MonthlyTransactionRollup.total_credits),
+        func.sum(MonthlyTransactionRollup.total_debits),
+        func.sum(MonthlyTransactionRollup.transaction_count)
+    ).filter(
+        and_(
+            MonthlyTransactionRollup.tenant_id == tenant_id,
+            MonthlyTransactionRollup.user_id == user_id,
+            period >= months[0],
+            period <= months[-1]
+        )
+    ).group_by(*columns).having(
+        # Rows emptied by deletes and moves are kept; skip them
+        func.sum(MonthlyTransactionRollup.transaction_count) != 0
+    ).all()
+
+
+def get_monthly_totals(
+    db: Session,
+    *,
+    user_id: int,
+    tenant_id: int,
+    months: List[Tuple[int, int]]
+) -> Dict[Tuple[int, int], Dict[str, Any]]:
+    """
+    Credits, debits, net and count per (year, month) for a user, summed over accounts
+    and categories with one range query. months must be sorted; those without
+    transactions get zero totals.
+    """
+    if not months:
+        return {}
+
+    found = {
+        (year, month): _summary(credits, debits, count)
+        for year, month, credits, debits, count in _range_rows(
+            db, user_id=user_id, tenant_id=tenant_id, months=months, by_category=False
+        )
+    }
+    return {key: found.get(key) or _summary(0, 0, 0) for key in months}
+
+
+def get_monthly_category_totals(
+    db: Session,
+    *,
+    user_id: int,
+    tenant_id: int,
+    months: List[Tuple[int, int]]
+) -> Dict[Tuple[int, int], Dict[Optional[int], Dict[str, Any]]]:
+    """
+    Like get_monthly_totals, but split by category within each month (None for
+    uncategorized transactions). Months without transactions map to an empty dict.
+    """
+    if not months:
+        return {}
+
+    totals: Dict[Tuple[int, int], Dict[Optional[int], Dict[str, Any]]] = {key: {} for key in months}
+    for year, month, category_id, credits, debits, count in _range_rows(
+        db, user_id=user_id, tenant_id=tenant_id, months=months, by_category=True
+    ):
+        if (year, month) in totals:
+            totals[(year, month)][category_id or None] = _summary(credits, debits, count)
+    return totals
@@ -10,6 +10,7 @@ from app.models.analytics import (
     DailyNetworkMetric, 
     ContactAnalyticsSummary, 
     InteractionAnalytics, 
+    InteractionAnalyticsTotals,
     OrganizationNetworkAnalytics, 
     SocialGroupAnalytics
 )
@@ -21,3 +22,7 @@ from app.models.transaction_subcategory import TransactionSubcategory
 from app.models.recurring_transaction import RecurringTransaction
 from app.models.transaction import Transaction
 from app.models.budget import Budget
+from app.models.job_occurrence import JobOccurrence
+from app.models.account_ledger import AccountLedgerEntry, AccountBalanceSnapshot
+from app.models.monthly_transaction_rollup import MonthlyTransactionRollup
+from app.models.exchange_rate import ExchangeRate
@@ -3,10 +3,12 @@ from fastapi.middleware.cors import CORSMiddleware
 import asyncio
 
 from app.core.enhanced_settings import get_settings
+from app.core.config import settings as core_settings
 from app.core.redis import redis_client
 from app.db.session import SessionLocal
 from app.api.v1.api import api_router
 from app.services.task_scheduler import task_scheduler_service
+from app.services.leader_election import scheduler_leader_election
 from app.api.middleware.rate_limit import rate_limit_middleware
 from app.api.middleware.request_validation import request_validation_middleware
 
@@ -77,6 +79,16 @@ async def startup_event():
     except Exception as e:
         print(f"Warning: Could not connect to Redis: {e}")
     
+    # The task scheduler and hot reload watcher must run once per cluster, not once
+    # per worker: only the elected leader starts them.
+    if core_settings.SCHEDULER_LEADER_ELECTION_ENABLED:
+        scheduler_leader_election.start()
+    else:
+        _start_leader_services()
+
+
+def _start_leader_services():
+    """Start services that must only run on the elected leader worker"""
     try:
         # Start the task scheduler
         task_scheduler_service.start()
@@ -89,21 +101,12 @@ async def startup_event():
         hot_reload_service.start()
 
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Cleanup on shutdown"""
-    print("🛑 Shutting down application")
-    
-    try:
-        # Disconnect Redis
-        redis_client.disconnect()
-        print("Redis disconnected")
-    except Exception as e:
-        print(f"Warning: Could not disconnect Redis: {e}")
-        
+def _stop_leader_services():
+    """Stop services started by _start_leader_services"""
     try:
         # Stop the task scheduler
-        task_scheduler_service.stop()
+        if task_scheduler_service.is_running:
+            task_scheduler_service.stop()
     except Exception as e:
         print(f"Warning: Could not stop task scheduler: {e}")
     
@@ -116,6 +119,29 @@ async def shutdown_event():
         print(f"Warning: Could not stop hot reload service: {e}")
 
 
+scheduler_leader_election.register(_start_leader_services, _stop_leader_services)
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Cleanup on shutdown"""
+    print("🛑 Shutting down application")
+    
+    # Step down first so the lease is released while Redis is still connected
+    # and another worker can take over immediately.
+    if core_settings.SCHEDULER_LEADER_ELECTION_ENABLED:
+        await scheduler_leader_election.stop()
+    else:
+        _stop_leader_services()
+    
+    try:
+        # Disconnect Redis
+        redis_client.disconnect()
+        print("Redis disconnected")
+    except Exception as e:
+        print(f"Warning: Could not disconnect Redis: {e}")
+
+
 @app.get("/")
 def read_root():
     return {
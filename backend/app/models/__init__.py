@@ -10,6 +10,7 @@ from .analytics import (
     DailyNetworkMetric, 
     ContactAnalyticsSummary, 
     InteractionAnalytics, 
+    InteractionAnalyticsTotals,
     OrganizationNetworkAnalytics, 
     SocialGroupAnalytics
 )
@@ -25,6 +26,10 @@ from .journal import JournalEntry, JournalTag, JournalAttachment
 from .personal_debt import PersonalDebt, DebtPayment
 from .personal_reminder import PersonalReminder
 from .gift import Gift, GiftIdea
+from .job_occurrence import JobOccurrence
+from .account_ledger import AccountLedgerEntry, AccountBalanceSnapshot
+from .monthly_transaction_rollup import MonthlyTransactionRollup
+from .exchange_rate import ExchangeRate
 
 __all__ = [
     "Tenant",
@@ -43,6 +48,7 @@ __all__ = [
     "DailyNetworkMetric",
     "ContactAnalyticsSummary",
     "InteractionAnalytics",
+    "InteractionAnalyticsTotals",
     "OrganizationNetworkAnalytics",
     "SocialGroupAnalytics",
     "Event",
@@ -67,5 +73,10 @@ __all__ = [
     "DebtPayment",
     "PersonalReminder",
     "Gift",
-    "GiftIdea"
+    "GiftIdea",
+    "JobOccurrence",
+    "AccountLedgerEntry",
+    "AccountBalanceSnapshot",
+    "MonthlyTransactionRollup",
+    "ExchangeRate"
 ]
@@ -0,0 +1,50 @@
+from sqlalchemy import Column, Integer, String, Numeric, DateTime, Date, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.sql import func
+
+from app.db.base_class import Base
+
+
+class AccountLedgerEntry(Base):
+    """
+    Append-only record of every change to a financial account's balance.
+
+    ``amount`` is the signed effect on the balance (credits positive, debits negative).
+    Changing or deleting a transaction appends a reversing entry instead of editing
+    history, so ``FinancialAccount.current_balance`` always equals the sum of the
+    account's entries.
+    """
+    __tablename__ = "account_ledger_entries"
+
+    id = Column(Integer, primary_key=True, index=True)
+    tenant_id = Column(Integer, ForeignKey("tenants.id"), nullable=False)
+    account_id = Column(Integer, ForeignKey("financial_accounts.id"), nullable=False)
+    transaction_id = Column(Integer, nullable=True)  # kept after the transaction is deleted
+    entry_type = Column(String(20), nullable=False)  # opening, transaction, reversal, adjustment
+    amount = Column(Numeric(15, 2), nullable=False)
+    entry_date = Column(Date, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index('ix_account_ledger_entries_account_date', 'account_id', 'entry_date'),
+    )
+
+
+class AccountBalanceSnapshot(Base):
+    """
+    Balance of an account at the end of ``snapshot_date`` (a month end).
+
+    Balance as of any date is the latest snapshot on or before it plus the ledger
+    entries dated after the snapshot.
+    """
+    __tablename__ = "account_balance_snapshots"
+
+    id = Column(Integer, primary_key=True, index=True)
+    tenant_id = Column(Integer, ForeignKey("tenants.id"), nullable=False)
+    account_id = Column(Integer, ForeignKey("financial_accounts.id"), nullable=False)
+    snapshot_date = Column(Date, nullable=False)
+    balance = Column(Numeric(15, 2), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint('account_id', 'snapshot_date', name='uq_account_balance_snapshots_account_date'),
+    )
@@ -120,23 +120,56 @@ class ContactAnalyticsSummary(Base):
     # Note: This represents a materialized view, actual view creation happens in migrations
 
 class InteractionAnalytics(Base):
+    """
+    Interaction counters per contact, kept current by crud.interaction_analytics on
+    every interaction write. Averages are stored alongside the totals they derive
+    from so a write only touches this row; interactions_last_30_days is trimmed by
+    the periodic decay task as interactions age out of the window.
+    """
     __tablename__ = "interaction_analytics"
     
-    contact_id = Column(Integer, ForeignKey("contacts.id"), primary_key=True, index=True)
-    tenant_id = Column(Integer, ForeignKey("tenants.id"), index=True)
-    total_interactions = Column(Integer)
-    in_person_meetings = Column(Integer)
-    phone_calls = Column(Integer)
-    emails = Column(Integer)
-    text_messages = Column(Integer)
-    avg_interaction_quality = Column(Numeric(3,2))
+    contact_id = Column(Integer, ForeignKey("contacts.id", ondelete="CASCADE"), primary_key=True, index=True)
+    tenant_id = Column(Integer, ForeignKey("tenants.id"), nullable=False, index=True)
+    total_interactions = Column(Integer, nullable=False, default=0)
+    in_person_meetings = Column(Integer, nullable=False, default=0)
+    phone_calls = Column(Integer, nullable=False, default=0)
+    emails = Column(Integer, nullable=False, default=0)
+    text_messages = Column(Integer, nullable=False, default=0)
+    quality_total = Column(Numeric(12, 1), nullable=False, default=0)
+    quality_count = Column(Integer, nullable=False, default=0)
+    duration_total = Column(Integer, nullable=False, default=0)
+    duration_count = Column(Integer, nullable=False, default=0)
+    avg_interaction_quality = Column(Numeric(4,2))
     avg_interaction_duration = Column(Numeric(8,2))
     last_interaction_date = Column(DateTime(timezone=True))
-    interactions_last_30_days = Column(Integer)
-    interactions_initiated_by_user = Column(Integer)
-    interactions_initiated_by_contact = Column(Integer)
-    
-    # Note: This represents a view, actual view creation happens in migrations
+    interactions_last_30_days = Column(Integer, nullable=False, default=0)
+    interactions_initiated_by_user = Column(Integer, nullable=False, default=0)
+    interactions_initiated_by_contact = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class InteractionAnalyticsTotals(Base):
+    """
+    Tenant-wide sums of the interaction_analytics rows, moved by the same deltas, so
+    tenant-level interaction endpoints read one row. The *_average_total columns
+    sum the per-contact averages; divided by contact_count they give the average
+    contact's quality and duration.
+    """
+    __tablename__ = "interaction_analytics_totals"
+
+    tenant_id = Column(Integer, ForeignKey("tenants.id"), primary_key=True)
+    contact_count = Column(Integer, nullable=False, default=0)
+    total_interactions = Column(Integer, nullable=False, default=0)
+    in_person_meetings = Column(Integer, nullable=False, default=0)
+    phone_calls = Column(Integer, nullable=False, default=0)
+    emails = Column(Integer, nullable=False, default=0)
+    text_messages = Column(Integer, nullable=False, default=0)
+    quality_average_total = Column(Numeric(14,2), nullable=False, default=0)
+    duration_average_total = Column(Numeric(18,2), nullable=False, default=0)
+    high_quality_contacts = Column(Integer, nullable=False, default=0)
+    interactions_last_30_days = Column(Integer, nullable=False, default=0)
+    interactions_initiated_by_user = Column(Integer, nullable=False, default=0)
+    interactions_initiated_by_contact = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
 class OrganizationNetworkAnalytics(Base):
     __tablename__ = "organization_network_analytics"
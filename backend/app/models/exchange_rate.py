@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, Numeric, Date, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+
+from app.db.base_class import Base
+
+
+class ExchangeRate(Base):
+    """
+    One unit of base_currency is worth `rate` units of quote_currency on rate_date.
+
+    Rates are loaded from a file with ``python cli.py fx load-rates``. A conversion on
+    a given day uses the latest rate on or before it; the inverse pair is used when
+    only the opposite direction is known.
+    """
+    __tablename__ = "exchange_rates"
+
+    id = Column(Integer, primary_key=True, index=True)
+    base_currency = Column(String(3), nullable=False)
+    quote_currency = Column(String(3), nullable=False)
+    rate_date = Column(Date, nullable=False)
+    rate = Column(Numeric(20, 10), nullable=False)
+    source = Column(String(100), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # Also serves the latest-rate-on-or-before lookups
+        UniqueConstraint('base_currency', 'quote_currency', 'rate_date', name='uq_exchange_rates_pair_date'),
+    )
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, DateTime, Date, ForeignKey, UniqueConstraint
+from sqlalchemy.sql import func
+
+from app.db.base_class import Base
+
+
+class JobOccurrence(Base):
+    """
+    Idempotency ledger for scheduled background jobs.
+
+    One row per (job_type, source_id, occurrence_date), e.g. a personal reminder firing
+    on a given day or a recurring transaction due on a given date. The unique constraint
+    guarantees that retried or concurrently running workers create the resulting task or
+    transaction at most once.
+    """
+    __tablename__ = "job_occurrences"
+
+    id = Column(Integer, primary_key=True, index=True)
+    tenant_id = Column(Integer, ForeignKey("tenants.id"), nullable=False, index=True)
+    job_type = Column(String(50), nullable=False)  # personal_reminder, recurring_transaction
+    source_id = Column(Integer, nullable=False)  # reminder_id / recurring transaction id
+    occurrence_date = Column(Date, nullable=False)
+    result_id = Column(Integer, nullable=True)  # id of the created task / transaction
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint('job_type', 'source_id', 'occurrence_date', name='uq_job_occurrences_job_source_date'),
+    )
@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, Numeric, DateTime, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.sql import func
+
+from app.db.base_class import Base
+
+
+class MonthlyTransactionRollup(Base):
+    """
+    Transaction totals per (tenant, user, account, category, year, month).
+
+    Maintained incrementally by the transaction CRUD layer and the bulk importer, and
+    rebuildable from the transactions table with ``python cli.py analytics
+    rebuild-rollups``. Transactions without an account or category are rolled up
+    under account_id / category_id 0, so the unique key never contains NULLs.
+    """
+    __tablename__ = "monthly_transaction_rollups"
+
+    id = Column(Integer, primary_key=True, index=True)
+    tenant_id = Column(Integer, ForeignKey("tenants.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    account_id = Column(Integer, nullable=False, default=0)
+    category_id = Column(Integer, nullable=False, default=0)
+    year = Column(Integer, nullable=False)
+    month = Column(Integer, nullable=False)
+    total_credits = Column(Numeric(15, 2), nullable=False, default=0)
+    total_debits = Column(Numeric(15, 2), nullable=False, default=0)
+    transaction_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint(
+            'tenant_id', 'user_id', 'account_id', 'category_id', 'year', 'month',
+            name='uq_monthly_transaction_rollups_key'
+        ),
+        Index('ix_monthly_transaction_rollups_user_month', 'tenant_id', 'user_id', 'year', 'month'),
+    )
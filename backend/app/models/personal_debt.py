@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Numeric, Boolean, DateTime, Date, ForeignKey, Text, Enum
+from sqlalchemy import Column, Integer, String, Numeric, Boolean, DateTime, Date, ForeignKey, Text, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -73,6 +73,11 @@ class PersonalDebt(Base):
     debtor = relationship("Contact", foreign_keys=[debtor_contact_id])
     payments = relationship("DebtPayment", back_populates="debt", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Overdue scans: active debts in a tenant past their due date
+        Index('ix_personal_debts_tenant_status_due', 'tenant_id', 'status', 'due_date'),
+    )
+
 
 class DebtPayment(Base):
     __tablename__ = "debt_payments"
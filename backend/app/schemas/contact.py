@@ -1,6 +1,7 @@
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, EmailStr
 from datetime import datetime, date
+from decimal import Decimal
 from enum import Enum
 
 
@@ -66,3 +67,47 @@ class Contact(ContactInDBBase):
 
 class ContactInDB(ContactInDBBase):
     pass
+
+
+class ContactInteractionBase(BaseModel):
+    interaction_type: str  # meeting, call, email, text, event
+    interaction_date: datetime
+    duration_minutes: Optional[int] = None
+    location: Optional[str] = None
+    interaction_quality: Optional[Decimal] = Decimal('5.0')  # 1-10 scale
+    interaction_mood: Optional[str] = None  # positive, neutral, negative
+    initiated_by: str  # me, them, mutual
+    title: Optional[str] = None
+    description: Optional[str] = None
+    topics_discussed: Optional[List[str]] = None
+    follow_up_required: Optional[bool] = False
+    next_steps: Optional[str] = None
+
+
+class ContactInteractionCreate(ContactInteractionBase):
+    contact_id: int
+
+
+class ContactInteractionUpdate(BaseModel):
+    interaction_type: Optional[str] = None
+    interaction_date: Optional[datetime] = None
+    duration_minutes: Optional[int] = None
+    location: Optional[str] = None
+    interaction_quality: Optional[Decimal] = None
+    interaction_mood: Optional[str] = None
+    initiated_by: Optional[str] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    topics_discussed: Optional[List[str]] = None
+    follow_up_required: Optional[bool] = None
+    next_steps: Optional[str] = None
+
+
+class ContactInteraction(ContactInteractionBase):
+    id: int
+    contact_id: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -1,5 +1,6 @@
 from typing import Optional, List
-from datetime import datetime
+from datetime import date, datetime
+from decimal import Decimal
 from pydantic import BaseModel, Field
 
 # Base Currency schema
@@ -46,4 +47,23 @@ class CurrencyList(BaseModel):
     currencies: List[Currency]
     total: int
     active_count: int
-    default_currency: Optional[Currency] = None
\ No newline at end of file
+    default_currency: Optional[Currency] = None
+
+# Exchange rate schemas
+class ExchangeRate(BaseModel):
+    base_currency: str
+    quote_currency: str
+    rate_date: date
+    rate: Decimal
+    source: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+class CurrencyConversion(BaseModel):
+    amount: Decimal
+    from_currency: str
+    to_currency: str
+    rate_date: date
+    rate: Decimal
+    converted_amount: Decimal
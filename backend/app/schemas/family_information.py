@@ -42,6 +42,30 @@ class FamilyTreeNode(BaseModel):
     children: List['FamilyTreeNode'] = []
 
 
+class RelativeInfo(BaseModel):
+    """Contact reachable through family relationships"""
+    contact: Contact
+    distance: int  # Number of relationship hops from the starting contact
+
+
+class RelationshipPathStep(BaseModel):
+    """One hop in a relationship path: from_contact is to_contact's relationship_type"""
+    from_contact_id: int
+    from_contact_name: str
+    to_contact_id: int
+    to_contact_name: str
+    relationship_type: str
+    relationship_category: str
+
+
+class RelationshipPath(BaseModel):
+    """Shortest chain of relationships between two contacts"""
+    from_contact_id: int
+    to_contact_id: int
+    degrees: int
+    steps: List[RelationshipPathStep]
+
+
 class FamilySummary(BaseModel):
     """Family information summary"""
     total_family_members: int
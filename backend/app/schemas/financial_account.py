@@ -1,5 +1,5 @@
 from typing import Optional, List
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 from pydantic import BaseModel, Field, field_validator
 
@@ -73,4 +73,11 @@ class FinancialAccountWithSummary(FinancialAccount):
     transaction_count: int
     total_credits: Decimal
     total_debits: Decimal
-    last_transaction_date: Optional[datetime] = None
\ No newline at end of file
+    last_transaction_date: Optional[datetime] = None
+
+# Account balance at the end of a given date
+class AccountBalance(BaseModel):
+    account_id: int
+    as_of: date
+    balance: Decimal
+    currency: str
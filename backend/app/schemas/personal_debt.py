@@ -82,6 +82,11 @@ class DebtPayment(DebtPaymentBase):
 
 
 # Extended schemas with related data
+class PersonalDebtWithBalance(PersonalDebt):
+    total_paid: Decimal
+    remaining_balance: Decimal
+
+
 class PersonalDebtWithPayments(PersonalDebt):
     payments: List[DebtPayment] = []
     total_paid: Optional[Decimal] = None
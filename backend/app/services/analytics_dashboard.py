@@ -0,0 +1,114 @@
+"""
+Analytics dashboard bundle.
+
+A dashboard load used to call a handful of analytics endpoints, each building its own
+AnalyticsService and re-querying the same contacts and interaction totals. The bundle
+loads one DashboardSnapshot of the tenant in the request's session, then computes every
+panel from it on a small thread pool. The panels only read the snapshot, so no session
+is shared across threads. Whole bundles are cached per tenant.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud.analytics import (
+    AnalyticsService,
+    DashboardSnapshot,
+    interaction_types,
+    interactions_overview,
+    key_performance_indicators,
+    network_health_scores,
+    overdue_follow_ups,
+    relationship_health,
+    response_rates,
+)
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.ANALYTICS_DASHBOARD_WORKERS, thread_name_prefix="analytics-dashboard"
+)
+
+
+def build_dashboard(snapshot: DashboardSnapshot) -> Dict[str, Any]:
+    """Compute every dashboard panel from one snapshot."""
+    contacts = snapshot.active_contacts
+    totals = snapshot.interaction_totals
+    sections = {
+        "network_health": _executor.submit(relationship_health, contacts),
+        "interactions_overview": _executor.submit(interactions_overview, totals),
+        "interaction_types": _executor.submit(interaction_types, totals),
+        "response_rate": _executor.submit(response_rates, totals),
+        "follow_ups_overdue": _executor.submit(overdue_follow_ups, contacts, snapshot.today),
+    }
+
+    # Shared by the overview and KPI panels
+    overview = {
+        "summary": snapshot.summary,
+        "network_health": network_health_scores(contacts),
+        "recent_activity": snapshot.recent_activity,
+        "top_insights": snapshot.top_insights
+    }
+    bundle: Dict[str, Any] = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "overview": overview,
+        "kpis": key_performance_indicators(overview),
+    }
+    for name, future in sections.items():
+        bundle[name] = future.result()
+    return bundle
+
+
+class DashboardCache:
+    """
+    Per-tenant bundle cache. Entries are dropped when a tenant's contacts or
+    interactions change and expire after ttl_seconds to bound staleness across
+    worker processes.
+    """
+
+    def __init__(self, ttl_seconds: int = 60, max_entries: int = 1000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[int, Tuple[float, Dict[str, Any]]] = {}
+        self._generations: Dict[int, int] = {}
+        # Bumped by invalidating every tenant
+        self._global_generation = 0
+        self._lock = threading.Lock()
+
+    def get_bundle(self, db: Session, tenant_id: int, refresh: bool = False) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(tenant_id)
+            if entry and not refresh and now - entry[0] < self.ttl_seconds:
+                return entry[1]
+            generation = (self._global_generation, self._generations.get(tenant_id, 0))
+
+        bundle = build_dashboard(AnalyticsService(db, tenant_id).load_dashboard_snapshot())
+
+        with self._lock:
+            if (self._global_generation, self._generations.get(tenant_id, 0)) != generation:
+                # Invalidated while loading; serve the fresh bundle but don't cache it
+                return bundle
+            if len(self._entries) >= self.max_entries and tenant_id not in self._entries:
+                # Drop the oldest entry
+                oldest_key = min(self._entries, key=lambda k: self._entries[k][0])
+                self._entries.pop(oldest_key, None)
+            self._entries[tenant_id] = (now, bundle)
+        return bundle
+
+    def invalidate(self, tenant_id: Optional[int] = None):
+        """Drop the cached bundle for a tenant, or all bundles if no tenant is given."""
+        with self._lock:
+            if tenant_id is None:
+                self._entries.clear()
+                self._global_generation += 1
+                return
+            self._generations[tenant_id] = self._generations.get(tenant_id, 0) + 1
+            self._entries.pop(tenant_id, None)
+
+
+# Global cache instance
+dashboard_cache = DashboardCache(ttl_seconds=settings.ANALYTICS_DASHBOARD_CACHE_TTL_SECONDS)
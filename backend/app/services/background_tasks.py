@@ -1,11 +1,16 @@
-from typing import Optional
-from datetime import datetime
-from celery import Celery
+from typing import Optional, List, Dict, Any, Tuple
+from datetime import datetime, date, timedelta
+from collections import defaultdict
+from celery import Celery, chord, group
 from celery.schedules import crontab
 from sqlalchemy.orm import Session
 import logging
 
 from app.core.config import settings
+from app.crud import account_ledger as crud_account_ledger
+from app.crud import interaction_analytics as crud_interaction_analytics
+from app.crud import job_occurrence as crud_job_occurrence
+from app.crud import recurring_transaction as crud_recurring_transaction
 from app.db.session import SessionLocal
 from app.services.recurring_transaction_service import RecurringTransactionService
 from app.services.notification_service import NotificationService
@@ -46,19 +51,79 @@ celery_app.conf.update(
             'task': 'app.services.background_tasks.process_personal_reminders',
             'schedule': crontab(hour=7, minute=0),
         },
+        # Snapshot account balances for the month that just ended
+        'create-monthly-balance-snapshots': {
+            'task': 'app.services.background_tasks.create_monthly_balance_snapshots',
+            'schedule': crontab(day_of_month=1, hour=0, minute=30),
+        },
+        # Age interactions out of the 30-day analytics windows
+        'decay-interaction-windows': {
+            'task': 'app.services.background_tasks.decay_interaction_windows',
+            'schedule': crontab(minute=15),
+        },
     },
 )
 
+def _chunk_by_tenant(
+    user_tenant_pairs: List[Tuple[int, int]],
+    chunk_size: int
+) -> List[Tuple[int, List[int]]]:
+    """Split (user_id, tenant_id) pairs into per-tenant chunks of at most chunk_size users."""
+    users_by_tenant: Dict[int, List[int]] = defaultdict(list)
+    for user_id, tenant_id in user_tenant_pairs:
+        users_by_tenant[tenant_id].append(user_id)
+    
+    chunks = []
+    for tenant_id in sorted(users_by_tenant):
+        user_ids = sorted(users_by_tenant[tenant_id])
+        for start in range(0, len(user_ids), chunk_size):
+            chunks.append((tenant_id, user_ids[start:start + chunk_size]))
+    return chunks
+
+
+def _fan_out(job: str, chunk_signatures: list) -> Dict[str, Any]:
+    """Dispatch chunk tasks as a chord whose callback aggregates their results."""
+    if not chunk_signatures:
+        return {"job": job, "chunks": 0, "aggregate_task_id": None}
+    
+    aggregate = chord(group(chunk_signatures))(aggregate_chunk_results.s(job=job))
+    return {"job": job, "chunks": len(chunk_signatures), "aggregate_task_id": aggregate.id}
+
+
+@celery_app.task
+def aggregate_chunk_results(results: List[Dict[str, Any]], job: str):
+    """Chord callback summing the numeric counters returned by every chunk."""
+    totals: Dict[str, Any] = {"job": job, "chunks": len(results)}
+    for result in results:
+        for key, value in (result or {}).items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                totals[key] = totals.get(key, 0) + value
+    totals["aggregated_at"] = datetime.utcnow().isoformat()
+    
+    logger.info(f"Aggregated {job} results: {totals}")
+    return totals
+
+
 @celery_app.task(bind=True, autoretry_for=(Exception,), retry_kwargs={'max_retries': 3, 'countdown': 60})
 def process_all_recurring_transactions(self, dry_run: bool = False):
-    """Background task to process all due recurring transactions."""
+    """
+    Background task to process all due recurring transactions.
+    Fans out one chunk task per group of users of a tenant; a failing chunk is
+    retried on its own and already generated occurrences are skipped.
+    """
     try:
         db = SessionLocal()
-        service = RecurringTransactionService(db)
         
-        result = service.process_due_recurring_transactions(dry_run=dry_run)
+        user_tenant_pairs = crud_recurring_transaction.get_users_with_due(db, reminder_date=date.today())
+        chunks = _chunk_by_tenant(user_tenant_pairs, settings.BACKGROUND_TASK_CHUNK_SIZE)
         
-        logger.info(f"Processed recurring transactions: {result}")
+        result = _fan_out(
+            "recurring_transactions",
+            [process_recurring_transactions_chunk.s(tenant_id, user_ids, dry_run=dry_run)
+             for tenant_id, user_ids in chunks]
+        )
+        
+        logger.info(f"Dispatched recurring transaction processing: {result}")
         return result
         
     except Exception as e:
@@ -67,6 +132,38 @@ def process_all_recurring_transactions(self, dry_run: bool = False):
     finally:
         db.close()
 
+
+@celery_app.task(bind=True, autoretry_for=(Exception,), retry_kwargs={'max_retries': 3, 'countdown': 60})
+def process_recurring_transactions_chunk(
+    self,
+    tenant_id: int,
+    user_ids: List[int],
+    dry_run: bool = False
+):
+    """Background task to process due recurring transactions for a chunk of one tenant's users."""
+    try:
+        db = SessionLocal()
+        service = RecurringTransactionService(db)
+        
+        totals = {"processed": 0, "failed": 0, "skipped": 0, "total_due": 0, "users": len(user_ids)}
+        for user_id in user_ids:
+            result = service.process_due_recurring_transactions(
+                user_id=user_id,
+                tenant_id=tenant_id,
+                dry_run=dry_run
+            )
+            for key in ("processed", "failed", "skipped", "total_due"):
+                totals[key] += result[key]
+        
+        logger.info(f"Processed recurring transactions for tenant {tenant_id} chunk: {totals}")
+        return totals
+        
+    except Exception as e:
+        logger.error(f"Failed to process recurring transactions for tenant {tenant_id} chunk: {str(e)}")
+        raise
+    finally:
+        db.close()
+
 @celery_app.task(bind=True, autoretry_for=(Exception,), retry_kwargs={'max_retries': 3, 'countdown': 60})
 def process_user_recurring_transactions(
     self, 
@@ -128,6 +225,47 @@ def health_check():
         "message": "Background tasks are running"
     }
 
+@celery_app.task(bind=True, autoretry_for=(Exception,), retry_kwargs={'max_retries': 3, 'countdown': 60})
+def create_monthly_balance_snapshots(self, snapshot_date: Optional[str] = None):
+    """
+    Snapshot every account's balance at a month end (by default, the last day of the
+    previous month) so balance-as-of queries only scan entries since the snapshot.
+    """
+    db = SessionLocal()
+    try:
+        if snapshot_date:
+            month_end = date.fromisoformat(snapshot_date)
+        else:
+            month_end = date.today().replace(day=1) - timedelta(days=1)
+        
+        created = crud_account_ledger.create_snapshots(db, snapshot_date=month_end)
+        logger.info(f"Created {created} balance snapshots for {month_end.isoformat()}")
+        return {"snapshot_date": month_end.isoformat(), "snapshots_created": created}
+        
+    except Exception as e:
+        logger.error(f"Failed to create balance snapshots: {str(e)}")
+        raise
+    finally:
+        db.close()
+
+@celery_app.task(bind=True, autoretry_for=(Exception,), retry_kwargs={'max_retries': 3, 'countdown': 60})
+def decay_interaction_windows(self, tenant_id: Optional[int] = None):
+    """
+    Recount the 30-day interaction counters of contacts with recent interactions.
+    Writes keep the counters current; this drops interactions that have aged out.
+    """
+    db = SessionLocal()
+    try:
+        checked = crud_interaction_analytics.decay_recent_windows(db, tenant_id=tenant_id)
+        logger.info(f"Decayed 30-day interaction windows for {checked} contacts")
+        return {"contacts_checked": checked}
+        
+    except Exception as e:
+        logger.error(f"Failed to decay interaction windows: {str(e)}")
+        raise
+    finally:
+        db.close()
+
 # Background task management endpoints
 @celery_app.task
 def get_task_status(task_id: str):
@@ -143,106 +281,150 @@ def get_task_status(task_id: str):
 
 @celery_app.task(bind=True, autoretry_for=(Exception,), retry_kwargs={'max_retries': 3, 'countdown': 60})
 def process_personal_reminders(self, user_id: Optional[int] = None, tenant_id: Optional[int] = None):
-    """Background task to process personal reminders and create tasks."""
+    """
+    Background task to process personal reminders and create tasks.
+    A single user is processed inline; otherwise work is fanned out into per-tenant chunks.
+    """
     try:
-        from datetime import date
-        from app.crud import personal_reminder, task
-        from app.schemas.task import TaskCreate
-        from app.models.personal_reminder import PersonalReminder
+        from app.models.user import User
         
         db = SessionLocal()
         logger.info("Starting personal reminders processing")
         
-        today = date.today()
-        processed_count = 0
-        created_tasks = 0
-        
-        # Get all users and tenants to process if not specified
         if user_id and tenant_id:
-            user_tenant_pairs = [(user_id, tenant_id)]
-        else:
-            # Get all active users and their tenants
-            from app.models.user import User
-            users = db.query(User).filter(User.is_active == True).all()
-            user_tenant_pairs = [(user.id, user.tenant_id) for user in users]
-        
-        for user_id, tenant_id in user_tenant_pairs:
-            # Get reminders that should trigger today
-            triggered_reminders = personal_reminder.get_reminders_for_date(
-                db=db,
-                user_id=user_id,
-                tenant_id=tenant_id,
-                target_date=today
-            )
-            
-            for reminder in triggered_reminders:
-                # Check if task creation is enabled for this reminder
-                notification_methods = reminder.notification_methods or {}
-                if not notification_methods.get('task_creation', False):
-                    continue
-                
-                # Calculate the next occurrence date
-                from app.crud.personal_reminder import _calculate_next_occurrence
-                next_occurrence = _calculate_next_occurrence(reminder, today)
-                if not next_occurrence:
-                    continue
-                
-                # Create reminder task title and description
-                task_title = f"Reminder: {reminder.title}"
-                task_description = f"Personal reminder for {reminder.title}"
-                
-                if reminder.contact:
-                    contact_name = f"{reminder.contact.first_name}"
-                    if reminder.contact.last_name:
-                        contact_name += f" {reminder.contact.last_name}"
-                    if reminder.contact.family_nickname:
-                        contact_name += f" ({reminder.contact.family_nickname})"
-                    
-                    task_description += f" - {contact_name}"
-                
-                if reminder.reminder_type in ['birthday', 'anniversary']:
-                    years_since = next_occurrence.year - reminder.event_date.year
-                    if reminder.reminder_type == 'birthday':
-                        task_description += f" - Turning {years_since}"
-                    else:
-                        task_description += f" - {years_since} years"
-                
-                if reminder.description:
-                    task_description += f"\n\n{reminder.description}"
-                
-                # Create the task
-                task_data = TaskCreate(
-                    title=task_title,
-                    description=task_description,
-                    due_date=next_occurrence,
-                    priority='high' if reminder.importance_level >= 4 else 'medium',
-                    contact_ids=[reminder.contact_id] if reminder.contact_id else []
-                )
-                
-                created_task = task.create_task(
-                    db=db,
-                    obj_in=task_data,
-                    user_id=user_id,
-                    tenant_id=tenant_id
-                )
-                
-                if created_task:
-                    created_tasks += 1
-                    logger.info(f"Created reminder task {created_task.id} for reminder {reminder.id}")
-                
-                processed_count += 1
+            return _process_personal_reminders_for_users(db, tenant_id, [user_id])
         
-        result = {
-            "processed_reminders": processed_count,
-            "created_tasks": created_tasks,
-            "processed_date": today.isoformat()
-        }
+        # Get all active users and their tenants
+        user_tenant_pairs = db.query(User.id, User.tenant_id).filter(User.is_active == True).all()
+        chunks = _chunk_by_tenant(user_tenant_pairs, settings.BACKGROUND_TASK_CHUNK_SIZE)
         
-        logger.info(f"Personal reminders processing completed: {result}")
+        result = _fan_out(
+            "personal_reminders",
+            [process_personal_reminders_chunk.s(chunk_tenant_id, user_ids)
+             for chunk_tenant_id, user_ids in chunks]
+        )
+        
+        logger.info(f"Dispatched personal reminders processing: {result}")
         return result
         
     except Exception as e:
         logger.error(f"Failed to process personal reminders: {str(e)}")
         raise
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+@celery_app.task(bind=True, autoretry_for=(Exception,), retry_kwargs={'max_retries': 3, 'countdown': 60})
+def process_personal_reminders_chunk(self, tenant_id: int, user_ids: List[int]):
+    """Background task to process personal reminders for a chunk of one tenant's users."""
+    try:
+        db = SessionLocal()
+        return _process_personal_reminders_for_users(db, tenant_id, user_ids)
+    except Exception as e:
+        logger.error(f"Failed to process personal reminders for tenant {tenant_id} chunk: {str(e)}")
+        raise
+    finally:
+        db.close()
+
+
+def _process_personal_reminders_for_users(db: Session, tenant_id: int, user_ids: List[int]) -> Dict[str, Any]:
+    """Create tasks for today's triggered reminders of the given users, at most once per occurrence."""
+    from app.crud import personal_reminder, task
+    from app.crud.personal_reminder import _calculate_next_occurrence
+    from app.schemas.task import TaskCreate
+    
+    today = date.today()
+    processed_count = 0
+    created_tasks = 0
+    skipped_duplicates = 0
+    
+    for user_id in user_ids:
+        # Get reminders that should trigger today
+        triggered_reminders = personal_reminder.get_reminders_for_date(
+            db=db,
+            user_id=user_id,
+            tenant_id=tenant_id,
+            target_date=today
+        )
+        
+        for reminder in triggered_reminders:
+            # Check if task creation is enabled for this reminder
+            notification_methods = reminder.notification_methods or {}
+            if not notification_methods.get('task_creation', False):
+                continue
+            
+            # Calculate the next occurrence date
+            next_occurrence = _calculate_next_occurrence(reminder, today)
+            if not next_occurrence:
+                continue
+            
+            # (reminder_id, occurrence_date) is the idempotency key: a retried chunk
+            # skips reminders whose task was already created
+            occurrence = crud_job_occurrence.claim(
+                db,
+                job_type=crud_job_occurrence.PERSONAL_REMINDER,
+                source_id=reminder.id,
+                occurrence_date=next_occurrence,
+                tenant_id=tenant_id
+            )
+            if occurrence is None:
+                skipped_duplicates += 1
+                continue
+            
+            # Create reminder task title and description
+            task_title = f"Reminder: {reminder.title}"
+            task_description = f"Personal reminder for {reminder.title}"
+            
+            if reminder.contact:
+                contact_name = f"{reminder.contact.first_name}"
+                if reminder.contact.last_name:
+                    contact_name += f" {reminder.contact.last_name}"
+                if reminder.contact.family_nickname:
+                    contact_name += f" ({reminder.contact.family_nickname})"
+                
+                task_description += f" - {contact_name}"
+            
+            if reminder.reminder_type in ['birthday', 'anniversary']:
+                years_since = next_occurrence.year - reminder.event_date.year
+                if reminder.reminder_type == 'birthday':
+                    task_description += f" - Turning {years_since}"
+                else:
+                    task_description += f" - {years_since} years"
+            
+            if reminder.description:
+                task_description += f"\n\n{reminder.description}"
+            
+            # Create the task
+            task_data = TaskCreate(
+                title=task_title,
+                description=task_description,
+                due_date=next_occurrence,
+                priority='high' if reminder.importance_level >= 4 else 'medium',
+                contact_ids=[reminder.contact_id] if reminder.contact_id else []
+            )
+            
+            # Commits the occurrence claim together with the task
+            created_task = task.create_task(
+                db=db,
+                obj_in=task_data,
+                user_id=user_id,
+                tenant_id=tenant_id
+            )
+            
+            if created_task:
+                occurrence.result_id = created_task.id
+                db.commit()
+                created_tasks += 1
+                logger.info(f"Created reminder task {created_task.id} for reminder {reminder.id}")
+            
+            processed_count += 1
+    
+    result = {
+        "processed_reminders": processed_count,
+        "created_tasks": created_tasks,
+        "skipped_duplicates": skipped_duplicates,
+        "processed_date": today.isoformat()
+    }
+    
+    logger.info(f"Personal reminders processing completed for tenant {tenant_id}: {result}")
+    return result
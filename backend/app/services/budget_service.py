@@ -1,4 +1,4 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from datetime import date
 from sqlalchemy.orm import Session
 
@@ -13,29 +13,30 @@ class BudgetService:
         """Get spending summary for a budget"""
         return crud.budget.get_budget_spending_summary(self.db, budget)
 
+    def get_budget_summaries(self, user_id: int, tenant_id: int) -> List[Tuple[Budget, Dict[str, Any]]]:
+        """Get a user's active budgets with spending summaries, evaluated together"""
+        return crud.budget.get_budget_summaries(self.db, user_id=user_id, tenant_id=tenant_id)
+
     def get_budget_alerts(self, user_id: int, tenant_id: int) -> List[Dict[str, Any]]:
         """Get budget alerts for overspending"""
         alert_budgets = crud.budget.get_budgets_over_alert_threshold(
             self.db, user_id=user_id, tenant_id=tenant_id
         )
-        
-        alerts = []
-        for budget, summary in alert_budgets:
-            alert = {
-                "budget_id": budget.id,
-                "budget_name": budget.name,
-                "budget_amount": budget.budget_amount,
-                "spent_amount": summary["spent_amount"],
-                "spent_percentage": summary["spent_percentage"],
-                "is_over_budget": summary["is_over_budget"],
-                "alert_percentage": budget.alert_percentage,
-                "days_remaining": summary["days_remaining"],
-                "period": budget.period,
-                "severity": self._get_alert_severity(summary["spent_percentage"], budget.alert_percentage)
-            }
-            alerts.append(alert)
-        
-        return alerts
+        return [self._build_alert(budget, summary) for budget, summary in alert_budgets]
+
+    def _build_alert(self, budget: Budget, summary: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "budget_id": budget.id,
+            "budget_name": budget.name,
+            "budget_amount": budget.budget_amount,
+            "spent_amount": summary["spent_amount"],
+            "spent_percentage": summary["spent_percentage"],
+            "is_over_budget": summary["is_over_budget"],
+            "alert_percentage": budget.alert_percentage,
+            "days_remaining": summary["days_remaining"],
+            "period": budget.period,
+            "severity": self._get_alert_severity(summary["spent_percentage"], budget.alert_percentage)
+        }
 
     def _get_alert_severity(self, spent_percentage: float, alert_percentage: int) -> str:
         """Determine alert severity based on spending percentage"""
@@ -0,0 +1,131 @@
+"""
+Optional running totals of budget spending.
+
+When BUDGET_SPENDING_CACHE_ENABLED is set, each user's evaluated budgets are kept
+in memory with their period windows and spent amounts. Transaction writes adjust
+the matching totals in place, so listing budgets and checking alerts can skip the
+grouped SUM over transactions until the day changes or the entry expires.
+"""
+import threading
+import time
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Mapping, NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+
+# Transaction fields that decide which budgets a transaction counts towards
+BUDGET_FIELDS = ('type', 'amount', 'transaction_date', 'category_id', 'subcategory_id')
+
+
+class BudgetWindow(NamedTuple):
+    """A budget's current period and filters, as evaluated on a given day."""
+    period_start: date
+    period_end: date
+    category_id: Optional[int]
+    subcategory_id: Optional[int]
+
+    def matches(self, transaction: Mapping) -> bool:
+        return (
+            transaction['type'] == 'debit'
+            and self.period_start <= transaction['transaction_date'] < self.period_end
+            and (self.category_id is None or transaction['category_id'] == self.category_id)
+            and (self.subcategory_id is None or transaction['subcategory_id'] == self.subcategory_id)
+        )
+
+
+class _Entry:
+    def __init__(self, loaded_at: float, evaluated_on: date, windows: Dict[int, BudgetWindow],
+                 spent: Dict[int, Decimal]):
+        self.loaded_at = loaded_at
+        self.evaluated_on = evaluated_on
+        self.windows = windows
+        self.spent = spent
+
+
+class BudgetSpendingCache:
+    """
+    Per-user running totals of spending per budget. Entries are valid for the day they
+    were evaluated on and expire after ttl_seconds to bound staleness across worker
+    processes, since writes made by other processes are not seen here.
+    """
+
+    def __init__(self, ttl_seconds: int = 300, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Tuple[int, int], _Entry] = {}
+        self._generations: Dict[Tuple[int, int], int] = {}
+        self._lock = threading.Lock()
+
+    def generation(self, tenant_id: int, user_id: int) -> int:
+        """Current write generation for a user; pass it back to store()."""
+        with self._lock:
+            return self._generations.get((tenant_id, user_id), 0)
+
+    def get(self, tenant_id: int, user_id: int, evaluated_on: date) -> Optional[Dict[int, Decimal]]:
+        """Spent amount per budget id, or None if there is no fresh entry for that day."""
+        key = (tenant_id, user_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.evaluated_on != evaluated_on or time.monotonic() - entry.loaded_at >= self.ttl_seconds:
+                self._entries.pop(key, None)
+                return None
+            return dict(entry.spent)
+
+    def store(
+        self,
+        tenant_id: int,
+        user_id: int,
+        evaluated_on: date,
+        windows: Dict[int, BudgetWindow],
+        spent: Dict[int, Decimal],
+        generation: int
+    ):
+        """Cache evaluated totals, unless a write for the user happened since `generation`."""
+        key = (tenant_id, user_id)
+        with self._lock:
+            if self._generations.get(key, 0) != generation:
+                return
+            if len(self._entries) >= self.max_entries and key not in self._entries:
+                oldest_key = min(self._entries, key=lambda k: self._entries[k].loaded_at)
+                self._entries.pop(oldest_key, None)
+            self._entries[key] = _Entry(time.monotonic(), evaluated_on, dict(windows), dict(spent))
+
+    def apply_transaction(
+        self,
+        tenant_id: int,
+        user_id: int,
+        old: Optional[Mapping] = None,
+        new: Optional[Mapping] = None
+    ):
+        """
+        Move a committed transaction write into the running totals: `old` holds the
+        BUDGET_FIELDS values before the write (None on create), `new` the values after
+        it (None on delete).
+        """
+        key = (tenant_id, user_id)
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            for values, sign in ((old, -1), (new, 1)):
+                if values is None:
+                    continue
+                amount = Decimal(str(values['amount'])) * sign
+                for budget_id, window in entry.windows.items():
+                    if window.matches(values):
+                        entry.spent[budget_id] += amount
+
+    def invalidate(self, tenant_id: int, user_id: int):
+        """Drop a user's totals, e.g. after their budgets change or a bulk import."""
+        key = (tenant_id, user_id)
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+            self._entries.pop(key, None)
+
+
+# Global cache instance
+budget_spending_cache = BudgetSpendingCache(ttl_seconds=settings.BUDGET_SPENDING_CACHE_TTL_SECONDS)
@@ -0,0 +1,264 @@
+"""
+Email delivery pipeline.
+
+Messages are handed to an ``EmailDeliveryQueue``, which sends them concurrently through a
+sink with bounded in-flight work and retries transient failures. The production sink is a
+pool of persistent SMTP connections; file and stdout sinks are available for development
+and tests.
+"""
+from concurrent.futures import Future, ThreadPoolExecutor
+from email.message import Message
+from pathlib import Path
+from typing import Optional, TextIO
+import logging
+import queue
+import smtplib
+import sys
+import threading
+import time
+import uuid
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class EmailSink:
+    """Destination that delivers a single email message."""
+
+    def send(self, message: Message) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class SMTPConnectionPool(EmailSink):
+    """
+    Pool of persistent, authenticated SMTP connections.
+    Connections are reused across messages and recycled after ``max_messages_per_connection``.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        use_tls: bool = True,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        size: int = 4,
+        max_messages_per_connection: int = 500,
+        timeout: float = 30.0,
+    ):
+        self.host = host
+        self.port = port
+        self.use_tls = use_tls
+        self.username = username
+        self.password = password
+        self.size = size
+        self.max_messages_per_connection = max_messages_per_connection
+        self.timeout = timeout
+
+        self._idle: "queue.LifoQueue[tuple]" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.use_tls:
+            server.starttls()
+        if self.username and self.password:
+            server.login(self.username, self.password)
+        return server
+
+    def _acquire(self) -> tuple:
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+
+            with self._lock:
+                can_create = self._created < self.size
+                if can_create:
+                    self._created += 1
+
+            if can_create:
+                try:
+                    return (self._connect(), 0)
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+
+            # Pool exhausted: wait for a connection to be returned or discarded
+            try:
+                return self._idle.get(timeout=1.0)
+            except queue.Empty:
+                continue
+
+    def _discard(self, server: smtplib.SMTP) -> None:
+        with self._lock:
+            self._created -= 1
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    def send(self, message: Message) -> None:
+        server, sent_count = self._acquire()
+        try:
+            server.send_message(message)
+        except (smtplib.SMTPServerDisconnected, OSError):
+            # Broken connection: drop it so the next attempt opens a fresh one
+            self._discard(server)
+            raise
+        except Exception:
+            self._idle.put((server, sent_count))
+            raise
+
+        sent_count += 1
+        if sent_count >= self.max_messages_per_connection:
+            self._discard(server)
+        else:
+            self._idle.put((server, sent_count))
+
+    def close(self) -> None:
+        while True:
+            try:
+                server, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(server)
+
+
+class FileEmailSink(EmailSink):
+    """Writes each message as an .eml file into a directory."""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def send(self, message: Message) -> None:
+        path = self.directory / f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex}.eml"
+        path.write_text(message.as_string(), encoding="utf-8")
+
+
+class StdoutEmailSink(EmailSink):
+    """Prints each message to a stream, for local development."""
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        self.stream = stream or sys.stdout
+        self._lock = threading.Lock()
+
+    def send(self, message: Message) -> None:
+        with self._lock:
+            self.stream.write(message.as_string())
+            self.stream.write("\n" + "-" * 79 + "\n")
+            self.stream.flush()
+
+
+def _is_transient(error: Exception) -> bool:
+    """Whether a failed send is worth retrying (network errors and 4xx SMTP replies)."""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return False
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    return isinstance(error, (smtplib.SMTPException, OSError))
+
+
+class EmailDeliveryQueue:
+    """
+    Bounded, concurrent send queue with retry.
+    ``submit`` blocks once ``max_pending`` messages are in flight, which keeps memory flat
+    when a job enqueues tens of thousands of messages.
+    """
+
+    def __init__(
+        self,
+        sink: EmailSink,
+        max_workers: int = 4,
+        max_pending: int = 100,
+        max_retries: int = 3,
+        retry_backoff_seconds: float = 1.0,
+    ):
+        self.sink = sink
+        self.max_retries = max_retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="email-delivery")
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    def submit(self, message: Message) -> "Future[bool]":
+        """Queue a message for delivery. The future resolves to True on success."""
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(self._deliver, message)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def send(self, message: Message) -> bool:
+        """Deliver a single message and wait for the outcome."""
+        return self.submit(message).result()
+
+    def _deliver(self, message: Message) -> bool:
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.sink.send(message)
+                return True
+            except Exception as e:
+                if attempt >= self.max_retries or not _is_transient(e):
+                    logger.error(f"Failed to send email to {message['To']}: {str(e)}")
+                    return False
+                logger.warning(f"Retrying email to {message['To']} after error: {str(e)}")
+                time.sleep(self.retry_backoff_seconds * (2 ** attempt))
+        return False
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        self.sink.close()
+
+
+def create_email_sink() -> Optional[EmailSink]:
+    """Create the sink selected by EMAIL_BACKEND, or None if it is not configured."""
+    backend = settings.EMAIL_BACKEND
+    if backend == "file":
+        return FileEmailSink(settings.EMAIL_FILE_PATH)
+    if backend == "stdout":
+        return StdoutEmailSink()
+    if not settings.SMTP_HOST or not settings.SMTP_PORT:
+        return None
+    return SMTPConnectionPool(
+        host=settings.SMTP_HOST,
+        port=settings.SMTP_PORT,
+        use_tls=settings.SMTP_TLS,
+        username=settings.SMTP_USERNAME,
+        password=settings.SMTP_PASSWORD,
+        size=settings.SMTP_POOL_SIZE,
+    )
+
+
+_delivery_queue: Optional[EmailDeliveryQueue] = None
+_delivery_queue_lock = threading.Lock()
+
+
+def get_email_delivery_queue() -> Optional[EmailDeliveryQueue]:
+    """
+    Get the process-wide delivery queue, so SMTP connections persist across jobs.
+    Returns None if email delivery is not configured.
+    """
+    global _delivery_queue
+    with _delivery_queue_lock:
+        if _delivery_queue is None:
+            sink = create_email_sink()
+            if sink is None:
+                return None
+            _delivery_queue = EmailDeliveryQueue(
+                sink,
+                max_workers=settings.SMTP_POOL_SIZE,
+                max_pending=settings.EMAIL_MAX_PENDING,
+                max_retries=settings.EMAIL_MAX_RETRIES,
+            )
+        return _delivery_queue
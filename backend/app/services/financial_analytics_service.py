@@ -1,10 +1,12 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import date, datetime, timedelta
 from decimal import Decimal
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_, desc
 
 from app import crud
+from app.core.currency_validator import get_default_currency_code
+from app.core.money import CurrencyTotals, currency_exponents, mean_amount, percentage, sum_amounts
 from app.models.transaction import Transaction
 from app.models.financial_account import FinancialAccount
 
@@ -12,35 +14,24 @@ class FinancialAnalyticsService:
     def __init__(self, db: Session):
         self.db = db
 
-    def get_dashboard_summary(self, user_id: int, tenant_id: int) -> Dict[str, Any]:
-        """Get financial dashboard summary"""
+    def get_dashboard_summary(self, user_id: int, tenant_id: int, currency: Optional[str] = None) -> Dict[str, Any]:
+        """Get financial dashboard summary, with balances totalled in `currency` (default currency if None)"""
         today = date.today()
+        currency = self._reporting_currency(currency)
         
-        # Current month summary
-        current_month_summary = crud.transaction.get_monthly_summary(
-            self.db, user_id=user_id, tenant_id=tenant_id, 
-            year=today.year, month=today.month
+        # Current and previous month summaries, for comparison
+        prev_month, current_month = crud.transaction_rollup.month_range(today, 2)
+        monthly_totals = crud.transaction_rollup.get_monthly_totals(
+            self.db, user_id=user_id, tenant_id=tenant_id, months=[prev_month, current_month]
         )
+        current_month_summary = monthly_totals[current_month]
+        prev_month_summary = monthly_totals[prev_month]
         
-        # Previous month summary for comparison
-        if today.month == 1:
-            prev_month = 12
-            prev_year = today.year - 1
-        else:
-            prev_month = today.month - 1
-            prev_year = today.year
-            
-        prev_month_summary = crud.transaction.get_monthly_summary(
-            self.db, user_id=user_id, tenant_id=tenant_id,
-            year=prev_year, month=prev_month
-        )
-        
-        # Account balances
-        accounts = crud.financial_account.get_financial_accounts_by_user(
-            self.db, user_id=user_id, tenant_id=tenant_id, active_only=True
+        # Account balances, converted in the database
+        balance_rows = crud.financial_account.get_balance_totals(
+            self.db, user_id=user_id, tenant_id=tenant_id, currency=currency, as_of=today
         )
-        
-        total_balance = sum(float(account.current_balance) for account in accounts)
+        balances = self._converted_totals(balance_rows, currency)
         
         # Recent transactions
         recent_transactions = crud.transaction.get_transactions_by_user(
@@ -49,17 +40,20 @@ class FinancialAnalyticsService:
         
         # Calculate changes
         income_change = self._calculate_percentage_change(
-            float(current_month_summary['total_credits']),
-            float(prev_month_summary['total_credits'])
+            current_month_summary['total_credits'],
+            prev_month_summary['total_credits']
         )
         
         expense_change = self._calculate_percentage_change(
-            float(current_month_summary['total_debits']),
-            float(prev_month_summary['total_debits'])
+            current_month_summary['total_debits'],
+            prev_month_summary['total_debits']
         )
         
         return {
-            "total_balance": total_balance,
+            "currency": currency,
+            "total_balance": balances["total"],
+            "balances_by_currency": balances["by_currency"],
+            "unconverted_currencies": balances["unconverted"],
             "current_month": {
                 "income": current_month_summary['total_credits'],
                 "expenses": current_month_summary['total_debits'],
@@ -70,40 +64,32 @@ class FinancialAnalyticsService:
                 "income_change": income_change,
                 "expense_change": expense_change
             },
-            "account_count": len(accounts),
+            "account_count": sum(row.account_count for row in balance_rows),
             "recent_transactions": recent_transactions
         }
 
     def get_cash_flow_analysis(self, user_id: int, tenant_id: int, months: int = 6) -> Dict[str, Any]:
         """Get cash flow analysis for specified months"""
-        today = date.today()
-        cash_flow_data = []
+        months_covered = crud.transaction_rollup.month_range(date.today(), months)
+        monthly_totals = crud.transaction_rollup.get_monthly_totals(
+            self.db, user_id=user_id, tenant_id=tenant_id, months=months_covered
+        )
         
-        for i in range(months):
-            # Calculate the month/year for this iteration
-            month_date = today.replace(day=1) - timedelta(days=i*30)
-            month = month_date.month
-            year = month_date.year
-            
-            # Get monthly summary
-            summary = crud.transaction.get_monthly_summary(
-                self.db, user_id=user_id, tenant_id=tenant_id, year=year, month=month
-            )
-            
+        # Oldest to newest
+        cash_flow_data = []
+        for year, month in months_covered:
+            summary = monthly_totals[(year, month)]
             cash_flow_data.append({
-                "month": month_date.strftime("%Y-%m"),
+                "month": f"{year:04d}-{month:02d}",
                 "income": summary['total_credits'],
                 "expenses": summary['total_debits'],
                 "net_flow": summary['net_amount']
             })
         
-        # Reverse to show oldest to newest
-        cash_flow_data.reverse()
-        
         # Calculate averages
-        avg_income = sum(float(item['income']) for item in cash_flow_data) / len(cash_flow_data)
-        avg_expenses = sum(float(item['expenses']) for item in cash_flow_data) / len(cash_flow_data)
-        avg_net = sum(float(item['net_flow']) for item in cash_flow_data) / len(cash_flow_data)
+        avg_income = mean_amount(item['income'] for item in cash_flow_data)
+        avg_expenses = mean_amount(item['expenses'] for item in cash_flow_data)
+        avg_net = mean_amount(item['net_flow'] for item in cash_flow_data)
         
         return {
             "cash_flow": cash_flow_data,
@@ -116,76 +102,87 @@ class FinancialAnalyticsService:
 
     def get_spending_trends(self, user_id: int, tenant_id: int, period: str = "monthly", months: int = 12) -> Dict[str, Any]:
         """Get spending trends analysis"""
-        today = date.today()
-        trends_data = []
-        
-        # Get category breakdown for trend analysis
-        category_breakdown = crud.transaction.get_category_breakdown(
-            self.db, user_id=user_id, tenant_id=tenant_id,
-            date_from=today - timedelta(days=months*30),
-            date_to=today
+        # Monthly totals and the category breakdown come from one rollup range query
+        months_covered = crud.transaction_rollup.month_range(date.today(), months)
+        monthly_totals = crud.transaction_rollup.get_monthly_category_totals(
+            self.db, user_id=user_id, tenant_id=tenant_id, months=months_covered
         )
         
-        # Process trend data based on period
-        for i in range(months):
-            period_start = today.replace(day=1) - timedelta(days=i*30)
-            period_end = period_start.replace(day=28) + timedelta(days=4)  # End of month
-            
-            period_summary = crud.transaction.get_monthly_summary(
-                self.db, user_id=user_id, tenant_id=tenant_id,
-                year=period_start.year, month=period_start.month
-            )
-            
+        # Process trend data based on period, oldest to newest
+        trends_data = []
+        categories: Dict[Any, Dict[str, Any]] = {}
+        for year, month in months_covered:
+            by_category = monthly_totals[(year, month)]
             trends_data.append({
-                "period": period_start.strftime("%Y-%m"),
-                "total_spending": period_summary['total_debits'],
-                "transaction_count": period_summary['transaction_count']
+                "period": f"{year:04d}-{month:02d}",
+                "total_spending": sum((s['total_debits'] for s in by_category.values()), Decimal('0')),
+                "transaction_count": sum(s['transaction_count'] for s in by_category.values())
             })
+            for category_id, summary in by_category.items():
+                category = categories.setdefault(
+                    category_id, {"category_id": category_id, "total_amount": Decimal('0'), "transaction_count": 0}
+                )
+                category["total_amount"] += summary['total_credits'] + summary['total_debits']
+                category["transaction_count"] += summary['transaction_count']
         
-        trends_data.reverse()
+        category_breakdown = sorted(categories.values(), key=lambda item: item["total_amount"], reverse=True)
         
         return {
             "trends": trends_data,
             "category_breakdown": category_breakdown
         }
 
-    def calculate_net_worth(self, user_id: int, tenant_id: int) -> Dict[str, Any]:
-        """Calculate net worth tracking data"""
-        accounts = crud.financial_account.get_financial_accounts_by_user(
+    def calculate_net_worth(self, user_id: int, tenant_id: int, currency: Optional[str] = None) -> Dict[str, Any]:
+        """Calculate net worth tracking data, totalled in `currency` (default currency if None)"""
+        today = date.today()
+        currency = self._reporting_currency(currency)
+        accounts = crud.financial_account.get_financial_accounts_with_summaries(
             self.db, user_id=user_id, tenant_id=tenant_id, active_only=True
         )
         
         assets = []
         liabilities = []
         
-        for account in accounts:
+        for account, summary in accounts:
+            last_transaction_date = summary["last_transaction_date"]
+            balance = currency_exponents.money(self.db, account.current_balance, account.currency)
             account_data = {
                 "account_name": account.account_name,
                 "account_type": account.account_type,
-                "balance": float(account.current_balance),
-                "currency": account.currency
+                "balance": balance.amount,
+                "currency": account.currency,
+                "transaction_count": summary["transaction_count"],
+                "last_transaction_date": last_transaction_date.isoformat() if last_transaction_date else None
             }
             
             # Categorize as asset or liability based on account type
-            if account.account_type in ['checking', 'savings', 'investment']:
-                assets.append(account_data)
-            elif account.account_type in ['credit_card', 'loan', 'mortgage']:
+            if account.account_type in crud.financial_account.LIABILITY_ACCOUNT_TYPES:
                 liabilities.append(account_data)
             else:
-                # Default to asset for unknown types
+                # Checking, savings, investment, and unknown types count as assets
                 assets.append(account_data)
         
-        total_assets = sum(account['balance'] for account in assets)
-        total_liabilities = sum(abs(account['balance']) for account in liabilities)  # Absolute value for liabilities
-        net_worth = total_assets - total_liabilities
+        # Totals are converted and summed per currency in the database
+        balance_rows = crud.financial_account.get_balance_totals(
+            self.db, user_id=user_id, tenant_id=tenant_id, currency=currency, as_of=today
+        )
+        asset_totals = self._converted_totals([row for row in balance_rows if not row.is_liability], currency)
+        liability_totals = self._converted_totals(  # Absolute value for liabilities
+            [row for row in balance_rows if row.is_liability], currency, absolute=True
+        )
+        net_worth = asset_totals["total"] - liability_totals["total"]
         
         return {
+            "currency": currency,
             "net_worth": net_worth,
-            "total_assets": total_assets,
-            "total_liabilities": total_liabilities,
+            "total_assets": asset_totals["total"],
+            "total_liabilities": liability_totals["total"],
+            "assets_by_currency": asset_totals["by_currency"],
+            "liabilities_by_currency": liability_totals["by_currency"],
+            "unconverted_currencies": sorted(set(asset_totals["unconverted"]) | set(liability_totals["unconverted"])),
             "assets": assets,
             "liabilities": liabilities,
-            "calculation_date": date.today().isoformat()
+            "calculation_date": today.isoformat()
         }
 
     def get_category_analysis(self, user_id: int, tenant_id: int, date_from: date, date_to: date) -> Dict[str, Any]:
@@ -196,17 +193,17 @@ class FinancialAnalyticsService:
         )
         
         # Calculate total spending for percentage calculations
-        total_spending = sum(float(item.total_amount) for item in category_breakdown)
+        total_spending = sum_amounts(item.total_amount for item in category_breakdown)
         
         # Format the breakdown with percentages
         formatted_breakdown = []
         for item in category_breakdown:
-            percentage = (float(item.total_amount) / total_spending * 100) if total_spending > 0 else 0
+            total_amount = sum_amounts([item.total_amount])
             formatted_breakdown.append({
                 "category_id": item.category_id,
-                "total_amount": float(item.total_amount),
+                "total_amount": total_amount,
                 "transaction_count": item.transaction_count,
-                "percentage": round(percentage, 2)
+                "percentage": percentage(total_amount, total_spending)
             })
         
         # Sort by amount descending
@@ -221,8 +218,36 @@ class FinancialAnalyticsService:
             "category_breakdown": formatted_breakdown
         }
 
-    def _calculate_percentage_change(self, current: float, previous: float) -> float:
+    def _reporting_currency(self, currency: Optional[str]) -> str:
+        return (currency or get_default_currency_code(self.db)).upper()
+
+    def _converted_totals(self, rows: List[Any], currency: str, absolute: bool = False) -> Dict[str, Any]:
+        """
+        Add up grouped balance rows (see crud.financial_account.get_balance_totals) already
+        converted to `currency`, alongside the unconverted total per currency. Currencies
+        without a rate are listed under "unconverted" and left out of the total.
+        """
+        by_currency = CurrencyTotals()
+        converted = []
+        unconverted = set()
+        for row in rows:
+            total, converted_total = (
+                (row.absolute_total, row.converted_absolute_total) if absolute
+                else (row.total, row.converted_total)
+            )
+            by_currency.add(currency_exponents.money(self.db, total, row.currency))
+            if converted_total is None:
+                unconverted.add(row.currency)
+            else:
+                converted.append(converted_total)
+        return {
+            "total": sum_amounts(converted, currency_exponents.get(self.db, currency)),
+            "by_currency": by_currency.amounts(),
+            "unconverted": sorted(unconverted)
+        }
+
+    def _calculate_percentage_change(self, current: Decimal, previous: Decimal) -> float:
         """Calculate percentage change between two values"""
         if previous == 0:
             return 100.0 if current > 0 else 0.0
-        return round(((current - previous) / previous) * 100, 2)
\ No newline at end of file
+        return percentage(current - previous, abs(previous))
\ No newline at end of file
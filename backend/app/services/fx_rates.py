@@ -0,0 +1,113 @@
+"""
+Foreign exchange rates for cross-currency totals.
+
+Rates live in the exchange_rates table and are loaded from a CSV or JSON file
+(``python cli.py fx load-rates``). Totals that span currencies are converted in
+SQL with crud.exchange_rate.convert_expression; single conversions go through
+the in-process LRU here, keyed by (from, to, date), so repeated lookups for the
+same pair and day do not hit the database.
+"""
+import csv
+import json
+import threading
+from collections import OrderedDict
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud import exchange_rate as crud_exchange_rate
+
+_MISSING = object()
+
+
+class FxRateCache:
+    """
+    LRU of rates by (from, to, date). Unknown rates are cached too, as None, so a
+    missing pair costs one query per day rather than one per conversion. Loading
+    rates clears the cache.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._rates: "OrderedDict[Tuple[str, str, date], Optional[Decimal]]" = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get_rate(self, db: Session, base: str, quote: str, as_of: date) -> Optional[Decimal]:
+        key = (base, quote, as_of)
+        with self._lock:
+            rate = self._rates.get(key, _MISSING)
+            if rate is not _MISSING:
+                self._rates.move_to_end(key)
+                return rate
+            generation = self._generation
+
+        rate = crud_exchange_rate.get_rate(db, base=base, quote=quote, as_of=as_of)
+
+        with self._lock:
+            # Skip caching if rates were reloaded while we queried
+            if generation == self._generation:
+                self._rates[key] = rate
+                self._rates.move_to_end(key)
+                while len(self._rates) > self.max_entries:
+                    self._rates.popitem(last=False)
+        return rate
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._rates.clear()
+
+
+def _parse_rate(record: Dict[str, Any], source: Optional[str], where: str) -> Dict[str, Any]:
+    try:
+        base = str(record['base']).strip().upper()
+        quote = str(record['quote']).strip().upper()
+        rate_date = date.fromisoformat(str(record['date']).strip())
+        rate = Decimal(str(record['rate']).strip())
+    except KeyError as e:
+        raise ValueError(f"{where}: missing field {e}")
+    except (ValueError, InvalidOperation):
+        raise ValueError(f"{where}: invalid date or rate")
+    if len(base) != 3 or len(quote) != 3 or not (base + quote).isalpha():
+        raise ValueError(f"{where}: currency codes must be three letters")
+    if not rate.is_finite() or rate <= 0:
+        raise ValueError(f"{where}: rate must be positive")
+    return {
+        'base_currency': base,
+        'quote_currency': quote,
+        'rate_date': rate_date,
+        'rate': rate,
+        'source': record.get('source') or source
+    }
+
+
+def read_rates_file(path: str, source: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Parse a rates file: CSV with a date,base,quote,rate[,source] header, or a JSON list
+    of objects with the same keys. Raises ValueError naming the first bad record.
+    """
+    file_path = Path(path)
+    source = source or file_path.name
+    with open(file_path, newline='', encoding='utf-8') as f:
+        if file_path.suffix.lower() == '.json':
+            records = [(f"record {i}", record) for i, record in enumerate(json.load(f), start=1)]
+        else:
+            reader = csv.DictReader(f)
+            records = [(f"line {reader.line_num}", record) for record in reader]
+    return [_parse_rate(record, source, where) for where, record in records]
+
+
+def load_rates_file(db: Session, path: str, source: Optional[str] = None) -> int:
+    """Load a rates file into exchange_rates, replacing rates for the same pair and date."""
+    count = crud_exchange_rate.upsert_rates(db, read_rates_file(path, source))
+    fx_rates.clear()
+    return count
+
+
+# Global rate cache
+fx_rates = FxRateCache(max_entries=settings.FX_RATE_CACHE_SIZE)
@@ -2,8 +2,11 @@ from typing import Any, Dict, List, Optional
 from sqlalchemy.orm import Session
 from datetime import date, timedelta
 
+from app.core.currency_validator import get_default_currency_code
+from app.core.money import currency_exponents, sum_amounts
 from app.models.gift import Gift, GiftIdea, GiftStatus
 from app.models.contact import Contact
+from app.crud import exchange_rate as crud_exchange_rate
 from app.crud import gift as gift_crud
 
 
@@ -107,16 +110,26 @@ class GiftIntegrationService:
         
         return contact_gift_data
     
-    def get_financial_summary(self, year: Optional[int] = None) -> Dict[str, Any]:
-        """Get financial summary of gift spending for integration with financial systems"""
+    def get_financial_summary(self, year: Optional[int] = None, currency: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get financial summary of gift spending for integration with financial systems.
+        Amounts are converted to `currency` (default currency if None) at today's rates;
+        gifts in currencies without a rate are counted under unconverted_gifts.
+        """
         
-        from sqlalchemy import func, extract
+        from sqlalchemy import case, func, extract
         
+        currency = (currency or get_default_currency_code(self.db)).upper()
+        exponent = currency_exponents.get(self.db, currency)
+        
+        # Spending per month and currency, converted per currency group, in one query
+        month = extract('month', Gift.purchase_date)
         query = self.db.query(
-            func.sum(Gift.actual_amount).label('total_spent'),
-            func.sum(Gift.budget_amount).label('total_budgeted'),
-            func.count(Gift.id).label('total_gifts'),
-            func.avg(Gift.actual_amount).label('avg_spent')
+            month.label('month'),
+            Gift.currency.label('currency'),
+            func.sum(Gift.actual_amount).label('spent'),
+            func.sum(Gift.budget_amount).label('budgeted'),
+            func.count(Gift.id).label('gifts')
         ).filter(
             Gift.user_id == self.user_id,
             Gift.tenant_id == self.tenant_id,
@@ -127,41 +140,42 @@ class GiftIntegrationService:
         if year:
             query = query.filter(extract('year', Gift.purchase_date) == year)
         
-        result = query.first()
-        
-        # Get spending by month for the year
-        monthly_query = self.db.query(
-            extract('month', Gift.purchase_date).label('month'),
-            func.sum(Gift.actual_amount).label('spent'),
-            func.count(Gift.id).label('count')
-        ).filter(
-            Gift.user_id == self.user_id,
-            Gift.tenant_id == self.tenant_id,
-            Gift.is_active == True,
-            Gift.actual_amount.isnot(None),
-            Gift.purchase_date.isnot(None)
-        )
-        
-        if year:
-            monthly_query = monthly_query.filter(extract('year', Gift.purchase_date) == year)
+        by_currency = query.group_by(month, Gift.currency).subquery()
+        rate = crud_exchange_rate.rate_expression(by_currency.c.currency, currency, date.today())
+        monthly_data = self.db.query(
+            by_currency.c.month,
+            func.sum(by_currency.c.spent * rate).label('spent'),
+            func.sum(by_currency.c.budgeted * rate).label('budgeted'),
+            func.sum(by_currency.c.gifts).label('count'),
+            func.sum(case((rate.is_(None), by_currency.c.gifts), else_=0)).label('unconverted')
+        ).group_by(by_currency.c.month).order_by(by_currency.c.month).all()
         
-        monthly_data = monthly_query.group_by(extract('month', Gift.purchase_date)).all()
+        total_spent = sum_amounts((row.spent for row in monthly_data), exponent)
+        total_budgeted = sum_amounts((row.budgeted for row in monthly_data), exponent)
+        total_gifts = sum(int(row.count) for row in monthly_data)
+        unconverted_gifts = sum(int(row.unconverted or 0) for row in monthly_data)
+        converted_gifts = total_gifts - unconverted_gifts
+        average_spent = sum_amounts([total_spent / converted_gifts], exponent) if converted_gifts else 0
         
         return {
+            "currency": currency,
             "summary": {
-                "total_spent": float(result.total_spent or 0),
-                "total_budgeted": float(result.total_budgeted or 0),
-                "total_gifts": result.total_gifts or 0,
-                "average_spent": float(result.avg_spent or 0),
-                "budget_variance": float((result.total_budgeted or 0) - (result.total_spent or 0))
+                "total_spent": float(total_spent),
+                "total_budgeted": float(total_budgeted),
+                "total_gifts": total_gifts,
+                "average_spent": float(average_spent),
+                "budget_variance": float(total_budgeted - total_spent),
+                "unconverted_gifts": unconverted_gifts
             },
+            # Gifts without a purchase date count towards the totals only
             "monthly_breakdown": [
                 {
                     "month": int(row.month),
-                    "spent": float(row.spent),
-                    "gift_count": row.count
+                    "spent": float(sum_amounts([row.spent], exponent)),
+                    "gift_count": int(row.count)
                 }
                 for row in monthly_data
+                if row.month is not None
             ],
             "year": year or date.today().year
         }
@@ -0,0 +1,188 @@
+"""
+Leader Election Service
+
+Elects a single leader among all API workers using a Redis lease lock, so that
+in-process singletons (the recurring task scheduler, the configuration hot reload
+watcher) run once per cluster instead of once per uvicorn worker.
+
+The lease is a plain Redis key holding the leader's identity with a TTL. The leader
+renews it periodically; if the leader dies or loses Redis for longer than the lease,
+the key expires and another worker takes over on its next election round.
+"""
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from typing import Callable, List, Optional
+
+import redis
+
+from app.core.config import settings
+from app.core.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderElection:
+    """
+    Redis lease based leader election with renewal and failover.
+
+    Callbacks registered with ``register`` are invoked on the event loop thread:
+    ``on_elected`` when this worker becomes leader and ``on_demoted`` when it loses
+    (or gives up) leadership.
+    """
+
+    def __init__(
+        self,
+        lock_key: str,
+        lease_seconds: int = 30,
+        renew_interval_seconds: int = 10,
+        redis_getter: Optional[Callable[[], redis.Redis]] = None,
+        identity: Optional[str] = None,
+    ):
+        if renew_interval_seconds >= lease_seconds:
+            raise ValueError("renew_interval_seconds must be shorter than lease_seconds")
+
+        self.lock_key = lock_key
+        self.lease_seconds = lease_seconds
+        self.renew_interval_seconds = renew_interval_seconds
+        self.identity = identity or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.is_leader = False
+
+        self._redis_getter = redis_getter or redis_client.connect
+        self._lease_expires_at = 0.0
+        self._on_elected: List[Callable[[], None]] = []
+        self._on_demoted: List[Callable[[], None]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def register(self, on_elected: Callable[[], None], on_demoted: Callable[[], None]):
+        """Register callbacks to run when leadership is gained and lost."""
+        self._on_elected.append(on_elected)
+        self._on_demoted.append(on_demoted)
+
+    def get_current_leader(self) -> Optional[str]:
+        """Return the identity currently holding the lease, if any."""
+        return self._redis_getter().get(self.lock_key)
+
+    def try_acquire(self) -> bool:
+        """Try to take the lease. Returns True if this worker now holds it."""
+        acquired = self._redis_getter().set(
+            self.lock_key, self.identity, nx=True, px=self.lease_seconds * 1000
+        )
+        if acquired:
+            self._lease_expires_at = time.monotonic() + self.lease_seconds
+        return bool(acquired)
+
+    def renew(self) -> bool:
+        """
+        Extend the lease if this worker still owns it.
+        Uses WATCH/MULTI so the ownership check and the expiry update are atomic.
+        """
+        client = self._redis_getter()
+        with client.pipeline() as pipe:
+            try:
+                pipe.watch(self.lock_key)
+                if pipe.get(self.lock_key) != self.identity:
+                    pipe.unwatch()
+                    return False
+                pipe.multi()
+                pipe.pexpire(self.lock_key, self.lease_seconds * 1000)
+                pipe.execute()
+            except redis.WatchError:
+                return False
+
+        self._lease_expires_at = time.monotonic() + self.lease_seconds
+        return True
+
+    def release(self) -> bool:
+        """Delete the lease if this worker owns it, allowing immediate failover."""
+        client = self._redis_getter()
+        with client.pipeline() as pipe:
+            try:
+                pipe.watch(self.lock_key)
+                if pipe.get(self.lock_key) != self.identity:
+                    pipe.unwatch()
+                    return False
+                pipe.multi()
+                pipe.delete(self.lock_key)
+                pipe.execute()
+                return True
+            except redis.WatchError:
+                return False
+
+    def step(self) -> bool:
+        """
+        Run a single election round: renew when leading, otherwise try to acquire.
+        Fires the elected/demoted callbacks on state transitions.
+        Returns whether this worker is the leader after the round.
+        """
+        try:
+            holds_lease = self.renew() if self.is_leader else self.try_acquire()
+        except redis.RedisError as e:
+            # Also covers errors while Redis fails over, e.g. writes to a demoted replica
+            logger.warning(f"Leader election for {self.lock_key} could not reach Redis: {str(e)}")
+            # Keep leading only while the last confirmed lease is still valid; after
+            # that another worker may already have taken over.
+            holds_lease = self.is_leader and time.monotonic() < self._lease_expires_at
+
+        if holds_lease and not self.is_leader:
+            self.is_leader = True
+            logger.info(f"{self.identity} elected leader for {self.lock_key}")
+            self._run_callbacks(self._on_elected)
+        elif not holds_lease and self.is_leader:
+            self.is_leader = False
+            logger.warning(f"{self.identity} lost leadership for {self.lock_key}")
+            self._run_callbacks(self._on_demoted)
+
+        return self.is_leader
+
+    def _run_callbacks(self, callbacks: List[Callable[[], None]]):
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Error in leader election callback for {self.lock_key}: {str(e)}")
+
+    async def _run(self):
+        while True:
+            try:
+                self.step()
+            except Exception as e:
+                # Keep the loop alive so this worker keeps renewing or rejoins the election
+                logger.error(f"Error in leader election round for {self.lock_key}: {str(e)}")
+            await asyncio.sleep(self.renew_interval_seconds)
+
+    def start(self):
+        """Start the election loop. Must be called from a running event loop."""
+        if self._task is not None and not self._task.done():
+            logger.warning(f"Leader election for {self.lock_key} is already running")
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop the election loop, step down and release the lease."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self.is_leader:
+            self.is_leader = False
+            self._run_callbacks(self._on_demoted)
+            try:
+                self.release()
+            except redis.RedisError as e:
+                logger.warning(f"Could not release leader lease {self.lock_key}: {str(e)}")
+
+
+# Global instance guarding the per-cluster background services
+scheduler_leader_election = LeaderElection(
+    lock_key=settings.SCHEDULER_LEADER_LOCK_KEY,
+    lease_seconds=settings.SCHEDULER_LEADER_LEASE_SECONDS,
+    renew_interval_seconds=settings.SCHEDULER_LEADER_RENEW_INTERVAL_SECONDS,
+)
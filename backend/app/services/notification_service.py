@@ -1,22 +1,110 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+from concurrent.futures import Future
 from datetime import date, timedelta
 from sqlalchemy.orm import Session
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-import smtplib
 import logging
 
 from app import crud
 from app.models.user import User
 from app.core.config import settings
+from app.services.email_delivery import EmailDeliveryQueue, get_email_delivery_queue
 from app.services.recurring_transaction_service import RecurringTransactionService
 
 logger = logging.getLogger(__name__)
 
+# Reminder email templates, parsed once at import and rendered with str.format_map
+_REMINDER_HTML_HEADER = """
+        <html>
+        <head>
+            <style>
+                body {{ font-family: Arial, sans-serif; }}
+                .header {{ background-color: #f8f9fa; padding: 20px; text-align: center; }}
+                .content {{ padding: 20px; }}
+                .reminder {{ border: 1px solid #dee2e6; margin: 10px 0; padding: 15px; border-radius: 5px; }}
+                .due-today {{ border-left: 4px solid #dc3545; }}
+                .due-soon {{ border-left: 4px solid #ffc107; }}
+                .due-later {{ border-left: 4px solid #28a745; }}
+                .amount {{ font-weight: bold; }}
+                .footer {{ background-color: #f8f9fa; padding: 10px; text-align: center; font-size: 0.8em; }}
+            </style>
+        </head>
+        <body>
+            <div class="header">
+                <h2>Recurring Transaction Reminders</h2>
+            </div>
+            <div class="content">
+                <p>Hi {name},</p>
+                <p>You have {count} upcoming recurring transaction(s):</p>
+        """
+
+_REMINDER_HTML_ITEM = """
+                <div class="reminder {css_class}">
+                    <h4>{description}</h4>
+                    <p><span class="amount">{currency} {amount}</span> - {type}</p>
+                    <p><strong>{due_text}</strong> - {next_due_date}</p>
+                    {category_line}
+                    {account_line}
+                </div>
+            """
+
+_REMINDER_HTML_FOOTER = """
+                <p>You can manage your recurring transactions in your Recaller dashboard.</p>
+            </div>
+            <div class="footer">
+                <p>This is an automated reminder from Recaller. If you no longer wish to receive these notifications, please update your preferences in the app.</p>
+            </div>
+        </body>
+        </html>
+        """
+
+_REMINDER_TEXT_HEADER = "Hi {name},\n\nYou have {count} upcoming recurring transaction(s):\n\n"
+
+_REMINDER_TEXT_ITEM = (
+    "• {description}\n"
+    "  Amount: {currency} {amount} ({type})\n"
+    "  {due_text} - {next_due_date}\n"
+    "{category_line}"
+    "{account_line}"
+    "\n"
+)
+
+_REMINDER_TEXT_FOOTER = (
+    "You can manage your recurring transactions in your Recaller dashboard.\n\n"
+    "This is an automated reminder from Recaller. If you no longer wish to receive these notifications, "
+    "please update your preferences in the app."
+)
+
+
+def _due_text(days_until: int) -> str:
+    return "Due today" if days_until == 0 else f"Due in {days_until} day(s)"
+
+
+def _reminder_fields(reminder: Dict[str, Any]) -> Dict[str, Any]:
+    """Fields shared by the HTML and text reminder item templates."""
+    return {
+        "description": reminder['description'],
+        "currency": reminder['currency'],
+        "amount": reminder['amount'],
+        "type": reminder['type'].title(),
+        "due_text": _due_text(reminder["days_until_due"]),
+        "next_due_date": reminder['next_due_date'],
+    }
+
+
 class NotificationService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, delivery_queue: Optional[EmailDeliveryQueue] = None):
         self.db = db
         self.recurring_service = RecurringTransactionService(db)
+        self._delivery_queue = delivery_queue
+
+    @property
+    def delivery_queue(self) -> Optional[EmailDeliveryQueue]:
+        """Delivery queue used for sending, defaulting to the shared process-wide queue."""
+        if self._delivery_queue is None:
+            self._delivery_queue = get_email_delivery_queue()
+        return self._delivery_queue
 
     def send_recurring_transaction_reminders(
         self,
@@ -24,9 +112,14 @@ class NotificationService:
         tenant_id: Optional[int] = None,
         reminder_days: List[int] = [7, 3, 1, 0]
     ) -> Dict[str, Any]:
-        """Send reminders for upcoming recurring transactions."""
+        """
+        Send reminders for upcoming recurring transactions.
+        Emails are queued as they are built and delivered concurrently over pooled
+        SMTP connections; results are collected once every user has been queued.
+        """
         notifications_sent = []
         failed_notifications = []
+        queued: List[Tuple[User, List[Dict[str, Any]], "Future[bool]"]] = []
         
         # Get users to notify
         if user_id and tenant_id:
@@ -34,6 +127,8 @@ class NotificationService:
         else:
             users = crud.user.get_all_active(self.db)
         
+        delivery_queue = self.delivery_queue
+        
         for user in users:
             if not user or not user.email:
                 continue
@@ -57,21 +152,18 @@ class NotificationService:
                         reminders_to_send.append(transaction)
                 
                 if reminders_to_send:
-                    # Send email notification
-                    email_sent = self._send_reminder_email(user, reminders_to_send)
-                    if email_sent:
-                        notifications_sent.append({
-                            "user_id": user.id,
-                            "email": user.email,
-                            "reminder_count": len(reminders_to_send),
-                            "reminders": reminders_to_send
-                        })
-                    else:
+                    if delivery_queue is None:
+                        logger.warning("Email delivery not configured, skipping email")
                         failed_notifications.append({
                             "user_id": user.id,
                             "email": user.email,
                             "error": "Failed to send email"
                         })
+                        continue
+                    
+                    # Queue email notification
+                    message = self._build_reminder_message(user, reminders_to_send)
+                    queued.append((user, reminders_to_send, delivery_queue.submit(message)))
                         
             except Exception as e:
                 logger.error(f"Failed to send reminder to user {user.id}: {str(e)}")
@@ -81,6 +173,21 @@ class NotificationService:
                     "error": str(e)
                 })
         
+        for user, reminders_to_send, future in queued:
+            if future.result():
+                notifications_sent.append({
+                    "user_id": user.id,
+                    "email": user.email,
+                    "reminder_count": len(reminders_to_send),
+                    "reminders": reminders_to_send
+                })
+            else:
+                failed_notifications.append({
+                    "user_id": user.id,
+                    "email": user.email,
+                    "error": "Failed to send email"
+                })
+        
         return {
             "notifications_sent": len(notifications_sent),
             "failed_notifications": len(failed_notifications),
@@ -88,43 +195,30 @@ class NotificationService:
             "errors": failed_notifications
         }
 
+    def _build_reminder_message(self, user: User, reminders: List[Dict[str, Any]]) -> MIMEMultipart:
+        """Build the multipart reminder email for a user."""
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = f"Recaller: {len(reminders)} Upcoming Recurring Transaction(s)"
+        msg['From'] = settings.SMTP_FROM_EMAIL
+        msg['To'] = user.email
+        
+        # Attach text and HTML versions
+        msg.attach(MIMEText(self._generate_reminder_email_text(user, reminders), 'plain'))
+        msg.attach(MIMEText(self._generate_reminder_email_html(user, reminders), 'html'))
+        return msg
+
     def _send_reminder_email(self, user: User, reminders: List[Dict[str, Any]]) -> bool:
-        """Send reminder email to user."""
+        """Send reminder email to user and wait for delivery."""
         try:
-            if not settings.SMTP_HOST or not settings.SMTP_PORT:
+            delivery_queue = self.delivery_queue
+            if delivery_queue is None:
                 logger.warning("SMTP settings not configured, skipping email")
                 return False
             
-            # Create email content
-            subject = f"Recaller: {len(reminders)} Upcoming Recurring Transaction(s)"
-            
-            # HTML email body
-            html_body = self._generate_reminder_email_html(user, reminders)
-            
-            # Text email body
-            text_body = self._generate_reminder_email_text(user, reminders)
-            
-            # Create message
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = settings.SMTP_FROM_EMAIL
-            msg['To'] = user.email
-            
-            # Attach text and HTML versions
-            msg.attach(MIMEText(text_body, 'plain'))
-            msg.attach(MIMEText(html_body, 'html'))
-            
-            # Send email
-            with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT) as server:
-                if settings.SMTP_TLS:
-                    server.starttls()
-                if settings.SMTP_USERNAME and settings.SMTP_PASSWORD:
-                    server.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
-                
-                server.send_message(msg)
-            
-            logger.info(f"Reminder email sent to {user.email}")
-            return True
+            sent = delivery_queue.send(self._build_reminder_message(user, reminders))
+            if sent:
+                logger.info(f"Reminder email sent to {user.email}")
+            return sent
             
         except Exception as e:
             logger.error(f"Failed to send email to {user.email}: {str(e)}")
@@ -132,77 +226,34 @@ class NotificationService:
 
     def _generate_reminder_email_html(self, user: User, reminders: List[Dict[str, Any]]) -> str:
         """Generate HTML email body for reminders."""
-        html = f"""
-        <html>
-        <head>
-            <style>
-                body {{ font-family: Arial, sans-serif; }}
-                .header {{ background-color: #f8f9fa; padding: 20px; text-align: center; }}
-                .content {{ padding: 20px; }}
-                .reminder {{ border: 1px solid #dee2e6; margin: 10px 0; padding: 15px; border-radius: 5px; }}
-                .due-today {{ border-left: 4px solid #dc3545; }}
-                .due-soon {{ border-left: 4px solid #ffc107; }}
-                .due-later {{ border-left: 4px solid #28a745; }}
-                .amount {{ font-weight: bold; }}
-                .footer {{ background-color: #f8f9fa; padding: 10px; text-align: center; font-size: 0.8em; }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h2>Recurring Transaction Reminders</h2>
-            </div>
-            <div class="content">
-                <p>Hi {getattr(user, 'first_name', None) or 'there'},</p>
-                <p>You have {len(reminders)} upcoming recurring transaction(s):</p>
-        """
+        parts = [_REMINDER_HTML_HEADER.format(
+            name=getattr(user, 'first_name', None) or 'there',
+            count=len(reminders)
+        )]
         
         for reminder in reminders:
             days_until = reminder["days_until_due"]
-            css_class = "due-today" if days_until == 0 else "due-soon" if days_until <= 3 else "due-later"
-            
-            due_text = "Due today" if days_until == 0 else f"Due in {days_until} day(s)"
-            
-            html += f"""
-                <div class="reminder {css_class}">
-                    <h4>{reminder['description']}</h4>
-                    <p><span class="amount">{reminder['currency']} {reminder['amount']}</span> - {reminder['type'].title()}</p>
-                    <p><strong>{due_text}</strong> - {reminder['next_due_date']}</p>
-                    {f"<p>Category: {reminder['category_name']}</p>" if reminder['category_name'] else ""}
-                    {f"<p>Account: {reminder['account_name']}</p>" if reminder['account_name'] else ""}
-                </div>
-            """
+            fields = _reminder_fields(reminder)
+            fields["css_class"] = "due-today" if days_until == 0 else "due-soon" if days_until <= 3 else "due-later"
+            fields["category_line"] = f"<p>Category: {reminder['category_name']}</p>" if reminder['category_name'] else ""
+            fields["account_line"] = f"<p>Account: {reminder['account_name']}</p>" if reminder['account_name'] else ""
+            parts.append(_REMINDER_HTML_ITEM.format_map(fields))
         
-        html += """
-                <p>You can manage your recurring transactions in your Recaller dashboard.</p>
-            </div>
-            <div class="footer">
-                <p>This is an automated reminder from Recaller. If you no longer wish to receive these notifications, please update your preferences in the app.</p>
-            </div>
-        </body>
-        </html>
-        """
-        
-        return html
+        parts.append(_REMINDER_HTML_FOOTER)
+        return "".join(parts)
 
     def _generate_reminder_email_text(self, user: User, reminders: List[Dict[str, Any]]) -> str:
         """Generate text email body for reminders."""
-        text = f"Hi {getattr(user, 'first_name', None) or 'there'},\n\n"
-        text += f"You have {len(reminders)} upcoming recurring transaction(s):\n\n"
+        parts = [_REMINDER_TEXT_HEADER.format(
+            name=getattr(user, 'first_name', None) or 'there',
+            count=len(reminders)
+        )]
         
         for reminder in reminders:
-            days_until = reminder["days_until_due"]
-            due_text = "Due today" if days_until == 0 else f"Due in {days_until} day(s)"
-            
-            text += f"• {reminder['description']}\n"
-            text += f"  Amount: {reminder['currency']} {reminder['amount']} ({reminder['type'].title()})\n"
-            text += f"  {due_text} - {reminder['next_due_date']}\n"
-            if reminder['category_name']:
-                text += f"  Category: {reminder['category_name']}\n"
-            if reminder['account_name']:
-                text += f"  Account: {reminder['account_name']}\n"
-            text += "\n"
-        
-        text += "You can manage your recurring transactions in your Recaller dashboard.\n\n"
-        text += "This is an automated reminder from Recaller. If you no longer wish to receive these notifications, please update your preferences in the app."
+            fields = _reminder_fields(reminder)
+            fields["category_line"] = f"  Category: {reminder['category_name']}\n" if reminder['category_name'] else ""
+            fields["account_line"] = f"  Account: {reminder['account_name']}\n" if reminder['account_name'] else ""
+            parts.append(_REMINDER_TEXT_ITEM.format_map(fields))
         
-        return text
\ No newline at end of file
+        parts.append(_REMINDER_TEXT_FOOTER)
+        return "".join(parts)
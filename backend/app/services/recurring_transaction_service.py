@@ -4,10 +4,12 @@ from sqlalchemy.orm import Session
 import logging
 
 from app import crud, schemas, models
+from app.crud import job_occurrence as crud_job_occurrence
 from app.core.config import settings
 from app.db.session import SessionLocal
 from app.models.recurring_transaction import RecurringTransaction
 from app.models.transaction import Transaction
+from app.services.budget_spending_cache import budget_spending_cache
 
 logger = logging.getLogger(__name__)
 
@@ -83,6 +85,18 @@ class RecurringTransactionService:
         override_date: Optional[date] = None
     ) -> Transaction:
         """Generate a transaction from recurring template."""
+        transaction = self._add_transaction_from_template(recurring, override_date)
+        self.db.commit()
+        self.db.refresh(transaction)
+        budget_spending_cache.invalidate(recurring.tenant_id, recurring.user_id)
+        return transaction
+
+    def _add_transaction_from_template(
+        self,
+        recurring: RecurringTransaction,
+        override_date: Optional[date] = None
+    ) -> Transaction:
+        """Add a transaction from the template and count the occurrence, without committing."""
         transaction_date = override_date or recurring.next_due_date or date.today()
         
         transaction_data = schemas.TransactionCreate(
@@ -108,28 +122,14 @@ class RecurringTransactionService:
         transaction_dict["user_id"] = recurring.user_id
         transaction_dict["tenant_id"] = recurring.tenant_id
         
-        # Create transaction
-        transaction = crud.transaction.create(
+        # Create transaction; its balance effect is posted to the account ledger
+        transaction = crud.transaction.add_transaction(
             db=self.db, 
             obj_in=schemas.TransactionCreate(**transaction_dict)
         )
         
-        # Update account balance if account exists
-        if transaction.account_id:
-            account = crud.financial_account.get(db=self.db, id=transaction.account_id)
-            if account and account.user_id == recurring.user_id:
-                if transaction.type == "credit":
-                    new_balance = account.current_balance + transaction.amount
-                else:
-                    new_balance = account.current_balance - transaction.amount
-                crud.financial_account.update_balance(
-                    db=self.db, 
-                    db_obj=account, 
-                    new_balance=new_balance
-                )
-        
         # Update recurring transaction statistics
-        crud.recurring_transaction.increment_occurrences(db=self.db, recurring_id=recurring.id)
+        recurring.occurrence_count = (getattr(recurring, 'occurrence_count', None) or 0) + 1
         
         return transaction
 
@@ -210,19 +210,33 @@ class RecurringTransactionService:
                     continue
                 
                 if not dry_run:
+                    # Claim this occurrence so retried or concurrent workers never
+                    # generate the same transaction twice
+                    occurrence = crud_job_occurrence.claim(
+                        self.db,
+                        job_type=crud_job_occurrence.RECURRING_TRANSACTION,
+                        source_id=recurring.id,
+                        occurrence_date=recurring.next_due_date or today,
+                        tenant_id=recurring.tenant_id
+                    )
+                    if occurrence is None:
+                        skipped.append({
+                            "recurring_id": recurring.id,
+                            "reason": "Occurrence already processed"
+                        })
+                        continue
+                    
                     # Generate transaction
-                    transaction = self.generate_transaction_from_template(recurring)
+                    transaction = self._add_transaction_from_template(recurring)
+                    occurrence.result_id = transaction.id
                     
                     # Update next due date
-                    next_due = self.calculate_next_due_date_from_recurring(recurring)
-                    crud.recurring_transaction.update(
-                        db=self.db,
-                        db_obj=recurring,
-                        obj_in=schemas.RecurringTransactionUpdate(
-                            next_due_date=next_due,
-                            last_processed_date=today
-                        )
-                    )
+                    recurring.next_due_date = self.calculate_next_due_date_from_recurring(recurring)
+                    
+                    # The claim, transaction, counter and due date commit together, so a
+                    # failure in any of them leaves nothing behind for the retry to trip on
+                    self.db.commit()
+                    budget_spending_cache.invalidate(recurring.tenant_id, recurring.user_id)
                     
                     processed.append({
                         "recurring_id": recurring.id,
@@ -245,6 +259,8 @@ class RecurringTransactionService:
                 
             except Exception as e:
                 logger.error(f"Failed to process recurring transaction {recurring.id}: {str(e)}")
+                # Discard partial work, including the occurrence claim, so a retry can redo it
+                self.db.rollback()
                 failed.append({
                     "recurring_id": recurring.id,
                     "error": str(e),
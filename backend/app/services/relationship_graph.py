@@ -0,0 +1,201 @@
+"""
+In-memory relationship graph for family tree and "how are we related" queries.
+
+Relationships are stored as two directed rows (A -> B and B -> A), where a row's
+relationship_type reads "A is B's <type>" (e.g. a 'parent' row points from the parent
+to the child). The graph keeps those rows as an adjacency list so traversals run in
+O(V + E) without further database round trips.
+"""
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+
+from app.models.contact import Contact
+from app.models.contact_relationship import ContactRelationship
+
+PARENT_TYPES = {'parent', 'father', 'mother'}
+CHILD_TYPES = {'child', 'son', 'daughter'}
+
+
+class RelationshipEdge(NamedTuple):
+    """A directed relationship: source is target's relationship_type."""
+    source_id: int
+    target_id: int
+    relationship_type: str
+    relationship_category: str
+
+
+class RelationshipGraph:
+    """Adjacency list over a user's active contact relationships."""
+
+    def __init__(self, edges: Iterable[RelationshipEdge]):
+        self._adjacency: Dict[int, List[RelationshipEdge]] = {}
+        for edge in edges:
+            self._adjacency.setdefault(edge.source_id, []).append(edge)
+            self._adjacency.setdefault(edge.target_id, [])
+
+    @classmethod
+    def load(cls, db: Session, tenant_id: int, user_id: int) -> "RelationshipGraph":
+        """Build the graph for a user's contacts with a single query."""
+        rows = db.query(
+            ContactRelationship.contact_a_id,
+            ContactRelationship.contact_b_id,
+            ContactRelationship.relationship_type,
+            ContactRelationship.relationship_category
+        ).join(
+            Contact, Contact.id == ContactRelationship.contact_a_id
+        ).filter(
+            and_(
+                ContactRelationship.tenant_id == tenant_id,
+                ContactRelationship.is_active == True,
+                Contact.tenant_id == tenant_id,
+                Contact.created_by_user_id == user_id
+            )
+        ).order_by(ContactRelationship.id).all()
+
+        return cls(RelationshipEdge(*row) for row in rows)
+
+    @property
+    def contact_ids(self) -> Set[int]:
+        return set(self._adjacency)
+
+    def edges(
+        self,
+        category: Optional[str] = None,
+        relationship_types: Optional[Set[str]] = None
+    ) -> List[RelationshipEdge]:
+        """All edges, optionally restricted to a category and set of relationship types."""
+        return [
+            edge
+            for out_edges in self._adjacency.values()
+            for edge in out_edges
+            if (category is None or edge.relationship_category == category)
+            and (relationship_types is None or edge.relationship_type in relationship_types)
+        ]
+
+    def neighbors(self, contact_id: int, category: Optional[str] = None) -> List[RelationshipEdge]:
+        """Outgoing edges of a contact."""
+        return [
+            edge for edge in self._adjacency.get(contact_id, [])
+            if category is None or edge.relationship_category == category
+        ]
+
+    def bfs(self, start_id: int, max_depth: int, category: Optional[str] = None) -> Dict[int, int]:
+        """Contacts reachable from start_id within max_depth hops, mapped to their distance."""
+        if start_id not in self._adjacency:
+            return {}
+
+        distances = {start_id: 0}
+        queue = deque([start_id])
+        while queue:
+            current = queue.popleft()
+            if distances[current] >= max_depth:
+                continue
+            for edge in self.neighbors(current, category):
+                if edge.target_id not in distances:
+                    distances[edge.target_id] = distances[current] + 1
+                    queue.append(edge.target_id)
+        return distances
+
+    def shortest_path(
+        self,
+        from_id: int,
+        to_id: int,
+        category: Optional[str] = None
+    ) -> Optional[List[RelationshipEdge]]:
+        """
+        Shortest chain of relationships from one contact to another, or None if they
+        are not connected. An empty list means both ids are the same contact.
+        """
+        if from_id not in self._adjacency or to_id not in self._adjacency:
+            return None
+        if from_id == to_id:
+            return []
+
+        came_from: Dict[int, RelationshipEdge] = {}
+        visited = {from_id}
+        queue = deque([from_id])
+        while queue:
+            current = queue.popleft()
+            for edge in self.neighbors(current, category):
+                if edge.target_id in visited:
+                    continue
+                visited.add(edge.target_id)
+                came_from[edge.target_id] = edge
+                if edge.target_id == to_id:
+                    path = []
+                    node = to_id
+                    while node != from_id:
+                        path.append(came_from[node])
+                        node = came_from[node].source_id
+                    path.reverse()
+                    return path
+                queue.append(edge.target_id)
+        return None
+
+    def parent_child_pairs(self) -> Set[Tuple[int, int]]:
+        """(parent_id, child_id) pairs from both parent and child typed rows."""
+        pairs = set()
+        for out_edges in self._adjacency.values():
+            for edge in out_edges:
+                if edge.relationship_type in PARENT_TYPES:
+                    pairs.add((edge.source_id, edge.target_id))
+                elif edge.relationship_type in CHILD_TYPES:
+                    pairs.add((edge.target_id, edge.source_id))
+        return pairs
+
+
+class RelationshipGraphCache:
+    """
+    Per-user graph cache. Entries are dropped when a tenant's relationships change
+    and expire after ttl_seconds to bound staleness across worker processes.
+    """
+
+    def __init__(self, ttl_seconds: int = 300, max_entries: int = 1000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Tuple[int, int], Tuple[float, RelationshipGraph]] = {}
+        self._generations: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def get_graph(self, db: Session, tenant_id: int, user_id: int) -> RelationshipGraph:
+        key = (tenant_id, user_id)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and now - entry[0] < self.ttl_seconds:
+                return entry[1]
+            generation = self._generations.get(tenant_id, 0)
+
+        graph = RelationshipGraph.load(db, tenant_id, user_id)
+
+        with self._lock:
+            if self._generations.get(tenant_id, 0) != generation:
+                # Invalidated while loading; serve the fresh graph but don't cache it
+                return graph
+            if len(self._entries) >= self.max_entries:
+                # Drop the oldest entry
+                oldest_key = min(self._entries, key=lambda k: self._entries[k][0])
+                self._entries.pop(oldest_key, None)
+            self._entries[key] = (now, graph)
+        return graph
+
+    def invalidate(self, tenant_id: Optional[int] = None):
+        """Drop cached graphs for a tenant, or all graphs if no tenant is given."""
+        with self._lock:
+            if tenant_id is None:
+                self._entries.clear()
+                for cached_tenant_id in self._generations:
+                    self._generations[cached_tenant_id] += 1
+                return
+            self._generations[tenant_id] = self._generations.get(tenant_id, 0) + 1
+            for key in [k for k in self._entries if k[0] == tenant_id]:
+                self._entries.pop(key, None)
+
+
+# Global cache instance
+relationship_graph_cache = RelationshipGraphCache()
@@ -0,0 +1,267 @@
+"""
+Bulk transaction import pipeline.
+
+Rows are streamed from a JSON payload, CSV or OFX file and processed in batches:
+validated with one Pydantic call per batch, inserted with a single multi-row
+``INSERT ... RETURNING`` per batch and recorded in the account ledger with one
+``INSERT ... SELECT``, while their balance effect is accumulated per account in
+memory. Balances are then applied with one ``UPDATE`` per account and everything
+is committed in a single transaction. A batch that fails to insert is
+retried row by row inside savepoints so that only the offending rows are reported.
+"""
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, TextIO, Tuple
+import csv
+import logging
+import re
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import and_, insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud import account_ledger, transaction_rollup
+from app.models.financial_account import FinancialAccount
+from app.models.transaction import Transaction
+from app.schemas.transaction import TransactionCreate
+from app.services.budget_spending_cache import budget_spending_cache
+
+logger = logging.getLogger(__name__)
+
+_batch_adapter = TypeAdapter(List[TransactionCreate])
+
+# CSV header aliases commonly found in bank exports
+CSV_COLUMN_ALIASES = {
+    'date': 'transaction_date',
+    'posted_date': 'transaction_date',
+    'memo': 'description',
+    'reference': 'reference_number',
+}
+
+_OFX_TAG = re.compile(r'<(/?)([A-Za-z0-9.]+)>([^<\r\n]*)')
+
+
+def _apply_signed_amount(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Derive type from the amount's sign when the source has no type column."""
+    if row.get('type') or 'amount' not in row:
+        return row
+    try:
+        amount = Decimal(str(row['amount']))
+    except InvalidOperation:
+        return row
+    row['type'] = 'debit' if amount < 0 else 'credit'
+    row['amount'] = abs(amount)
+    return row
+
+
+def iter_csv_rows(stream: TextIO, default_account_id: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yield transaction dicts from a CSV file, one row at a time.
+    Columns match TransactionCreate fields; a signed amount is accepted in place of type.
+    """
+    reader = csv.DictReader(stream)
+    for record in reader:
+        row = {}
+        for column, value in record.items():
+            if column is None or value is None:
+                continue
+            key = column.strip().lower()
+            key = CSV_COLUMN_ALIASES.get(key, key)
+            value = value.strip()
+            if value != '':
+                row[key] = value
+        if default_account_id is not None:
+            row.setdefault('account_id', default_account_id)
+        yield _apply_signed_amount(row)
+
+
+def iter_ofx_rows(stream: TextIO, default_account_id: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yield transaction dicts from the STMTTRN records of an OFX file (SGML v1 or XML v2),
+    reading the file line by line.
+    """
+    currency = None
+    current: Optional[Dict[str, str]] = None
+    for line in stream:
+        for closing, tag, value in _OFX_TAG.findall(line):
+            tag = tag.upper()
+            value = value.strip()
+            if tag == 'STMTTRN':
+                if not closing:
+                    current = {}
+                elif current is not None:
+                    yield _ofx_transaction(current, currency, default_account_id)
+                    current = None
+            elif tag == 'CURDEF' and value:
+                currency = value
+            elif current is not None and not closing and value:
+                current[tag] = value
+
+
+def _ofx_transaction(record: Dict[str, str], currency: Optional[str], account_id: Optional[int]) -> Dict[str, Any]:
+    row: Dict[str, Any] = {}
+    if 'TRNAMT' in record:
+        row['amount'] = record['TRNAMT']
+    posted = record.get('DTPOSTED', '')
+    if len(posted) >= 8:
+        row['transaction_date'] = f"{posted[0:4]}-{posted[4:6]}-{posted[6:8]}"
+    description = ' - '.join(part for part in (record.get('NAME'), record.get('MEMO')) if part)
+    if description:
+        row['description'] = description
+    if record.get('FITID'):
+        row['reference_number'] = record['FITID']
+    if currency:
+        row['currency'] = currency
+    if account_id is not None:
+        row['account_id'] = account_id
+    if record.get('TRNTYPE'):
+        row['extra_data'] = {'ofx_trntype': record['TRNTYPE']}
+    return _apply_signed_amount(row)
+
+
+class TransactionImportService:
+    """Imports transactions for one user in a single database transaction."""
+
+    def __init__(self, db: Session, user_id: int, tenant_id: int, batch_size: Optional[int] = None):
+        self.db = db
+        self.user_id = user_id
+        self.tenant_id = tenant_id
+        self.batch_size = batch_size or settings.TRANSACTION_IMPORT_BATCH_SIZE
+        self._account_access: Dict[int, bool] = {}
+
+    def import_rows(self, rows: Iterable[Any]) -> Dict[str, Any]:
+        """
+        Import rows (dicts in TransactionCreate shape). Invalid rows are reported in
+        ``errors`` with their 1-based position and do not stop the import.
+        """
+        transaction_ids: List[int] = []
+        errors: List[Dict[str, Any]] = []
+        balance_deltas: Dict[int, Dict[date, Decimal]] = defaultdict(lambda: defaultdict(Decimal))
+        rollup_deltas: Dict[transaction_rollup.RollupKey, List] = {}
+
+        numbered = enumerate(rows, start=1)
+        try:
+            while True:
+                batch = list(islice(numbered, self.batch_size))
+                if not batch:
+                    break
+
+                valid, batch_errors = self._validate_batch(batch)
+                errors.extend(batch_errors)
+
+                inserted, insert_errors = self._insert_batch(valid)
+                errors.extend(insert_errors)
+
+                batch_ids = []
+                for (_, transaction), transaction_id in inserted:
+                    batch_ids.append(transaction_id)
+                    transaction_rollup.accumulate(rollup_deltas, self._values(transaction))
+                    if transaction.account_id:
+                        balance_deltas[transaction.account_id][transaction.transaction_date] += (
+                            account_ledger.transaction_effect(transaction.type, transaction.amount)
+                        )
+                account_ledger.record_transactions(self.db, transaction_ids=batch_ids)
+                transaction_ids.extend(batch_ids)
+
+            account_ledger.apply_deltas(self.db, balance_deltas)
+            transaction_rollup.apply_deltas(self.db, rollup_deltas)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        if transaction_ids:
+            budget_spending_cache.invalidate(self.tenant_id, self.user_id)
+
+        errors.sort(key=lambda e: e['row'])
+        logger.info(
+            f"Imported {len(transaction_ids)} transactions for user {self.user_id} "
+            f"({len(errors)} failed, {len(balance_deltas)} accounts updated)"
+        )
+        return {
+            'created': len(transaction_ids),
+            'failed': len(errors),
+            'transaction_ids': transaction_ids,
+            'accounts_updated': len(balance_deltas),
+            'errors': errors,
+        }
+
+    def _validate_batch(
+        self,
+        batch: List[Tuple[int, Any]]
+    ) -> Tuple[List[Tuple[int, TransactionCreate]], List[Dict[str, Any]]]:
+        """Validate a batch with one adapter call, re-validating only the good rows on failure."""
+        errors = []
+        try:
+            items = _batch_adapter.validate_python([data for _, data in batch])
+        except ValidationError as exc:
+            messages: Dict[int, List[str]] = defaultdict(list)
+            for error in exc.errors():
+                field = '.'.join(str(part) for part in error['loc'][1:])
+                messages[error['loc'][0]].append(f"{field}: {error['msg']}" if field else error['msg'])
+            for index, parts in messages.items():
+                errors.append({'row': batch[index][0], 'error': '; '.join(parts)})
+            batch = [entry for index, entry in enumerate(batch) if index not in messages]
+            items = _batch_adapter.validate_python([data for _, data in batch]) if batch else []
+
+        self._load_account_access({item.account_id for item in items if item.account_id})
+
+        valid = []
+        for (row_number, _), item in zip(batch, items):
+            if item.account_id and not self._account_access[item.account_id]:
+                errors.append({'row': row_number, 'error': 'Account not found'})
+            else:
+                valid.append((row_number, item))
+        return valid, errors
+
+    def _load_account_access(self, account_ids: Set[int]):
+        """Check ownership for accounts not seen in earlier batches with one query."""
+        unknown = account_ids - self._account_access.keys()
+        if not unknown:
+            return
+        owned = {
+            account_id for (account_id,) in self.db.query(FinancialAccount.id).filter(
+                and_(
+                    FinancialAccount.id.in_(unknown),
+                    FinancialAccount.user_id == self.user_id,
+                    FinancialAccount.tenant_id == self.tenant_id
+                )
+            )
+        }
+        for account_id in unknown:
+            self._account_access[account_id] = account_id in owned
+
+    def _values(self, transaction: TransactionCreate) -> Dict[str, Any]:
+        return {**transaction.model_dump(), 'user_id': self.user_id, 'tenant_id': self.tenant_id}
+
+    def _insert_batch(
+        self,
+        valid: List[Tuple[int, TransactionCreate]]
+    ) -> Tuple[List[Tuple[Tuple[int, TransactionCreate], int]], List[Dict[str, Any]]]:
+        """Insert a batch in one statement; on failure, retry each row in its own savepoint."""
+        if not valid:
+            return [], []
+
+        # Only the set of new ids is reported, so RETURNING order does not matter and
+        # the statement stays a single multi-row INSERT on every backend
+        statement = insert(Transaction).returning(Transaction.id)
+        try:
+            with self.db.begin_nested():
+                ids = self.db.execute(statement, [self._values(item) for _, item in valid]).scalars().all()
+            return list(zip(valid, ids)), []
+        except SQLAlchemyError as e:
+            logger.warning(f"Batch insert failed, retrying row by row: {str(e)}")
+
+        inserted, errors = [], []
+        for entry in valid:
+            row_number, item = entry
+            try:
+                with self.db.begin_nested():
+                    transaction_id = self.db.execute(statement, [self._values(item)]).scalar_one()
+                inserted.append((entry, transaction_id))
+            except SQLAlchemyError as e:
+                errors.append({'row': row_number, 'error': str(e.orig) if getattr(e, 'orig', None) else str(e)})
+        return inserted, errors
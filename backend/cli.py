@@ -10,6 +10,8 @@ Usage:
     python cli.py user --help
     python cli.py user create-user
     python cli.py user list-users
+    python cli.py analytics rebuild-rollups
+    python cli.py fx load-rates rates.csv
 """
 
 import click
@@ -21,6 +23,8 @@ from typing import Optional
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
 
 from app.cli.user_commands import user
+from app.cli.analytics_commands import analytics
+from app.cli.fx_commands import fx
 from app.db.session import SessionLocal
 from app.models.tenant import Tenant
 
@@ -127,6 +131,8 @@ def health():
 # Register command groups
 cli.add_command(user)
 cli.add_command(tenant)
+cli.add_command(analytics)
+cli.add_command(fx)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark exact minor-unit aggregation against the old float path
+Run this script to compare speed and accumulated error on synthetic amounts
+"""
+import argparse
+import random
+import sys
+import timeit
+from decimal import Decimal
+from pathlib import Path
+
+# Add app to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.money import from_minor, mean_amount, sum_amounts
+
+
+def float_total(values):
+    """The previous analytics path: sum(float(...))"""
+    return sum(float(value) for value in values)
+
+
+def float_mean(values):
+    return sum(float(value) for value in values) / len(values)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=100000, help="Amounts per aggregation")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    # Amounts as they come back from Numeric(15, 2) columns
+    values = [from_minor(rng.randint(1, 10 ** 7), 2) for _ in range(args.count)]
+    exact = sum(values, Decimal("0"))
+
+    print(f"💰 Aggregating {args.count} amounts, best of {args.repeat}")
+    print("=" * 50)
+    for name, function in [
+        ("float sum", float_total),
+        ("minor-unit sum", sum_amounts),
+        ("float mean", float_mean),
+        ("minor-unit mean", mean_amount),
+    ]:
+        seconds = min(timeit.repeat(lambda: function(values), number=1, repeat=args.repeat))
+        print(f"{name:<16} {seconds * 1000:10.2f} ms")
+
+    float_error = abs(Decimal(repr(float_total(values))) - exact)
+    print("\nExact total:      ", exact)
+    print("Minor-unit total: ", sum_amounts(values))
+    print("Float total:      ", repr(float_total(values)), f"(off by {float_error})")
+
+
+if __name__ == "__main__":
+    main()
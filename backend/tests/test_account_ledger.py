@@ -0,0 +1,182 @@
+"""
+Tests for ledger-based account balances and monthly balance snapshots
+"""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, event, func
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401 - register all mappers
+from app.crud import account_ledger
+from app.crud import financial_account as crud_financial_account
+from app.crud import transaction as crud_transaction
+from app.models.account_ledger import AccountBalanceSnapshot, AccountLedgerEntry
+from app.models.financial_account import FinancialAccount
+from app.models.monthly_transaction_rollup import MonthlyTransactionRollup
+from app.models.transaction import Transaction
+from app.schemas.financial_account import FinancialAccountCreate, FinancialAccountUpdate
+from app.schemas.transaction import TransactionCreate, TransactionUpdate
+
+TENANT_ID = 1
+USER_ID = 1
+
+
+@pytest.fixture
+def engine(tmp_path):
+    # A file database so that separate sessions see each other's commits
+    engine = create_engine(f"sqlite:///{tmp_path / 'ledger.db'}")
+    for model in (FinancialAccount, Transaction, AccountLedgerEntry, AccountBalanceSnapshot, MonthlyTransactionRollup):
+        model.__table__.create(bind=engine)
+    return engine
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+def create_account(db, opening_balance="100.00", user_id=USER_ID):
+    return crud_financial_account.create_financial_account(
+        db,
+        obj_in=FinancialAccountCreate(account_name="Checking", current_balance=Decimal(opening_balance)),
+        user_id=user_id,
+        tenant_id=TENANT_ID
+    )
+
+
+def create_transaction(db, account_id, amount, type="debit", transaction_date=date(2024, 3, 10)):
+    return crud_transaction.create_transaction(
+        db,
+        obj_in=TransactionCreate(
+            type=type, amount=Decimal(amount), transaction_date=transaction_date, account_id=account_id
+        ),
+        user_id=USER_ID,
+        tenant_id=TENANT_ID
+    )
+
+
+def stored_balance(db, account_id):
+    db.expire_all()
+    return db.get(FinancialAccount, account_id).current_balance
+
+
+def ledger_total(db, account_id):
+    return db.query(func.sum(AccountLedgerEntry.amount)).filter(AccountLedgerEntry.account_id == account_id).scalar()
+
+
+class TestLedgerPosting:
+    """Test that every balance change goes through the ledger"""
+
+    def test_opening_balance_is_a_ledger_entry(self, db):
+        account = create_account(db, "250.00")
+
+        entry = db.query(AccountLedgerEntry).one()
+        assert entry.entry_type == account_ledger.OPENING
+        assert entry.amount == Decimal("250.00")
+        assert stored_balance(db, account.id) == Decimal("250.00")
+
+    def test_transaction_writes_keep_balance_equal_to_ledger(self, db):
+        account = create_account(db)
+        other = create_account(db, "0")
+
+        transaction = create_transaction(db, account.id, "30.00")
+        create_transaction(db, account.id, "12.50", type="credit")
+        crud_transaction.update_transaction(
+            db, db_obj=transaction, obj_in=TransactionUpdate(amount=Decimal("40.00"), account_id=other.id)
+        )
+        crud_transaction.update_transaction(db, db_obj=transaction, obj_in=TransactionUpdate(description="Groceries"))
+        crud_transaction.delete_transaction(db, transaction_id=transaction.id, user_id=USER_ID, tenant_id=TENANT_ID)
+
+        assert stored_balance(db, account.id) == Decimal("112.50") == ledger_total(db, account.id)
+        assert stored_balance(db, other.id) == Decimal("0.00") == ledger_total(db, other.id)
+        types = [e.entry_type for e in db.query(AccountLedgerEntry).order_by(AccountLedgerEntry.id)]
+        assert types == ["opening", "transaction", "transaction", "reversal", "transaction", "reversal"]
+
+    def test_transaction_on_another_users_account_is_not_posted(self, db):
+        account = create_account(db, user_id=2)
+
+        create_transaction(db, account.id, "30.00")
+
+        assert stored_balance(db, account.id) == Decimal("100.00")
+        assert db.query(AccountLedgerEntry).filter(AccountLedgerEntry.entry_type == "transaction").count() == 0
+
+    def test_concurrent_writers_do_not_lose_updates(self, session_factory):
+        setup = session_factory()
+        account_id = create_account(setup).id
+        setup.close()
+
+        first, second = session_factory(), session_factory()
+        stale = crud_financial_account.get_financial_account(first, account_id, TENANT_ID)
+        assert stale.current_balance == Decimal("100.00")
+        create_transaction(second, account_id, "10.00", type="credit")
+        create_transaction(first, account_id, "5.00", type="credit")
+
+        assert stored_balance(second, account_id) == Decimal("115.00")
+        first.close()
+        second.close()
+
+    def test_setting_balance_posts_an_adjustment(self, db):
+        account = create_account(db)
+
+        crud_financial_account.update_financial_account(
+            db, db_obj=account, obj_in=FinancialAccountUpdate(current_balance=Decimal("80.00"))
+        )
+
+        adjustment = db.query(AccountLedgerEntry).filter(AccountLedgerEntry.entry_type == "adjustment").one()
+        assert adjustment.amount == Decimal("-20.00")
+        assert stored_balance(db, account.id) == Decimal("80.00")
+
+
+class TestBalanceAsOf:
+    """Test snapshot-based historical balances"""
+
+    def test_balance_as_of_uses_snapshot_plus_later_entries(self, db):
+        account = create_account(db, "0")
+        create_transaction(db, account.id, "100.00", type="credit", transaction_date=date(2024, 1, 5))
+        create_transaction(db, account.id, "30.00", transaction_date=date(2024, 2, 10))
+        assert account_ledger.create_snapshots(db, snapshot_date=date(2024, 1, 31)) == 1
+        assert account_ledger.create_snapshots(db, snapshot_date=date(2024, 1, 31)) == 0
+        create_transaction(db, account.id, "20.00", transaction_date=date(2024, 3, 3))
+
+        assert db.query(AccountBalanceSnapshot).filter(
+            AccountBalanceSnapshot.account_id == account.id
+        ).one().balance == Decimal("100.00")
+        assert account_ledger.get_balance_as_of(db, account_id=account.id, as_of=date(2024, 1, 31)) == Decimal("100.00")
+        assert account_ledger.get_balance_as_of(db, account_id=account.id, as_of=date(2024, 2, 29)) == Decimal("70.00")
+        assert account_ledger.get_balance_as_of(db, account_id=account.id, as_of=date(2024, 3, 31)) == Decimal("50.00")
+        assert account_ledger.get_balance_as_of(db, account_id=account.id, as_of=date(2023, 12, 31)) == Decimal("0")
+
+    def test_backdated_entry_updates_later_snapshots(self, db):
+        account = create_account(db, "0")
+        create_transaction(db, account.id, "100.00", type="credit", transaction_date=date(2024, 1, 5))
+        account_ledger.create_snapshots(db, snapshot_date=date(2024, 1, 31))
+        account_ledger.create_snapshots(db, snapshot_date=date(2024, 2, 29))
+
+        create_transaction(db, account.id, "10.00", transaction_date=date(2024, 2, 1))
+
+        snapshots = db.query(AccountBalanceSnapshot).order_by(AccountBalanceSnapshot.snapshot_date).all()
+        assert [s.balance for s in snapshots] == [Decimal("100.00"), Decimal("90.00")]
+        assert account_ledger.get_balance_as_of(db, account_id=account.id, as_of=date(2024, 3, 1)) == Decimal("90.00")
+
+    def test_balances_for_many_accounts_in_two_queries(self, db, engine):
+        accounts = [create_account(db, "0") for _ in range(5)]
+        for i, account in enumerate(accounts):
+            create_transaction(db, account.id, f"{i + 1}0.00", type="credit", transaction_date=date(2024, 1, 5))
+        account_ledger.create_snapshots(db, snapshot_date=date(2024, 1, 31))
+        account_ids = [account.id for account in accounts]
+
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        balances = account_ledger.get_balances_as_of(db, account_ids=account_ids, as_of=date(2024, 2, 15))
+
+        assert balances == {account_id: Decimal(f"{i + 1}0.00") for i, account_id in enumerate(account_ids)}
+        assert len(statements) == 2
@@ -0,0 +1,132 @@
+"""
+Tests for grouped per-account transaction summaries
+"""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401 - register all mappers
+from app.core.money import currency_exponents
+from app.crud import financial_account as crud_financial_account
+from app.crud import transaction as crud_transaction
+from app.models.exchange_rate import ExchangeRate
+from app.models.financial_account import FinancialAccount
+from app.models.transaction import Transaction
+from app.services.financial_analytics_service import FinancialAnalyticsService
+
+TENANT_ID = 1
+USER_ID = 1
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    FinancialAccount.__table__.create(bind=engine)
+    Transaction.__table__.create(bind=engine)
+    ExchangeRate.__table__.create(bind=engine)
+    return engine
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture(autouse=True)
+def exponents():
+    # The currencies table uses ARRAY columns, which sqlite cannot create
+    currency_exponents.prime({"USD": 2})
+    yield
+    currency_exponents.invalidate()
+
+
+@pytest.fixture
+def statements(engine):
+    seen = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        seen.append(statement)
+
+    return seen
+
+
+@pytest.fixture
+def accounts(db):
+    """Checking with four transactions, an empty savings account and a credit card."""
+    checking = FinancialAccount(tenant_id=TENANT_ID, user_id=USER_ID, account_name="Checking",
+                                account_type="checking", current_balance=Decimal("500.00"))
+    savings = FinancialAccount(tenant_id=TENANT_ID, user_id=USER_ID, account_name="Savings",
+                               account_type="savings", current_balance=Decimal("1000.00"))
+    card = FinancialAccount(tenant_id=TENANT_ID, user_id=USER_ID, account_name="Visa",
+                            account_type="credit_card", current_balance=Decimal("-200.00"))
+    db.add_all([checking, savings, card])
+    db.flush()
+    db.add_all([
+        Transaction(tenant_id=TENANT_ID, user_id=USER_ID, account_id=checking.id, type="credit",
+                    amount=Decimal("100.00"), transaction_date=date(2024, 1, 5)),
+        Transaction(tenant_id=TENANT_ID, user_id=USER_ID, account_id=checking.id, type="debit",
+                    amount=Decimal("30.00"), transaction_date=date(2024, 2, 10)),
+        Transaction(tenant_id=TENANT_ID, user_id=USER_ID, account_id=checking.id, type="debit",
+                    amount=Decimal("12.50"), transaction_date=date(2024, 1, 20)),
+        # Another user's transaction against the same account is not counted
+        Transaction(tenant_id=TENANT_ID, user_id=2, account_id=checking.id, type="credit",
+                    amount=Decimal("999.00"), transaction_date=date(2024, 3, 1)),
+        Transaction(tenant_id=TENANT_ID, user_id=USER_ID, account_id=card.id, type="debit",
+                    amount=Decimal("200.00"), transaction_date=date(2024, 2, 1)),
+    ])
+    db.commit()
+    return checking.id, savings.id, card.id
+
+
+class TestAccountSummaries:
+    """Test that summaries match the per-account queries they replace"""
+
+    def test_accounts_with_summaries_in_one_query(self, db, accounts, statements):
+        checking, savings, card = accounts
+        statements.clear()
+
+        result = crud_financial_account.get_financial_accounts_with_summaries(
+            db, user_id=USER_ID, tenant_id=TENANT_ID
+        )
+
+        assert len(statements) == 1
+        assert [account.id for account, _ in result] == [checking, savings, card]
+        summaries = {account.id: summary for account, summary in result}
+        assert summaries[checking] == {
+            "transaction_count": 3,
+            "total_credits": Decimal("100.00"),
+            "total_debits": Decimal("42.50"),
+            "last_transaction_date": date(2024, 2, 10),
+        }
+        assert summaries[savings] == {
+            "transaction_count": 0, "total_credits": 0, "total_debits": 0, "last_transaction_date": None
+        }
+        assert summaries[card]["total_debits"] == Decimal("200.00")
+
+    def test_single_account_summary_matches_grouped_summary(self, db, accounts):
+        checking, savings, _ = accounts
+
+        summaries = crud_transaction.get_account_summaries(db, user_id=USER_ID, account_ids=[checking, savings])
+
+        assert crud_transaction.get_account_summary(db, account_id=checking, user_id=USER_ID) == summaries[checking]
+        assert summaries[savings]["transaction_count"] == 0
+
+    def test_net_worth_uses_the_grouped_summary(self, db, accounts, statements):
+        statements.clear()
+
+        net_worth = FinancialAnalyticsService(db).calculate_net_worth(
+            user_id=USER_ID, tenant_id=TENANT_ID, currency="USD"
+        )
+
+        # Accounts with their summaries, then the converted totals
+        assert len(statements) == 2
+        assert net_worth["net_worth"] == 1300.0
+        assert net_worth["assets"][0]["transaction_count"] == 3
+        assert net_worth["assets"][0]["last_transaction_date"] == "2024-02-10"
+        assert net_worth["liabilities"][0]["account_name"] == "Visa"
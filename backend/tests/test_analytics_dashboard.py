@@ -0,0 +1,156 @@
+"""
+Tests for the analytics dashboard bundle and its per-tenant cache
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from app.crud import interaction_analytics
+from app.crud.analytics import AnalyticsService, DashboardSnapshot, relationship_health
+from app.services import analytics_dashboard
+from app.services.analytics_dashboard import DashboardCache, build_dashboard
+
+TENANT_ID = 1
+TODAY = date(2025, 3, 10)
+
+
+def contact(contact_id, strength, next_contact_in=None, urgency=None):
+    return SimpleNamespace(
+        id=contact_id,
+        first_name="Contact",
+        last_name=str(contact_id),
+        connection_strength=Decimal(strength),
+        next_suggested_contact_date=TODAY + timedelta(days=next_contact_in) if next_contact_in is not None else None,
+        follow_up_urgency=urgency
+    )
+
+
+@pytest.fixture
+def snapshot():
+    totals = dict.fromkeys(interaction_analytics.TOTALS_COLUMNS, 0)
+    totals.update(
+        contact_count=2, total_interactions=6, in_person_meetings=2, phone_calls=3, emails=1,
+        interactions_last_30_days=4, interactions_initiated_by_user=4, interactions_initiated_by_contact=2,
+        avg_interaction_quality=7.5, avg_interaction_duration=20.0
+    )
+    return DashboardSnapshot(
+        summary={"total_contacts": 4, "active_contacts": 3, "strong_relationships": 1,
+                 "pending_follow_ups": 0, "overdue_follow_ups": 2},
+        active_contacts=[
+            contact(1, "9.0"),
+            contact(2, "4.0", next_contact_in=-3, urgency="high"),
+            contact(3, "2.0", next_contact_in=-1, urgency="low"),
+        ],
+        interaction_totals=totals,
+        recent_activity={"interactions_last_30_days": 4, "new_contacts_last_30_days": 1,
+                         "follow_ups_completed": 18, "events_attended": 5},
+        top_insights=[],
+        today=TODAY
+    )
+
+
+class TestBuildDashboard:
+    """Test that every panel is computed from the one snapshot"""
+
+    def test_panels(self, snapshot):
+        bundle = build_dashboard(snapshot)
+
+        assert bundle["overview"]["summary"]["total_contacts"] == 4
+        assert bundle["overview"]["network_health"]["relationship_strength_avg"] == 5.0
+        assert bundle["kpis"]["network_size"] == 4
+        assert bundle["kpis"]["strong_relationships_ratio"] == 0.25
+        assert bundle["network_health"] == relationship_health(snapshot.active_contacts)
+        assert bundle["interactions_overview"]["interaction_frequency"] == 3.0
+        assert bundle["interaction_types"] == {"meetings": 2, "calls": 3, "emails": 1, "texts": 0}
+        assert bundle["response_rate"]["overall_response_rate"] == pytest.approx(1 / 3)
+
+    def test_overdue_follow_ups(self, snapshot):
+        overdue = build_dashboard(snapshot)["follow_ups_overdue"]
+
+        assert overdue["total_overdue"] == 2
+        assert overdue["overdue_by_urgency"] == {"high": 1, "medium": 0, "low": 1}
+        assert [c["days_overdue"] for c in overdue["overdue_contacts"]] == [3, 1]
+
+    def test_empty_tenant(self, snapshot):
+        empty = snapshot._replace(active_contacts=[])
+
+        bundle = build_dashboard(empty)
+
+        assert bundle["network_health"]["overall_health"]["score"] == 0.0
+        assert bundle["follow_ups_overdue"]["total_overdue"] == 0
+
+
+class TestDashboardCache:
+    """Test that bundles are cached per tenant and dropped on writes"""
+
+    @pytest.fixture
+    def loads(self, monkeypatch, snapshot):
+        calls = []
+
+        def load(service):
+            calls.append(service.tenant_id)
+            return snapshot
+
+        monkeypatch.setattr(AnalyticsService, "load_dashboard_snapshot", load)
+        return calls
+
+    def test_serves_cached_bundle(self, loads):
+        cache = DashboardCache()
+
+        first = cache.get_bundle(None, TENANT_ID)
+        second = cache.get_bundle(None, TENANT_ID)
+
+        assert second is first
+        assert loads == [TENANT_ID]
+
+    def test_refresh_and_invalidate_reload(self, loads):
+        cache = DashboardCache()
+
+        cache.get_bundle(None, TENANT_ID)
+        cache.get_bundle(None, TENANT_ID, refresh=True)
+        cache.invalidate(TENANT_ID)
+        cache.get_bundle(None, TENANT_ID)
+        cache.get_bundle(None, 2)
+
+        assert loads == [TENANT_ID, TENANT_ID, TENANT_ID, 2]
+
+    def test_expired_entry_reloads(self, loads):
+        cache = DashboardCache(ttl_seconds=0)
+
+        cache.get_bundle(None, TENANT_ID)
+        cache.get_bundle(None, TENANT_ID)
+
+        assert loads == [TENANT_ID, TENANT_ID]
+
+    def test_invalidated_while_loading_is_not_cached(self, monkeypatch, loads):
+        cache = DashboardCache()
+        build = analytics_dashboard.build_dashboard
+
+        def build_and_invalidate(snapshot):
+            cache.invalidate(TENANT_ID)
+            return build(snapshot)
+
+        monkeypatch.setattr(analytics_dashboard, "build_dashboard", build_and_invalidate)
+        cache.get_bundle(None, TENANT_ID)
+        monkeypatch.setattr(analytics_dashboard, "build_dashboard", build)
+        cache.get_bundle(None, TENANT_ID)
+
+        assert loads == [TENANT_ID, TENANT_ID]
+
+    def test_invalidate_all_while_loading_is_not_cached(self, monkeypatch, loads):
+        cache = DashboardCache()
+        build = analytics_dashboard.build_dashboard
+
+        def build_and_invalidate_all(snapshot):
+            cache.invalidate()
+            return build(snapshot)
+
+        # The tenant has no generation yet when the global invalidation lands
+        monkeypatch.setattr(analytics_dashboard, "build_dashboard", build_and_invalidate_all)
+        cache.get_bundle(None, TENANT_ID)
+        monkeypatch.setattr(analytics_dashboard, "build_dashboard", build)
+        cache.get_bundle(None, TENANT_ID)
+
+        assert loads == [TENANT_ID, TENANT_ID]
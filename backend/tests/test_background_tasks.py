@@ -4,7 +4,9 @@ from datetime import datetime
 
 from app.services.background_tasks import (
     process_all_recurring_transactions,
+    process_recurring_transactions_chunk,
     process_user_recurring_transactions,
+    aggregate_chunk_results,
     send_recurring_transaction_reminders,
     health_check,
     get_task_status
@@ -14,61 +16,75 @@ from app.services.background_tasks import (
 class TestBackgroundTasks:
     """Test background task functionality."""
     
+    @patch('app.services.background_tasks.chord')
+    @patch('app.services.background_tasks.crud_recurring_transaction')
     @patch('app.services.background_tasks.SessionLocal')
-    @patch('app.services.background_tasks.RecurringTransactionService')
     def test_process_all_recurring_transactions_success(
         self, 
-        mock_service_class, 
-        mock_session_local
+        mock_session_local,
+        mock_crud,
+        mock_chord
     ):
-        """Test successful processing of all recurring transactions."""
+        """Test that processing all recurring transactions fans out per-tenant chunks."""
         # Mock database session
         mock_db = Mock()
         mock_session_local.return_value = mock_db
         
-        # Mock service and its response
-        mock_service = Mock()
-        mock_service_class.return_value = mock_service
-        mock_service.process_due_recurring_transactions.return_value = {
-            "processed": 5,
-            "failed": 0,
-            "skipped": 2,
-            "total_due": 7,
-            "details": [],
-            "errors": [],
-            "skipped_details": []
-        }
+        # Three users in tenant 1, one in tenant 2
+        mock_crud.get_users_with_due.return_value = [(1, 1), (2, 1), (3, 1), (4, 2)]
+        mock_chord.return_value.return_value.id = "aggregate-task-id"
         
-        # Execute the task
-        result = process_all_recurring_transactions(dry_run=False)
+        with patch('app.services.background_tasks.settings') as mock_settings:
+            mock_settings.BACKGROUND_TASK_CHUNK_SIZE = 2
+            result = process_all_recurring_transactions(dry_run=False)
         
-        # Verify the result
-        assert result["processed"] == 5
-        assert result["failed"] == 0
-        assert result["skipped"] == 2
+        # Verify the dispatch summary
+        assert result["job"] == "recurring_transactions"
+        assert result["chunks"] == 3
+        assert result["aggregate_task_id"] == "aggregate-task-id"
         
-        # Verify service was called correctly
-        mock_service.process_due_recurring_transactions.assert_called_once_with(dry_run=False)
+        # Verify one chunk signature per tenant chunk
+        chunk_group = mock_chord.call_args[0][0]
+        chunk_args = [sig.args for sig in chunk_group.tasks]
+        assert chunk_args == [(1, [1, 2]), (1, [3]), (2, [4])]
+        assert all(sig.kwargs == {"dry_run": False} for sig in chunk_group.tasks)
         
         # Verify database session was closed
         mock_db.close.assert_called_once()
     
+    @patch('app.services.background_tasks.chord')
+    @patch('app.services.background_tasks.crud_recurring_transaction')
+    @patch('app.services.background_tasks.SessionLocal')
+    def test_process_all_recurring_transactions_nothing_due(
+        self,
+        mock_session_local,
+        mock_crud,
+        mock_chord
+    ):
+        """Test that nothing is dispatched when no recurring transactions are due."""
+        mock_session_local.return_value = Mock()
+        mock_crud.get_users_with_due.return_value = []
+        
+        result = process_all_recurring_transactions(dry_run=False)
+        
+        assert result["chunks"] == 0
+        assert result["aggregate_task_id"] is None
+        mock_chord.assert_not_called()
+    
+    @patch('app.services.background_tasks.crud_recurring_transaction')
     @patch('app.services.background_tasks.SessionLocal')
-    @patch('app.services.background_tasks.RecurringTransactionService')
     def test_process_all_recurring_transactions_with_exception(
         self, 
-        mock_service_class, 
-        mock_session_local
+        mock_session_local,
+        mock_crud
     ):
         """Test handling of exceptions in recurring transaction processing."""
         # Mock database session
         mock_db = Mock()
         mock_session_local.return_value = mock_db
         
-        # Mock service that raises an exception
-        mock_service = Mock()
-        mock_service_class.return_value = mock_service
-        mock_service.process_due_recurring_transactions.side_effect = Exception("Database error")
+        # Mock a query that raises an exception
+        mock_crud.get_users_with_due.side_effect = Exception("Database error")
         
         # Execute the task and expect it to raise an exception
         with pytest.raises(Exception, match="Database error"):
@@ -77,6 +93,48 @@ class TestBackgroundTasks:
         # Verify database session was still closed
         mock_db.close.assert_called_once()
     
+    @patch('app.services.background_tasks.SessionLocal')
+    @patch('app.services.background_tasks.RecurringTransactionService')
+    def test_process_recurring_transactions_chunk(
+        self,
+        mock_service_class,
+        mock_session_local
+    ):
+        """Test that a chunk processes each of its users and sums the counters."""
+        mock_db = Mock()
+        mock_session_local.return_value = mock_db
+        
+        mock_service = Mock()
+        mock_service_class.return_value = mock_service
+        mock_service.process_due_recurring_transactions.side_effect = [
+            {"processed": 2, "failed": 0, "skipped": 1, "total_due": 3},
+            {"processed": 1, "failed": 1, "skipped": 0, "total_due": 2},
+        ]
+        
+        result = process_recurring_transactions_chunk(tenant_id=7, user_ids=[10, 11], dry_run=True)
+        
+        assert result == {"processed": 3, "failed": 1, "skipped": 1, "total_due": 5, "users": 2}
+        mock_service.process_due_recurring_transactions.assert_any_call(user_id=10, tenant_id=7, dry_run=True)
+        mock_service.process_due_recurring_transactions.assert_any_call(user_id=11, tenant_id=7, dry_run=True)
+        mock_db.close.assert_called_once()
+    
+    def test_aggregate_chunk_results(self):
+        """Test that the chord callback sums numeric counters across chunks."""
+        result = aggregate_chunk_results(
+            [
+                {"processed": 3, "failed": 1, "users": 2},
+                {"processed": 4, "failed": 0, "users": 1, "processed_date": "2025-01-20"},
+            ],
+            job="recurring_transactions"
+        )
+        
+        assert result["job"] == "recurring_transactions"
+        assert result["chunks"] == 2
+        assert result["processed"] == 7
+        assert result["failed"] == 1
+        assert result["users"] == 3
+        assert "aggregated_at" in result
+    
     @patch('app.services.background_tasks.SessionLocal')
     @patch('app.services.background_tasks.RecurringTransactionService')
     def test_process_user_recurring_transactions_success(
@@ -0,0 +1,180 @@
+"""
+Tests for set-based budget evaluation and the running-total spending cache
+"""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401 - register all mappers
+from app.core.config import settings
+from app.crud import budget as crud_budget
+from app.crud import transaction as crud_transaction
+from app.models.budget import Budget
+from app.models.monthly_transaction_rollup import MonthlyTransactionRollup
+from app.models.transaction import Transaction
+from app.schemas.budget import BudgetUpdate
+from app.schemas.transaction import TransactionCreate, TransactionUpdate
+from app.services.budget_spending_cache import budget_spending_cache
+
+TENANT_ID = 1
+USER_ID = 1
+TODAY = date(2024, 5, 15)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    Budget.__table__.create(bind=engine)
+    Transaction.__table__.create(bind=engine)
+    MonthlyTransactionRollup.__table__.create(bind=engine)
+    return engine
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def statements(engine):
+    seen = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        seen.append(statement)
+
+    return seen
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    budget_spending_cache.invalidate(TENANT_ID, USER_ID)
+    yield
+    budget_spending_cache.invalidate(TENANT_ID, USER_ID)
+
+
+def add_budget(db, name, period, amount="100.00", user_id=USER_ID, start_date=date(2024, 1, 1), **extra):
+    budget = Budget(tenant_id=TENANT_ID, user_id=user_id, name=name, period=period,
+                    budget_amount=Decimal(amount), start_date=start_date, alert_percentage=80, **extra)
+    db.add(budget)
+    return budget
+
+
+def add_transaction(db, amount, transaction_date, type="debit", user_id=USER_ID, **extra):
+    db.add(Transaction(tenant_id=TENANT_ID, user_id=user_id, type=type, amount=Decimal(amount),
+                       transaction_date=transaction_date, **extra))
+
+
+@pytest.fixture
+def budgets(db):
+    budgets = {
+        "groceries": add_budget(db, "Groceries", "monthly", category_id=1),
+        "dining": add_budget(db, "Dining", "quarterly", "500.00", subcategory_id=7),
+        "everything": add_budget(db, "Everything", "yearly", "2000.00"),
+        "trip": add_budget(db, "Trip", "custom", "300.00", start_date=date(2024, 4, 1), end_date=date(2024, 5, 1)),
+        "other_user": add_budget(db, "Other", "monthly", "10.00", user_id=2),
+    }
+    add_transaction(db, "60.00", date(2024, 5, 2), category_id=1)
+    add_transaction(db, "25.00", date(2024, 5, 31), category_id=1, subcategory_id=7)
+    add_transaction(db, "40.00", date(2024, 4, 30), category_id=1)      # last month
+    add_transaction(db, "90.00", date(2024, 4, 10), subcategory_id=7)
+    add_transaction(db, "500.00", date(2024, 5, 3), type="credit", category_id=1)
+    add_transaction(db, "70.00", date(2024, 5, 4), user_id=2, category_id=1)
+    add_transaction(db, "15.00", date(2024, 6, 1))                       # next month
+    db.commit()
+    return budgets
+
+
+def reference_spent(db, budget):
+    """Spent amount from the original one-SUM-per-budget rules."""
+    start, end = crud_budget.get_budget_period(budget, TODAY)
+    return sum(
+        (t.amount for t in db.query(Transaction).all()
+         if t.user_id == budget.user_id and t.type == "debit" and start <= t.transaction_date < end
+         and (budget.category_id is None or t.category_id == budget.category_id)
+         and (budget.subcategory_id is None or t.subcategory_id == budget.subcategory_id)),
+        Decimal("0")
+    )
+
+
+class TestBudgetEvaluation:
+    """Test that one grouped query matches per-budget evaluation"""
+
+    def test_all_budgets_evaluated_in_one_query(self, db, budgets, statements):
+        statements.clear()
+
+        rows = crud_budget.get_budgets_with_spending(db, tenant_id=TENANT_ID, current_date=TODAY)
+
+        assert len(statements) == 1
+        spent = {budget.name: amount for budget, amount in rows}
+        assert spent == {
+            "Groceries": Decimal("85.00"),
+            "Dining": Decimal("115.00"),
+            "Everything": Decimal("230.00"),
+            "Trip": Decimal("130.00"),
+            "Other": Decimal("70.00"),
+        }
+        for budget, amount in rows:
+            assert amount == reference_spent(db, budget)
+
+    def test_single_budget_summary(self, db, budgets):
+        summary = crud_budget.get_budget_spending_summary(db, budgets["groceries"], TODAY)
+
+        assert summary["spent_amount"] == Decimal("85.00")
+        assert summary["remaining_amount"] == Decimal("15.00")
+        assert summary["is_over_budget"] is False
+        assert summary["days_remaining"] == 17
+        assert (summary["period_start"], summary["period_end"]) == (date(2024, 5, 1), date(2024, 6, 1))
+
+
+class TestBudgetSpendingCache:
+    """Test running totals kept current by transaction writes"""
+
+    @pytest.fixture(autouse=True)
+    def enable_cache(self, monkeypatch):
+        monkeypatch.setattr(settings, "BUDGET_SPENDING_CACHE_ENABLED", True)
+
+    def summaries(self, db):
+        return {
+            budget.name: summary["spent_amount"]
+            for budget, summary in crud_budget.get_budget_summaries(
+                db, user_id=USER_ID, tenant_id=TENANT_ID, current_date=TODAY
+            )
+        }
+
+    def test_cached_totals_follow_transaction_writes(self, db, budgets, statements):
+        self.summaries(db)
+        statements.clear()
+
+        transaction = crud_transaction.create_transaction(
+            db,
+            obj_in=TransactionCreate(type="debit", amount=Decimal("10.00"), transaction_date=TODAY, category_id=1),
+            user_id=USER_ID,
+            tenant_id=TENANT_ID
+        )
+        crud_transaction.update_transaction(
+            db, db_obj=transaction, obj_in=TransactionUpdate(amount=Decimal("12.00"), subcategory_id=7)
+        )
+        statements.clear()
+        cached = self.summaries(db)
+
+        assert not any("sum(" in statement.lower() for statement in statements)
+        assert cached["Groceries"] == Decimal("97.00")
+        assert cached["Dining"] == Decimal("127.00")
+        budget_spending_cache.invalidate(TENANT_ID, USER_ID)
+        assert self.summaries(db) == cached
+
+        crud_transaction.delete_transaction(db, transaction_id=transaction.id, user_id=USER_ID, tenant_id=TENANT_ID)
+        assert self.summaries(db)["Everything"] == Decimal("230.00")
+
+    def test_budget_changes_invalidate_totals(self, db, budgets):
+        assert self.summaries(db)["Everything"] == Decimal("230.00")
+
+        crud_budget.update(db, db_obj=budgets["everything"], obj_in=BudgetUpdate(category_id=1))
+
+        assert self.summaries(db)["Everything"] == Decimal("125.00")
@@ -0,0 +1,131 @@
+"""
+Tests for contact relationship read queries against an in-memory database
+"""
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401 - register all mappers
+from app.crud import contact_relationship as crud_relationship
+from app.models.contact import Contact
+from app.models.contact_relationship import ContactRelationship
+
+TENANT_ID = 1
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    Contact.__table__.create(bind=engine)
+    ContactRelationship.__table__.create(bind=engine)
+    return engine
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def query_counter(engine):
+    """Count SELECT statements issued against the engine."""
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    return statements
+
+
+def add_contact(db, first_name, last_name=None, tenant_id=TENANT_ID):
+    contact = Contact(tenant_id=tenant_id, created_by_user_id=1, first_name=first_name, last_name=last_name)
+    db.add(contact)
+    db.flush()
+    return contact
+
+
+def relate(db, a, b, type_a_to_b, type_b_to_a, category, is_active=True, tenant_id=TENANT_ID):
+    """Store a relationship in both directions, as create_contact_relationship does."""
+    for source, target, rel_type in [(a, b, type_a_to_b), (b, a, type_b_to_a)]:
+        db.add(ContactRelationship(
+            tenant_id=tenant_id,
+            created_by_user_id=1,
+            contact_a_id=source.id,
+            contact_b_id=target.id,
+            relationship_type=rel_type,
+            relationship_category=category,
+            is_active=is_active,
+        ))
+    db.flush()
+
+
+class TestRelationshipSummary:
+    """Test the single-query relationship summary read model"""
+
+    def test_summary_groups_by_category(self, db):
+        me = add_contact(db, "Alex", "Smith")
+        sister = add_contact(db, "Beth", "Smith")
+        father = add_contact(db, "Carl", "Smith")
+        friend = add_contact(db, "Dana")
+        boss = add_contact(db, "Eve", "Stone")
+        relate(db, me, sister, "sister", "brother", "family")
+        relate(db, me, father, "father", "son", "family")
+        relate(db, me, friend, "friend", "friend", "social")
+        relate(db, me, boss, "manager", "report", "professional")
+        db.commit()
+
+        summary = crud_relationship.get_relationship_summary(db, me.id, TENANT_ID)
+
+        assert set(summary) == {"family", "social", "professional"}
+        assert [r["other_contact_name"] for r in summary["family"]] == ["Beth Smith", "Carl Smith"]
+        assert [r["relationship_type"] for r in summary["family"]] == ["sister", "father"]
+        assert summary["social"][0]["other_contact_name"] == "Dana"
+        assert summary["social"][0]["other_contact_id"] == friend.id
+        assert summary["professional"][0]["relationship_type"] == "manager"
+
+    def test_summary_lists_each_relationship_once(self, db):
+        me = add_contact(db, "Alex")
+        sibling = add_contact(db, "Beth")
+        relate(db, me, sibling, "sister", "brother", "family")
+        db.commit()
+
+        summary = crud_relationship.get_relationship_summary(db, me.id, TENANT_ID)
+
+        assert len(summary["family"]) == 1
+        assert summary["family"][0]["other_contact_id"] == sibling.id
+
+    def test_summary_uses_a_single_query(self, db, query_counter):
+        me = add_contact(db, "Alex")
+        for i in range(25):
+            relate(db, me, add_contact(db, f"Relative {i}"), "cousin", "cousin", "family")
+        db.commit()
+        me_id = me.id
+        query_counter.clear()
+
+        summary = crud_relationship.get_relationship_summary(db, me_id, TENANT_ID)
+
+        assert len(summary["family"]) == 25
+        assert len(query_counter) == 1
+
+    def test_summary_excludes_inactive_and_other_tenants(self, db):
+        me = add_contact(db, "Alex")
+        relate(db, me, add_contact(db, "Former"), "friend", "friend", "social", is_active=False)
+        relate(db, me, add_contact(db, "Other tenant"), "friend", "friend", "social", tenant_id=2)
+        db.commit()
+
+        assert crud_relationship.get_relationship_summary(db, me.id, TENANT_ID) == {}
+
+    def test_summary_handles_missing_counterpart(self, db):
+        me = add_contact(db, "Alex")
+        ghost = add_contact(db, "Ghost")
+        relate(db, me, ghost, "friend", "friend", "social")
+        db.query(Contact).filter(Contact.id == ghost.id).delete(synchronize_session=False)
+        db.commit()
+
+        summary = crud_relationship.get_relationship_summary(db, me.id, TENANT_ID)
+
+        assert summary["social"][0]["other_contact_name"] == "Unknown"
@@ -0,0 +1,120 @@
+"""
+Tests for the grouped debt summary and overdue scan
+"""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401 - register all mappers
+from app.crud import personal_debt as debt_crud
+from app.models.contact import Contact
+from app.models.personal_debt import DebtPayment, DebtStatus, DebtType, PaymentStatus, PersonalDebt
+
+TENANT_ID = 1
+USER_ID = 1
+TODAY = date(2024, 6, 15)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    for model in (Contact, PersonalDebt, DebtPayment):
+        model.__table__.create(bind=engine)
+    return engine
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def statements(engine):
+    seen = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        seen.append(statement)
+
+    return seen
+
+
+def add_contact(db, name, user_id=USER_ID):
+    contact = Contact(tenant_id=TENANT_ID, created_by_user_id=user_id, first_name=name)
+    db.add(contact)
+    db.flush()
+    return contact
+
+
+def add_debt(db, creditor, debtor, amount, due_date=None, payments=(), status=DebtStatus.ACTIVE,
+             payment_status=PaymentStatus.UNPAID, user_id=USER_ID):
+    debt = PersonalDebt(tenant_id=TENANT_ID, user_id=user_id, creditor_contact_id=creditor.id,
+                        debtor_contact_id=debtor.id, debt_type=DebtType.PERSONAL_LOAN, amount=Decimal(amount),
+                        due_date=due_date, status=status, payment_status=payment_status, created_date=date(2024, 1, 1))
+    db.add(debt)
+    db.flush()
+    for payment in payments:
+        db.add(DebtPayment(debt_id=debt.id, amount=Decimal(payment), payment_date=date(2024, 2, 1)))
+    return debt
+
+
+@pytest.fixture
+def debts(db):
+    """Debts between one of the user's contacts and another user's contact, in both directions."""
+    mine = add_contact(db, "Mine")
+    theirs = add_contact(db, "Theirs", user_id=2)
+    debts = {
+        "lent": add_debt(db, mine, theirs, "100.00", due_date=date(2024, 6, 1), payments=["30.00", "20.00"],
+                         payment_status=PaymentStatus.PARTIAL),
+        "lent_later": add_debt(db, mine, theirs, "40.00", due_date=date(2024, 7, 1)),
+        "borrowed": add_debt(db, theirs, mine, "250.00", due_date=date(2024, 5, 1)),
+        "repaid": add_debt(db, theirs, mine, "60.00", due_date=date(2024, 3, 1), payments=["60.00"],
+                           status=DebtStatus.PAID, payment_status=PaymentStatus.PAID),
+        "other_user": add_debt(db, theirs, theirs, "999.00", due_date=date(2024, 1, 1), user_id=2),
+    }
+    db.commit()
+    return debts
+
+
+class TestDebtReadModel:
+    """Test that summaries and overdue scans are single grouped queries"""
+
+    def test_summary_in_one_query(self, db, debts, statements):
+        statements.clear()
+
+        summary = debt_crud.get_debt_summary(db, USER_ID, TENANT_ID, as_of_date=TODAY)
+
+        assert len(statements) == 1
+        assert summary == {
+            "total_debts": 3,
+            "total_amount_owed_to_me": Decimal("90.00"),
+            "total_amount_i_owe": Decimal("250.00"),
+            "active_debts": 3,
+            "overdue_debts": 2,
+        }
+
+    def test_overdue_debts_with_balances_in_one_query(self, db, debts, statements):
+        statements.clear()
+
+        overdue = debt_crud.get_overdue_debts_with_balances(db, USER_ID, TENANT_ID, as_of_date=TODAY)
+
+        assert len(statements) == 1
+        assert [(debt.id, paid, remaining) for debt, paid, remaining in overdue] == [
+            (debts["borrowed"].id, Decimal("0"), Decimal("250.00")),
+            (debts["lent"].id, Decimal("50.00"), Decimal("50.00")),
+        ]
+        assert debt_crud.get_overdue_debts(db, USER_ID, TENANT_ID, as_of_date=TODAY) == [
+            debts["borrowed"], debts["lent"]
+        ]
+
+    def test_balances_match_per_debt_totals(self, db, debts):
+        overdue = debt_crud.get_overdue_debts_with_balances(db, USER_ID, TENANT_ID, as_of_date=date(2024, 12, 31))
+
+        for debt, paid, remaining in overdue:
+            assert paid == debt_crud.get_total_paid(db, debt.id)
+            assert remaining == debt.amount - paid
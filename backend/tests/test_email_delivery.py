@@ -0,0 +1,207 @@
+"""
+Tests for the pooled, queued email delivery pipeline
+"""
+import io
+import smtplib
+import threading
+from datetime import date
+from decimal import Decimal
+from email.mime.text import MIMEText
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.services.email_delivery import (
+    EmailDeliveryQueue,
+    EmailSink,
+    FileEmailSink,
+    SMTPConnectionPool,
+    StdoutEmailSink,
+)
+from app.services.notification_service import NotificationService
+
+
+def make_message(to: str = "user@example.com") -> MIMEText:
+    msg = MIMEText("body")
+    msg["Subject"] = "Test"
+    msg["To"] = to
+    return msg
+
+
+class RecordingSink(EmailSink):
+    """Test sink that records recipients and can fail the first N sends."""
+
+    def __init__(self, errors=None):
+        self.sent = []
+        self.errors = list(errors or [])
+        self._lock = threading.Lock()
+
+    def send(self, message):
+        with self._lock:
+            if self.errors:
+                raise self.errors.pop(0)
+            self.sent.append(message["To"])
+
+
+class TestEmailDeliveryQueue:
+    """Test concurrent sending and retry behaviour"""
+
+    def test_delivers_all_messages(self):
+        sink = RecordingSink()
+        delivery = EmailDeliveryQueue(sink, max_workers=4, max_pending=2)
+
+        futures = [delivery.submit(make_message(f"user{i}@example.com")) for i in range(20)]
+
+        assert all(future.result() for future in futures)
+        assert sorted(sink.sent) == sorted(f"user{i}@example.com" for i in range(20))
+        delivery.close()
+
+    def test_retries_transient_errors(self):
+        sink = RecordingSink(errors=[smtplib.SMTPServerDisconnected("gone"), smtplib.SMTPResponseException(451, b"busy")])
+        delivery = EmailDeliveryQueue(sink, max_workers=1, max_retries=3, retry_backoff_seconds=0)
+
+        assert delivery.send(make_message()) is True
+        assert sink.sent == ["user@example.com"]
+        delivery.close()
+
+    def test_does_not_retry_permanent_errors(self):
+        sink = RecordingSink(errors=[smtplib.SMTPRecipientsRefused({"user@example.com": (550, b"no such user")})])
+        delivery = EmailDeliveryQueue(sink, max_workers=1, max_retries=3, retry_backoff_seconds=0)
+
+        assert delivery.send(make_message()) is False
+        assert sink.sent == []
+        assert sink.errors == []
+        delivery.close()
+
+    def test_gives_up_after_max_retries(self):
+        sink = RecordingSink(errors=[ConnectionRefusedError()] * 3)
+        delivery = EmailDeliveryQueue(sink, max_workers=1, max_retries=2, retry_backoff_seconds=0)
+
+        assert delivery.send(make_message()) is False
+        assert sink.sent == []
+        delivery.close()
+
+
+class TestSinks:
+    """Test SMTP pooling and the local sinks"""
+
+    @patch("app.services.email_delivery.smtplib.SMTP")
+    def test_smtp_pool_reuses_connection(self, mock_smtp):
+        pool = SMTPConnectionPool("smtp.example.com", 587, use_tls=True, username="u", password="p", size=2)
+
+        for _ in range(5):
+            pool.send(make_message())
+
+        mock_smtp.assert_called_once_with("smtp.example.com", 587, timeout=30.0)
+        server = mock_smtp.return_value
+        server.starttls.assert_called_once()
+        server.login.assert_called_once_with("u", "p")
+        assert server.send_message.call_count == 5
+
+    @patch("app.services.email_delivery.smtplib.SMTP")
+    def test_smtp_pool_replaces_broken_connection(self, mock_smtp):
+        broken, healthy = Mock(), Mock()
+        broken.send_message.side_effect = smtplib.SMTPServerDisconnected("gone")
+        mock_smtp.side_effect = [broken, healthy]
+        pool = SMTPConnectionPool("smtp.example.com", 25, use_tls=False, size=1)
+
+        with pytest.raises(smtplib.SMTPServerDisconnected):
+            pool.send(make_message())
+        pool.send(make_message())
+
+        assert mock_smtp.call_count == 2
+        healthy.send_message.assert_called_once()
+
+    @patch("app.services.email_delivery.smtplib.SMTP")
+    def test_smtp_pool_recycles_after_message_limit(self, mock_smtp):
+        pool = SMTPConnectionPool("smtp.example.com", 25, use_tls=False, size=1, max_messages_per_connection=2)
+
+        for _ in range(4):
+            pool.send(make_message())
+
+        assert mock_smtp.call_count == 2
+
+    def test_file_sink_writes_eml_files(self, tmp_path):
+        sink = FileEmailSink(str(tmp_path / "outbox"))
+
+        sink.send(make_message("a@example.com"))
+        sink.send(make_message("b@example.com"))
+
+        files = list((tmp_path / "outbox").glob("*.eml"))
+        assert len(files) == 2
+        assert any("To: a@example.com" in f.read_text() for f in files)
+
+    def test_stdout_sink_writes_message(self):
+        stream = io.StringIO()
+        StdoutEmailSink(stream).send(make_message("a@example.com"))
+
+        assert "To: a@example.com" in stream.getvalue()
+
+
+class TestNotificationServiceDelivery:
+    """Test reminder sending through the delivery queue"""
+
+    def _reminder(self, days_until_due):
+        return {
+            "recurring_id": 1,
+            "description": "Rent Payment",
+            "amount": Decimal("1200.00"),
+            "currency": "USD",
+            "type": "debit",
+            "next_due_date": date.today(),
+            "days_until_due": days_until_due,
+            "is_due_soon": True,
+            "category_name": "Housing",
+            "account_name": None,
+        }
+
+    @patch("app.services.notification_service.crud")
+    def test_send_reminders_queues_one_email_per_user(self, mock_crud):
+        users = []
+        for i in range(3):
+            user = Mock(id=i + 1, tenant_id=1, email=f"user{i}@example.com", first_name=f"User{i}")
+            users.append(user)
+        users.append(Mock(id=99, tenant_id=1, email=None))
+        mock_crud.user.get_all_active.return_value = users
+
+        sink = RecordingSink()
+        service = NotificationService(Mock(), delivery_queue=EmailDeliveryQueue(sink, max_workers=2))
+        service.recurring_service = Mock()
+        service.recurring_service.get_upcoming_recurring_transactions.side_effect = [
+            [self._reminder(0)],
+            [self._reminder(5)],  # not a reminder day
+            [self._reminder(1), self._reminder(7)],
+        ]
+
+        result = service.send_recurring_transaction_reminders()
+
+        assert result["notifications_sent"] == 2
+        assert result["failed_notifications"] == 0
+        assert sorted(sink.sent) == ["user0@example.com", "user2@example.com"]
+        assert {d["user_id"]: d["reminder_count"] for d in result["details"]} == {1: 1, 3: 2}
+
+    @patch("app.services.notification_service.crud")
+    def test_send_reminders_reports_failed_deliveries(self, mock_crud):
+        mock_crud.user.get_all_active.return_value = [
+            Mock(id=1, tenant_id=1, email="user@example.com", first_name="User")
+        ]
+        sink = RecordingSink(errors=[smtplib.SMTPRecipientsRefused({})])
+        service = NotificationService(Mock(), delivery_queue=EmailDeliveryQueue(sink, max_workers=1))
+        service.recurring_service = Mock()
+        service.recurring_service.get_upcoming_recurring_transactions.return_value = [self._reminder(3)]
+
+        result = service.send_recurring_transaction_reminders()
+
+        assert result["notifications_sent"] == 0
+        assert result["failed_notifications"] == 1
+        assert result["errors"][0]["error"] == "Failed to send email"
+
+    def test_reminder_message_has_text_and_html_parts(self):
+        service = NotificationService(Mock(), delivery_queue=EmailDeliveryQueue(RecordingSink()))
+        user = Mock(email="user@example.com", first_name="Alice")
+
+        msg = service._build_reminder_message(user, [self._reminder(0)])
+
+        assert msg["To"] == "user@example.com"
+        assert msg["Subject"] == "Recaller: 1 Upcoming Recurring Transaction(s)"
+        assert [part.get_content_type() for part in msg.get_payload()] == ["text/plain", "text/html"]
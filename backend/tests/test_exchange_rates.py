@@ -0,0 +1,210 @@
+"""
+Tests for the exchange rate table, rate cache and SQL-side currency conversion
+"""
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401 - register all mappers
+from app.cli.fx_commands import fx
+from app.core.money import currency_exponents
+from app.crud import exchange_rate as crud_exchange_rate
+from app.crud import financial_account, transaction  # noqa: F401 - used through app.crud by the service
+from app.models.exchange_rate import ExchangeRate
+from app.models.financial_account import FinancialAccount
+from app.models.gift import Gift
+from app.models.transaction import Transaction
+from app.services.financial_analytics_service import FinancialAnalyticsService
+from app.services.fx_rates import FxRateCache, load_rates_file, read_rates_file
+from app.services.gift_integration import GiftIntegrationService
+
+TENANT_ID = 1
+USER_ID = 1
+
+RATES_CSV = """date,base,quote,rate
+2024-01-01,EUR,USD,1.10
+2024-02-01,EUR,USD,1.08
+2024-02-01,usd,jpy,150
+"""
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    for model in (ExchangeRate, FinancialAccount, Transaction, Gift):
+        model.__table__.create(bind=engine)
+    return engine
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def statements(engine):
+    seen = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        seen.append(statement)
+
+    return seen
+
+
+@pytest.fixture(autouse=True)
+def exponents():
+    # The currencies table uses ARRAY columns, which sqlite cannot create
+    currency_exponents.prime({"USD": 2, "EUR": 2, "JPY": 0})
+    yield
+    currency_exponents.invalidate()
+
+
+@pytest.fixture
+def rates(db, tmp_path):
+    path = tmp_path / "rates.csv"
+    path.write_text(RATES_CSV)
+    assert load_rates_file(db, str(path)) == 3
+
+
+class TestRateTable:
+    """Test loading and looking up rates"""
+
+    def test_latest_rate_on_or_before_date(self, db, rates):
+        assert crud_exchange_rate.get_rate(db, base="EUR", quote="USD", as_of=date(2024, 1, 15)) == Decimal("1.10")
+        assert crud_exchange_rate.get_rate(db, base="EUR", quote="USD", as_of=date(2024, 3, 1)) == Decimal("1.08")
+        assert crud_exchange_rate.get_rate(db, base="EUR", quote="USD", as_of=date(2023, 12, 31)) is None
+        assert crud_exchange_rate.get_rate(db, base="USD", quote="USD", as_of=date(2023, 12, 31)) == 1
+
+    def test_inverse_rate_when_only_the_opposite_pair_is_known(self, db, rates):
+        rate = crud_exchange_rate.get_rate(db, base="JPY", quote="USD", as_of=date(2024, 2, 1))
+
+        assert rate == 1 / Decimal("150")
+
+    def test_reload_replaces_rates_for_the_same_day(self, db, rates, tmp_path):
+        path = tmp_path / "rates.json"
+        path.write_text('[{"date": "2024-02-01", "base": "EUR", "quote": "USD", "rate": "1.09", "source": "ecb"}]')
+
+        load_rates_file(db, str(path))
+
+        assert db.query(ExchangeRate).count() == 3
+        stored = db.query(ExchangeRate).filter(ExchangeRate.rate == Decimal("1.09")).one()
+        assert stored.source == "ecb"
+
+    def test_bad_records_are_reported_by_line(self, tmp_path):
+        path = tmp_path / "rates.csv"
+        path.write_text("date,base,quote,rate\n2024-01-01,EUR,USD,1.1\n2024-01-02,EUR,USD,-1\n")
+
+        with pytest.raises(ValueError, match="line 3: rate must be positive"):
+            read_rates_file(str(path))
+
+    def test_load_rates_command(self, db, tmp_path):
+        path = tmp_path / "rates.csv"
+        path.write_text(RATES_CSV)
+
+        with patch("app.cli.fx_commands.get_db_session", return_value=db):
+            result = CliRunner().invoke(fx, ["load-rates", str(path)])
+
+        assert result.exit_code == 0
+        assert "Loaded 3 exchange rate(s)" in result.output
+
+
+class TestRateCache:
+    """Test the (from, to, date) LRU"""
+
+    def test_hits_misses_and_eviction(self, db, rates, statements):
+        cache = FxRateCache(max_entries=2)
+        statements.clear()
+
+        assert cache.get_rate(db, "EUR", "USD", date(2024, 2, 10)) == Decimal("1.08")
+        assert cache.get_rate(db, "EUR", "USD", date(2024, 2, 10)) == Decimal("1.08")
+        assert cache.get_rate(db, "GBP", "USD", date(2024, 2, 10)) is None
+        assert cache.get_rate(db, "GBP", "USD", date(2024, 2, 10)) is None
+        assert len(statements) == 2
+
+        cache.get_rate(db, "USD", "JPY", date(2024, 2, 10))
+        cache.get_rate(db, "EUR", "USD", date(2024, 2, 10))
+        assert len(statements) == 4
+
+        cache.clear()
+        cache.get_rate(db, "USD", "JPY", date(2024, 2, 10))
+        assert len(statements) == 5
+
+
+class TestConvertedTotals:
+    """Test cross-currency totals converted in the database"""
+
+    @pytest.fixture
+    def accounts(self, db, rates):
+        for name, account_type, balance, currency in [
+            ("Checking", "checking", "100.00", "USD"),
+            ("Girokonto", "savings", "200.00", "EUR"),
+            ("Tokyo", "checking", "15000", "JPY"),
+            ("London", "savings", "50.00", "GBP"),
+            ("Visa", "credit_card", "-40.00", "EUR"),
+        ]:
+            db.add(FinancialAccount(tenant_id=TENANT_ID, user_id=USER_ID, account_name=name,
+                                    account_type=account_type, current_balance=Decimal(balance), currency=currency))
+        db.commit()
+
+    def test_net_worth_converts_per_currency(self, db, accounts, statements):
+        service = FinancialAnalyticsService(db)
+        with patch("app.services.financial_analytics_service.date") as mock_date:
+            mock_date.today.return_value = date(2024, 2, 15)
+            statements.clear()
+            net_worth = service.calculate_net_worth(user_id=USER_ID, tenant_id=TENANT_ID, currency="USD")
+
+        assert len(statements) == 2
+        # 100 + 200 * 1.08 + 15000 / 150; GBP has no rate
+        assert net_worth["total_assets"] == Decimal("416.00")
+        assert net_worth["total_liabilities"] == Decimal("43.20")
+        assert net_worth["net_worth"] == Decimal("372.80")
+        assert net_worth["unconverted_currencies"] == ["GBP"]
+        assert net_worth["assets_by_currency"]["JPY"] == Decimal("15000")
+
+    def test_dashboard_balance_in_requested_currency(self, db, accounts):
+        with patch("app.services.financial_analytics_service.date") as mock_date, \
+                patch("app.services.financial_analytics_service.crud.transaction_rollup.get_monthly_totals") as totals, \
+                patch("app.services.financial_analytics_service.crud.transaction.get_transactions_by_user"):
+            mock_date.today.return_value = date(2024, 2, 15)
+            empty = {"total_credits": Decimal("0"), "total_debits": Decimal("0"),
+                     "net_amount": Decimal("0"), "transaction_count": 0}
+            totals.return_value = {(2024, 1): empty, (2024, 2): empty}
+            summary = FinancialAnalyticsService(db).get_dashboard_summary(USER_ID, TENANT_ID, currency="EUR")
+
+        # 100 / 1.08 + 200 - 40; there is no JPY/EUR or GBP pair
+        assert summary["currency"] == "EUR"
+        assert summary["unconverted_currencies"] == ["GBP", "JPY"]
+        assert summary["total_balance"] == Decimal("252.59")
+        assert summary["account_count"] == 5
+
+    def test_gift_spending_in_one_query(self, db, rates, statements):
+        for amount, currency, purchased in [
+            ("10.00", "USD", date(2024, 3, 5)),
+            ("50.00", "EUR", date(2024, 3, 20)),
+            ("3000", "JPY", date(2024, 4, 1)),
+            ("7.00", "GBP", None),
+        ]:
+            db.add(Gift(tenant_id=TENANT_ID, user_id=USER_ID, title="Gift", actual_amount=Decimal(amount),
+                        currency=currency, purchase_date=purchased, gift_details={}))
+        db.commit()
+        statements.clear()
+
+        summary = GiftIntegrationService(db, USER_ID, TENANT_ID).get_financial_summary(currency="USD")
+
+        assert len(statements) == 1
+        assert summary["summary"]["total_spent"] == 84.0
+        assert summary["summary"]["total_gifts"] == 4
+        assert summary["summary"]["unconverted_gifts"] == 1
+        assert summary["summary"]["average_spent"] == 28.0
+        assert summary["monthly_breakdown"] == [
+            {"month": 3, "spent": 64.0, "gift_count": 2},
+            {"month": 4, "spent": 20.0, "gift_count": 1},
+        ]
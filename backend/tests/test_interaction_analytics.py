@@ -0,0 +1,192 @@
+"""
+Tests for incrementally maintained interaction analytics
+"""
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401 - register all mappers
+from app.crud import contact as crud_contact
+from app.crud import contact_interaction as crud_interaction
+from app.crud import interaction_analytics
+from app.crud.analytics import AnalyticsService
+from app.models.analytics import InteractionAnalytics, InteractionAnalyticsTotals
+from app.models.contact import Contact, ContactInteraction
+from app.schemas.contact import ContactInteractionCreate, ContactInteractionUpdate
+
+TENANT_ID = 1
+NOW = datetime.now(timezone.utc)
+
+
+# Deleting a contact loads every table related to it, some of which use postgres-only column types
+@compiles(ARRAY, "sqlite")
+@compiles(JSONB, "sqlite")
+def _compile_as_json(type_, compiler, **kw):
+    return "JSON"
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    related = {relation.mapper.local_table for relation in Contact.__mapper__.relationships}
+    for table in related | {Contact.__table__, InteractionAnalytics.__table__, InteractionAnalyticsTotals.__table__}:
+        table.create(bind=engine)
+    return engine
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def statements(engine):
+    seen = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        seen.append(statement)
+
+    return seen
+
+
+@pytest.fixture
+def contacts(db):
+    contacts = [Contact(tenant_id=TENANT_ID, created_by_user_id=1, first_name=name) for name in ("Ada", "Grace")]
+    db.add_all(contacts)
+    db.commit()
+    return contacts
+
+
+def record(db, contact, interaction_type, days_ago, quality=None, duration=None, initiated_by="me"):
+    """Record an interaction; without a quality it gets the schema default of 5.0"""
+    fields = {"interaction_quality": Decimal(quality)} if quality else {}
+    return crud_interaction.create_interaction(db, ContactInteractionCreate(
+        contact_id=contact.id,
+        interaction_type=interaction_type,
+        interaction_date=NOW - timedelta(days=days_ago),
+        duration_minutes=duration,
+        initiated_by=initiated_by,
+        **fields
+    ), TENANT_ID)
+
+
+def snapshot(db):
+    """Contact rows and tenant totals as plain values, for comparing against a rebuild."""
+    db.expire_all()
+    rows = {
+        row.contact_id: tuple(
+            getattr(row, column) for column in interaction_analytics.COUNTER_COLUMNS
+            + interaction_analytics.AVERAGE_SOURCE_COLUMNS + ('avg_interaction_quality', 'avg_interaction_duration')
+        ) + (row.last_interaction_date.replace(tzinfo=None),)
+        for row in db.query(InteractionAnalytics)
+    }
+    return rows, interaction_analytics.get_totals(db, tenant_id=TENANT_ID)
+
+
+@pytest.fixture
+def interactions(db, contacts):
+    ada, grace = contacts
+    return [
+        record(db, ada, "meeting", 2, quality="9.0", duration=60),
+        record(db, ada, "call", 40, quality="8.0", duration=15, initiated_by="them"),
+        record(db, grace, "email", 5, quality="4.5"),
+        record(db, grace, "text", 1, initiated_by="mutual"),
+    ]
+
+
+class TestIncrementalMaintenance:
+    """Test that writes keep the analytics equal to a full rebuild"""
+
+    def test_creates_match_rebuild(self, db, interactions):
+        incremental = snapshot(db)
+        interaction_analytics.rebuild(db)
+
+        assert snapshot(db) == incremental
+        rows, totals = incremental
+        assert totals["total_interactions"] == 4
+        assert totals["contact_count"] == 2
+        assert totals["interactions_last_30_days"] == 3
+        assert totals["high_quality_contacts"] == 1
+        # Ada averages 8.50, Grace (4.5 and the default 5.0) 4.75
+        assert totals["quality_average_total"] == Decimal("13.25")
+
+    def test_updates_and_deletes_match_rebuild(self, db, contacts, interactions):
+        ada, grace = contacts
+        latest = interactions[0]
+        crud_interaction.update_interaction(db, latest, ContactInteractionUpdate(
+            interaction_type="call", interaction_date=NOW - timedelta(days=60)
+        ), TENANT_ID)
+        crud_interaction.update_interaction(db, interactions[2], ContactInteractionUpdate(
+            duration_minutes=30, interaction_quality=None
+        ), TENANT_ID)
+        crud_interaction.delete_interaction(db, interactions[3].id, TENANT_ID)
+
+        incremental = snapshot(db)
+        interaction_analytics.rebuild(db)
+
+        assert snapshot(db) == incremental
+        rows, totals = incremental
+        assert rows[ada.id][0] == 2
+        assert rows[grace.id][0] == 1
+        assert totals["phone_calls"] == 2
+        assert totals["interactions_last_30_days"] == 1
+        # Grace's only interaction left has no quality, so only Ada's average counts
+        assert totals["quality_average_total"] == Decimal("8.50")
+        assert totals["high_quality_contacts"] == 1
+
+    def test_last_interaction_removed_drops_contact(self, db, contacts):
+        ada, _ = contacts
+        only = record(db, ada, "meeting", 1, quality="9.0")
+
+        crud_interaction.delete_interaction(db, only.id, TENANT_ID)
+
+        assert db.query(InteractionAnalytics).count() == 0
+        assert interaction_analytics.get_totals(db, tenant_id=TENANT_ID)["contact_count"] == 0
+        assert interaction_analytics.get_totals(db, tenant_id=TENANT_ID)["high_quality_contacts"] == 0
+
+    def test_deleting_contact_leaves_totals(self, db, contacts, interactions):
+        ada, _ = contacts
+
+        crud_contact.delete_contact(db, contact_id=ada.id, tenant_id=TENANT_ID)
+
+        totals = interaction_analytics.get_totals(db, tenant_id=TENANT_ID)
+        assert totals["contact_count"] == 1
+        assert totals["total_interactions"] == 2
+        assert totals["high_quality_contacts"] == 0
+
+    def test_decay_drops_aged_interactions(self, db, interactions):
+        checked = interaction_analytics.decay_recent_windows(db, now=NOW + timedelta(days=28, hours=12))
+
+        assert checked == 2
+        totals = interaction_analytics.get_totals(db, tenant_id=TENANT_ID)
+        # Only the text from a day ago is still within 30 days
+        assert totals["interactions_last_30_days"] == 1
+
+
+class TestTenantTotals:
+    """Test that tenant-level reads come from one row"""
+
+    def test_interaction_totals_in_one_query(self, db, interactions, statements):
+        statements.clear()
+
+        totals = AnalyticsService(db, TENANT_ID).get_interaction_totals()
+
+        assert len(statements) == 1
+        assert totals["total_interactions"] == 4
+        assert totals["avg_interaction_quality"] == 6.625
+        assert totals["interactions_initiated_by_user"] == 2
+        assert totals["interactions_initiated_by_contact"] == 1
+
+    def test_empty_tenant(self, db):
+        totals = AnalyticsService(db, TENANT_ID).get_interaction_totals()
+
+        assert totals["contact_count"] == 0
+        assert totals["avg_interaction_quality"] == 0.0
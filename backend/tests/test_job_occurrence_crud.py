@@ -0,0 +1,105 @@
+"""
+Tests for the scheduled job idempotency ledger
+"""
+import pytest
+from datetime import date
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.crud import job_occurrence
+from app.models.job_occurrence import JobOccurrence
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite:///:memory:")
+
+    # pysqlite needs explicit BEGIN for SAVEPOINT to behave like PostgreSQL
+    @event.listens_for(engine, "connect")
+    def do_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def do_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    JobOccurrence.__table__.create(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+class TestJobOccurrenceClaim:
+    """Test that each (job_type, source_id, occurrence_date) can be claimed once"""
+
+    def test_first_claim_succeeds(self, db):
+        occurrence = job_occurrence.claim(
+            db, job_type=job_occurrence.PERSONAL_REMINDER, source_id=1,
+            occurrence_date=date(2025, 3, 1), tenant_id=1
+        )
+        db.commit()
+
+        assert occurrence is not None
+        assert job_occurrence.get_occurrence(
+            db, job_type=job_occurrence.PERSONAL_REMINDER, source_id=1, occurrence_date=date(2025, 3, 1)
+        ).id == occurrence.id
+
+    def test_duplicate_claim_is_rejected(self, db):
+        job_occurrence.claim(
+            db, job_type=job_occurrence.PERSONAL_REMINDER, source_id=1,
+            occurrence_date=date(2025, 3, 1), tenant_id=1
+        )
+        db.commit()
+
+        duplicate = job_occurrence.claim(
+            db, job_type=job_occurrence.PERSONAL_REMINDER, source_id=1,
+            occurrence_date=date(2025, 3, 1), tenant_id=1
+        )
+
+        assert duplicate is None
+        assert db.query(JobOccurrence).count() == 1
+
+    def test_rejected_claim_keeps_outer_transaction_usable(self, db):
+        job_occurrence.claim(
+            db, job_type=job_occurrence.PERSONAL_REMINDER, source_id=1,
+            occurrence_date=date(2025, 3, 1), tenant_id=1
+        )
+        db.commit()
+
+        assert job_occurrence.claim(
+            db, job_type=job_occurrence.PERSONAL_REMINDER, source_id=1,
+            occurrence_date=date(2025, 3, 1), tenant_id=1
+        ) is None
+        next_claim = job_occurrence.claim(
+            db, job_type=job_occurrence.PERSONAL_REMINDER, source_id=2,
+            occurrence_date=date(2025, 3, 1), tenant_id=1
+        )
+        db.commit()
+
+        assert next_claim is not None
+        assert db.query(JobOccurrence).count() == 2
+
+    def test_keys_differ_by_job_type_and_date(self, db):
+        claims = [
+            job_occurrence.claim(db, job_type=job_type, source_id=1, occurrence_date=occurrence_date, tenant_id=1)
+            for job_type, occurrence_date in [
+                (job_occurrence.PERSONAL_REMINDER, date(2025, 3, 1)),
+                (job_occurrence.RECURRING_TRANSACTION, date(2025, 3, 1)),
+                (job_occurrence.PERSONAL_REMINDER, date(2026, 3, 1)),
+            ]
+        ]
+        db.commit()
+
+        assert all(claim is not None for claim in claims)
+
+    def test_uncommitted_claim_is_discarded_on_rollback(self, db):
+        job_occurrence.claim(
+            db, job_type=job_occurrence.RECURRING_TRANSACTION, source_id=5,
+            occurrence_date=date(2025, 3, 1), tenant_id=1
+        )
+        db.rollback()
+
+        assert job_occurrence.claim(
+            db, job_type=job_occurrence.RECURRING_TRANSACTION, source_id=5,
+            occurrence_date=date(2025, 3, 1), tenant_id=1
+        ) is not None
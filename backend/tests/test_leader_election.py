@@ -0,0 +1,175 @@
+"""
+Tests for Redis-based leader election of per-cluster background services
+"""
+import asyncio
+from unittest.mock import Mock, patch
+
+import pytest
+import redis
+
+from app.services.leader_election import LeaderElection
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def fake_redis():
+    """Shared in-memory Redis stand-in, as seen by every simulated worker."""
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+def make_worker(fake_redis, identity, lease_seconds=30, renew_interval_seconds=10):
+    election = LeaderElection(
+        lock_key="test:leader",
+        lease_seconds=lease_seconds,
+        renew_interval_seconds=renew_interval_seconds,
+        redis_getter=lambda: fake_redis,
+        identity=identity,
+    )
+    elected, demoted = Mock(), Mock()
+    election.register(elected, demoted)
+    return election, elected, demoted
+
+
+class TestLeaderElection:
+    """Test leader election, lease renewal and failover"""
+
+    def test_renew_interval_must_be_shorter_than_lease(self, fake_redis):
+        with pytest.raises(ValueError):
+            LeaderElection("test:leader", lease_seconds=10, renew_interval_seconds=10,
+                           redis_getter=lambda: fake_redis)
+
+    def test_only_one_worker_is_elected(self, fake_redis):
+        workers = [make_worker(fake_redis, f"worker-{i}") for i in range(4)]
+
+        results = [election.step() for election, _, _ in workers]
+
+        assert results == [True, False, False, False]
+        assert fake_redis.get("test:leader") == "worker-0"
+        workers[0][1].assert_called_once()
+        for _, elected, _ in workers[1:]:
+            elected.assert_not_called()
+
+    def test_leader_renews_lease(self, fake_redis):
+        leader, elected, demoted = make_worker(fake_redis, "worker-a")
+        leader.step()
+        fake_redis.pexpire("test:leader", 500)
+
+        assert leader.step() is True
+        assert fake_redis.pttl("test:leader") > 500
+        elected.assert_called_once()
+        demoted.assert_not_called()
+
+    def test_renew_fails_when_lease_taken_by_another_worker(self, fake_redis):
+        leader, _, demoted = make_worker(fake_redis, "worker-a")
+        leader.step()
+        fake_redis.set("test:leader", "worker-b")
+
+        assert leader.step() is False
+        demoted.assert_called_once()
+        assert fake_redis.get("test:leader") == "worker-b"
+
+    def test_failover_after_lease_expires(self, fake_redis):
+        leader, _, _ = make_worker(fake_redis, "worker-a")
+        follower, follower_elected, _ = make_worker(fake_redis, "worker-b")
+        leader.step()
+        assert follower.step() is False
+
+        # Leader dies without releasing; its lease expires
+        fake_redis.delete("test:leader")
+
+        assert follower.step() is True
+        follower_elected.assert_called_once()
+        assert follower.get_current_leader() == "worker-b"
+
+    def test_release_only_deletes_own_lease(self, fake_redis):
+        leader, _, _ = make_worker(fake_redis, "worker-a")
+        follower, _, _ = make_worker(fake_redis, "worker-b")
+        leader.step()
+
+        assert follower.release() is False
+        assert fake_redis.get("test:leader") == "worker-a"
+        assert leader.release() is True
+        assert fake_redis.get("test:leader") is None
+
+    @pytest.mark.parametrize("error", [
+        redis.ConnectionError("down"),
+        redis.ReadOnlyError("You can't write against a read only replica."),
+        redis.ResponseError("LOADING Redis is loading the dataset in memory"),
+    ])
+    def test_redis_outage_keeps_leadership_until_lease_expires(self, fake_redis, error):
+        leader, _, demoted = make_worker(fake_redis, "worker-a")
+        leader.step()
+
+        with patch.object(leader, "renew", side_effect=error):
+            assert leader.step() is True
+            demoted.assert_not_called()
+
+            leader._lease_expires_at = 0.0
+            assert leader.step() is False
+            demoted.assert_called_once()
+
+    def test_redis_outage_follower_stays_follower(self, fake_redis):
+        follower, elected, _ = make_worker(fake_redis, "worker-b")
+
+        with patch.object(follower, "try_acquire", side_effect=redis.ConnectionError("down")):
+            assert follower.step() is False
+        elected.assert_not_called()
+
+    def test_callback_errors_do_not_break_election(self, fake_redis):
+        election = LeaderElection("test:leader", redis_getter=lambda: fake_redis, identity="worker-a")
+        healthy = Mock()
+        election.register(Mock(side_effect=RuntimeError("boom")), Mock())
+        election.register(healthy, Mock())
+
+        assert election.step() is True
+        healthy.assert_called_once()
+
+    def test_stop_demotes_and_releases_lease(self, fake_redis):
+        leader, elected, demoted = make_worker(fake_redis, "worker-a")
+        follower, follower_elected, _ = make_worker(fake_redis, "worker-b")
+
+        async def run():
+            leader.start()
+            await asyncio.sleep(0)
+            await leader.stop()
+
+        asyncio.run(run())
+
+        elected.assert_called_once()
+        demoted.assert_called_once()
+        assert fake_redis.get("test:leader") is None
+        assert follower.step() is True
+        follower_elected.assert_called_once()
+
+    def test_election_loop_survives_unexpected_errors(self, fake_redis):
+        election, elected, _ = make_worker(fake_redis, "worker-a", lease_seconds=1, renew_interval_seconds=0.01)
+        step = election.step
+        rounds = []
+
+        def flaky_step():
+            rounds.append(None)
+            if len(rounds) == 1:
+                raise RuntimeError("boom")
+            return step()
+
+        async def run():
+            with patch.object(election, "step", side_effect=flaky_step):
+                election.start()
+                await asyncio.sleep(0.05)
+                await election.stop()
+
+        asyncio.run(run())
+
+        assert len(rounds) > 1
+        elected.assert_called_once()
+
+    def test_stop_tolerates_redis_errors_on_release(self, fake_redis):
+        leader, _, demoted = make_worker(fake_redis, "worker-a")
+        leader.step()
+
+        with patch.object(leader, "release", side_effect=redis.ReadOnlyError("read only")):
+            asyncio.run(leader.stop())
+
+        assert leader.is_leader is False
+        demoted.assert_called_once()
@@ -0,0 +1,173 @@
+"""
+Property-based tests for exact money arithmetic in minor units
+"""
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from hypothesis import given, strategies as st
+
+from app.core.money import (
+    CurrencyExponents, CurrencyTotals, Money, divide_minor, from_minor, mean_amount, percentage,
+    sum_amounts, to_minor
+)
+from app.services.financial_analytics_service import FinancialAnalyticsService
+
+exponents = st.integers(min_value=0, max_value=4)
+minor_units = st.integers(min_value=-10 ** 15, max_value=10 ** 15)
+
+
+@st.composite
+def amounts(draw, exponent=2):
+    """Decimals with exactly `exponent` places, like values read from Numeric(15, 2)."""
+    return from_minor(draw(minor_units), exponent)
+
+
+class TestMinorUnits:
+    """Test conversion between Decimal amounts and integer minor units"""
+
+    @given(minor_units, exponents)
+    def test_round_trip(self, minor, exponent):
+        assert to_minor(from_minor(minor, exponent), exponent) == minor
+
+    @given(minor_units, exponents)
+    def test_formatted_with_currency_places(self, minor, exponent):
+        assert from_minor(minor, exponent).as_tuple().exponent == -exponent
+
+    @given(st.lists(amounts(), max_size=50))
+    def test_sum_is_exact(self, values):
+        assert sum_amounts(values) == sum(values, Decimal("0"))
+
+    @given(st.lists(amounts(), min_size=1, max_size=50))
+    def test_sum_is_order_independent(self, values):
+        assert sum_amounts(values) == sum_amounts(reversed(values))
+
+    @given(minor_units, st.integers(min_value=1, max_value=1000))
+    def test_divide_rounds_half_to_even(self, minor, divisor):
+        expected = (Decimal(minor) / Decimal(divisor)).to_integral_value()
+        assert divide_minor(minor, divisor) == expected
+
+    @given(st.lists(amounts(), min_size=1, max_size=50))
+    def test_mean_is_within_half_a_minor_unit(self, values):
+        mean = mean_amount(values)
+        assert abs(mean * len(values) - sum(values)) <= Decimal("0.005") * len(values)
+
+    def test_floats_are_rejected(self):
+        with pytest.raises(TypeError):
+            to_minor(0.1)
+
+    def test_float_path_drifts_where_minor_units_do_not(self):
+        values = [Decimal("0.10")] * 10
+        assert sum(float(v) for v in values) != 1.0
+        assert sum_amounts(values) == Decimal("1.00")
+
+
+class TestMoney:
+    """Test Money values and per-currency totals"""
+
+    @given(minor_units, minor_units, exponents)
+    def test_addition_matches_decimal(self, a, b, exponent):
+        left, right = Money(a, "XXX", exponent), Money(b, "XXX", exponent)
+        assert (left + right).amount == left.amount + right.amount
+        assert (left - right) + right == left
+
+    def test_currencies_do_not_mix(self):
+        with pytest.raises(ValueError):
+            Money.of("1.00", "USD") + Money.of("1", "JPY", 0)
+
+    def test_rounds_to_currency_exponent(self):
+        assert Money.of("1234.5", "JPY", 0).amount == Decimal("1234")
+        assert Money.of("1.2345", "KWD", 3).amount == Decimal("1.234")
+        assert str(Money.of("7", "USD")) == "7.00 USD"
+
+    @given(st.lists(st.tuples(st.sampled_from(["USD", "EUR"]), amounts()), max_size=30))
+    def test_totals_per_currency(self, entries):
+        totals = CurrencyTotals()
+        for code, value in entries:
+            totals.add(Money.of(value, code))
+
+        for code, total in totals.amounts().items():
+            assert total == sum((v for c, v in entries if c == code), Decimal("0"))
+
+    @given(amounts(), amounts())
+    def test_percentage_is_rounded_to_two_places(self, part, whole):
+        result = percentage(part, whole)
+        if whole <= 0:
+            assert result == 0.0
+        else:
+            assert result == float((part * 100 / whole).quantize(Decimal("0.01")))
+
+
+class TestCurrencyExponents:
+    """Test the cached currencies.decimal_places lookup"""
+
+    def test_loads_once_and_defaults_unknown_codes(self):
+        db = MagicMock()
+        db.query.return_value = [("USD", 2), ("JPY", 0), ("KWD", 3)]
+        cache = CurrencyExponents()
+
+        assert cache.get(db, "JPY") == 0
+        assert cache.get(db, "KWD") == 3
+        assert cache.get(db, "XYZ") == 2
+        assert db.query.call_count == 1
+
+        cache.invalidate()
+        cache.get(db, "USD")
+        assert db.query.call_count == 2
+
+
+class TestAnalyticsAmounts:
+    """Test that analytics totals come back as exact Decimals"""
+
+    @pytest.fixture(autouse=True)
+    def exponents(self):
+        with patch("app.services.financial_analytics_service.currency_exponents",
+                   CurrencyExponents()) as cache:
+            cache.prime({"USD": 2, "JPY": 0})
+            yield
+
+    def test_net_worth_totals_per_currency(self):
+        accounts = [
+            (SimpleNamespace(account_name="Checking", account_type="checking", current_balance=Decimal("0.10"),
+                             currency="USD"), {"transaction_count": 0, "last_transaction_date": None})
+        ]
+        # Grouped rows as returned by crud.financial_account.get_balance_totals, converted to USD
+        balance_rows = [
+            SimpleNamespace(is_liability=is_liability, currency=currency, account_count=1, total=Decimal(total),
+                            absolute_total=abs(Decimal(total)), converted_total=converted and Decimal(converted),
+                            converted_absolute_total=converted and abs(Decimal(converted)))
+            for is_liability, currency, total, converted in [
+                (False, "USD", "0.30", "0.30"),
+                (False, "JPY", "1500", "10.0300000000"),
+                (False, "GBP", "5.00", None),
+                (True, "USD", "-0.30", "-0.30"),
+            ]
+        ]
+        with patch("app.services.financial_analytics_service.crud") as crud:
+            crud.financial_account.get_financial_accounts_with_summaries.return_value = accounts
+            crud.financial_account.get_balance_totals.return_value = balance_rows
+            crud.financial_account.LIABILITY_ACCOUNT_TYPES = ("credit_card",)
+            net_worth = FinancialAnalyticsService(MagicMock()).calculate_net_worth(
+                user_id=1, tenant_id=1, currency="usd"
+            )
+
+        assert net_worth["currency"] == "USD"
+        assert net_worth["assets_by_currency"] == {"GBP": Decimal("5.00"), "JPY": Decimal("1500"), "USD": Decimal("0.30")}
+        assert net_worth["liabilities_by_currency"] == {"USD": Decimal("0.30")}
+        assert net_worth["unconverted_currencies"] == ["GBP"]
+        assert net_worth["total_assets"] == Decimal("10.33")
+        assert net_worth["net_worth"] == Decimal("10.03")
+        assert net_worth["assets"][0]["balance"] == Decimal("0.10")
+
+    def test_category_percentages(self):
+        rows = [SimpleNamespace(category_id=i, total_amount=Decimal("0.10"), transaction_count=1) for i in range(3)]
+        with patch("app.services.financial_analytics_service.crud") as crud:
+            crud.transaction.get_category_breakdown.return_value = rows
+            analysis = FinancialAnalyticsService(MagicMock()).get_category_analysis(
+                1, 1, date(2024, 1, 1), date(2024, 1, 31)
+            )
+
+        assert analysis["total_spending"] == Decimal("0.30")
+        assert [item["percentage"] for item in analysis["category_breakdown"]] == [33.33, 33.33, 33.33]
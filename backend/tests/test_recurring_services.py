@@ -128,6 +128,42 @@ class TestRecurringTransactionService:
         next_due = service.calculate_next_due_date_from_recurring(sample_recurring_transaction)
         expected_next = date(2024, 3, 1)  # Next month after Feb 1
         assert next_due == expected_next
+    
+    @pytest.fixture
+    def due_crud(self, sample_recurring_transaction):
+        """Patch the CRUD calls made while processing one due recurring transaction."""
+        sample_recurring_transaction.end_date = None
+        sample_recurring_transaction.max_occurrences = None
+        sample_recurring_transaction.occurrence_count = 2
+        with patch('app.services.recurring_transaction_service.crud') as mock_crud, \
+             patch('app.services.recurring_transaction_service.schemas'), \
+             patch('app.services.recurring_transaction_service.crud_job_occurrence') as mock_claims, \
+             patch('app.services.recurring_transaction_service.budget_spending_cache'):
+            mock_crud.recurring_transaction.get_all_due.return_value = [sample_recurring_transaction]
+            mock_crud.transaction.get_by_recurring_and_date.return_value = None
+            mock_crud.transaction.add_transaction.return_value = Mock(id=99, amount=Decimal("1500.00"))
+            yield mock_crud, mock_claims
+    
+    def test_due_transaction_commits_once(self, service, mock_db_session, sample_recurring_transaction, due_crud):
+        """Test that the claim, transaction, counter and due date are committed together."""
+        result = service.process_due_recurring_transactions()
+        
+        assert result["processed"] == 1
+        mock_db_session.commit.assert_called_once()
+        assert sample_recurring_transaction.next_due_date == date(2024, 3, 1)
+        assert sample_recurring_transaction.occurrence_count == 3
+        assert due_crud[1].claim.return_value.result_id == 99
+    
+    def test_failure_after_claim_rolls_everything_back(
+        self, service, mock_db_session, sample_recurring_transaction, due_crud
+    ):
+        """Test that nothing is committed when a step after the claim fails."""
+        with patch.object(service, 'calculate_next_due_date_from_recurring', side_effect=ValueError("bad frequency")):
+            result = service.process_due_recurring_transactions()
+        
+        assert result["failed"] == 1
+        mock_db_session.commit.assert_not_called()
+        mock_db_session.rollback.assert_called_once()
 
 
 class TestNotificationService:
@@ -215,7 +251,8 @@ class TestNotificationService:
         assert "automated reminder" in text
     
     @patch('smtplib.SMTP')
-    @patch('app.services.notification_service.settings')
+    @patch('app.services.email_delivery._delivery_queue', None)
+    @patch('app.services.email_delivery.settings')
     def test_send_reminder_email_success(
         self, 
         mock_settings, 
@@ -226,25 +263,29 @@ class TestNotificationService:
     ):
         """Test successful email sending."""
         # Configure mock settings
+        mock_settings.EMAIL_BACKEND = "smtp"
         mock_settings.SMTP_HOST = "smtp.example.com"
         mock_settings.SMTP_PORT = 587
         mock_settings.SMTP_TLS = True
         mock_settings.SMTP_USERNAME = "user"
         mock_settings.SMTP_PASSWORD = "pass"
-        mock_settings.SMTP_FROM_EMAIL = "noreply@example.com"
+        mock_settings.SMTP_POOL_SIZE = 1
+        mock_settings.EMAIL_MAX_PENDING = 10
+        mock_settings.EMAIL_MAX_RETRIES = 0
         
-        # Mock SMTP server
-        mock_server = Mock()
-        mock_smtp_class.return_value.__enter__.return_value = mock_server
+        # Mock SMTP server; the delivery pool keeps the connection open
+        mock_server = mock_smtp_class.return_value
         
         result = service._send_reminder_email(sample_user, sample_reminders)
         
         assert result is True
+        mock_smtp_class.assert_called_once_with("smtp.example.com", 587, timeout=30.0)
         mock_server.starttls.assert_called_once()
         mock_server.login.assert_called_once()
         mock_server.send_message.assert_called_once()
     
-    @patch('app.services.notification_service.settings')
+    @patch('app.services.email_delivery._delivery_queue', None)
+    @patch('app.services.email_delivery.settings')
     def test_send_reminder_email_no_smtp_config(
         self, 
         mock_settings,
@@ -253,6 +294,7 @@ class TestNotificationService:
         sample_reminders
     ):
         """Test email sending with no SMTP configuration."""
+        mock_settings.EMAIL_BACKEND = "smtp"
         mock_settings.SMTP_HOST = None
         mock_settings.SMTP_PORT = None
         
@@ -0,0 +1,230 @@
+"""
+Tests for the in-memory relationship graph and the family queries built on it
+"""
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401 - register all mappers
+from app.crud import contact_relationship as crud_relationship
+from app.crud.family_information import FamilyInformationService
+from app.models.contact import Contact
+from app.models.contact_relationship import ContactRelationship
+from app.services.relationship_graph import (
+    RelationshipEdge,
+    RelationshipGraph,
+    RelationshipGraphCache,
+    relationship_graph_cache,
+)
+
+TENANT_ID = 1
+USER_ID = 1
+
+
+@pytest.fixture(autouse=True)
+def clear_graph_cache():
+    relationship_graph_cache.invalidate()
+    yield
+    relationship_graph_cache.invalidate()
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    Contact.__table__.create(bind=engine)
+    ContactRelationship.__table__.create(bind=engine)
+    return engine
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def query_counter(engine):
+    """Count SELECT statements issued against the engine."""
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    return statements
+
+
+def add_contact(db, first_name, last_name="Smith", user_id=USER_ID):
+    contact = Contact(tenant_id=TENANT_ID, created_by_user_id=user_id, first_name=first_name, last_name=last_name)
+    db.add(contact)
+    db.flush()
+    return contact
+
+
+def relate(db, a, b, type_a_to_b, type_b_to_a, category="family", is_active=True):
+    """Store a relationship in both directions, as create_contact_relationship does."""
+    for source, target, rel_type in [(a, b, type_a_to_b), (b, a, type_b_to_a)]:
+        db.add(ContactRelationship(
+            tenant_id=TENANT_ID,
+            created_by_user_id=USER_ID,
+            contact_a_id=source.id,
+            contact_b_id=target.id,
+            relationship_type=rel_type,
+            relationship_category=category,
+            is_active=is_active,
+        ))
+    db.flush()
+
+
+@pytest.fixture
+def family(db):
+    """Grandpa -> Dad -> (Me, Sis), Dad married to Mom, Me friends with Pal."""
+    people = {name: add_contact(db, name) for name in ["Grandpa", "Dad", "Mom", "Me", "Sis", "Pal"]}
+    relate(db, people["Grandpa"], people["Dad"], "father", "son")
+    relate(db, people["Dad"], people["Me"], "father", "son")
+    relate(db, people["Dad"], people["Sis"], "father", "daughter")
+    relate(db, people["Dad"], people["Mom"], "husband", "wife")
+    relate(db, people["Me"], people["Sis"], "brother", "sister")
+    relate(db, people["Me"], people["Pal"], "friend", "friend", category="social")
+    db.commit()
+    return {name: contact.id for name, contact in people.items()}
+
+
+class TestRelationshipGraph:
+    """Test graph loading and traversal"""
+
+    def test_load_uses_a_single_query(self, db, family, query_counter):
+        query_counter.clear()
+
+        graph = RelationshipGraph.load(db, TENANT_ID, USER_ID)
+
+        assert len(query_counter) == 1
+        assert graph.contact_ids == set(family.values())
+        assert len(graph.edges()) == 12
+
+    def test_load_excludes_inactive_and_other_users(self, db, family):
+        stranger = add_contact(db, "Stranger", user_id=2)
+        other = add_contact(db, "Other", user_id=2)
+        relate(db, stranger, other, "friend", "friend", category="social")
+        relate(db, add_contact(db, "Ex"), add_contact(db, "Ex2"), "friend", "friend", is_active=False)
+        db.commit()
+
+        graph = RelationshipGraph.load(db, TENANT_ID, USER_ID)
+
+        assert graph.contact_ids == set(family.values())
+
+    def test_bfs_respects_depth_and_category(self, db, family):
+        graph = RelationshipGraph.load(db, TENANT_ID, USER_ID)
+
+        assert graph.bfs(family["Me"], 1, category="family") == {
+            family["Me"]: 0, family["Dad"]: 1, family["Sis"]: 1,
+        }
+        assert graph.bfs(family["Me"], 2, category="family") == {
+            family["Me"]: 0, family["Dad"]: 1, family["Sis"]: 1,
+            family["Grandpa"]: 2, family["Mom"]: 2,
+        }
+        assert family["Pal"] in graph.bfs(family["Me"], 1)
+        assert graph.bfs(999, 3) == {}
+
+    def test_shortest_path(self, db, family):
+        graph = RelationshipGraph.load(db, TENANT_ID, USER_ID)
+
+        path = graph.shortest_path(family["Grandpa"], family["Sis"])
+
+        assert [(e.source_id, e.target_id, e.relationship_type) for e in path] == [
+            (family["Grandpa"], family["Dad"], "father"),
+            (family["Dad"], family["Sis"], "father"),
+        ]
+        assert graph.shortest_path(family["Me"], family["Me"]) == []
+        assert graph.shortest_path(family["Grandpa"], family["Pal"], category="family") is None
+
+    def test_parent_child_pairs_from_either_direction(self):
+        graph = RelationshipGraph([
+            RelationshipEdge(1, 2, "mother", "family"),
+            RelationshipEdge(2, 1, "son", "family"),
+            RelationshipEdge(4, 3, "daughter", "family"),
+            RelationshipEdge(1, 3, "friend", "social"),
+        ])
+
+        assert graph.parent_child_pairs() == {(1, 2), (3, 4)}
+
+
+class TestRelationshipGraphCache:
+    """Test caching and invalidation"""
+
+    def test_graph_is_cached_until_invalidated(self, db, family, query_counter):
+        cache = RelationshipGraphCache()
+        query_counter.clear()
+
+        first = cache.get_graph(db, TENANT_ID, USER_ID)
+        assert cache.get_graph(db, TENANT_ID, USER_ID) is first
+        assert len(query_counter) == 1
+
+        cache.invalidate(TENANT_ID)
+        assert cache.get_graph(db, TENANT_ID, USER_ID) is not first
+        assert len(query_counter) == 2
+
+    def test_relationship_writes_invalidate_graph(self, db, family):
+        before = relationship_graph_cache.get_graph(db, TENANT_ID, USER_ID)
+
+        crud_relationship.delete_contact_relationship(db, family["Me"], family["Pal"], TENANT_ID)
+        after = relationship_graph_cache.get_graph(db, TENANT_ID, USER_ID)
+
+        assert after is not before
+        assert family["Pal"] not in after.contact_ids
+
+
+class TestFamilyInformationGraph:
+    """Test family queries backed by the relationship graph"""
+
+    def test_family_members_map_contact_to_own_relationship(self, db, family):
+        service = FamilyInformationService(db)
+
+        members = service.get_family_members(USER_ID, TENANT_ID)
+
+        types = {m.contact.id: m.relationship_type for m in members}
+        assert family["Pal"] not in types
+        assert types[family["Grandpa"]] == "father"
+        assert types[family["Mom"]] == "wife"
+        assert types[family["Sis"]] == "daughter"
+
+    def test_family_tree_nests_children_under_parents(self, db, family):
+        service = FamilyInformationService(db)
+        members = service.get_family_members(USER_ID, TENANT_ID)
+        pairs = relationship_graph_cache.get_graph(db, TENANT_ID, USER_ID).parent_child_pairs()
+
+        tree = service._build_family_tree(members, depth=3, parent_child_pairs=pairs)
+
+        roots = {node.contact_name: node for node in tree}
+        assert set(roots) == {"Grandpa Smith", "Mom Smith"}
+        dad = roots["Grandpa Smith"].children[0]
+        assert dad.contact_name == "Dad Smith"
+        assert sorted(child.contact_name for child in dad.children) == ["Me Smith", "Sis Smith"]
+
+    def test_family_tree_survives_parent_cycles(self):
+        service = FamilyInformationService(None)
+        members = [
+            type("Member", (), {"contact": Contact(id=i, first_name=f"C{i}"), "relationship_type": "parent"})()
+            for i in (1, 2)
+        ]
+
+        tree = service._build_family_tree(members, depth=3, parent_child_pairs={(1, 2), (2, 1)})
+
+        assert len(tree) == 1
+        assert tree[0].children[0].children == []
+
+    def test_get_relatives_and_relationship_path(self, db, family):
+        service = FamilyInformationService(db)
+
+        relatives = service.get_relatives(USER_ID, TENANT_ID, family["Grandpa"], depth=2)
+        path = service.find_relationship_path(USER_ID, TENANT_ID, family["Mom"], family["Grandpa"])
+
+        assert [(r.contact.first_name, r.distance) for r in relatives] == [
+            ("Dad", 1), ("Mom", 2), ("Me", 2), ("Sis", 2),
+        ]
+        assert path.degrees == 2
+        assert [step.relationship_type for step in path.steps] == ["wife", "son"]
+        assert path.steps[1].to_contact_name == "Grandpa Smith"
+        assert service.find_relationship_path(USER_ID, TENANT_ID, family["Pal"], family["Grandpa"], "family") is None
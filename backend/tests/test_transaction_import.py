@@ -0,0 +1,195 @@
+"""
+Tests for the bulk transaction import pipeline
+"""
+import io
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401 - register all mappers
+from app.models.account_ledger import AccountBalanceSnapshot, AccountLedgerEntry
+from app.models.financial_account import FinancialAccount
+from app.models.monthly_transaction_rollup import MonthlyTransactionRollup
+from app.models.transaction import Transaction
+from app.services.transaction_import import TransactionImportService, iter_csv_rows, iter_ofx_rows
+
+TENANT_ID = 1
+USER_ID = 1
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+
+    # Let pysqlite emit BEGIN so SAVEPOINTs behave as on PostgreSQL
+    @event.listens_for(engine, "connect")
+    def do_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def do_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    FinancialAccount.__table__.create(bind=engine)
+    Transaction.__table__.create(bind=engine)
+    AccountLedgerEntry.__table__.create(bind=engine)
+    AccountBalanceSnapshot.__table__.create(bind=engine)
+    MonthlyTransactionRollup.__table__.create(bind=engine)
+    return engine
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def statements(engine):
+    """Record INSERT and UPDATE statements issued against the engine."""
+    seen = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("INSERT", "UPDATE")):
+            seen.append(statement)
+
+    return seen
+
+
+def add_account(db, balance="100.00", user_id=USER_ID):
+    account = FinancialAccount(
+        tenant_id=TENANT_ID, user_id=user_id, account_name="Checking", current_balance=Decimal(balance)
+    )
+    db.add(account)
+    db.commit()
+    return account.id
+
+
+def row(amount, type="debit", account_id=None, **extra):
+    return {"type": type, "amount": amount, "transaction_date": "2024-03-01", "account_id": account_id, **extra}
+
+
+def balance(db, account_id):
+    db.expire_all()
+    return db.get(FinancialAccount, account_id).current_balance
+
+
+class TestTransactionImportService:
+    """Test batching, balance aggregation and error capture"""
+
+    def test_imports_in_batches_with_one_balance_update_per_account(self, db, statements):
+        checking = add_account(db)
+        savings = add_account(db, balance="0")
+        rows = [row("10.00", account_id=checking) for _ in range(25)]
+        rows += [row("5.00", type="credit", account_id=savings) for _ in range(5)]
+        statements.clear()
+
+        result = TransactionImportService(db, USER_ID, TENANT_ID, batch_size=10).import_rows(rows)
+
+        assert result["created"] == 30
+        assert result["failed"] == 0
+        assert len(set(result["transaction_ids"])) == 30
+        assert balance(db, checking) == Decimal("-150.00")
+        assert balance(db, savings) == Decimal("25.00")
+        # One transaction INSERT and one ledger INSERT ... SELECT per batch, plus one rollup upsert
+        assert sum(s.lstrip().upper().startswith("INSERT") for s in statements) == 7
+        assert sum(s.lstrip().upper().startswith("UPDATE") for s in statements) == 2
+
+    def test_reports_invalid_rows_and_imports_the_rest(self, db):
+        account_id = add_account(db)
+        other_users_account = add_account(db, user_id=2)
+        rows = [
+            row("10.00", account_id=account_id),
+            row("-3", account_id=account_id),
+            {"type": "transfer", "amount": "1.00"},
+            "not a row",
+            row("2.00", account_id=other_users_account),
+            row("1.50", type="credit", account_id=account_id),
+        ]
+
+        result = TransactionImportService(db, USER_ID, TENANT_ID, batch_size=4).import_rows(rows)
+
+        assert result["created"] == 2
+        assert [e["row"] for e in result["errors"]] == [2, 3, 4, 5]
+        assert "amount" in result["errors"][0]["error"]
+        assert result["errors"][3]["error"] == "Account not found"
+        assert balance(db, account_id) == Decimal("91.50")
+        assert balance(db, other_users_account) == Decimal("100.00")
+
+    def test_failed_batch_insert_falls_back_to_per_row_savepoints(self, db):
+        account_id = add_account(db)
+        db.execute(text("CREATE UNIQUE INDEX uq_test_reference ON transactions (reference_number)"))
+        db.commit()
+        rows = [row("1.00", account_id=account_id, reference_number=ref) for ref in ["a", "b", "a", "c"]]
+
+        result = TransactionImportService(db, USER_ID, TENANT_ID).import_rows(rows)
+
+        assert result["created"] == 3
+        assert [e["row"] for e in result["errors"]] == [3]
+        assert db.query(Transaction).count() == 3
+        assert db.query(AccountLedgerEntry).count() == 3
+        assert balance(db, account_id) == Decimal("97.00")
+
+    def test_unexpected_error_rolls_back_everything(self, db, monkeypatch):
+        account_id = add_account(db)
+        service = TransactionImportService(db, USER_ID, TENANT_ID)
+        monkeypatch.setattr("app.crud.account_ledger.apply_deltas", lambda db, deltas: 1 / 0)
+
+        with pytest.raises(ZeroDivisionError):
+            service.import_rows([row("1.00", account_id=account_id)])
+
+        assert db.query(Transaction).count() == 0
+
+
+class TestImportSources:
+    """Test CSV and OFX row streaming"""
+
+    def test_csv_rows_with_signed_amounts_and_default_account(self):
+        stream = io.StringIO(
+            "Date,Amount,Description,Reference\n"
+            "2024-03-01,-12.50,Coffee,abc\n"
+            "2024-03-02,100, Salary ,\n"
+        )
+
+        rows = list(iter_csv_rows(stream, default_account_id=7))
+
+        assert rows == [
+            {"transaction_date": "2024-03-01", "amount": Decimal("12.50"), "type": "debit",
+             "description": "Coffee", "reference_number": "abc", "account_id": 7},
+            {"transaction_date": "2024-03-02", "amount": Decimal("100"), "type": "credit",
+             "description": "Salary", "account_id": 7},
+        ]
+
+    def test_ofx_rows(self):
+        stream = io.StringIO(
+            "OFXHEADER:100\n<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><CURDEF>EUR\n"
+            "<BANKTRANLIST>\n"
+            "<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20240301120000<TRNAMT>-42.10<FITID>1001<NAME>Grocer<MEMO>Weekly\n"
+            "</STMTTRN>\n"
+            "<STMTTRN>\n<TRNTYPE>CREDIT</TRNTYPE>\n<DTPOSTED>20240305</DTPOSTED>\n<TRNAMT>1500.00</TRNAMT>\n"
+            "<FITID>1002</FITID>\n</STMTTRN>\n"
+            "</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>\n"
+        )
+
+        rows = list(iter_ofx_rows(stream, default_account_id=3))
+
+        assert rows[0] == {
+            "amount": Decimal("42.10"), "type": "debit", "transaction_date": "2024-03-01",
+            "description": "Grocer - Weekly", "reference_number": "1001", "currency": "EUR",
+            "account_id": 3, "extra_data": {"ofx_trntype": "DEBIT"},
+        }
+        assert rows[1]["type"] == "credit"
+        assert rows[1]["transaction_date"] == "2024-03-05"
+
+    def test_csv_import_end_to_end(self, db):
+        account_id = add_account(db)
+        stream = io.StringIO("date,amount\n2024-03-01,-20\n2024-03-02,5\n")
+
+        result = TransactionImportService(db, USER_ID, TENANT_ID).import_rows(iter_csv_rows(stream, account_id))
+
+        assert result["created"] == 2
+        assert balance(db, account_id) == Decimal("85.00")
@@ -0,0 +1,145 @@
+"""
+Tests for incrementally maintained monthly transaction rollups
+"""
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401 - register all mappers
+from app.cli.analytics_commands import analytics
+from app.crud import transaction as crud_transaction
+from app.crud import transaction_rollup
+from app.models.monthly_transaction_rollup import MonthlyTransactionRollup
+from app.models.transaction import Transaction
+from app.schemas.transaction import TransactionCreate, TransactionUpdate
+from app.services.financial_analytics_service import FinancialAnalyticsService
+
+TENANT_ID = 1
+USER_ID = 1
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    Transaction.__table__.create(bind=engine)
+    MonthlyTransactionRollup.__table__.create(bind=engine)
+    return engine
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def statements(engine):
+    seen = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        seen.append(statement)
+
+    return seen
+
+
+def create(db, amount, transaction_date, type="debit", **extra):
+    return crud_transaction.create_transaction(
+        db,
+        obj_in=TransactionCreate(type=type, amount=Decimal(amount), transaction_date=transaction_date, **extra),
+        user_id=USER_ID,
+        tenant_id=TENANT_ID
+    )
+
+
+def rollup_rows(db):
+    return sorted(
+        (r.account_id, r.category_id, r.year, r.month, r.total_credits, r.total_debits, r.transaction_count)
+        for r in db.query(MonthlyTransactionRollup).filter(MonthlyTransactionRollup.transaction_count != 0)
+    )
+
+
+@pytest.fixture
+def transactions(db):
+    """A few transactions written through the CRUD layer, then edited."""
+    create(db, "1000.00", date(2024, 1, 31), type="credit")
+    groceries = create(db, "80.00", date(2024, 2, 3), category_id=3)
+    create(db, "20.00", date(2024, 2, 14), category_id=3)
+    rent = create(db, "900.00", date(2024, 2, 28), category_id=5)
+    crud_transaction.update_transaction(
+        db, db_obj=groceries, obj_in=TransactionUpdate(amount=Decimal("85.00"), transaction_date=date(2024, 3, 2))
+    )
+    crud_transaction.delete_transaction(db, transaction_id=rent.id, user_id=USER_ID, tenant_id=TENANT_ID)
+    # Written directly, so only a rebuild picks it up
+    db.add(Transaction(tenant_id=TENANT_ID, user_id=2, type="debit", amount=Decimal("5.00"),
+                       transaction_date=date(2024, 2, 1)))
+    db.commit()
+
+
+class TestRollupMaintenance:
+    """Test that incremental upkeep matches a rebuild from transactions"""
+
+    def test_incremental_rollups_match_rebuild(self, db, transactions):
+        incremental = rollup_rows(db)
+
+        assert incremental == [
+            (0, 0, 2024, 1, Decimal("1000.00"), Decimal("0"), 1),
+            (0, 3, 2024, 2, Decimal("0"), Decimal("20.00"), 1),
+            (0, 3, 2024, 3, Decimal("0"), Decimal("85.00"), 1),
+        ]
+        assert transaction_rollup.rebuild(db, tenant_id=TENANT_ID, user_id=USER_ID) == 3
+        assert rollup_rows(db) == incremental
+
+    def test_rebuild_command(self, db, transactions):
+        with patch("app.cli.analytics_commands.get_db_session", return_value=db):
+            result = CliRunner().invoke(analytics, ["rebuild-rollups", "--tenant-id", str(TENANT_ID)])
+
+        assert result.exit_code == 0
+        assert "Rebuilt 4 monthly rollup row(s) for tenant 1" in result.output
+
+    def test_month_range_crosses_years(self):
+        assert transaction_rollup.month_range(date(2024, 2, 10), 4) == [(2023, 11), (2023, 12), (2024, 1), (2024, 2)]
+
+
+class TestRollupAnalytics:
+    """Test that analytics read the rollups in one range query"""
+
+    def test_monthly_summary(self, db, transactions):
+        summary = crud_transaction.get_monthly_summary(db, user_id=USER_ID, tenant_id=TENANT_ID, year=2024, month=1)
+
+        assert summary == {
+            "total_credits": Decimal("1000.00"),
+            "total_debits": Decimal("0"),
+            "net_amount": Decimal("1000.00"),
+            "transaction_count": 1,
+        }
+
+    def test_cash_flow_and_trends_use_one_query_each(self, db, transactions, statements):
+        service = FinancialAnalyticsService(db)
+        with patch("app.services.financial_analytics_service.date") as mock_date:
+            mock_date.today.return_value = date(2024, 3, 20)
+            statements.clear()
+            cash_flow = service.get_cash_flow_analysis(USER_ID, TENANT_ID, months=3)
+            assert len(statements) == 1
+            statements.clear()
+            trends = service.get_spending_trends(USER_ID, TENANT_ID, months=12)
+            assert len(statements) == 1
+
+        assert [(m["month"], m["income"], m["expenses"]) for m in cash_flow["cash_flow"]] == [
+            ("2024-01", Decimal("1000.00"), Decimal("0")),
+            ("2024-02", Decimal("0"), Decimal("20.00")),
+            ("2024-03", Decimal("0"), Decimal("85.00")),
+        ]
+        assert len(trends["trends"]) == 12
+        assert trends["trends"][0]["period"] == "2023-04"
+        assert trends["trends"][-1] == {"period": "2024-03", "total_spending": Decimal("85.00"), "transaction_count": 1}
+        assert trends["category_breakdown"] == [
+            {"category_id": None, "total_amount": Decimal("1000.00"), "transaction_count": 1},
+            {"category_id": 3, "total_amount": Decimal("105.00"), "transaction_count": 2},
+        ]
@@ -6,8 +6,11 @@ including model registration, discovery, and inference requests.
 """
 
 from fastapi import APIRouter, HTTPException, Depends, Request
-from typing import List, Optional, Dict, Any
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, List, Optional, Dict, Any
+import json
 import logging
+import uuid
 
 try:
     from ..schemas.mcp_schemas import (
@@ -20,6 +23,9 @@ try:
     from ..services.inference import inference_service
     from ..services.auth import get_current_tenant, verify_api_access
     from ..services.privacy import privacy_enforcer
+    from ..services.batching import embedding_batcher
+    from ..services.embedding_cache import embedding_cache
+    from ..services.admission import admission_controller
     from ..core.protocol import MCPProtocolError
 except ImportError:
     from schemas.mcp_schemas import (
@@ -32,6 +38,9 @@ except ImportError:
     from services.inference import inference_service
     from services.auth import get_current_tenant, verify_api_access
     from services.privacy import privacy_enforcer
+    from services.batching import embedding_batcher
+    from services.embedding_cache import embedding_cache
+    from services.admission import admission_controller
     from core.protocol import MCPProtocolError
 
 
@@ -128,6 +137,59 @@ async def get_model(
     return model
 
 
+# Streaming helpers
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _sse_stream(
+    http_request: Request,
+    model_id: str,
+    chunks: AsyncIterator[str],
+    prompt_tokens: int
+) -> AsyncIterator[str]:
+    """
+    Relay generated chunks as ``token`` events, then a ``done`` event with usage.
+    
+    Stops generating as soon as the client disconnects.
+    """
+    request_id = str(uuid.uuid4())
+    parts: List[str] = []
+    try:
+        async for chunk in chunks:
+            if await http_request.is_disconnected():
+                logger.info(f"Client disconnected, stopping stream {request_id}")
+                break
+            parts.append(chunk)
+            yield _sse_event("token", {"request_id": request_id, "text": chunk})
+        else:
+            completion_tokens = len("".join(parts).split())
+            yield _sse_event("done", {
+                "request_id": request_id,
+                "model_id": model_id,
+                "finish_reason": "stop",
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens
+                }
+            })
+    except Exception as e:
+        logger.error(f"Streaming inference failed: {e}")
+        yield _sse_event("error", {"request_id": request_id, "message": "Inference failed"})
+    finally:
+        await chunks.aclose()
+
+
+def _sse_response(events: AsyncIterator[str]) -> StreamingResponse:
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 # Inference Endpoints
 @router.post("/inference/completion", response_model=CompletionResponse)
 async def completion_inference(
@@ -135,11 +197,17 @@ async def completion_inference(
     http_request: Request,
     current_tenant = Depends(get_current_tenant)
 ):
-    """Perform text completion inference."""
+    """Perform text completion inference, streamed as server-sent events if ``stream`` is set."""
     try:
         # Add tenant context
         request.tenant_id = current_tenant.id if current_tenant else None
         
+        if request.stream:
+            chunks = await inference_service.stream_completion(request)
+            return _sse_response(
+                _sse_stream(http_request, request.model_id, chunks, len(request.prompt.split()))
+            )
+        
         response = await inference_service.completion(request)
         return response
     except MCPProtocolError as e:
@@ -155,11 +223,20 @@ async def chat_inference(
     http_request: Request,
     current_tenant = Depends(get_current_tenant)
 ):
-    """Perform chat completion inference."""
+    """Perform chat completion inference, streamed as server-sent events if ``stream`` is set."""
     try:
         # Add tenant context
         request.tenant_id = current_tenant.id if current_tenant else None
         
+        if request.stream:
+            chunks = await inference_service.stream_chat(request)
+            return _sse_response(
+                _sse_stream(
+                    http_request, request.model_id, chunks,
+                    sum(len(msg.content.split()) for msg in request.messages)
+                )
+            )
+        
         response = await inference_service.chat(request)
         return response
     except MCPProtocolError as e:
@@ -206,10 +283,14 @@ async def health_check():
         for model_id, is_healthy in model_health.items():
             model = model_registry.get_model(model_id)
             if model:
-                status = ModelHealthStatus(
-                    model_id=model_id,
-                    status=ModelStatus.AVAILABLE if is_healthy else ModelStatus.ERROR
-                )
+                if is_healthy:
+                    model_status = ModelStatus.AVAILABLE
+                elif model.status == ModelStatus.LOADING:
+                    # Not initialized yet (warming up or lazily initialized)
+                    model_status = ModelStatus.LOADING
+                else:
+                    model_status = ModelStatus.ERROR
+                status = ModelHealthStatus(model_id=model_id, status=model_status)
                 model_statuses.append(status)
         
         overall_status = "healthy" if all(model_health.values()) else "degraded"
@@ -269,6 +350,7 @@ async def server_info():
                 "completion_inference",
                 "chat_inference",
                 "embedding_inference",
+                "streaming_inference",
                 "health_monitoring",
                 "tenant_isolation"
             ]
@@ -301,6 +383,20 @@ async def server_stats(current_tenant = Depends(get_current_tenant)):
         
         stats["inference_types"] = list(stats["inference_types"])
         
+        # Embedding batch throughput and latency for the tenant's models
+        stats["embedding_batching"] = embedding_batcher.get_stats(model_ids=[model.id for model in models])
+        
+        # Embedding cache hit rates for the tenant
+        stats["embedding_cache"] = embedding_cache.get_stats(tenant_id=tenant_id)
+        
+        # Queue depth and wait times for the tenant's models
+        capacity_keys = []
+        for model in models:
+            backend = model_registry.get_model_backend(model.id, tenant_id)
+            if backend:
+                capacity_keys.append(backend.get_capacity_key())
+        stats["admission"] = admission_controller.get_stats(tenant_id=tenant_id, capacity_keys=capacity_keys)
+        
         # Add tenant info if available
         if current_tenant:
             stats["tenant_id"] = current_tenant.id
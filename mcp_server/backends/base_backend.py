@@ -5,8 +5,10 @@ This module defines the abstract base class for all model backends,
 establishing the interface that all backend implementations must follow.
 """
 
+import asyncio
 import logging
-from typing import Dict, List, Optional, Any
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Any
 from datetime import datetime
 from abc import ABC, abstractmethod
 
@@ -47,6 +49,13 @@ class ModelBackend(ABC):
         # Extract common configuration
         self.timeout = config.get("timeout", 120)
         self.max_retries = config.get("max_retries", 3)
+        # Requests the model can serve at once (None = server default)
+        self.max_concurrency = config.get("max_concurrency")
+        
+        # Requests currently running on this backend
+        self._in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
         
         logger.info(f"Created {self.__class__.__name__} backend for model: {model_id}")
     
@@ -137,6 +146,39 @@ class ModelBackend(ABC):
         """
         pass
     
+    async def stream_completion(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """
+        Generate a text completion as a stream of text chunks.
+        
+        The default implementation yields the whole completion as one chunk.
+        Backends that can emit tokens as they are generated should override
+        it. Closing the iterator early (e.g. on client disconnect) must stop
+        generation.
+        
+        Args:
+            prompt: Input prompt text
+            **kwargs: Additional generation parameters
+            
+        Yields:
+            Generated text chunks, in order
+        """
+        yield await self.generate_completion(prompt, **kwargs)
+    
+    async def stream_chat_response(self, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[str]:
+        """
+        Generate a chat response as a stream of text chunks.
+        
+        The default implementation yields the whole response as one chunk.
+        
+        Args:
+            messages: List of chat messages with 'role' and 'content' keys
+            **kwargs: Additional generation parameters
+            
+        Yields:
+            Generated text chunks, in order
+        """
+        yield await self.generate_chat_response(messages, **kwargs)
+    
     async def generate_embedding(self, text: str, **kwargs) -> List[float]:
         """
         Generate text embeddings.
@@ -153,6 +195,25 @@ class ModelBackend(ABC):
         """
         raise NotImplementedError(f"{self.__class__.__name__} does not support embeddings")
     
+    async def generate_embeddings_batch(self, texts: List[str], **kwargs) -> List[List[float]]:
+        """
+        Generate embeddings for several texts in one call.
+        
+        The default implementation embeds the texts one at a time. Backends
+        that can run a batch through the model at once should override it.
+        
+        Args:
+            texts: Input texts to embed
+            **kwargs: Additional embedding parameters
+            
+        Returns:
+            One embedding per input text, in input order
+            
+        Raises:
+            NotImplementedError: If embeddings are not supported
+        """
+        return [await self.generate_embedding(text, **kwargs) for text in texts]
+    
     async def classify_text(self, text: str, labels: List[str], **kwargs) -> Dict[str, float]:
         """
         Classify text against provided labels.
@@ -170,6 +231,58 @@ class ModelBackend(ABC):
         """
         raise NotImplementedError(f"{self.__class__.__name__} does not support classification")
     
+    def get_model_version(self) -> str:
+        """
+        Identify the exact model weights behind this backend.
+        
+        Used to key cached outputs, so changing the configured model or its
+        version never serves results computed by the previous one.
+        
+        Returns:
+            The configured ``model_version``, else the configured model name
+        """
+        return str(self.config.get("model_version") or self.config.get("model_name") or self.model_id)
+    
+    def get_capacity_key(self) -> str:
+        """
+        Identify the compute this backend runs on, for admission control.
+        
+        Backends with the same key share one set of concurrency slots, e.g.
+        several tenants' registrations of the same model on one server.
+        
+        Returns:
+            The model ID by default
+        """
+        return self.model_id
+    
+    @asynccontextmanager
+    async def in_use(self) -> AsyncIterator[None]:
+        """Count a request as running on this backend for the duration of the block."""
+        self._in_flight += 1
+        self._idle.clear()
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            if not self._in_flight:
+                self._idle.set()
+    
+    async def wait_idle(self, timeout: float) -> bool:
+        """
+        Wait for the requests running on this backend to finish.
+        
+        Args:
+            timeout: Seconds to wait at most
+            
+        Returns:
+            False if requests were still running when the timeout expired
+        """
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+    
     def get_model_info(self) -> Dict[str, Any]:
         """
         Get detailed information about this model backend.
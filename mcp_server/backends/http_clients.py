@@ -0,0 +1,109 @@
+"""
+Shared HTTP client sessions for model backends.
+
+Backends talking to the same server (e.g. many models on one Ollama host)
+share one ``aiohttp.ClientSession`` per origin, so they share one pool of
+keep-alive connections, bounded per host, and one DNS cache instead of
+opening a pool per model. Sessions are reference counted and closed when
+the last backend using them releases them.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import aiohttp
+from yarl import URL
+
+try:
+    from ..config.settings import mcp_settings
+except ImportError:
+    from config.settings import mcp_settings
+
+
+logger = logging.getLogger(__name__)
+
+
+def request_timeout(total: Optional[float] = None, streaming: bool = True) -> aiohttp.ClientTimeout:
+    """
+    Timeout for one request: the configured connect and read timeouts,
+    plus an optional cap on the whole request.
+    
+    A non-streaming generation sends nothing until it is complete, so
+    with ``streaming=False`` only ``total`` bounds the wait for the
+    response, not the read timeout.
+    """
+    return aiohttp.ClientTimeout(
+        total=total,
+        connect=mcp_settings.HTTP_CONNECT_TIMEOUT_SECONDS,
+        sock_read=mcp_settings.HTTP_READ_TIMEOUT_SECONDS if streaming else None
+    )
+
+
+@dataclass
+class _SharedSession:
+    session: aiohttp.ClientSession
+    loop: asyncio.AbstractEventLoop
+    refs: int = 0
+
+
+class HTTPClientRegistry:
+    """Keeps one pooled client session per base URL origin."""
+
+    def __init__(self):
+        self._sessions: Dict[str, _SharedSession] = {}
+
+    @staticmethod
+    def _origin(base_url: str) -> str:
+        return str(URL(base_url).origin())
+
+    def acquire(self, base_url: str) -> aiohttp.ClientSession:
+        """Get the shared session for a base URL; pair with ``release``."""
+        origin = self._origin(base_url)
+        loop = asyncio.get_running_loop()
+        shared = self._sessions.get(origin)
+        if shared is None or shared.session.closed or shared.loop is not loop:
+            # A session is bound to the loop it was created on
+            shared = _SharedSession(session=self._create_session(), loop=loop)
+            self._sessions[origin] = shared
+            logger.debug(f"Opened shared HTTP session for {origin}")
+        shared.refs += 1
+        return shared.session
+
+    async def release(self, session: aiohttp.ClientSession) -> None:
+        """Drop one reference; the session is closed once nobody uses it."""
+        for origin, shared in list(self._sessions.items()):
+            if shared.session is session:
+                shared.refs -= 1
+                if shared.refs <= 0:
+                    del self._sessions[origin]
+                    await session.close()
+                return
+        # Not a shared session (or already dropped): it belongs to the caller
+        if not session.closed:
+            await session.close()
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=mcp_settings.HTTP_MAX_CONNECTIONS_PER_HOST,
+            limit_per_host=mcp_settings.HTTP_MAX_CONNECTIONS_PER_HOST,
+            keepalive_timeout=mcp_settings.HTTP_KEEPALIVE_SECONDS,
+            use_dns_cache=True,
+            ttl_dns_cache=mcp_settings.HTTP_DNS_CACHE_SECONDS
+        )
+        return aiohttp.ClientSession(connector=connector, timeout=request_timeout())
+
+    async def close(self) -> None:
+        sessions, self._sessions = list(self._sessions.values()), {}
+        for shared in sessions:
+            if not shared.session.closed:
+                await shared.session.close()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Backends sharing each origin's session."""
+        return {origin: shared.refs for origin, shared in self._sessions.items()}
+
+
+# Global HTTP client registry instance
+http_clients = HTTPClientRegistry()
@@ -8,15 +8,28 @@ demonstrating how to create a functional model backend for the MCP server.
 import logging
 import aiohttp
 import asyncio
-from typing import Dict, List, Optional, Any
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, List, Optional, Any
 from datetime import datetime
 import json
 
 from .base_backend import ModelBackend, ModelStatus, InferenceType
+from .http_clients import http_clients, request_timeout
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class _Conversation:
+    """Server-side state of one multi-turn conversation."""
+    messages: List[Dict[str, str]] = field(default_factory=list)
+    # Token context returned by api/generate, passed back on the next turn
+    context: Optional[List[int]] = None
+    last_used: float = field(default_factory=time.monotonic)
+
+
 class OllamaBackend(ModelBackend):
     """
     Ollama model backend implementation.
@@ -34,8 +47,24 @@ class OllamaBackend(ModelBackend):
         "stream": false,
         "temperature": 0.7,
         "top_p": 0.9,
-        "max_tokens": 1024
+        "max_tokens": 1024,
+        "keep_alive": "5m",
+        "max_concurrency": 4,
+        "max_conversations": 256,
+        "conversation_ttl_seconds": 1800
     }
+    
+    Chat uses Ollama's ``api/chat`` endpoint with structured messages.
+    Passing ``conversation_id`` keeps the conversation on the server: chat
+    requests then only carry the new messages, and the stored history is
+    resent unchanged, so Ollama can reuse the cached prompt prefix while
+    ``keep_alive`` holds the model in memory. Completions in a conversation
+    pass back the ``context`` tokens returned by the previous turn.
+    
+    All models on one Ollama server share a pooled HTTP session (see
+    ``http_clients``); ``timeout`` caps each request on top of the shared
+    connect and read timeouts. Non-streaming generations are bounded by
+    ``timeout`` alone, since no bytes arrive until they finish.
     """
     
     def __init__(self, model_id: str, config: Dict[str, Any]):
@@ -51,21 +80,29 @@ class OllamaBackend(ModelBackend):
         self.top_p = config.get("top_p", 0.9) 
         self.max_tokens = config.get("max_tokens", 1024)
         
+        # How long Ollama keeps the model (and its prompt cache) loaded
+        self.keep_alive = config.get("keep_alive", "5m")
+        
+        # Multi-turn conversation state, least recently used first
+        self.max_conversations = config.get("max_conversations", 256)
+        self.conversation_ttl = config.get("conversation_ttl_seconds", 1800)
+        self._conversations: "OrderedDict[str, _Conversation]" = OrderedDict()
+        
         # Ensure URLs are properly formatted
         if not self.base_url.endswith('/'):
             self.base_url += '/'
         
         self._session = None
+        self._timeout = request_timeout(self.timeout)
+        self._generate_timeout = request_timeout(self.timeout, streaming=False)
         
     async def initialize(self) -> None:
         """Initialize Ollama model backend."""
         try:
             logger.info(f"Initializing Ollama model: {self.model_name} at {self.base_url}")
             
-            # Create HTTP session
-            self._session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=self.timeout)
-            )
+            # Use the server's shared HTTP session
+            self._session = http_clients.acquire(self.base_url)
             
             # Check if Ollama is running
             await self._check_ollama_service()
@@ -82,14 +119,14 @@ class OllamaBackend(ModelBackend):
             logger.error(f"Failed to initialize Ollama model {self.model_name}: {e}")
             self._update_status(ModelStatus.ERROR)
             if self._session:
-                await self._session.close()
+                await http_clients.release(self._session)
                 self._session = None
             raise
     
     async def _check_ollama_service(self) -> None:
         """Check if Ollama service is running."""
         try:
-            async with self._session.get(f"{self.base_url}api/version") as response:
+            async with self._session.get(f"{self.base_url}api/version", timeout=self._timeout) as response:
                 if response.status == 200:
                     version_info = await response.json()
                     logger.info(f"Connected to Ollama service version: {version_info.get('version', 'unknown')}")
@@ -102,7 +139,7 @@ class OllamaBackend(ModelBackend):
         """Check if the specified model is available."""
         try:
             # List available models
-            async with self._session.get(f"{self.base_url}api/tags") as response:
+            async with self._session.get(f"{self.base_url}api/tags", timeout=self._timeout) as response:
                 if response.status == 200:
                     models_data = await response.json()
                     available_models = [model['name'] for model in models_data.get('models', [])]
@@ -125,7 +162,8 @@ class OllamaBackend(ModelBackend):
             
             async with self._session.post(
                 f"{self.base_url}api/pull",
-                json=pull_data
+                json=pull_data,
+                timeout=self._timeout
             ) as response:
                 if response.status == 200:
                     # Read the streaming response
@@ -151,14 +189,16 @@ class OllamaBackend(ModelBackend):
                 return False
             
             # Simple ping to check service availability
-            async with self._session.get(f"{self.base_url}api/version") as response:
+            async with self._session.get(f"{self.base_url}api/version", timeout=self._timeout) as response:
                 is_healthy = response.status == 200
                 
                 if is_healthy:
                     # Optional: Test with a small generation request
                     test_prompt = "Hello"
                     try:
-                        await self._generate_with_retries(test_prompt, max_tokens=5)
+                        await self._generate_with_retries(
+                            "api/generate", self._build_generate_request(test_prompt, max_tokens=5)
+                        )
                     except Exception as e:
                         logger.warning(f"Health check generation test failed: {e}")
                         is_healthy = False
@@ -182,9 +222,10 @@ class OllamaBackend(ModelBackend):
         """Shutdown the Ollama backend."""
         try:
             if self._session:
-                await self._session.close()
+                await http_clients.release(self._session)
                 self._session = None
             
+            self._conversations.clear()
             self._update_status(ModelStatus.MAINTENANCE)
             self._initialized = False
             
@@ -193,59 +234,154 @@ class OllamaBackend(ModelBackend):
         except Exception as e:
             logger.error(f"Error during Ollama backend shutdown: {e}")
     
+    def get_capacity_key(self) -> str:
+        """Registrations of the same model on one Ollama server share its slots."""
+        return f"ollama:{self.base_url}{self.model_name}"
+    
     def get_capabilities(self) -> List[InferenceType]:
         """Ollama supports completion and chat inference."""
         return [InferenceType.COMPLETION, InferenceType.CHAT]
     
-    async def generate_completion(self, prompt: str, **kwargs) -> str:
+    async def generate_completion(self, prompt: str, conversation_id: Optional[str] = None, **kwargs) -> str:
         """Generate a text completion using Ollama."""
+        self._ensure_available()
+        conversation = self._get_conversation(conversation_id)
+        request_data = self._build_generate_request(prompt, conversation, **self._generation_params(kwargs))
+        return await self._generate_with_retries("api/generate", request_data, conversation)
+    
+    async def generate_chat_response(self, messages: List[Dict[str, str]],
+                                     conversation_id: Optional[str] = None, **kwargs) -> str:
+        """Generate a chat response using Ollama's chat API."""
+        self._ensure_available()
+        conversation = self._get_conversation(conversation_id)
+        history = self._chat_history(messages, conversation)
+        request_data = self._build_chat_request(history, **self._generation_params(kwargs))
+        
+        text = await self._generate_with_retries("api/chat", request_data)
+        self._remember_reply(conversation, history, text)
+        return text
+    
+    async def stream_completion(self, prompt: str, conversation_id: Optional[str] = None,
+                                **kwargs) -> AsyncIterator[str]:
+        """Stream a text completion from Ollama token by token."""
+        self._ensure_available()
+        conversation = self._get_conversation(conversation_id)
+        request_data = self._build_generate_request(prompt, conversation, **self._generation_params(kwargs))
+        async for chunk in self._stream_with_retries("api/generate", request_data, conversation):
+            yield chunk
+    
+    async def stream_chat_response(self, messages: List[Dict[str, str]],
+                                   conversation_id: Optional[str] = None, **kwargs) -> AsyncIterator[str]:
+        """Stream a chat response from Ollama token by token."""
+        self._ensure_available()
+        conversation = self._get_conversation(conversation_id)
+        history = self._chat_history(messages, conversation)
+        request_data = self._build_chat_request(history, **self._generation_params(kwargs))
+        
+        parts = []
+        async for chunk in self._stream_with_retries("api/chat", request_data):
+            parts.append(chunk)
+            yield chunk
+        # Only a completed reply becomes part of the conversation
+        self._remember_reply(conversation, history, "".join(parts))
+    
+    def _ensure_available(self) -> None:
         if not self._session or self.status != ModelStatus.AVAILABLE:
             raise Exception(f"Model {self.model_id} is not available")
-        
-        # Merge generation parameters
-        generation_params = {
+    
+    def _generation_params(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge per-request generation parameters over the configured defaults."""
+        return {
             "temperature": kwargs.get("temperature", self.temperature),
             "top_p": kwargs.get("top_p", self.top_p),
             "max_tokens": kwargs.get("max_tokens", self.max_tokens)
         }
-        
-        return await self._generate_with_retries(prompt, **generation_params)
     
-    async def generate_chat_response(self, messages: List[Dict[str, str]], **kwargs) -> str:
-        """Generate a chat response using Ollama."""
-        if not self._session or self.status != ModelStatus.AVAILABLE:
-            raise Exception(f"Model {self.model_id} is not available")
+    def _get_conversation(self, conversation_id: Optional[str]) -> Optional[_Conversation]:
+        """Look up or start a conversation, dropping expired and excess ones."""
+        if not conversation_id:
+            return None
         
-        # Convert messages to Ollama format and extract the conversation
-        if messages:
-            # For now, concatenate messages into a single prompt
-            # A more sophisticated implementation would use Ollama's chat API
-            conversation = ""
-            for msg in messages:
-                role = msg.get("role", "user")
-                content = msg.get("content", "")
-                conversation += f"{role}: {content}\n"
-            
-            conversation += "assistant: "
-            
-            # Merge generation parameters
-            generation_params = {
-                "temperature": kwargs.get("temperature", self.temperature),
-                "top_p": kwargs.get("top_p", self.top_p),
-                "max_tokens": kwargs.get("max_tokens", self.max_tokens)
-            }
-            
-            return await self._generate_with_retries(conversation, **generation_params)
-        else:
+        now = time.monotonic()
+        while self._conversations:
+            oldest_id, oldest = next(iter(self._conversations.items()))
+            if now - oldest.last_used < self.conversation_ttl:
+                break
+            del self._conversations[oldest_id]
+        
+        conversation = self._conversations.get(conversation_id)
+        if conversation is None:
+            conversation = self._conversations[conversation_id] = _Conversation()
+            while len(self._conversations) > self.max_conversations:
+                self._conversations.popitem(last=False)
+        conversation.last_used = now
+        self._conversations.move_to_end(conversation_id)
+        return conversation
+    
+    def _chat_history(self, messages: List[Dict[str, str]],
+                      conversation: Optional[_Conversation]) -> List[Dict[str, str]]:
+        """The conversation so far followed by the new messages."""
+        new_messages = [
+            {"role": msg.get("role", "user"), "content": msg.get("content", "")} for msg in messages
+        ]
+        if not new_messages:
             raise ValueError("No messages provided for chat")
+        return (conversation.messages if conversation else []) + new_messages
+    
+    def _remember_reply(self, conversation: Optional[_Conversation],
+                        history: List[Dict[str, str]], text: str) -> None:
+        if conversation is not None:
+            conversation.messages = history + [{"role": "assistant", "content": text}]
+    
+    def _options(self, generation_params: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "temperature": generation_params.get("temperature", self.temperature),
+            "top_p": generation_params.get("top_p", self.top_p),
+            "num_predict": generation_params.get("max_tokens", self.max_tokens)
+        }
+    
+    def _build_generate_request(self, prompt: str, conversation: Optional[_Conversation] = None,
+                                **generation_params) -> Dict[str, Any]:
+        """Prepare request data for the Ollama generate API."""
+        request_data = {
+            "model": self.model_name,
+            "prompt": prompt,
+            "keep_alive": self.keep_alive,
+            "options": self._options(generation_params)
+        }
+        if conversation and conversation.context:
+            request_data["context"] = conversation.context
+        return request_data
+    
+    def _build_chat_request(self, messages: List[Dict[str, str]], **generation_params) -> Dict[str, Any]:
+        """Prepare request data for the Ollama chat API."""
+        return {
+            "model": self.model_name,
+            "messages": messages,
+            "keep_alive": self.keep_alive,
+            "options": self._options(generation_params)
+        }
+    
+    @staticmethod
+    def _extract_text(data: Dict[str, Any]) -> str:
+        """Generated text of a generate or chat API response object."""
+        if "message" in data:
+            return (data.get("message") or {}).get("content", "")
+        return data.get("response", "")
+    
+    @staticmethod
+    def _update_context(conversation: Optional[_Conversation], data: Dict[str, Any]) -> None:
+        if conversation is not None and data.get("context"):
+            conversation.context = data["context"]
     
-    async def _generate_with_retries(self, prompt: str, **generation_params) -> str:
+    async def _generate_with_retries(self, endpoint: str, request_data: Dict[str, Any],
+                                     conversation: Optional[_Conversation] = None) -> str:
         """Generate text with automatic retries."""
         last_exception = None
         
         for attempt in range(self.max_retries):
             try:
-                return await self._generate_text(prompt, **generation_params)
+                return await self._generate_text(endpoint, request_data, conversation)
             except Exception as e:
                 last_exception = e
                 logger.warning(f"Generation attempt {attempt + 1} failed: {e}")
@@ -254,42 +390,52 @@ class OllamaBackend(ModelBackend):
         
         raise Exception(f"All {self.max_retries} generation attempts failed. Last error: {last_exception}")
     
-    async def _generate_text(self, prompt: str, **generation_params) -> str:
+    async def _stream_with_retries(self, endpoint: str, request_data: Dict[str, Any],
+                                   conversation: Optional[_Conversation] = None) -> AsyncIterator[str]:
+        """
+        Stream text with automatic retries.
+        
+        Only failures before the first chunk are retried; once text has been
+        handed to the caller a retry would repeat it.
+        """
+        last_exception = None
+        
+        for attempt in range(self.max_retries):
+            started = False
+            try:
+                async for chunk in self._stream_text(endpoint, request_data, conversation):
+                    started = True
+                    yield chunk
+                return
+            except Exception as e:
+                if started:
+                    raise
+                last_exception = e
+                logger.warning(f"Streaming attempt {attempt + 1} failed: {e}")
+                if attempt < self.max_retries - 1:
+                    await asyncio.sleep(1)  # Brief delay before retry
+        
+        raise Exception(f"All {self.max_retries} generation attempts failed. Last error: {last_exception}")
+    
+    async def _generate_text(self, endpoint: str, request_data: Dict[str, Any],
+                             conversation: Optional[_Conversation] = None) -> str:
         """Core text generation logic."""
-        # Prepare request data for Ollama API
-        request_data = {
-            "model": self.model_name,
-            "prompt": prompt,
-            "stream": self.stream,
-            "options": {
-                "temperature": generation_params.get("temperature", self.temperature),
-                "top_p": generation_params.get("top_p", self.top_p),
-                "num_predict": generation_params.get("max_tokens", self.max_tokens)
-            }
-        }
+        if self.stream:
+            # Collect the chunks and join once rather than growing a string per token
+            chunks = [chunk async for chunk in self._stream_text(endpoint, request_data, conversation)]
+            return "".join(chunks)
         
         try:
             async with self._session.post(
-                f"{self.base_url}api/generate",
-                json=request_data
+                f"{self.base_url}{endpoint}",
+                json={**request_data, "stream": False},
+                timeout=self._generate_timeout
             ) as response:
                 
                 if response.status == 200:
-                    if self.stream:
-                        # Handle streaming response
-                        generated_text = ""
-                        async for line in response.content:
-                            if line:
-                                data = json.loads(line)
-                                if data.get('response'):
-                                    generated_text += data['response']
-                                if data.get('done'):
-                                    break
-                        return generated_text
-                    else:
-                        # Handle non-streaming response
-                        result = await response.json()
-                        return result.get('response', '')
+                    result = await response.json()
+                    self._update_context(conversation, result)
+                    return self._extract_text(result)
                 else:
                     error_text = await response.text()
                     raise Exception(f"Ollama API error {response.status}: {error_text}")
@@ -299,4 +445,41 @@ class OllamaBackend(ModelBackend):
         except json.JSONDecodeError as e:
             raise Exception(f"JSON decode error: {e}")
         except Exception as e:
-            raise Exception(f"Generation error: {e}")
\ No newline at end of file
+            raise Exception(f"Generation error: {e}")
+    
+    async def _stream_text(self, endpoint: str, request_data: Dict[str, Any],
+                           conversation: Optional[_Conversation] = None) -> AsyncIterator[str]:
+        """
+        Yield generated text from Ollama's NDJSON stream as it arrives.
+        
+        Closing the generator early releases the unread response, which
+        closes the connection and makes Ollama stop generating.
+        """
+        try:
+            async with self._session.post(
+                f"{self.base_url}{endpoint}",
+                json={**request_data, "stream": True},
+                timeout=self._timeout
+            ) as response:
+                
+                if response.status != 200:
+                    error_text = await response.text()
+                    raise Exception(f"Ollama API error {response.status}: {error_text}")
+                
+                async for line in response.content:
+                    if not line.strip():
+                        continue
+                    data = json.loads(line)
+                    if data.get('error'):
+                        raise Exception(f"Ollama API error: {data['error']}")
+                    text = self._extract_text(data)
+                    if text:
+                        yield text
+                    if data.get('done'):
+                        self._update_context(conversation, data)
+                        break
+                        
+        except aiohttp.ClientError as e:
+            raise Exception(f"HTTP client error: {e}")
+        except json.JSONDecodeError as e:
+            raise Exception(f"JSON decode error: {e}")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark log redaction against the previous one-pattern-at-a-time path
+Run this script to compare speed on synthetic inference log lines and check that the output is identical
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from mcp_server.services.privacy import PrivacyEnforcer
+
+
+def previous_sanitize(patterns, message):
+    """The previous sanitize_log_message: every pattern scans the whole message."""
+    for pattern in patterns:
+        message = pattern.sub('[REDACTED]', message)
+    return message
+
+
+def log_lines(count, sensitive_rate, rng):
+    """Inference log lines; roughly sensitive_rate of them carry an email, SSN, card number or IP."""
+    sensitive = [
+        lambda i: f" user=user{i}@example.com",
+        lambda i: f" ssn={rng.randint(100, 999)}-{rng.randint(10, 99)}-{rng.randint(1000, 9999)}",
+        lambda i: f" card=4532 {rng.randint(1000, 9999)} {rng.randint(1000, 9999)} {rng.randint(1000, 9999)}",
+        lambda i: f" client=10.0.{i % 256}.{rng.randint(1, 254)}",
+    ]
+    lines = []
+    for i in range(count):
+        line = (
+            f"2026-10-18 12:{i % 60:02d}:{(i * 7) % 60:02d},{i % 1000:03d} INFO services.inference "
+            f"request {i:08x} model=tenant_{i % 8}_ollama_llama3.2:3b tokens={rng.randint(1, 1024)} "
+            f"latency_ms={rng.uniform(5, 900):.1f} queue_ms={rng.uniform(0, 50):.1f} status=ok"
+        )
+        if rng.random() < sensitive_rate:
+            line += rng.choice(sensitive)(i)
+        lines.append(line)
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=100000, help="Log lines per run")
+    parser.add_argument("--sensitive-rate", type=float, default=0.02, help="Share of lines with sensitive data")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    enforcer = PrivacyEnforcer()
+    patterns = enforcer._compiled_patterns
+    lines = log_lines(args.count, args.sensitive_rate, random.Random(args.seed))
+
+    mismatches = sum(
+        1 for line in lines if enforcer.sanitize_log_message(line) != previous_sanitize(patterns, line)
+    )
+
+    print(f"🔒 Redacting {args.count} log lines ({args.sensitive_rate:.0%} sensitive), best of {args.repeat}")
+    print("=" * 50)
+    timings = {}
+    for name, function in [
+        ("previous", lambda line: previous_sanitize(patterns, line)),
+        ("current", enforcer.sanitize_log_message),
+    ]:
+        seconds = min(timeit.repeat(lambda: [function(line) for line in lines], number=1, repeat=args.repeat))
+        timings[name] = seconds
+        print(f"{name:<10} {seconds * 1000:10.2f} ms {args.count / seconds:12,.0f} lines/s")
+
+    print(f"\nSpeedup:    {timings['previous'] / timings['current']:.2f}x")
+    print(f"Mismatches: {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
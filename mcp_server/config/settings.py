@@ -31,6 +31,10 @@ class MCPServerSettings(BaseSettings):
     MCP_SECRET_KEY: str = Field(default="change-me-in-production-min-32-chars", description="Secret key for MCP server authentication")
     MCP_ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=30, description="MCP access token expiration")
     MCP_ENABLE_TENANT_ISOLATION: bool = Field(default=True, description="Enable tenant isolation")
+    TENANT_CACHE_TTL_SECONDS: int = Field(default=300, description="How long verified tenant info is served without asking the backend")
+    TENANT_CACHE_STALE_SECONDS: int = Field(default=60, description="How long expired tenant info is still served while it is refreshed in the background")
+    TENANT_CACHE_NEGATIVE_TTL_SECONDS: int = Field(default=30, description="How long an unknown tenant ID is remembered")
+    TENANT_CACHE_MAX_ENTRIES: int = Field(default=1024, description="Tenants kept in the verification cache")
     
     # Backend Integration
     BACKEND_API_URL: str = Field(default="http://backend:8000", description="FastAPI backend URL")
@@ -41,7 +45,11 @@ class MCPServerSettings(BaseSettings):
     MODEL_REGISTRY_PATH: str = Field(default="./model_configs", description="Path to model registry")
     MODEL_CONFIG_PATH: str = Field(default="./config/models.json", description="Path to models configuration file")
     MODEL_CONFIG_WATCH: bool = Field(default=True, description="Watch configuration file for changes")
-    MAX_CONCURRENT_REQUESTS: int = Field(default=10, description="Maximum concurrent model requests")
+    MODEL_CONFIG_WATCH_DEBOUNCE_MS: int = Field(default=500, description="Quiet period after a configuration file change before reloading")
+    MAX_CONCURRENT_REQUESTS: int = Field(default=10, description="Maximum concurrent model requests per tenant")
+    MODEL_INIT_CONCURRENCY: int = Field(default=4, description="Model backends initialized at the same time")
+    MODEL_BACKGROUND_WARMUP: bool = Field(default=True, description="Initialize models in the background after startup")
+    MODEL_LAZY_INIT: bool = Field(default=False, description="Initialize each model on its first request instead of at startup")
     
     # Default Model Environment Variables (for quick setup)
     DEFAULT_OLLAMA_URL: Optional[str] = Field(default="http://localhost:11434", description="Default Ollama server URL")
@@ -53,6 +61,29 @@ class MCPServerSettings(BaseSettings):
     MAX_RESPONSE_TOKENS: int = Field(default=1024, description="Maximum response tokens")
     REQUEST_TIMEOUT_SECONDS: int = Field(default=120, description="Request timeout in seconds")
     
+    # HTTP Connection Pools
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = Field(default=5.0, description="Timeout for opening a connection to a backend")
+    HTTP_READ_TIMEOUT_SECONDS: float = Field(default=60.0, description="Longest wait for the next bytes of a backend response")
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = Field(default=32, description="Connections kept per backend host, shared by all its models")
+    HTTP_KEEPALIVE_SECONDS: float = Field(default=60.0, description="How long idle connections are kept open for reuse")
+    HTTP_DNS_CACHE_SECONDS: int = Field(default=300, description="How long resolved backend host names are cached")
+    
+    # Admission Control
+    MAX_QUEUED_REQUESTS_PER_TENANT: int = Field(default=50, description="Requests a tenant may have waiting for a model slot")
+    MODEL_MAX_CONCURRENCY: int = Field(default=4, description="Concurrent requests per model unless its config sets max_concurrency")
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = Field(default=30.0, description="Longest a request waits for a model slot before it is rejected")
+    TENANT_QUEUE_WEIGHTS: Dict[str, float] = Field(default_factory=dict, description="Fair-queuing weight per tenant ID (default 1.0)")
+    
+    # Embedding Batching
+    EMBEDDING_BATCHING_ENABLED: bool = Field(default=True, description="Coalesce concurrent embedding requests per model")
+    EMBEDDING_BATCH_MAX_SIZE: int = Field(default=32, description="Maximum texts per embedding batch")
+    EMBEDDING_BATCH_MAX_WAIT_MS: float = Field(default=5.0, description="Longest a request waits for its batch to fill, in milliseconds")
+    
+    # Embedding Cache
+    EMBEDDING_CACHE_ENABLED: bool = Field(default=True, description="Reuse embeddings of identical text per tenant and model")
+    EMBEDDING_CACHE_MAX_ENTRIES: int = Field(default=10000, description="Embeddings kept in the in-memory cache tier")
+    EMBEDDING_CACHE_PATH: Optional[str] = Field(default=None, description="SQLite file for the persistent cache tier (requires DATA_RETENTION_DAYS > 0)")
+    
     # Privacy and Security
     ENABLE_REQUEST_LOGGING: bool = Field(default=False, description="Enable request logging (privacy impact)")
     ANONYMIZE_LOGS: bool = Field(default=True, description="Anonymize sensitive data in logs")
@@ -8,22 +8,25 @@ providing standardized communication between the MCP server and LLMs.
 import json
 import asyncio
 import logging
-from typing import Dict, Any, Optional, Callable, Awaitable
+from typing import AsyncIterator, Dict, Any, Optional, Callable, Awaitable, Set, Tuple
 from datetime import datetime
 import uuid
 
 try:
     from ..schemas.mcp_schemas import (
-        MCPMessage, MCPRequest, MCPResponse, MCPError, MCPMessageType
+        MCPMessage, MCPRequest, MCPResponse, MCPError, MCPMessageType, MCPNotification
     )
 except ImportError:
     from schemas.mcp_schemas import (
-        MCPMessage, MCPRequest, MCPResponse, MCPError, MCPMessageType
+        MCPMessage, MCPRequest, MCPResponse, MCPError, MCPMessageType, MCPNotification
     )
 
 
 logger = logging.getLogger(__name__)
 
+# Sends one serialized message to the client of the current connection
+SendCallback = Callable[[str], Awaitable[None]]
+
 
 class MCPProtocolError(Exception):
     """MCP protocol specific error."""
@@ -44,6 +47,8 @@ class MCPProtocolHandler:
     
     def __init__(self):
         self._methods: Dict[str, Callable] = {}
+        self._stream_methods: Dict[str, Callable] = {}
+        self._active_streams: Dict[Tuple[Any, str], asyncio.Task] = {}
         self._pending_requests: Dict[str, asyncio.Future] = {}
         self._message_handlers: Dict[MCPMessageType, Callable] = {
             MCPMessageType.REQUEST: self._handle_request,
@@ -57,12 +62,30 @@ class MCPProtocolHandler:
         self._methods[method_name] = handler
         logger.info(f"Registered MCP method: {method_name}")
     
-    async def process_message(self, message_data: str) -> Optional[str]:
+    def register_stream_method(self, method_name: str, handler: Callable):
+        """
+        Register a streaming method handler.
+        
+        The handler returns (or is a coroutine returning) an async iterator of
+        text chunks. Each chunk is sent to the client as a STREAM_CHUNK_METHOD
+        notification as soon as it is produced; the final response carries the
+        joined text.
+        """
+        self._stream_methods[method_name] = handler
+        logger.info(f"Registered MCP streaming method: {method_name}")
+    
+    async def process_message(self, message_data: str, send: Optional[SendCallback] = None,
+                              context: Optional[Dict[str, Any]] = None) -> Optional[str]:
         """
         Process an incoming MCP message.
         
         Args:
             message_data: JSON string containing the MCP message
+            send: Callback used to push notifications to the client while a
+                streaming request is running. Without it, streaming methods
+                only return the final result.
+            context: Params set by the server for the connection, e.g. its
+                authenticated tenant. They replace any the client sends.
             
         Returns:
             Optional JSON string response
@@ -71,6 +94,8 @@ class MCPProtocolHandler:
             # Parse the message
             data = json.loads(message_data)
             message_type = MCPMessageType(data.get("type"))
+            if context and message_type == MCPMessageType.REQUEST:
+                data["params"] = {**(data.get("params") or {}), **context}
             
             # Route to appropriate handler
             handler = self._message_handlers.get(message_type)
@@ -80,8 +105,8 @@ class MCPProtocolHandler:
                     message=f"Unknown message type: {message_type}"
                 )
             
-            response = await handler(data)
-            return json.dumps(response.dict()) if response else None
+            response = await handler(data, send)
+            return json.dumps(response.dict(), default=str) if response else None
             
         except json.JSONDecodeError as e:
             logger.error(f"Invalid JSON in MCP message: {e}")
@@ -90,7 +115,7 @@ class MCPProtocolHandler:
                 message="Parse error",
                 data={"original_error": str(e)}
             )
-            return json.dumps(error_response.dict())
+            return json.dumps(error_response.dict(), default=str)
             
         except MCPProtocolError as e:
             logger.error(f"MCP protocol error: {e}")
@@ -100,7 +125,7 @@ class MCPProtocolHandler:
                 message=e.message,
                 data=e.data
             )
-            return json.dumps(error_response.dict())
+            return json.dumps(error_response.dict(), default=str)
             
         except Exception as e:
             logger.error(f"Unexpected error processing MCP message: {e}")
@@ -110,13 +135,20 @@ class MCPProtocolHandler:
                 message="Internal error",
                 data={"error_type": type(e).__name__}
             )
-            return json.dumps(error_response.dict())
+            return json.dumps(error_response.dict(), default=str)
     
-    async def _handle_request(self, data: Dict[str, Any]) -> Optional[MCPResponse]:
+    async def _handle_request(self, data: Dict[str, Any], send: Optional[SendCallback] = None) -> Optional[MCPResponse]:
         """Handle MCP request messages."""
         try:
             request = MCPRequest(**data)
             
+            stream_handler = self._stream_methods.get(request.method)
+            if stream_handler:
+                return MCPResponse(
+                    id=request.id,
+                    result=await self._run_stream(request, stream_handler, send)
+                )
+            
             # Find the method handler
             handler = self._methods.get(request.method)
             if not handler:
@@ -146,7 +178,33 @@ class MCPProtocolHandler:
                 data={"error": str(e)}
             )
     
-    async def _handle_response(self, data: Dict[str, Any]) -> None:
+    async def _run_stream(self, request: MCPRequest, handler: Callable,
+                          send: Optional[SendCallback]) -> Dict[str, Any]:
+        """Forward a streaming handler's chunks as notifications and collect the full text."""
+        chunks = handler(request.params or {})
+        if asyncio.iscoroutine(chunks):
+            chunks = await chunks
+        
+        stream_key = (send, request.id)
+        self._active_streams[stream_key] = asyncio.current_task()
+        parts = []
+        try:
+            async for chunk in chunks:
+                parts.append(chunk)
+                if send:
+                    notification = MCPNotification(
+                        method=STREAM_CHUNK_METHOD,
+                        params={"request_id": request.id, "index": len(parts) - 1, "text": chunk}
+                    )
+                    await send(json.dumps(notification.dict(), default=str))
+        finally:
+            # Also runs on cancellation or a failed send, so generation stops
+            self._active_streams.pop(stream_key, None)
+            await chunks.aclose()
+        
+        return {"text": "".join(parts), "chunks": len(parts)}
+    
+    async def _handle_response(self, data: Dict[str, Any], send: Optional[SendCallback] = None) -> None:
         """Handle MCP response messages."""
         response = MCPResponse(**data)
         
@@ -156,7 +214,7 @@ class MCPProtocolHandler:
             if not future.cancelled():
                 future.set_result(response)
     
-    async def _handle_error(self, data: Dict[str, Any]) -> None:
+    async def _handle_error(self, data: Dict[str, Any], send: Optional[SendCallback] = None) -> None:
         """Handle MCP error messages."""
         error = MCPError(**data)
         
@@ -168,9 +226,17 @@ class MCPProtocolHandler:
         
         logger.error(f"Received MCP error: {error.code} - {error.message}")
     
-    async def _handle_notification(self, data: Dict[str, Any]) -> None:
+    async def _handle_notification(self, data: Dict[str, Any], send: Optional[SendCallback] = None) -> None:
         """Handle MCP notification messages."""
         # Notifications don't require responses
+        if data.get("method") == STREAM_CANCEL_METHOD:
+            request_id = (data.get("params") or {}).get("request_id")
+            task = self._active_streams.get((send, request_id))
+            if task:
+                logger.info(f"Cancelling stream for request {request_id}")
+                task.cancel()
+            return
+        
         logger.info(f"Received MCP notification: {data}")
     
     async def send_request(self, method: str, params: Optional[Dict[str, Any]] = None, 
@@ -240,9 +306,19 @@ class MCPServer:
     and managing the protocol lifecycle.
     """
     
-    def __init__(self, host: str = "0.0.0.0", port: int = 8001):
+    def __init__(self, host: str = "0.0.0.0", port: int = 8001,
+                 authenticate: Optional[Callable[[Any], Awaitable[Dict[str, Any]]]] = None):
+        """
+        Args:
+            host: Interface to listen on
+            port: Port to listen on
+            authenticate: Called with each new connection. Returns the params
+                to set on every request of the connection, or raises
+                MCPProtocolError to refuse it.
+        """
         self.host = host
         self.port = port
+        self.authenticate = authenticate
         self.protocol_handler = MCPProtocolHandler()
         self._server = None
         self._connections = set()
@@ -251,6 +327,10 @@ class MCPServer:
         """Register a method handler."""
         self.protocol_handler.register_method(method_name, handler)
     
+    def register_stream_method(self, method_name: str, handler: Callable):
+        """Register a streaming method handler."""
+        self.protocol_handler.register_stream_method(method_name, handler)
+    
     async def start(self) -> None:
         """Start the MCP server."""
         logger.info(f"Starting MCP server on {self.host}:{self.port}")
@@ -274,18 +354,49 @@ class MCPServer:
         self._connections.clear()
     
     async def handle_connection(self, websocket, path):
-        """Handle a new WebSocket connection."""
+        """
+        Handle a new WebSocket connection.
+        
+        Messages are processed concurrently so that a cancel notification can
+        reach a stream that is still running; responses carry the request id.
+        """
+        context = None
+        if self.authenticate is not None:
+            try:
+                context = await self.authenticate(websocket)
+            except MCPProtocolError as e:
+                logger.warning(f"Refused MCP connection from {websocket.remote_address}: {e.message}")
+                # 1008: policy violation
+                await websocket.close(code=1008, reason=e.message)
+                return
+        
         self._connections.add(websocket)
         logger.info(f"New MCP connection from {websocket.remote_address}")
         
+        send = websocket.send
+        in_flight: Set[asyncio.Task] = set()
+        
+        async def respond(message: str) -> None:
+            try:
+                response = await self.protocol_handler.process_message(message, send=send, context=context)
+                if response:
+                    await send(response)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Failed to respond on MCP connection: {e}")
+        
         try:
             async for message in websocket:
-                response = await self.protocol_handler.process_message(message)
-                if response:
-                    await websocket.send(response)
+                task = asyncio.create_task(respond(message))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
         except Exception as e:
             logger.error(f"Connection error: {e}")
         finally:
+            # The client is gone: stop any generation still streaming to it
+            for task in list(in_flight):
+                task.cancel()
             self._connections.discard(websocket)
             logger.info(f"MCP connection closed for {websocket.remote_address}")
 
@@ -294,6 +405,11 @@ class MCPServer:
 MCP_VERSION = "1.0.0"
 MCP_SPEC_URL = "https://modelcontext.org/"
 
+# Notification carrying one chunk of a streaming request's output
+STREAM_CHUNK_METHOD = "inference.chunk"
+# Notification from the client asking to stop a streaming request
+STREAM_CANCEL_METHOD = "inference.cancel"
+
 # Standard error codes
 class MCPErrorCodes:
     PARSE_ERROR = -32700
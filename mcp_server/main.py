@@ -19,6 +19,9 @@ try:
     from .api.endpoints import router as api_router
     from .models.registry import model_registry
     from .services.auth import auth_service
+    from .services.batching import embedding_batcher
+    from .services.embedding_cache import embedding_cache
+    from .backends.http_clients import http_clients
     from .core.protocol import MCPProtocolError
     from . import __version__, __description__
 except ImportError:
@@ -27,6 +30,9 @@ except ImportError:
     from api.endpoints import router as api_router
     from models.registry import model_registry
     from services.auth import auth_service
+    from services.batching import embedding_batcher
+    from services.embedding_cache import embedding_cache
+    from backends.http_clients import http_clients
     from core.protocol import MCPProtocolError
     import __init__
     __version__ = __init__.__version__
@@ -65,6 +71,9 @@ async def lifespan(app: FastAPI):
     finally:
         logger.info("Shutting down MCP Server...")
         
+        # Stop model warm-up if it is still running
+        await model_registry.close()
+        
         # Cleanup configuration loader
         try:
             from .services.config_loader import config_loader
@@ -78,9 +87,16 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"Error cleaning up config loader: {e}")
         
+        # Stop embedding batchers
+        await embedding_batcher.close()
+        embedding_cache.close()
+        
         # Cleanup auth service
         await auth_service.cleanup()
         
+        # Close pooled backend connections
+        await http_clients.close()
+        
         logger.info("MCP Server shutdown complete")
 
 
@@ -5,8 +5,10 @@ This module provides model registration, discovery, and lifecycle management
 for the MCP server, supporting multiple backend types and configurations.
 """
 
+import asyncio
 import logging
-from typing import Dict, List, Optional, Any
+import time
+from typing import Dict, List, Optional, Set, Any
 from datetime import datetime
 import json
 import os
@@ -19,6 +21,9 @@ try:
     from ..config.settings import mcp_settings
     from ..services.privacy import privacy_enforcer
     from ..services.config_loader import config_loader
+    from ..services.batching import embedding_batcher
+    from ..services.embedding_cache import embedding_cache
+    from ..services.admission import admission_controller
     from ..backends import ModelBackend, OllamaBackend, HuggingFaceBackend
 except ImportError:
     from schemas.mcp_schemas import (
@@ -27,6 +32,9 @@ except ImportError:
     from config.settings import mcp_settings
     from services.privacy import privacy_enforcer
     from services.config_loader import config_loader
+    from services.batching import embedding_batcher
+    from services.embedding_cache import embedding_cache
+    from services.admission import admission_controller
     from backends import ModelBackend, OllamaBackend, HuggingFaceBackend
 
 
@@ -38,11 +46,24 @@ class ModelRegistry:
     Model registry and management service.
     
     Manages model lifecycle, registration, discovery, and health monitoring.
+    
+    Backends are initialized concurrently (up to MODEL_INIT_CONCURRENCY at a
+    time) in a background warm-up, so the server answers requests such as
+    /health while models are still loading. With MODEL_LAZY_INIT a backend
+    is only initialized on its first request. Either way concurrent callers
+    share a single initialization per model.
     """
     
     def __init__(self):
         self._models: Dict[str, ModelInfo] = {}
         self._backends: Dict[str, ModelBackend] = {}
+        self._init_tasks: Dict[str, asyncio.Task] = {}
+        self._warmup_task: Optional[asyncio.Task] = None
+        # Replaced backends waiting for their running requests to finish
+        self._retiring: Set[asyncio.Task] = set()
+        # Models from the configuration file, with the request each was registered from
+        self._config_models: Dict[str, Dict[str, Any]] = {}
+        self._reload_lock = asyncio.Lock()
         self._registry_path = mcp_settings.MODEL_REGISTRY_PATH
         self._backend_classes = {
             "ollama": OllamaBackend,
@@ -57,8 +78,9 @@ class ModelRegistry:
         # Create registry directory if it doesn't exist
         os.makedirs(self._registry_path, exist_ok=True)
         
-        # Initialize configuration loader
+        # Initialize configuration loader and apply its file watcher's reloads
         await config_loader.initialize()
+        config_loader.add_reload_callback(self.apply_configuration)
         
         # Load models from configuration files first
         await self._load_models_from_config()
@@ -67,27 +89,109 @@ class ModelRegistry:
         await self._load_registry()
         
         # Initialize all registered models
-        for model_id in list(self._models.keys()):
-            try:
-                await self._initialize_model(model_id)
-            except Exception as e:
-                logger.error(f"Failed to initialize model {model_id}: {e}")
+        pending = [model_id for model_id in self._models if model_id not in self._backends]
+        if mcp_settings.MODEL_LAZY_INIT:
+            logger.info(f"Lazy initialization: {len(pending)} models will start on first request")
+        elif mcp_settings.MODEL_BACKGROUND_WARMUP:
+            self._warmup_task = asyncio.create_task(self.warm_up(pending))
+        else:
+            await self.warm_up(pending)
+    
+    async def warm_up(self, model_ids: List[str]) -> None:
+        """Initialize the given models concurrently, at most MODEL_INIT_CONCURRENCY at a time."""
+        if not model_ids:
+            return
+        
+        semaphore = asyncio.Semaphore(mcp_settings.MODEL_INIT_CONCURRENCY)
+        
+        async def warm(model_id: str) -> None:
+            async with semaphore:
+                await self.ensure_backend(model_id)
+        
+        started = time.perf_counter()
+        await asyncio.gather(*(warm(model_id) for model_id in model_ids))
+        ready = sum(1 for model_id in model_ids if model_id in self._backends)
+        logger.info(f"Warmed up {ready}/{len(model_ids)} models in {time.perf_counter() - started:.1f}s")
+    
+    async def ensure_backend(self, model_id: str) -> Optional[ModelBackend]:
+        """
+        Get a model's backend, initializing it first if needed.
+        
+        Concurrent callers wait on one shared initialization. A failed
+        initialization is not remembered, so a later call retries it.
+        
+        Returns:
+            The backend, or None if the model is unknown or failed to start
+        """
+        backend = self._backends.get(model_id)
+        if backend or model_id not in self._models:
+            return backend
+        
+        task = self._init_tasks.get(model_id)
+        if task is None:
+            task = asyncio.ensure_future(self._initialize_model(model_id))
+            self._init_tasks[model_id] = task
+            task.add_done_callback(lambda done: self._init_task_done(model_id, done))
+        
+        try:
+            # Shielded: one caller giving up must not abort the shared initialization
+            await asyncio.shield(task)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            return None
+        return self._backends.get(model_id)
+    
+    def _init_task_done(self, model_id: str, task: asyncio.Task) -> None:
+        if self._init_tasks.get(model_id) is task:
+            del self._init_tasks[model_id]
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            logger.error(f"Failed to initialize model {model_id}: {error}")
+            model = self._models.get(model_id)
+            if model:
+                model.status = ModelStatus.ERROR
+                model.updated_at = datetime.utcnow()
     
-    async def _load_models_from_config(self) -> None:
-        """Load models from configuration files."""
+    async def close(self) -> None:
+        """Stop any warm-up or initialization still in progress, and shut replaced backends down."""
+        tasks = [self._warmup_task] if self._warmup_task else []
+        tasks += list(self._init_tasks.values())
+        tasks += list(self._retiring)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._warmup_task = None
+    
+    async def _load_models_from_config(self) -> List[str]:
+        """
+        Load models from configuration files.
+        
+        Models are registered without initializing their backends; the
+        caller warms them up together.
+        
+        Returns:
+            IDs of the newly registered models
+        """
+        model_ids = []
         try:
             model_requests = await config_loader.get_model_requests()
             
             for request in model_requests:
                 try:
                     # Use default tenant for configuration-loaded models
-                    await self.register_model(request, "default")
+                    model_id = await self.register_model(request, "default", initialize=False)
+                    self._config_models[model_id] = self._config_fingerprint(request)
+                    model_ids.append(model_id)
                     logger.info(f"Loaded model from configuration: {request.name}")
                 except Exception as e:
                     logger.error(f"Failed to load model from configuration {request.name}: {e}")
                     
         except Exception as e:
             logger.error(f"Failed to load models from configuration: {e}")
+        return model_ids
     
     async def reload_configuration(self) -> bool:
         """
@@ -101,8 +205,8 @@ class ModelRegistry:
             if await config_loader.reload_configuration():
                 logger.info("Reloading models from updated configuration")
                 
-                # Load new models from configuration
-                await self._load_models_from_config()
+                # Apply only what changed in the configuration
+                await self.apply_configuration()
                 
                 return True
             return False
@@ -111,19 +215,144 @@ class ModelRegistry:
             logger.error(f"Failed to reload configuration: {e}")
             raise
     
-    async def register_model(self, request: ModelRegistrationRequest, tenant_id: str) -> str:
+    async def apply_configuration(self) -> Dict[str, List[str]]:
+        """
+        Bring configuration-file models in line with the loaded configuration.
+        
+        Only the difference is applied: removed models are unregistered, new
+        ones registered and started, and changed ones restarted. A changed
+        model keeps serving from its old backend until the new one is ready.
+        Models whose configuration did not change are left alone.
+        
+        Returns:
+            IDs of the added, removed and changed models
+        """
+        async with self._reload_lock:
+            desired = {
+                self._make_model_id(request, "default"): request
+                for request in await config_loader.get_model_requests()
+            }
+            removed = [model_id for model_id in self._config_models if model_id not in desired]
+            added = [model_id for model_id in desired if model_id not in self._config_models]
+            changed = [
+                model_id for model_id in desired
+                if model_id in self._config_models
+                and self._config_models[model_id] != self._config_fingerprint(desired[model_id])
+            ]
+            # Known from an earlier run's registry file: replace rather than re-register
+            changed += [model_id for model_id in added if model_id in self._models]
+            added = [model_id for model_id in added if model_id not in self._models]
+            
+            for model_id in removed:
+                if model_id in self._models:
+                    await self.unregister_model(model_id, "default")
+                del self._config_models[model_id]
+            
+            started = []
+            for model_id in added:
+                try:
+                    await self.register_model(desired[model_id], "default", initialize=False)
+                    self._config_models[model_id] = self._config_fingerprint(desired[model_id])
+                    started.append(model_id)
+                except Exception as e:
+                    logger.error(f"Failed to add model {model_id} from configuration: {e}")
+            
+            async def restart(model_id: str) -> None:
+                try:
+                    await self._restart_model(model_id, desired[model_id])
+                    self._config_models[model_id] = self._config_fingerprint(desired[model_id])
+                except Exception as e:
+                    # Left with the previous fingerprint, so the next reload retries
+                    logger.error(f"Failed to restart model {model_id} with its new configuration: {e}")
+            
+            warm_up = [] if mcp_settings.MODEL_LAZY_INIT else [self.warm_up(started)]
+            await asyncio.gather(*warm_up, *(restart(model_id) for model_id in changed))
+            
+            logger.info(f"Applied configuration: {len(added)} added, {len(removed)} removed, {len(changed)} changed")
+            return {"added": added, "removed": removed, "changed": changed}
+    
+    async def _restart_model(self, model_id: str, request: ModelRegistrationRequest) -> None:
+        """Replace a model's configuration, swapping in a new backend once it is ready."""
+        backend_class = self._backend_classes.get(request.backend_type)
+        if not backend_class:
+            raise ValueError(f"Unsupported backend type: {request.backend_type}")
+        
+        validated_config = privacy_enforcer.validate_model_config(request.config)
+        model_info = self._new_model_info(model_id, request, "default")
+        old_backend = self._backends.get(model_id)
+        
+        if old_backend is None:
+            # Not running: the new configuration is picked up when it starts
+            self._models[model_id] = model_info
+            await self._save_model_config(model_id, validated_config)
+            if not mcp_settings.MODEL_LAZY_INIT:
+                await self.ensure_backend(model_id)
+            return
+        
+        backend = backend_class(model_id, validated_config)
+        await backend.initialize()
+        
+        model_info.capabilities = backend.get_capabilities()
+        model_info.status = backend.status
+        self._models[model_id] = model_info
+        self._backends[model_id] = backend
+        await self._save_model_config(model_id, validated_config)
+        
+        await embedding_batcher.remove(model_id)
+        admission_controller.remove(old_backend)
+        embedding_cache.invalidate_model(model_id)
+        # Requests already running on the old backend still need its HTTP session
+        task = asyncio.create_task(self._retire_backend(old_backend))
+        self._retiring.add(task)
+        task.add_done_callback(self._retiring.discard)
+        logger.info(f"Restarted model backend with new configuration: {model_id}")
+    
+    async def _retire_backend(self, backend: ModelBackend) -> None:
+        """Shut a replaced backend down once the requests running on it have finished."""
+        try:
+            # A request can't outlast the backend's own timeout
+            if not await backend.wait_idle(backend.timeout):
+                logger.warning(f"Shutting down replaced backend for {backend.model_id} with requests still running")
+        finally:
+            await backend.shutdown()
+    
+    @staticmethod
+    def _make_model_id(request: ModelRegistrationRequest, tenant_id: str) -> str:
+        return f"{tenant_id}_{request.backend_type}_{request.name}".lower().replace(" ", "_").replace("-", "_")
+    
+    @staticmethod
+    def _new_model_info(model_id: str, request: ModelRegistrationRequest, tenant_id: str) -> ModelInfo:
+        return ModelInfo(
+            id=model_id,
+            name=request.name,
+            description=request.description,
+            backend_type=request.backend_type,
+            capabilities=request.capabilities or [],
+            status=ModelStatus.LOADING,
+            tenant_id=tenant_id
+        )
+    
+    @staticmethod
+    def _config_fingerprint(request: ModelRegistrationRequest) -> Dict[str, Any]:
+        return request.model_dump(mode="json")
+    
+    async def register_model(self, request: ModelRegistrationRequest, tenant_id: str,
+                             initialize: bool = True) -> str:
         """
         Register a new model.
         
         Args:
             request: Model registration request
             tenant_id: Tenant ID for isolation (from auth context)
+            initialize: Initialize the backend now and drop the model if that
+                fails; otherwise it is initialized later by warm-up or on
+                first request
             
         Returns:
             Model ID
         """
         # Create tenant-scoped model ID to prevent conflicts
-        model_id = f"{tenant_id}_{request.backend_type}_{request.name}".lower().replace(" ", "_").replace("-", "_")
+        model_id = self._make_model_id(request, tenant_id)
         
         # Check if model already exists for this tenant
         if model_id in self._models:
@@ -137,15 +366,7 @@ class ModelRegistry:
         validated_config = privacy_enforcer.validate_model_config(request.config)
         
         # Create model info with tenant isolation
-        model_info = ModelInfo(
-            id=model_id,
-            name=request.name,
-            description=request.description,
-            backend_type=request.backend_type,
-            capabilities=request.capabilities or [],
-            status=ModelStatus.LOADING,
-            tenant_id=tenant_id
-        )
+        model_info = self._new_model_info(model_id, request, tenant_id)
         
         # Register the model
         self._models[model_id] = model_info
@@ -153,6 +374,9 @@ class ModelRegistry:
         # Save to registry
         await self._save_model_config(model_id, validated_config)
         
+        if not initialize:
+            return model_id
+        
         # Initialize the model backend
         try:
             await self._initialize_model(model_id, validated_config)
@@ -183,11 +407,14 @@ class ModelRegistry:
         
         # Shutdown backend if exists
         if model_id in self._backends:
+            await embedding_batcher.remove(model_id)
+            admission_controller.remove(self._backends[model_id])
             await self._backends[model_id].shutdown()
             del self._backends[model_id]
         
         # Remove from registry
         del self._models[model_id]
+        embedding_cache.invalidate_model(model_id)
         
         # Remove config file
         config_path = os.path.join(self._registry_path, f"{model_id}.json")
@@ -354,6 +581,11 @@ class ModelRegistry:
         backend = backend_class(model_id, config)
         await backend.initialize()
         
+        if self._models.get(model_id) is not model_info:
+            # Unregistered (or replaced) while initializing
+            await backend.shutdown()
+            return
+        
         # Update model info with backend capabilities
         model_info.capabilities = backend.get_capabilities()
         model_info.status = backend.status
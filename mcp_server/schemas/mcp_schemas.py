@@ -57,6 +57,13 @@ class MCPResponse(MCPMessage):
     error: Optional[Dict[str, Any]] = Field(default=None, description="Error information")
 
 
+class MCPNotification(MCPMessage):
+    """MCP protocol notification message (no response expected)."""
+    type: MCPMessageType = MCPMessageType.NOTIFICATION
+    method: str = Field(description="Notification method name")
+    params: Optional[Dict[str, Any]] = Field(default=None, description="Notification parameters")
+
+
 class MCPError(MCPMessage):
     """MCP protocol error message."""
     type: MCPMessageType = MCPMessageType.ERROR
@@ -109,10 +116,12 @@ class CompletionRequest(InferenceRequest):
     """Text completion request."""
     inference_type: InferenceType = InferenceType.COMPLETION
     prompt: str = Field(description="Input prompt")
+    conversation_id: Optional[str] = Field(default=None, description="Continue a multi-turn session")
     max_tokens: Optional[int] = Field(default=None, description="Maximum tokens to generate")
     temperature: Optional[float] = Field(default=0.7, ge=0.0, le=2.0, description="Sampling temperature")
     top_p: Optional[float] = Field(default=0.9, ge=0.0, le=1.0, description="Top-p sampling")
     stop_sequences: Optional[List[str]] = Field(default=None, description="Stop sequences")
+    stream: Optional[bool] = Field(default=False, description="Enable streaming response")
 
 
 class ChatMessage(BaseModel):
@@ -125,7 +134,8 @@ class ChatMessage(BaseModel):
 class ChatRequest(InferenceRequest):
     """Chat completion request."""
     inference_type: InferenceType = InferenceType.CHAT
-    messages: List[ChatMessage] = Field(description="Chat conversation history")
+    messages: List[ChatMessage] = Field(description="Chat conversation history (new messages only when continuing a server-side conversation)")
+    conversation_id: Optional[str] = Field(default=None, description="Continue a server-side conversation")
     max_tokens: Optional[int] = Field(default=None, description="Maximum tokens to generate")
     temperature: Optional[float] = Field(default=0.7, ge=0.0, le=2.0, description="Sampling temperature")
     stream: Optional[bool] = Field(default=False, description="Enable streaming response")
@@ -0,0 +1,348 @@
+"""
+Admission control for model inference.
+
+Every inference request passes through the admission controller before it
+reaches a backend:
+
+- each tenant may run at most MAX_CONCURRENT_REQUESTS requests at once and
+  queue at most MAX_QUEUED_REQUESTS_PER_TENANT more (O(1) counters)
+- each physical model runs at most its ``max_concurrency`` requests at once
+  (MODEL_MAX_CONCURRENCY by default), matched to what the backend can serve
+- waiting requests are admitted in weighted fair order across tenants, so a
+  tenant that queues a burst does not starve the others on a shared model
+- a request that cannot be admitted before its deadline fails with
+  RATE_LIMIT_EXCEEDED instead of waiting forever
+
+Embedding requests only take a tenant slot: the embedding batcher already
+limits each model to one backend call at a time.
+
+Requests without a tenant (tenant isolation disabled) are not held to the
+per-tenant limits; they only wait for model slots.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Dict, List, Optional, Any, Tuple
+
+try:
+    from ..config.settings import mcp_settings
+    from ..backends.base_backend import ModelBackend
+    from ..core.protocol import MCPProtocolError, MCPErrorCodes
+except ImportError:
+    from config.settings import mcp_settings
+    from backends.base_backend import ModelBackend
+    from core.protocol import MCPProtocolError, MCPErrorCodes
+
+
+logger = logging.getLogger(__name__)
+
+# Counts requests without a tenant (tenant isolation disabled), which have no tenant limits
+_NO_TENANT = ""
+
+
+@dataclass(eq=False)
+class _Waiter:
+    """A request queued for a slot on one model."""
+    tenant_id: str
+    start_tag: float
+    finish_tag: float
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+@dataclass
+class AdmissionMetrics:
+    """Admission counters for one model gate."""
+    admitted: int = 0
+    queued: int = 0
+    rejected: int = 0
+    timed_out: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        self.admitted += 1
+        self.total_wait_seconds += seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "admitted": self.admitted,
+            "queued_total": self.queued,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "avg_wait_ms": 1000 * self.total_wait_seconds / self.admitted if self.admitted else 0.0,
+            "max_wait_ms": 1000 * self.max_wait_seconds
+        }
+
+
+class _ModelGate:
+    """
+    Concurrency slots and fair queue for one physical model.
+
+    Waiters are ordered by start-time fair queuing: a tenant's next request
+    is tagged one ``1 / weight`` step after its previous one, starting no
+    earlier than the gate's virtual time, and the smallest finish tag is
+    admitted first. A tenant with many queued requests therefore takes
+    turns with the others instead of being served in arrival order.
+    """
+
+    def __init__(self, key: str, capacity: int):
+        self.key = key
+        self.capacity = capacity
+        self.running = 0
+        self.waiting = 0
+        self.virtual_time = 0.0
+        self.metrics = AdmissionMetrics()
+        self._heap: List[Tuple[float, int, _Waiter]] = []
+        self._last_finish: Dict[str, float] = {}
+        self._sequence = itertools.count()
+
+    def enqueue(self, tenant_id: str, weight: float) -> _Waiter:
+        start = max(self.virtual_time, self._last_finish.get(tenant_id, 0.0))
+        waiter = _Waiter(
+            tenant_id=tenant_id,
+            start_tag=start,
+            finish_tag=start + 1.0 / weight,
+            future=asyncio.get_running_loop().create_future()
+        )
+        self._last_finish[tenant_id] = waiter.finish_tag
+        heapq.heappush(self._heap, (waiter.finish_tag, next(self._sequence), waiter))
+        self.waiting += 1
+        self.metrics.queued += 1
+        return waiter
+
+    def pop_eligible(self, at_tenant_limit: Callable[[str], bool]) -> Optional[_Waiter]:
+        """Take the first live waiter whose tenant is below its limit."""
+        skipped = []
+        found = None
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            waiter = entry[2]
+            if waiter.future.done():
+                # Timed out or cancelled while queued
+                continue
+            if at_tenant_limit(waiter.tenant_id):
+                skipped.append(entry)
+                continue
+            found = waiter
+            break
+        for entry in skipped:
+            heapq.heappush(self._heap, entry)
+
+        if found is not None:
+            self.waiting -= 1
+            self.virtual_time = max(self.virtual_time, found.start_tag)
+        return found
+
+    def forget(self) -> None:
+        """Account for a waiter that left the queue without being admitted."""
+        self.waiting -= 1
+        if len(self._heap) > 2 * self.waiting + 32:
+            self._heap = [entry for entry in self._heap if not entry[2].future.done()]
+            heapq.heapify(self._heap)
+        self.reset_if_idle()
+
+    def reset_if_idle(self) -> None:
+        """Start the next busy period with fresh tags once nothing is running or queued."""
+        if not self.waiting and not self.running:
+            self._heap.clear()
+            self._last_finish.clear()
+            self.virtual_time = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "running": self.running,
+            "queue_depth": self.waiting,
+            **self.metrics.to_dict()
+        }
+
+
+class AdmissionController:
+    """Admits inference requests per tenant and per model."""
+
+    def __init__(self,
+                 max_running_per_tenant: Optional[int] = None,
+                 max_queued_per_tenant: Optional[int] = None,
+                 queue_timeout_seconds: Optional[float] = None,
+                 tenant_weights: Optional[Dict[str, float]] = None):
+        self.max_running_per_tenant = max_running_per_tenant or mcp_settings.MAX_CONCURRENT_REQUESTS
+        self.max_queued_per_tenant = (
+            max_queued_per_tenant if max_queued_per_tenant is not None
+            else mcp_settings.MAX_QUEUED_REQUESTS_PER_TENANT
+        )
+        self.queue_timeout_seconds = queue_timeout_seconds or mcp_settings.ADMISSION_QUEUE_TIMEOUT_SECONDS
+        self.tenant_weights = tenant_weights if tenant_weights is not None else mcp_settings.TENANT_QUEUE_WEIGHTS
+        self._gates: Dict[str, _ModelGate] = {}
+        self._tenant_running: Dict[str, int] = {}
+        self._tenant_queued: Dict[str, int] = {}
+
+    @asynccontextmanager
+    async def admit(self, tenant_id: Optional[str], backend: Optional[ModelBackend]) -> AsyncIterator[None]:
+        """
+        Hold a slot for the duration of the block.
+
+        With a backend, waits in the model's fair queue for a model slot.
+        Without one, only a tenant slot is taken, and a tenant already at its
+        limit is rejected straight away.
+        """
+        tenant = tenant_id or _NO_TENANT
+        gate = self._get_gate(backend) if backend is not None else None
+        if gate is not None:
+            await self._acquire(gate, tenant)
+        else:
+            self._acquire_tenant_slot(tenant)
+        try:
+            yield
+        finally:
+            self._release(gate, tenant)
+
+    def check_queue(self, tenant_id: Optional[str]) -> None:
+        """Fail fast if the tenant could not even queue another request."""
+        tenant = tenant_id or _NO_TENANT
+        queued = self._tenant_queued.get(tenant, 0)
+        if tenant != _NO_TENANT and queued >= self.max_queued_per_tenant:
+            raise MCPProtocolError(
+                code=MCPErrorCodes.RATE_LIMIT_EXCEEDED,
+                message=f"Rate limit exceeded: {queued} requests already queued"
+            )
+
+    @staticmethod
+    def _capacity_key(backend: ModelBackend) -> str:
+        if hasattr(backend, "get_capacity_key"):
+            return backend.get_capacity_key()
+        return backend.model_id
+
+    def _get_gate(self, backend: ModelBackend) -> _ModelGate:
+        key = self._capacity_key(backend)
+        capacity = getattr(backend, "max_concurrency", None) or mcp_settings.MODEL_MAX_CONCURRENCY
+        gate = self._gates.get(key)
+        if gate is None:
+            gate = self._gates[key] = _ModelGate(key, capacity)
+        elif gate.capacity != capacity:
+            gate.capacity = capacity
+        return gate
+
+    async def _acquire(self, gate: _ModelGate, tenant: str) -> None:
+        # Fast path only when nobody is queued, so arrivals can't jump the queue
+        if not gate.waiting and gate.running < gate.capacity and not self._at_tenant_limit(tenant):
+            self._start(gate, tenant)
+            gate.metrics.record_wait(0.0)
+            return
+
+        try:
+            self.check_queue(tenant)
+        except MCPProtocolError:
+            gate.metrics.rejected += 1
+            raise
+
+        waiter = gate.enqueue(tenant, self.tenant_weights.get(tenant, 1.0))
+        self._tenant_queued[tenant] = self._tenant_queued.get(tenant, 0) + 1
+        # Free slots may be held back only by other tenants' limits
+        self._dispatch(gate)
+        try:
+            done, _ = await asyncio.wait({waiter.future}, timeout=self.queue_timeout_seconds)
+        except asyncio.CancelledError:
+            self._abandon(gate, waiter)
+            raise
+
+        if not done:
+            self._abandon(gate, waiter)
+            gate.metrics.timed_out += 1
+            raise MCPProtocolError(
+                code=MCPErrorCodes.RATE_LIMIT_EXCEEDED,
+                message=f"Rate limit exceeded: not admitted within {self.queue_timeout_seconds}s"
+            )
+
+    def _at_tenant_limit(self, tenant: str) -> bool:
+        return tenant != _NO_TENANT and self._tenant_running.get(tenant, 0) >= self.max_running_per_tenant
+
+    def _acquire_tenant_slot(self, tenant: str) -> None:
+        running = self._tenant_running.get(tenant, 0)
+        if self._at_tenant_limit(tenant):
+            raise MCPProtocolError(
+                code=MCPErrorCodes.RATE_LIMIT_EXCEEDED,
+                message=f"Rate limit exceeded: {running} concurrent requests"
+            )
+        self._tenant_running[tenant] = running + 1
+
+    def _abandon(self, gate: _ModelGate, waiter: _Waiter) -> None:
+        """Leave the queue, giving back the slot if it was granted meanwhile."""
+        if waiter.future.done() and not waiter.future.cancelled():
+            self._release(gate, waiter.tenant_id)
+            return
+        waiter.future.cancel()
+        self._decrement(self._tenant_queued, waiter.tenant_id)
+        gate.forget()
+
+    def _start(self, gate: _ModelGate, tenant: str) -> None:
+        gate.running += 1
+        self._tenant_running[tenant] = self._tenant_running.get(tenant, 0) + 1
+
+    def _release(self, gate: Optional[_ModelGate], tenant: str) -> None:
+        self._decrement(self._tenant_running, tenant)
+        if gate is not None:
+            gate.running -= 1
+            self._dispatch(gate)
+            gate.reset_if_idle()
+        # The tenant may have had requests waiting on other models
+        for other in self._gates.values():
+            if other is not gate and other.waiting:
+                self._dispatch(other)
+
+    def _dispatch(self, gate: _ModelGate) -> None:
+        """Admit waiters while the model has free slots."""
+        while gate.running < gate.capacity:
+            waiter = gate.pop_eligible(self._at_tenant_limit)
+            if waiter is None:
+                return
+            self._decrement(self._tenant_queued, waiter.tenant_id)
+            self._start(gate, waiter.tenant_id)
+            gate.metrics.record_wait(time.perf_counter() - waiter.enqueued_at)
+            waiter.future.set_result(None)
+
+    @staticmethod
+    def _decrement(counters: Dict[str, int], tenant: str) -> None:
+        remaining = counters.get(tenant, 0) - 1
+        if remaining > 0:
+            counters[tenant] = remaining
+        else:
+            counters.pop(tenant, None)
+
+    def remove(self, backend: ModelBackend) -> None:
+        """Forget an idle model gate, e.g. when the model is unregistered."""
+        key = self._capacity_key(backend)
+        gate = self._gates.get(key)
+        if gate is not None and not gate.running and not gate.waiting:
+            del self._gates[key]
+
+    def get_stats(self, tenant_id: Optional[str] = None,
+                  capacity_keys: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Queue depth and wait-time metrics per model, plus per-tenant counters."""
+        tenants = [tenant_id] if tenant_id is not None else list(
+            set(self._tenant_running) | set(self._tenant_queued)
+        )
+        return {
+            "models": {
+                key: gate.to_dict()
+                for key, gate in self._gates.items()
+                if capacity_keys is None or key in capacity_keys
+            },
+            "tenants": {
+                tenant: {
+                    "running": self._tenant_running.get(tenant, 0),
+                    "queued": self._tenant_queued.get(tenant, 0)
+                }
+                for tenant in tenants
+            }
+        }
+
+
+# Global admission controller instance
+admission_controller = AdmissionController()
@@ -5,11 +5,14 @@ This module provides authentication, tenant isolation, and access control
 for the MCP server, integrating with the main Recaller backend.
 """
 
+import asyncio
 import logging
-from typing import Optional, Dict, Any
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, Tuple
 from fastapi import HTTPException, Depends, Request
 import httpx
-from datetime import datetime
 
 try:
     from ..config.settings import mcp_settings
@@ -38,19 +41,33 @@ class TenantInfo:
         return self.__str__()
 
 
+@dataclass
+class _CacheEntry:
+    """Cached tenant lookup; tenant_info is None for a tenant the backend does not know."""
+    tenant_info: Optional[TenantInfo]
+    fetched_at: float = field(default_factory=time.monotonic)
+
+
 class AuthService:
     """
     Authentication and authorization service.
     
     Handles tenant verification, API access control, and integration
-    with the main Recaller backend for authentication.
+    with the main Recaller backend for authentication. Tenant lookups are
+    cached (including unknown tenants, for a shorter time) in a bounded
+    LRU, and concurrent lookups of the same tenant share one backend call.
     """
     
     def __init__(self):
         self._backend_client = None
-        self._tenant_cache: Dict[str, TenantInfo] = {}
-        self._cache_ttl = 300  # 5 minutes
-        self._last_cache_update: Dict[str, datetime] = {}
+        # Verified tenants, least recently used first
+        self._tenant_cache: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._cache_ttl = mcp_settings.TENANT_CACHE_TTL_SECONDS
+        self._stale_ttl = mcp_settings.TENANT_CACHE_STALE_SECONDS
+        self._negative_cache_ttl = mcp_settings.TENANT_CACHE_NEGATIVE_TTL_SECONDS
+        self._max_cache_entries = mcp_settings.TENANT_CACHE_MAX_ENTRIES
+        # Backend lookups in progress, shared by everyone asking for the same tenant
+        self._inflight: Dict[str, asyncio.Future] = {}
     
     async def get_backend_client(self) -> httpx.AsyncClient:
         """Get HTTP client for backend communication."""
@@ -59,9 +76,21 @@ class AuthService:
             if mcp_settings.BACKEND_API_KEY:
                 headers["Authorization"] = f"Bearer {mcp_settings.BACKEND_API_KEY}"
             
+            # One pooled client for all backend calls, with keep-alive and
+            # the same connect/read timeouts as the model backends
             self._backend_client = httpx.AsyncClient(
                 base_url=mcp_settings.BACKEND_API_URL,
-                headers=headers
+                headers=headers,
+                timeout=httpx.Timeout(
+                    mcp_settings.REQUEST_TIMEOUT_SECONDS,
+                    connect=mcp_settings.HTTP_CONNECT_TIMEOUT_SECONDS,
+                    read=mcp_settings.HTTP_READ_TIMEOUT_SECONDS
+                ),
+                limits=httpx.Limits(
+                    max_connections=mcp_settings.HTTP_MAX_CONNECTIONS_PER_HOST,
+                    max_keepalive_connections=mcp_settings.HTTP_MAX_CONNECTIONS_PER_HOST,
+                    keepalive_expiry=mcp_settings.HTTP_KEEPALIVE_SECONDS
+                )
             )
         return self._backend_client
     
@@ -80,72 +109,7 @@ class AuthService:
             MCPProtocolError: If tenant access is denied
         """
         try:
-            # Check cache first
-            if self._is_cached_valid(tenant_id):
-                return self._tenant_cache[tenant_id]
-            
-            # Query backend for tenant information
-            client = await self.get_backend_client()
-            
-            # Use the same tenant verification logic as the main backend
-            headers = {"X-Tenant-ID": tenant_id}
-            if user_token:
-                headers["Authorization"] = f"Bearer {user_token}"
-            
-            try:
-                response = await client.get("/api/v1/config/tenant-info", headers=headers)
-            except Exception as e:
-                logger.warning(f"Failed to connect to backend for tenant verification: {e}")
-                # In development mode, create a default tenant when backend is unavailable
-                if tenant_id == "default":
-                    tenant_info = TenantInfo(
-                        id="default",
-                        slug="default",
-                        name="Default Tenant",
-                        active=True
-                    )
-                    self._tenant_cache[tenant_id] = tenant_info
-                    self._last_cache_update[tenant_id] = datetime.utcnow()
-                    return tenant_info
-                else:
-                    raise MCPProtocolError(
-                        code=MCPErrorCodes.TENANT_ACCESS_DENIED,
-                        message="Backend unavailable for tenant verification"
-                    )
-            
-            if response.status_code == 404:
-                # Try default tenant
-                if tenant_id != "default":
-                    return await self.verify_tenant_access("default", user_token)
-                else:
-                    raise MCPProtocolError(
-                        code=MCPErrorCodes.TENANT_ACCESS_DENIED,
-                        message="Default tenant not found"
-                    )
-            
-            if response.status_code == 403:
-                raise MCPProtocolError(
-                    code=MCPErrorCodes.TENANT_ACCESS_DENIED,
-                    message="Tenant access denied"
-                )
-            
-            response.raise_for_status()
-            tenant_data = response.json()
-            
-            # Create tenant info
-            tenant_info = TenantInfo(
-                id=tenant_data.get("id", tenant_id),
-                slug=tenant_data.get("slug", tenant_id),
-                name=tenant_data.get("name", tenant_id),
-                active=tenant_data.get("active", True)
-            )
-            
-            # Cache the result
-            self._tenant_cache[tenant_id] = tenant_info
-            self._last_cache_update[tenant_id] = datetime.utcnow()
-            
-            return tenant_info
-            
+            tenant_info = await self._lookup_tenant(tenant_id, user_token)
         except MCPProtocolError:
             raise
         except Exception as e:
@@ -162,6 +126,115 @@ class AuthService:
                 code=MCPErrorCodes.TENANT_ACCESS_DENIED,
                 message="Failed to verify tenant access"
             )
+        
+        if tenant_info is None:
+            # Unknown tenant: fall back to the default tenant
+            if tenant_id != "default":
+                return await self.verify_tenant_access("default", user_token)
+            raise MCPProtocolError(
+                code=MCPErrorCodes.TENANT_ACCESS_DENIED,
+                message="Default tenant not found"
+            )
+        
+        return tenant_info
+    
+    async def _lookup_tenant(self, tenant_id: str, user_token: Optional[str]) -> Optional[TenantInfo]:
+        """
+        Get tenant info from the cache or the backend.
+        
+        Fresh entries are served directly. Expired entries are still served
+        for TENANT_CACHE_STALE_SECONDS while one background request refreshes
+        them. Otherwise the caller waits for the backend; concurrent callers
+        for the same tenant share one request.
+        
+        Returns:
+            Tenant information, or None if the backend does not know the tenant
+        """
+        entry = self._tenant_cache.get(tenant_id)
+        if entry is not None:
+            age = time.monotonic() - entry.fetched_at
+            ttl = self._cache_ttl if entry.tenant_info else self._negative_cache_ttl
+            if age < ttl or (entry.tenant_info and age < ttl + self._stale_ttl):
+                if age >= ttl:
+                    self._fetch_once(tenant_id, user_token)
+                self._tenant_cache.move_to_end(tenant_id)
+                return entry.tenant_info
+        
+        # Shielded: one caller giving up must not fail the others waiting on it
+        return await asyncio.shield(self._fetch_once(tenant_id, user_token))
+    
+    def _fetch_once(self, tenant_id: str, user_token: Optional[str]) -> asyncio.Future:
+        """Start a backend lookup for the tenant unless one is already running."""
+        future = self._inflight.get(tenant_id)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch_tenant(tenant_id, user_token))
+            self._inflight[tenant_id] = future
+            future.add_done_callback(lambda done: self._fetch_done(tenant_id, done))
+        return future
+    
+    def _fetch_done(self, tenant_id: str, future: asyncio.Future) -> None:
+        if self._inflight.get(tenant_id) is future:
+            del self._inflight[tenant_id]
+        if not future.cancelled() and future.exception() is not None:
+            # Also reached for background refreshes nobody awaits; a stale
+            # entry is kept until its stale period ends
+            logger.warning(f"Tenant lookup failed for {tenant_id}: {future.exception()}")
+    
+    async def _fetch_tenant(self, tenant_id: str, user_token: Optional[str]) -> Optional[TenantInfo]:
+        """Ask the backend about a tenant and cache the answer."""
+        # Query backend for tenant information
+        client = await self.get_backend_client()
+        
+        # Use the same tenant verification logic as the main backend
+        headers = {"X-Tenant-ID": tenant_id}
+        if user_token:
+            headers["Authorization"] = f"Bearer {user_token}"
+        
+        try:
+            response = await client.get("/api/v1/config/tenant-info", headers=headers)
+        except Exception as e:
+            logger.warning(f"Failed to connect to backend for tenant verification: {e}")
+            # In development mode, create a default tenant when backend is unavailable
+            if tenant_id == "default":
+                tenant_info = TenantInfo(
+                    id="default",
+                    slug="default",
+                    name="Default Tenant",
+                    active=True
+                )
+                self._cache_tenant(tenant_id, tenant_info)
+                return tenant_info
+            else:
+                raise MCPProtocolError(
+                    code=MCPErrorCodes.TENANT_ACCESS_DENIED,
+                    message="Backend unavailable for tenant verification"
+                )
+        
+        if response.status_code == 404:
+            self._cache_tenant(tenant_id, None)
+            return None
+        
+        if response.status_code == 403:
+            raise MCPProtocolError(
+                code=MCPErrorCodes.TENANT_ACCESS_DENIED,
+                message="Tenant access denied"
+            )
+        
+        response.raise_for_status()
+        tenant_data = response.json()
+        
+        # Create tenant info
+        tenant_info = TenantInfo(
+            id=tenant_data.get("id", tenant_id),
+            slug=tenant_data.get("slug", tenant_id),
+            name=tenant_data.get("name", tenant_id),
+            active=tenant_data.get("active", True)
+        )
+        
+        # Cache the result
+        self._cache_tenant(tenant_id, tenant_info)
+        
+        return tenant_info
     
     async def verify_api_access(self, request: Request, tenant_info: TenantInfo) -> bool:
         """
@@ -186,28 +259,59 @@ class AuthService:
         
         return True
     
-    def _is_cached_valid(self, tenant_id: str) -> bool:
-        """Check if cached tenant info is still valid."""
-        if tenant_id not in self._tenant_cache:
-            return False
-        
-        last_update = self._last_cache_update.get(tenant_id)
-        if not last_update:
-            return False
-        
-        age = (datetime.utcnow() - last_update).total_seconds()
-        return age < self._cache_ttl
+    def _cache_tenant(self, tenant_id: str, tenant_info: Optional[TenantInfo]) -> None:
+        """Cache a lookup result (None for an unknown tenant), evicting the least recently used."""
+        self._tenant_cache[tenant_id] = _CacheEntry(tenant_info=tenant_info)
+        self._tenant_cache.move_to_end(tenant_id)
+        while len(self._tenant_cache) > self._max_cache_entries:
+            self._tenant_cache.popitem(last=False)
     
     async def cleanup(self):
         """Cleanup resources."""
+        for future in list(self._inflight.values()):
+            future.cancel()
+        self._inflight.clear()
         if self._backend_client:
             await self._backend_client.aclose()
+            self._backend_client = None
 
 
 # Global auth service instance
 auth_service = AuthService()
 
 
+def _tenant_credentials(headers) -> Tuple[str, Optional[str]]:
+    """Tenant ID from the X-Tenant-ID header, and the bearer token if any."""
+    tenant_id = headers.get("X-Tenant-ID", "default")
+    auth_header = headers.get("Authorization")
+    user_token = None
+    if auth_header and auth_header.startswith("Bearer "):
+        user_token = auth_header[7:]
+    return tenant_id, user_token
+
+
+async def authenticate_connection(websocket) -> Dict[str, Any]:
+    """
+    MCPServer ``authenticate`` hook resolving a WebSocket connection's tenant.
+    
+    Verifies the same headers as get_current_tenant, sent with the connection
+    handshake. The verified tenant replaces any ``tenant_id`` in the params of
+    the connection's requests.
+    
+    Raises:
+        MCPProtocolError: If tenant access is denied
+    """
+    if not mcp_settings.MCP_ENABLE_TENANT_ISOLATION:
+        return {"tenant_id": None}
+    
+    # websockets' connection API, else its legacy server protocol
+    request = getattr(websocket, "request", None)
+    headers = request.headers if request is not None else websocket.request_headers
+    tenant_id, user_token = _tenant_credentials(headers)
+    tenant_info = await auth_service.verify_tenant_access(tenant_id, user_token)
+    return {"tenant_id": tenant_info.id}
+
+
 # FastAPI dependencies
 async def get_current_tenant(request: Request) -> Optional[TenantInfo]:
     """
@@ -219,15 +323,7 @@ async def get_current_tenant(request: Request) -> Optional[TenantInfo]:
         # If tenant isolation is disabled, return None
         return None
     
-    # Get tenant ID from header
-    tenant_id = request.headers.get("X-Tenant-ID", "default")
-    
-    # Get user token if available
-    auth_header = request.headers.get("Authorization")
-    user_token = None
-    if auth_header and auth_header.startswith("Bearer "):
-        user_token = auth_header[7:]
-    
+    tenant_id, user_token = _tenant_credentials(request.headers)
     try:
         tenant_info = await auth_service.verify_tenant_access(tenant_id, user_token)
         return tenant_info
@@ -0,0 +1,230 @@
+"""
+Dynamic request batching for embedding inference.
+
+Concurrent embedding requests for the same model are coalesced into one
+backend call: a per-model scheduler collects pending texts until either
+the batch is full or a short wait window closes, calls
+``generate_embeddings_batch`` once, and scatters the vectors back to the
+awaiting callers.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any
+
+try:
+    from ..config.settings import mcp_settings
+    from ..backends.base_backend import ModelBackend
+except ImportError:
+    from config.settings import mcp_settings
+    from backends.base_backend import ModelBackend
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingRequest:
+    """One caller's texts waiting for a batch."""
+    texts: List[str]
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+@dataclass
+class BatchMetrics:
+    """Throughput and latency counters for one model's batcher."""
+    requests: int = 0
+    texts: int = 0
+    batches: int = 0
+    failed_batches: int = 0
+    max_batch_size: int = 0
+    total_wait_seconds: float = 0.0
+    total_batch_seconds: float = 0.0
+    started_at: float = field(default_factory=time.perf_counter)
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = max(time.perf_counter() - self.started_at, 1e-9)
+        return {
+            "requests": self.requests,
+            "texts": self.texts,
+            "batches": self.batches,
+            "failed_batches": self.failed_batches,
+            "avg_batch_size": self.texts / self.batches if self.batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "avg_queue_wait_ms": 1000 * self.total_wait_seconds / self.requests if self.requests else 0.0,
+            "avg_batch_latency_ms": 1000 * self.total_batch_seconds / self.batches if self.batches else 0.0,
+            "texts_per_second": self.texts / elapsed
+        }
+
+
+class EmbeddingBatcher:
+    """
+    Micro-batching scheduler for one model backend.
+
+    A batch is dispatched as soon as it holds ``max_batch_size`` texts, or
+    ``max_wait_ms`` after its first request arrived. A request is never
+    split across batches, so a single oversized request runs on its own.
+    """
+
+    def __init__(self, backend: ModelBackend, max_batch_size: int = 32, max_wait_ms: float = 5.0):
+        self.backend = backend
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_ms / 1000
+        self.metrics = BatchMetrics()
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._carry: Optional[_PendingRequest] = None
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """Queue texts for the next batch and wait for their embeddings."""
+        if not texts:
+            return []
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(_PendingRequest(texts=list(texts), future=future))
+        return await future
+
+    def _ensure_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._worker.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            self._carry = None
+            self._worker = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect_batch()
+            await self._dispatch(batch)
+
+    async def _collect_batch(self) -> List[_PendingRequest]:
+        """Wait for a first request, then gather more until full or the window closes."""
+        first = self._carry or await self._queue.get()
+        self._carry = None
+        batch = [first]
+        size = len(first.texts)
+        deadline = time.perf_counter() + self.max_wait_seconds
+
+        while size < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                pending = await asyncio.wait_for(self._queue.get(), timeout=remaining)
+            except asyncio.TimeoutError:
+                break
+            if size + len(pending.texts) > self.max_batch_size:
+                # Keep it for the next batch rather than splitting it
+                self._carry = pending
+                break
+            batch.append(pending)
+            size += len(pending.texts)
+        return batch
+
+    async def _dispatch(self, batch: List[_PendingRequest]) -> None:
+        """Run one backend call for the batch and hand each caller its slice."""
+        # Callers that gave up (e.g. client disconnect) don't need embedding
+        batch = [pending for pending in batch if not pending.future.done()]
+        if not batch:
+            return
+
+        texts = [text for pending in batch for text in pending.texts]
+        started = time.perf_counter()
+        for pending in batch:
+            self.metrics.total_wait_seconds += started - pending.enqueued_at
+
+        try:
+            embeddings = await self.backend.generate_embeddings_batch(texts)
+            if len(embeddings) != len(texts):
+                raise ValueError(f"Backend returned {len(embeddings)} embeddings for {len(texts)} texts")
+        except Exception as e:
+            self.metrics.failed_batches += 1
+            logger.error(f"Embedding batch of {len(texts)} texts failed for {self.backend.model_id}: {e}")
+            for pending in batch:
+                if not pending.future.done():
+                    pending.future.set_exception(e)
+            return
+        finally:
+            self.metrics.total_batch_seconds += time.perf_counter() - started
+            self.metrics.batches += 1
+            self.metrics.requests += len(batch)
+            self.metrics.texts += len(texts)
+            self.metrics.max_batch_size = max(self.metrics.max_batch_size, len(texts))
+
+        offset = 0
+        for pending in batch:
+            count = len(pending.texts)
+            if not pending.future.done():
+                pending.future.set_result(embeddings[offset:offset + count])
+            offset += count
+
+    async def close(self) -> None:
+        """Stop the worker, failing any requests still waiting."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        leftovers = [self._carry] if self._carry else []
+        while self._queue is not None and not self._queue.empty():
+            leftovers.append(self._queue.get_nowait())
+        for pending in leftovers:
+            if not pending.future.done():
+                pending.future.set_exception(RuntimeError(f"Embedding batcher for {self.backend.model_id} closed"))
+        self._carry = None
+
+
+class EmbeddingBatchScheduler:
+    """Keeps one EmbeddingBatcher per model backend."""
+
+    def __init__(self):
+        self._batchers: Dict[str, EmbeddingBatcher] = {}
+
+    async def embed(self, backend: ModelBackend, texts: List[str]) -> List[List[float]]:
+        """Embed texts through the model's batcher, or directly if batching is disabled."""
+        if not mcp_settings.EMBEDDING_BATCHING_ENABLED:
+            return await backend.generate_embeddings_batch(texts)
+        batcher = await self._get_batcher(backend)
+        return await batcher.embed(texts)
+
+    async def _get_batcher(self, backend: ModelBackend) -> EmbeddingBatcher:
+        batcher = self._batchers.get(backend.model_id)
+        if batcher is None or batcher.backend is not backend:
+            # New model, or the model was re-registered with a fresh backend
+            stale = batcher
+            batcher = EmbeddingBatcher(
+                backend,
+                max_batch_size=mcp_settings.EMBEDDING_BATCH_MAX_SIZE,
+                max_wait_ms=mcp_settings.EMBEDDING_BATCH_MAX_WAIT_MS
+            )
+            self._batchers[backend.model_id] = batcher
+            if stale is not None:
+                await stale.close()
+        return batcher
+
+    async def remove(self, model_id: str) -> None:
+        """Drop a model's batcher, e.g. when the model is unregistered."""
+        batcher = self._batchers.pop(model_id, None)
+        if batcher:
+            await batcher.close()
+
+    async def close(self) -> None:
+        for model_id in list(self._batchers):
+            await self.remove(model_id)
+
+    def get_stats(self, model_ids: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Batching metrics per model, optionally limited to the given models."""
+        return {
+            model_id: batcher.metrics.to_dict()
+            for model_id, batcher in self._batchers.items()
+            if model_ids is None or model_id in model_ids
+        }
+
+
+# Global embedding batch scheduler instance
+embedding_batcher = EmbeddingBatchScheduler()
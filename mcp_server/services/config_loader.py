@@ -3,16 +3,27 @@ Configuration loader service for dynamic model management.
 
 This module provides configuration loading and validation for models,
 supporting JSON/YAML files and environment variable overrides.
+
+The configuration file is watched with filesystem events (inotify on
+Linux) through ``watchfiles``; bursts of events, such as an editor saving
+in several steps, are debounced into one reload. Without ``watchfiles``
+the loader falls back to polling the file's modification time.
 """
 
+import hashlib
 import json
 import logging
 import os
-from typing import Dict, List, Optional, Any
+from typing import Awaitable, Callable, Dict, List, Optional, Any
 from pathlib import Path
 import asyncio
 from datetime import datetime
 
+try:
+    import watchfiles
+except ImportError:
+    watchfiles = None
+
 try:
     from ..schemas.mcp_schemas import ModelRegistrationRequest
     from ..config.settings import mcp_settings
@@ -37,7 +48,9 @@ class ConfigurationLoader:
         self._watch_enabled = mcp_settings.MODEL_CONFIG_WATCH
         self._file_watcher_task = None
         self._last_modified = None
+        self._last_digest = None
         self._config_cache = None
+        self._reload_callbacks: List[Callable[[], Awaitable[None]]] = []
         
     async def initialize(self) -> None:
         """Initialize the configuration loader."""
@@ -62,12 +75,14 @@ class ConfigurationLoader:
         # Load from file if it exists
         if os.path.exists(self._config_path):
             try:
-                with open(self._config_path, 'r') as f:
-                    config = json.load(f)
+                with open(self._config_path, 'rb') as f:
+                    content = f.read()
+                config = json.loads(content)
                 
                 # Update last modified time
                 stat = os.stat(self._config_path)
                 self._last_modified = stat.st_mtime
+                self._last_digest = hashlib.sha256(content).hexdigest()
                 
                 logger.info(f"Loaded configuration from {self._config_path}")
                 
@@ -225,9 +240,10 @@ class ConfigurationLoader:
             logger.warning(f"Configuration file {self._config_path} not found for reload")
             return False
         
-        # Check if file was modified
-        stat = os.stat(self._config_path)
-        if self._last_modified and stat.st_mtime <= self._last_modified:
+        # Check if the content changed (saves that rewrite the same bytes don't count)
+        with open(self._config_path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        if self._last_digest and digest == self._last_digest:
             return False  # No changes
         
         logger.info("Configuration file changed, reloading...")
@@ -239,27 +255,52 @@ class ConfigurationLoader:
             logger.error(f"Failed to reload configuration: {e}")
             raise
     
+    def add_reload_callback(self, callback: Callable[[], Awaitable[None]]) -> None:
+        """Register a coroutine function to run after the file watcher reloads the configuration."""
+        self._reload_callbacks.append(callback)
+    
     async def _start_file_watcher(self) -> None:
         """Start file watcher for configuration changes."""
-        if not os.path.exists(self._config_path):
-            logger.info("Configuration file doesn't exist, file watcher will start when file is created")
+        config_dir = os.path.dirname(os.path.abspath(self._config_path))
+        if not os.path.isdir(config_dir):
+            logger.info(f"Configuration directory {config_dir} doesn't exist, not watching for changes")
             return
         
-        self._file_watcher_task = asyncio.create_task(self._file_watcher_loop())
+        if watchfiles is not None:
+            self._file_watcher_task = asyncio.create_task(self._file_watcher_loop(config_dir))
+        else:
+            logger.warning("watchfiles is not installed, polling the configuration file instead")
+            self._file_watcher_task = asyncio.create_task(self._file_polling_loop())
         logger.info(f"Started file watcher for {self._config_path}")
     
-    async def _file_watcher_loop(self) -> None:
+    async def _file_watcher_loop(self, config_dir: str) -> None:
+        """Reload the configuration whenever filesystem events touch the file."""
+        config_path = os.path.abspath(self._config_path)
+        # Watch the directory, not the file: editors and deploy tools often
+        # replace the file, which would end a watch on the old inode
+        async for _ in watchfiles.awatch(
+            config_dir,
+            watch_filter=lambda change, path: os.path.abspath(path) == config_path,
+            debounce=mcp_settings.MODEL_CONFIG_WATCH_DEBOUNCE_MS,
+            recursive=False
+        ):
+            await self._reload_and_notify()
+    
+    async def _file_polling_loop(self) -> None:
         """File watcher loop for configuration changes."""
         while True:
-            try:
-                await asyncio.sleep(5)  # Check every 5 seconds
-                
-                if await self.reload_configuration():
-                    logger.info("Configuration automatically reloaded due to file changes")
-                    
-            except Exception as e:
-                logger.error(f"Error in file watcher: {e}")
-                await asyncio.sleep(10)  # Wait longer on error
+            await asyncio.sleep(5)  # Check every 5 seconds
+            await self._reload_and_notify()
+    
+    async def _reload_and_notify(self) -> None:
+        try:
+            if await self.reload_configuration():
+                logger.info("Configuration automatically reloaded due to file changes")
+                for callback in self._reload_callbacks:
+                    await callback()
+        except Exception as e:
+            # Keep the current configuration until the file is fixed
+            logger.error(f"Error in file watcher: {e}")
     
     async def cleanup(self) -> None:
         """Cleanup resources."""
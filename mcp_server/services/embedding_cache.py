@@ -0,0 +1,221 @@
+"""
+Content-addressed embedding cache.
+
+Embeddings are keyed by (tenant_id, model_id, model version, sha256(text)),
+so identical text is embedded once per tenant and model. Raw text is never
+stored, only its digest. Two tiers:
+
+- an in-memory LRU holding float32 arrays (``array('f')``, 4 bytes per value
+  instead of a Python float object per value)
+- an optional SQLite file, used only when EMBEDDING_CACHE_PATH is set and
+  DATA_RETENTION_DAYS allows keeping data; entries older than the retention
+  period are never served and are pruned on open.
+
+Keys carry the tenant id, so tenants never share entries even for the same
+text and model.
+"""
+
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Sequence, Tuple
+
+try:
+    from ..config.settings import mcp_settings
+except ImportError:
+    from config.settings import mcp_settings
+
+
+logger = logging.getLogger(__name__)
+
+# (tenant_id, model_id, model_version, sha256 hex digest of the text)
+CacheKey = Tuple[str, str, str, str]
+
+
+def text_digest(text: str) -> str:
+    """SHA-256 hex digest identifying a text without keeping it."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class _TenantCounters:
+    """Hit and miss counts for one tenant."""
+
+    def __init__(self):
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "lookups": lookups,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0
+        }
+
+
+class SQLiteVectorStore:
+    """Persistent tier: float32 vectors as BLOBs in a local SQLite file."""
+
+    def __init__(self, path: str, retention_seconds: int):
+        self.path = path
+        self.retention_seconds = retention_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    tenant_id TEXT NOT NULL,
+                    model_id TEXT NOT NULL,
+                    model_version TEXT NOT NULL,
+                    text_sha256 TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (tenant_id, model_id, model_version, text_sha256)
+                )
+                """
+            )
+            self._conn.execute("DELETE FROM embeddings WHERE created_at < ?", (self._oldest_allowed(),))
+
+    def _oldest_allowed(self) -> float:
+        return time.time() - self.retention_seconds
+
+    def get_many(self, keys: Sequence[CacheKey]) -> Dict[CacheKey, array]:
+        found: Dict[CacheKey, array] = {}
+        oldest = self._oldest_allowed()
+        with self._lock:
+            for key in keys:
+                row = self._conn.execute(
+                    "SELECT vector FROM embeddings WHERE tenant_id = ? AND model_id = ? AND model_version = ? "
+                    "AND text_sha256 = ? AND created_at >= ?",
+                    (*key, oldest)
+                ).fetchone()
+                if row:
+                    vector = array("f")
+                    vector.frombytes(row[0])
+                    found[key] = vector
+        return found
+
+    def put_many(self, items: Dict[CacheKey, array]) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?, ?, ?)",
+                [(*key, vector.tobytes(), now) for key, vector in items.items()]
+            )
+
+    def delete_model(self, model_id: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM embeddings WHERE model_id = ?", (model_id,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class EmbeddingCache:
+    """
+    Two-tier embedding cache. Lookups check memory first, then the SQLite
+    file; disk hits are promoted into memory.
+    """
+
+    def __init__(self, max_entries: int = 10000, store: Optional[SQLiteVectorStore] = None):
+        self.max_entries = max_entries
+        self.store = store
+        self._memory: "OrderedDict[CacheKey, array]" = OrderedDict()
+        self._counters: Dict[str, _TenantCounters] = {}
+
+    async def get_many(self, keys: Sequence[CacheKey]) -> Dict[CacheKey, array]:
+        """Cached vectors for whichever keys are present."""
+        found: Dict[CacheKey, array] = {}
+        missing: List[CacheKey] = []
+        for key in keys:
+            vector = self._memory.get(key)
+            if vector is None:
+                missing.append(key)
+                continue
+            self._memory.move_to_end(key)
+            found[key] = vector
+            self._counter(key).memory_hits += 1
+
+        if missing and self.store is not None:
+            from_disk = await asyncio.to_thread(self.store.get_many, missing)
+            for key, vector in from_disk.items():
+                self._remember(key, vector)
+                found[key] = vector
+                self._counter(key).disk_hits += 1
+            missing = [key for key in missing if key not in from_disk]
+
+        for key in missing:
+            self._counter(key).misses += 1
+        return found
+
+    async def put_many(self, items: Dict[CacheKey, array]) -> None:
+        """Store freshly computed vectors in both tiers."""
+        for key, vector in items.items():
+            self._remember(key, vector)
+        if items and self.store is not None:
+            await asyncio.to_thread(self.store.put_many, items)
+
+    def _remember(self, key: CacheKey, vector: array) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _counter(self, key: CacheKey) -> _TenantCounters:
+        tenant_id = key[0]
+        counters = self._counters.get(tenant_id)
+        if counters is None:
+            counters = self._counters[tenant_id] = _TenantCounters()
+        return counters
+
+    def invalidate_model(self, model_id: str) -> None:
+        """Drop every cached vector of a model, e.g. when it is unregistered."""
+        for key in [key for key in self._memory if key[1] == model_id]:
+            del self._memory[key]
+        if self.store is not None:
+            self.store.delete_model(model_id)
+
+    def get_stats(self, tenant_id: Optional[str] = None) -> Dict[str, Any]:
+        """Hit-rate counters for one tenant, or summed over all tenants."""
+        if tenant_id is not None:
+            counters = self._counters.get(tenant_id, _TenantCounters()).to_dict()
+        else:
+            counters = _TenantCounters()
+            for tenant_counters in self._counters.values():
+                counters.memory_hits += tenant_counters.memory_hits
+                counters.disk_hits += tenant_counters.disk_hits
+                counters.misses += tenant_counters.misses
+            counters = counters.to_dict()
+        counters["persistent_tier"] = self.store is not None
+        return counters
+
+    def close(self) -> None:
+        if self.store is not None:
+            self.store.close()
+
+
+def _create_embedding_cache() -> EmbeddingCache:
+    store = None
+    if mcp_settings.EMBEDDING_CACHE_PATH:
+        if mcp_settings.DATA_RETENTION_DAYS > 0:
+            store = SQLiteVectorStore(
+                mcp_settings.EMBEDDING_CACHE_PATH,
+                retention_seconds=mcp_settings.DATA_RETENTION_DAYS * 86400
+            )
+        else:
+            logger.warning("EMBEDDING_CACHE_PATH is set but DATA_RETENTION_DAYS is 0; keeping embeddings in memory only")
+    return EmbeddingCache(max_entries=mcp_settings.EMBEDDING_CACHE_MAX_ENTRIES, store=store)
+
+
+# Global embedding cache instance
+embedding_cache = _create_embedding_cache()
@@ -7,29 +7,38 @@ of inference requests through the registered model backends.
 
 import logging
 import uuid
-from typing import Optional, Dict, Any, List
+from array import array
+from typing import AsyncIterator, Optional, Dict, Any, List
 from datetime import datetime
 
+from pydantic import BaseModel, ValidationError
+
 try:
     from ..schemas.mcp_schemas import (
         CompletionRequest, ChatRequest, EmbeddingRequest,
         CompletionResponse, ChatResponse, EmbeddingResponse,
-        InferenceType, ChatMessage
+        InferenceType, ChatMessage, ModelStatus
     )
     from ..models.registry import model_registry
     from ..core.protocol import MCPProtocolError, MCPErrorCodes
     from ..config.settings import mcp_settings
     from ..services.privacy import privacy_enforcer
+    from ..services.batching import embedding_batcher
+    from ..services.embedding_cache import embedding_cache, text_digest
+    from ..services.admission import admission_controller
 except ImportError:
     from schemas.mcp_schemas import (
         CompletionRequest, ChatRequest, EmbeddingRequest,
         CompletionResponse, ChatResponse, EmbeddingResponse,
-        InferenceType, ChatMessage
+        InferenceType, ChatMessage, ModelStatus
     )
     from models.registry import model_registry
     from core.protocol import MCPProtocolError, MCPErrorCodes
     from config.settings import mcp_settings
     from services.privacy import privacy_enforcer
+    from services.batching import embedding_batcher
+    from services.embedding_cache import embedding_cache, text_digest
+    from services.admission import admission_controller
 
 
 logger = logging.getLogger(__name__)
@@ -70,21 +79,15 @@ class InferenceService:
             })
             
             # Get model backend with tenant access control
-            backend = model_registry.get_model_backend(request.model_id, request.tenant_id)
-            if not backend:
-                raise MCPProtocolError(
-                    code=MCPErrorCodes.MODEL_NOT_AVAILABLE,
-                    message=f"Model {request.model_id} not available or access denied"
-                )
-            
-            # Check rate limits
-            await self._check_rate_limits(request.tenant_id)
+            backend = await self._get_backend(request)
             
-            # Track request
-            self._track_request(request_id, request)
-            
-            # Process inference (placeholder - actual implementation depends on backend)
-            generated_text = await self._process_completion(backend, request)
+            # Wait for a slot on the model, shared fairly between tenants
+            async with backend.in_use(), admission_controller.admit(request.tenant_id, backend):
+                # Track request
+                self._track_request(request_id, request)
+                
+                # Process inference (placeholder - actual implementation depends on backend)
+                generated_text = await self._process_completion(backend, request)
             
             # Create response
             response = CompletionResponse(
@@ -134,21 +137,15 @@ class InferenceService:
             })
             
             # Get model backend with tenant access control
-            backend = model_registry.get_model_backend(request.model_id, request.tenant_id)
-            if not backend:
-                raise MCPProtocolError(
-                    code=MCPErrorCodes.MODEL_NOT_AVAILABLE,
-                    message=f"Model {request.model_id} not available or access denied"
-                )
+            backend = await self._get_backend(request)
             
-            # Check rate limits
-            await self._check_rate_limits(request.tenant_id)
-            
-            # Track request
-            self._track_request(request_id, request)
-            
-            # Process inference
-            response_message = await self._process_chat(backend, request)
+            # Wait for a slot on the model, shared fairly between tenants
+            async with backend.in_use(), admission_controller.admit(request.tenant_id, backend):
+                # Track request
+                self._track_request(request_id, request)
+                
+                # Process inference
+                response_message = await self._process_chat(backend, request)
             
             # Create response
             response = ChatResponse(
@@ -175,6 +172,134 @@ class InferenceService:
         finally:
             self._untrack_request(request_id)
     
+    async def stream_completion(self, request: CompletionRequest) -> AsyncIterator[str]:
+        """
+        Start a streaming text completion.
+        
+        Validation and access control run before this returns, so those
+        errors surface before any output is sent. A tenant whose queue is
+        already full is rejected here too; waiting for a model slot happens
+        when the stream is first read.
+        
+        Args:
+            request: Completion request parameters
+            
+        Returns:
+            Async iterator of generated text chunks
+        """
+        await self._validate_request(request, InferenceType.COMPLETION)
+        
+        privacy_enforcer.validate_inference_request({
+            "prompt": request.prompt,
+            "model_id": request.model_id
+        })
+        
+        backend = await self._get_backend(request)
+        admission_controller.check_queue(request.tenant_id)
+        
+        chunks = backend.stream_completion(
+            prompt=request.prompt,
+            conversation_id=request.conversation_id,
+            max_tokens=request.max_tokens or mcp_settings.MAX_RESPONSE_TOKENS,
+            temperature=request.temperature or 0.7
+        )
+        return self._stream(request, backend, chunks)
+    
+    async def stream_chat(self, request: ChatRequest) -> AsyncIterator[str]:
+        """
+        Start a streaming chat completion.
+        
+        Args:
+            request: Chat request parameters
+            
+        Returns:
+            Async iterator of generated text chunks
+        """
+        await self._validate_request(request, InferenceType.CHAT)
+        
+        privacy_enforcer.validate_inference_request({
+            "messages": [{"content": msg.content} for msg in request.messages],
+            "model_id": request.model_id
+        })
+        
+        backend = await self._get_backend(request)
+        admission_controller.check_queue(request.tenant_id)
+        
+        chunks = backend.stream_chat_response(
+            messages=[{"role": msg.role, "content": msg.content} for msg in request.messages],
+            conversation_id=request.conversation_id,
+            max_tokens=request.max_tokens or mcp_settings.MAX_RESPONSE_TOKENS,
+            temperature=request.temperature or 0.7
+        )
+        return self._stream(request, backend, chunks)
+    
+    async def _stream(self, request: Any, backend, chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+        """
+        Relay backend chunks while holding a model slot and tracking the request.
+        
+        The slot is taken when the first chunk is requested and held until
+        the stream ends. If the consumer stops early (client disconnect,
+        cancellation) the backend stream is closed too, so the model stops
+        generating.
+        """
+        request_id = str(uuid.uuid4())
+        try:
+            async with backend.in_use(), admission_controller.admit(request.tenant_id, backend):
+                self._track_request(request_id, request)
+                async for chunk in chunks:
+                    if chunk:
+                        yield chunk
+        finally:
+            await chunks.aclose()
+            self._untrack_request(request_id)
+    
+    def register_mcp_methods(self, server: Any) -> None:
+        """
+        Expose inference on an MCP server.
+        
+        ``inference.completion`` and ``inference.chat`` return the whole
+        response. Their ``.stream`` variants send each chunk to the client as
+        an ``inference.chunk`` notification as soon as it is generated, and
+        stop generating when the client sends ``inference.cancel``.
+        
+        Requests run as the tenant the server's ``authenticate`` hook resolved
+        for the connection (see ``auth.authenticate_connection``).
+        
+        Raises:
+            ValueError: If the server does not authenticate its connections
+        """
+        if getattr(server, "authenticate", None) is None:
+            raise ValueError("Inference methods need an MCP server that authenticates its connections")
+        server.register_method("inference.completion", self._mcp_completion)
+        server.register_method("inference.chat", self._mcp_chat)
+        server.register_stream_method("inference.completion.stream", self._mcp_stream_completion)
+        server.register_stream_method("inference.chat.stream", self._mcp_stream_chat)
+    
+    async def _mcp_completion(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return (await self.completion(_parse_params(CompletionRequest, params))).dict()
+    
+    async def _mcp_chat(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return (await self.chat(_parse_params(ChatRequest, params))).dict()
+    
+    async def _mcp_stream_completion(self, params: Dict[str, Any]) -> AsyncIterator[str]:
+        return await self.stream_completion(_parse_params(CompletionRequest, params))
+    
+    async def _mcp_stream_chat(self, params: Dict[str, Any]) -> AsyncIterator[str]:
+        return await self.stream_chat(_parse_params(ChatRequest, params))
+    
+    async def _get_backend(self, request: Any):
+        """Get the model backend with tenant access control, starting it if needed."""
+        backend = model_registry.get_model_backend(request.model_id, request.tenant_id)
+        if not backend and model_registry.get_model(request.model_id, request.tenant_id):
+            # Lazily initialized, or still warming up: wait for the shared initialization
+            backend = await model_registry.ensure_backend(request.model_id)
+        if not backend:
+            raise MCPProtocolError(
+                code=MCPErrorCodes.MODEL_NOT_AVAILABLE,
+                message=f"Model {request.model_id} not available or access denied"
+            )
+        return backend
+    
     async def embedding(self, request: EmbeddingRequest) -> EmbeddingResponse:
         """
         Process a text embedding request.
@@ -192,21 +317,15 @@ class InferenceService:
             await self._validate_request(request, InferenceType.EMBEDDING)
             
             # Get model backend with tenant access control
-            backend = model_registry.get_model_backend(request.model_id, request.tenant_id)
-            if not backend:
-                raise MCPProtocolError(
-                    code=MCPErrorCodes.MODEL_NOT_AVAILABLE,
-                    message=f"Model {request.model_id} not available or access denied"
-                )
-            
-            # Check rate limits
-            await self._check_rate_limits(request.tenant_id)
-            
-            # Track request
-            self._track_request(request_id, request)
+            backend = await self._get_backend(request)
             
-            # Process inference
-            embeddings = await self._process_embedding(backend, request)
+            # Take a tenant slot (the embedding batcher limits backend calls)
+            async with admission_controller.admit(request.tenant_id, None):
+                # Track request
+                self._track_request(request_id, request)
+                
+                # Process inference
+                embeddings = await self._process_embedding(backend, request)
             
             # Create response
             response = EmbeddingResponse(
@@ -244,6 +363,14 @@ class InferenceService:
                 message=f"Model {request.model_id} not found or access denied for tenant"
             )
         
+        if not model.capabilities and model.status == ModelStatus.LOADING:
+            # Lazy or still warming up: capabilities are only known once the backend has started
+            if not await model_registry.ensure_backend(request.model_id):
+                raise MCPProtocolError(
+                    code=MCPErrorCodes.MODEL_NOT_AVAILABLE,
+                    message=f"Model {request.model_id} not available or access denied"
+                )
+        
         if expected_type not in model.capabilities:
             raise MCPProtocolError(
                 code=MCPErrorCodes.INVALID_PARAMS,
@@ -267,24 +394,8 @@ class InferenceService:
                     message=f"Conversation too long: {total_length} tokens > {mcp_settings.MAX_CONTEXT_LENGTH}"
                 )
     
-    async def _check_rate_limits(self, tenant_id: Optional[str]) -> None:
-        """Check rate limits for the tenant."""
-        if not tenant_id:
-            return
-        
-        current_requests = sum(
-            1 for req_info in self._active_requests.values()
-            if req_info.get("tenant_id") == tenant_id
-        )
-        
-        if current_requests >= mcp_settings.MAX_CONCURRENT_REQUESTS:
-            raise MCPProtocolError(
-                code=MCPErrorCodes.RATE_LIMIT_EXCEEDED,
-                message=f"Rate limit exceeded: {current_requests} concurrent requests"
-            )
-    
     def _track_request(self, request_id: str, request: Any) -> None:
-        """Track active request for monitoring and rate limiting."""
+        """Track active request for monitoring."""
         self._active_requests[request_id] = {
             "tenant_id": getattr(request, 'tenant_id', None),
             "model_id": request.model_id,
@@ -311,6 +422,7 @@ class InferenceService:
         if hasattr(backend, 'generate_completion'):
             return await backend.generate_completion(
                 prompt=request.prompt,
+                conversation_id=request.conversation_id,
                 max_tokens=request.max_tokens or mcp_settings.MAX_RESPONSE_TOKENS,
                 temperature=request.temperature or 0.7
             )
@@ -329,9 +441,10 @@ class InferenceService:
         logger.info(f"Processing chat with {backend.model_id}")
         
         # This would be replaced with actual backend-specific inference
-        if hasattr(backend, 'generate_chat'):
-            content = await backend.generate_chat(
+        if hasattr(backend, 'generate_chat_response'):
+            content = await backend.generate_chat_response(
                 messages=[{"role": msg.role, "content": msg.content} for msg in request.messages],
+                conversation_id=request.conversation_id,
                 max_tokens=request.max_tokens or mcp_settings.MAX_RESPONSE_TOKENS,
                 temperature=request.temperature or 0.7
             )
@@ -349,21 +462,45 @@ class InferenceService:
         """
         Process embedding request with the model backend.
         
-        This is a placeholder implementation. The actual implementation
-        would depend on the specific backend type.
+        Texts already embedded for this tenant and model come from the
+        embedding cache; the rest go through the model's embedding batcher,
+        so concurrent requests share backend calls.
         """
-        # Placeholder implementation
         logger.info(f"Processing embedding with {backend.model_id}")
         
         texts = [request.text] if isinstance(request.text, str) else request.text
         
-        # This would be replaced with actual backend-specific inference
-        if hasattr(backend, 'generate_embeddings'):
-            return await backend.generate_embeddings(texts)
-        else:
-            # Fallback mock embeddings for development/testing
-            import random
-            return [[random.random() for _ in range(384)] for _ in texts]
+        if not mcp_settings.EMBEDDING_CACHE_ENABLED:
+            return await embedding_batcher.embed(backend, texts)
+        
+        version = backend.get_model_version()
+        keys = [
+            (str(request.tenant_id), backend.model_id, version, text_digest(text))
+            for text in texts
+        ]
+        vectors = await embedding_cache.get_many(keys)
+        
+        # Embed each missing text once, even if it repeats within the request
+        missing = {key: text for key, text in zip(keys, texts) if key not in vectors}
+        if missing:
+            computed = await embedding_batcher.embed(backend, list(missing.values()))
+            fresh = {key: array('f', vector) for key, vector in zip(missing, computed)}
+            await embedding_cache.put_many(fresh)
+            vectors.update(fresh)
+        
+        return [vectors[key].tolist() for key in keys]
+
+
+def _parse_params(request_type: type, params: Dict[str, Any]) -> BaseModel:
+    """Build an inference request from MCP params, failing with INVALID_PARAMS."""
+    try:
+        return request_type(**params)
+    except ValidationError as e:
+        raise MCPProtocolError(
+            code=MCPErrorCodes.INVALID_PARAMS,
+            message=f"Invalid {request_type.__name__} params",
+            data={"errors": [f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors()]}
+        )
 
 
 # Global inference service instance
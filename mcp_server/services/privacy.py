@@ -37,6 +37,10 @@ class PrivacyEnforcer:
             r'\b(?:\d{1,3}\.){3}\d{1,3}\b',  # IP addresses
         ]
         self._compiled_patterns = [re.compile(pattern) for pattern in self._sensitive_patterns]
+        # All sensitive patterns in one alternation, to find messages that need no redaction in one scan
+        self._sensitive_prefilter = re.compile("|".join(f"(?:{pattern})" for pattern in self._sensitive_patterns))
+        self._path_pattern = re.compile(r'/[^\s]+')
+        self._url_pattern = re.compile(r'https?://[^\s]+')
     
     def validate_external_request(self, url: str) -> bool:
         """
@@ -102,6 +106,13 @@ class PrivacyEnforcer:
         if not mcp_settings.ANONYMIZE_LOGS:
             return message
         
+        # Most messages contain nothing sensitive; one scan settles that.
+        # Otherwise the patterns still run one after another: a single
+        # alternation would resolve overlapping matches of different
+        # patterns (e.g. "1.2.3.123-45-6789") differently.
+        if self._sensitive_prefilter.search(message) is None:
+            return message
+        
         sanitized = message
         
         for pattern in self._compiled_patterns:
@@ -123,10 +134,10 @@ class PrivacyEnforcer:
             return error_message
         
         # Remove potential file paths
-        sanitized = re.sub(r'/[^\s]+', '[PATH]', error_message)
+        sanitized = self._path_pattern.sub('[PATH]', error_message)
         
         # Remove potential URLs
-        sanitized = re.sub(r'https?://[^\s]+', '[URL]', sanitized)
+        sanitized = self._url_pattern.sub('[URL]', sanitized)
         
         # Apply general sanitization
         sanitized = self.sanitize_log_message(sanitized)
@@ -184,18 +195,15 @@ class PrivacyEnforcer:
     def _check_for_external_references(self, text: str) -> None:
         """Check text for external references that might leak data."""
         # Check for URLs
-        url_pattern = r'https?://[^\s]+'
-        if re.search(url_pattern, text):
-            urls = re.findall(url_pattern, text)
-            for url in urls:
-                try:
-                    self.validate_external_request(url)
-                except MCPProtocolError:
-                    if mcp_settings.ENFORCE_LOCAL_ONLY:
-                        raise MCPProtocolError(
-                            code=MCPErrorCodes.INVALID_PARAMS,
-                            message="External URLs in prompts are blocked for privacy protection"
-                        )
+        for url in self._url_pattern.findall(text):
+            try:
+                self.validate_external_request(url)
+            except MCPProtocolError:
+                if mcp_settings.ENFORCE_LOCAL_ONLY:
+                    raise MCPProtocolError(
+                        code=MCPErrorCodes.INVALID_PARAMS,
+                        message="External URLs in prompts are blocked for privacy protection"
+                    )
     
     def get_privacy_status(self) -> Dict[str, Any]:
         """
@@ -4,11 +4,14 @@ Test configuration and fixtures for MCP server tests.
 
 import pytest
 import asyncio
+from contextlib import asynccontextmanager
 from typing import Generator, AsyncGenerator
 from unittest.mock import AsyncMock, MagicMock
 import sys
 import os
 
+from aiohttp import web
+
 # Add the parent directory to the path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
@@ -27,6 +30,31 @@ def event_loop() -> Generator:
     loop.close()
 
 
+@pytest.fixture
+def stub_server():
+    """
+    Serve an HTTP stub on a free local port for the duration of an
+    ``async with`` block. The stub builds its app in ``make_app()`` and
+    gets its ``base_url`` set once the server is listening:
+
+        async with stub_server(OllamaStub()) as stub:
+            ...
+    """
+    @asynccontextmanager
+    async def serve(stub):
+        runner = web.AppRunner(stub.make_app())
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, "127.0.0.1", 0).start()
+            host, port = runner.addresses[0][:2]
+            stub.base_url = f"http://{host}:{port}"
+            yield stub
+        finally:
+            await runner.cleanup()
+
+    return serve
+
+
 @pytest.fixture
 def mock_tenant_1() -> TenantInfo:
     """Create a mock tenant for testing."""
@@ -0,0 +1,186 @@
+"""
+Tests for admission control and fair queuing of inference requests.
+"""
+
+import pytest
+import asyncio
+import sys
+import os
+from types import SimpleNamespace
+
+# Add the parent directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core.protocol import MCPProtocolError, MCPErrorCodes
+from services.admission import AdmissionController
+
+
+def backend(key: str = "shared-model", max_concurrency: int = 1):
+    return SimpleNamespace(
+        model_id=key, max_concurrency=max_concurrency, get_capacity_key=lambda: key
+    )
+
+
+async def hold(controller, tenant_id, model, started, release, label):
+    async with controller.admit(tenant_id, model):
+        started.append(label)
+        await release.wait()
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestAdmissionController:
+    """Test per-model slots, per-tenant limits and fair ordering."""
+
+    @pytest.mark.asyncio
+    async def test_waits_for_model_slot_instead_of_rejecting(self):
+        controller = AdmissionController(max_running_per_tenant=10, queue_timeout_seconds=5)
+        model = backend(max_concurrency=1)
+        started, release = [], asyncio.Event()
+
+        tasks = [asyncio.ensure_future(hold(controller, "t1", model, started, release, i)) for i in range(2)]
+        await settle()
+        assert started == [0]
+        assert controller.get_stats()["models"]["shared-model"]["queue_depth"] == 1
+
+        release.set()
+        await asyncio.gather(*tasks)
+        stats = controller.get_stats()["models"]["shared-model"]
+        assert started == [0, 1]
+        assert (stats["running"], stats["queue_depth"], stats["admitted"]) == (0, 0, 2)
+
+    @pytest.mark.asyncio
+    async def test_burst_from_one_tenant_does_not_starve_another(self):
+        controller = AdmissionController(max_running_per_tenant=10, queue_timeout_seconds=5)
+        model = backend(max_concurrency=1)
+        order, releases = [], {}
+
+        async def request(tenant_id, label):
+            async with controller.admit(tenant_id, model):
+                order.append(label)
+                releases[label] = asyncio.Event()
+                await releases[label].wait()
+
+        tasks = [asyncio.ensure_future(request("noisy", "n0"))]
+        await settle()
+        tasks += [asyncio.ensure_future(request("noisy", f"n{i}")) for i in range(1, 4)]
+        await settle()
+        tasks.append(asyncio.ensure_future(request("quiet", "q0")))
+        await settle()
+
+        while len(order) < 5:
+            releases[order[-1]].set()
+            await settle()
+        releases[order[-1]].set()
+        await asyncio.gather(*tasks)
+
+        assert order == ["n0", "n1", "q0", "n2", "n3"]
+
+    @pytest.mark.asyncio
+    async def test_tenant_limit_applies_across_models(self):
+        controller = AdmissionController(max_running_per_tenant=1, queue_timeout_seconds=5)
+        started, release = [], asyncio.Event()
+
+        first = asyncio.ensure_future(hold(controller, "t1", backend("a", 4), started, release, "a"))
+        second = asyncio.ensure_future(hold(controller, "t1", backend("b", 4), started, release, "b"))
+        other = asyncio.ensure_future(hold(controller, "t2", backend("b", 4), started, release, "other"))
+        await settle()
+        assert started == ["a", "other"]
+        assert controller.get_stats(tenant_id="t1")["tenants"] == {"t1": {"running": 1, "queued": 1}}
+
+        release.set()
+        await asyncio.gather(first, second, other)
+        assert started == ["a", "other", "b"]
+
+    @pytest.mark.asyncio
+    async def test_deadline_rejects_and_leaves_queue(self):
+        controller = AdmissionController(queue_timeout_seconds=0.05)
+        model = backend(max_concurrency=1)
+        started, release = [], asyncio.Event()
+
+        holder = asyncio.ensure_future(hold(controller, "t1", model, started, release, "held"))
+        await settle()
+        with pytest.raises(MCPProtocolError) as exc_info:
+            async with controller.admit("t2", model):
+                pass
+
+        assert exc_info.value.code == MCPErrorCodes.RATE_LIMIT_EXCEEDED
+        stats = controller.get_stats()
+        assert stats["models"]["shared-model"]["timed_out"] == 1
+        assert stats["models"]["shared-model"]["queue_depth"] == 0
+        assert "t2" not in stats["tenants"]
+
+        release.set()
+        await holder
+
+    @pytest.mark.asyncio
+    async def test_full_tenant_queue_is_rejected_immediately(self):
+        controller = AdmissionController(max_queued_per_tenant=1, queue_timeout_seconds=5)
+        model = backend(max_concurrency=1)
+        started, release = [], asyncio.Event()
+
+        tasks = [asyncio.ensure_future(hold(controller, "t1", model, started, release, i)) for i in range(2)]
+        await settle()
+        with pytest.raises(MCPProtocolError):
+            controller.check_queue("t1")
+        with pytest.raises(MCPProtocolError):
+            async with controller.admit("t1", model):
+                pass
+
+        assert controller.get_stats()["models"]["shared-model"]["rejected"] == 1
+        release.set()
+        await asyncio.gather(*tasks)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_leak_a_slot(self):
+        controller = AdmissionController(queue_timeout_seconds=5)
+        model = backend(max_concurrency=1)
+        started, release = [], asyncio.Event()
+
+        holder = asyncio.ensure_future(hold(controller, "t1", model, started, release, "held"))
+        waiter = asyncio.ensure_future(hold(controller, "t2", model, started, release, "cancelled"))
+        await settle()
+        waiter.cancel()
+        await settle()
+        release.set()
+        await holder
+
+        async with controller.admit("t3", model):
+            stats = controller.get_stats()
+        assert started == ["held"]
+        assert stats["models"]["shared-model"]["running"] == 1
+        assert stats["tenants"] == {"t3": {"running": 1, "queued": 0}}
+
+    @pytest.mark.asyncio
+    async def test_without_backend_only_the_tenant_limit_applies(self):
+        controller = AdmissionController(max_running_per_tenant=1)
+
+        async with controller.admit("t1", None):
+            with pytest.raises(MCPProtocolError):
+                async with controller.admit("t1", None):
+                    pass
+            async with controller.admit("t2", None):
+                pass
+
+        assert controller.get_stats()["tenants"] == {}
+
+    @pytest.mark.asyncio
+    async def test_requests_without_tenant_have_no_tenant_limit(self):
+        """With tenant isolation off, only model slots limit requests."""
+        controller = AdmissionController(max_running_per_tenant=1, max_queued_per_tenant=1, queue_timeout_seconds=5)
+        model = backend(max_concurrency=2)
+        started, release = [], asyncio.Event()
+
+        tasks = [asyncio.ensure_future(hold(controller, None, model, started, release, i)) for i in range(4)]
+        await settle()
+        assert started == [0, 1]
+        controller.check_queue(None)
+        async with controller.admit(None, None):
+            pass
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert started == [0, 1, 2, 3]
@@ -0,0 +1,239 @@
+"""
+Tests for event-driven configuration reloads and diff-based model updates.
+"""
+
+import pytest
+import asyncio
+import json
+import sys
+import os
+from unittest.mock import patch
+
+# Add the parent directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backends.base_backend import ModelBackend
+from config.settings import mcp_settings
+from models.registry import ModelRegistry
+from schemas.mcp_schemas import InferenceType, ModelStatus
+from services.config_loader import ConfigurationLoader
+
+
+class FakeBackend(ModelBackend):
+    """Backend that records its lifecycle and can be told to fail starting."""
+
+    async def initialize(self) -> None:
+        if self.config.get("fail"):
+            raise RuntimeError("cannot start")
+        self.status = ModelStatus.AVAILABLE
+
+    async def health_check(self) -> bool:
+        return True
+
+    async def shutdown(self) -> None:
+        self.status = ModelStatus.MAINTENANCE
+
+    def get_capabilities(self):
+        return [InferenceType.COMPLETION]
+
+    async def generate_completion(self, prompt: str, **kwargs) -> str:
+        return self.config["model_name"]
+
+    async def generate_chat_response(self, messages, **kwargs) -> str:
+        raise NotImplementedError
+
+    async def generate_embedding(self, text: str, **kwargs):
+        raise NotImplementedError
+
+
+def write_config(path, **models):
+    """Write a configuration file with one ollama model per keyword (name=model_name or config)."""
+    entries = []
+    for name, config in models.items():
+        config = config if isinstance(config, dict) else {"model_name": config}
+        entries.append({"name": name, "backend_type": "ollama", "config": config})
+    with open(path, "w") as f:
+        json.dump({"models": entries}, f)
+
+
+@pytest.fixture
+def setup(tmp_path):
+    config_path = str(tmp_path / "models.json")
+    with patch.object(mcp_settings, "MODEL_CONFIG_PATH", config_path), \
+         patch.object(mcp_settings, "MODEL_CONFIG_WATCH", False), \
+         patch.object(mcp_settings, "MODEL_LAZY_INIT", False):
+        loader = ConfigurationLoader()
+        registry = ModelRegistry()
+        registry._registry_path = str(tmp_path / "registry")
+        os.makedirs(registry._registry_path)
+        registry._backend_classes["ollama"] = FakeBackend
+        with patch("models.registry.config_loader", loader):
+            yield config_path, loader, registry
+
+
+async def start(registry: ModelRegistry, loader: ConfigurationLoader) -> None:
+    await loader.load_configuration()
+    await registry.warm_up(await registry._load_models_from_config())
+
+
+class TestConfigurationDiff:
+    """Test that reloads only touch the models that changed."""
+
+    @pytest.mark.asyncio
+    async def test_only_affected_models_are_touched(self, setup):
+        config_path, loader, registry = setup
+        write_config(config_path, kept="kept:1", edited="edited:1", dropped="dropped:1")
+        await start(registry, loader)
+        kept = registry._backends["default_ollama_kept"]
+        edited = registry._backends["default_ollama_edited"]
+        dropped = registry._backends["default_ollama_dropped"]
+
+        write_config(config_path, kept="kept:1", edited="edited:2", added="added:1")
+        assert await registry.reload_configuration() is True
+        await asyncio.gather(*registry._retiring)
+
+        assert registry._backends["default_ollama_kept"] is kept
+        assert kept.status == ModelStatus.AVAILABLE
+        assert await registry._backends["default_ollama_edited"].generate_completion("") == "edited:2"
+        assert edited.status == ModelStatus.MAINTENANCE
+        assert "default_ollama_dropped" not in registry._models
+        assert dropped.status == ModelStatus.MAINTENANCE
+        assert "default_ollama_added" in registry._backends
+
+    @pytest.mark.asyncio
+    async def test_restart_waits_for_running_requests(self, setup):
+        config_path, loader, registry = setup
+        write_config(config_path, edited="edited:1")
+        await start(registry, loader)
+        old = registry._backends["default_ollama_edited"]
+
+        async with old.in_use():
+            write_config(config_path, edited="edited:2")
+            await registry.reload_configuration()
+            await asyncio.sleep(0.01)
+
+            assert registry._backends["default_ollama_edited"] is not old
+            assert old.status == ModelStatus.AVAILABLE
+
+        await asyncio.gather(*registry._retiring)
+        assert old.status == ModelStatus.MAINTENANCE
+
+    @pytest.mark.asyncio
+    async def test_close_shuts_down_replaced_backends(self, setup):
+        config_path, loader, registry = setup
+        write_config(config_path, edited="edited:1")
+        await start(registry, loader)
+        old = registry._backends["default_ollama_edited"]
+
+        async with old.in_use():
+            write_config(config_path, edited="edited:2")
+            await registry.reload_configuration()
+            await registry.close()
+
+            assert old.status == ModelStatus.MAINTENANCE
+
+    @pytest.mark.asyncio
+    async def test_apply_reports_the_diff(self, setup):
+        config_path, loader, registry = setup
+        write_config(config_path, kept="kept:1", edited="edited:1", dropped="dropped:1")
+        await start(registry, loader)
+
+        write_config(config_path, kept="kept:1", edited="edited:2", added="added:1")
+        await loader.reload_configuration()
+        diff = await registry.apply_configuration()
+
+        assert diff == {
+            "added": ["default_ollama_added"],
+            "removed": ["default_ollama_dropped"],
+            "changed": ["default_ollama_edited"]
+        }
+
+    @pytest.mark.asyncio
+    async def test_failed_restart_keeps_the_old_backend(self, setup):
+        config_path, loader, registry = setup
+        write_config(config_path, edited="edited:1")
+        await start(registry, loader)
+        old = registry._backends["default_ollama_edited"]
+
+        write_config(config_path, edited={"model_name": "edited:2", "fail": True})
+        await registry.reload_configuration()
+
+        assert registry._backends["default_ollama_edited"] is old
+        assert old.status == ModelStatus.AVAILABLE
+
+        # Still seen as changed, so fixing the file retries the restart
+        write_config(config_path, edited="edited:3")
+        await registry.reload_configuration()
+        assert await registry._backends["default_ollama_edited"].generate_completion("") == "edited:3"
+
+    @pytest.mark.asyncio
+    async def test_unchanged_content_is_not_a_reload(self, setup):
+        config_path, loader, registry = setup
+        write_config(config_path, kept="kept:1")
+        await start(registry, loader)
+
+        write_config(config_path, kept="kept:1")
+
+        assert await registry.reload_configuration() is False
+
+
+class TestFileWatcher:
+    """Test the filesystem-event watcher."""
+
+    @pytest.mark.asyncio
+    async def test_burst_of_writes_triggers_one_reload(self, tmp_path):
+        config_path = str(tmp_path / "models.json")
+        write_config(config_path, first="first:1")
+        reloads = []
+
+        async def on_reload():
+            reloads.append(loader._config_cache["models"][0]["config"]["model_name"])
+
+        with patch.object(mcp_settings, "MODEL_CONFIG_PATH", config_path), \
+             patch.object(mcp_settings, "MODEL_CONFIG_WATCH", True), \
+             patch.object(mcp_settings, "MODEL_CONFIG_WATCH_DEBOUNCE_MS", 200):
+            loader = ConfigurationLoader()
+            loader.add_reload_callback(on_reload)
+            await loader.initialize()
+            await asyncio.sleep(0.2)
+            try:
+                for version in range(2, 5):
+                    write_config(config_path, first=f"first:{version}")
+                    await asyncio.sleep(0.02)
+                for _ in range(50):
+                    if reloads:
+                        break
+                    await asyncio.sleep(0.05)
+                await asyncio.sleep(0.4)
+            finally:
+                await loader.cleanup()
+
+        assert reloads == ["first:4"]
+
+    @pytest.mark.asyncio
+    async def test_invalid_file_keeps_current_configuration(self, tmp_path):
+        config_path = str(tmp_path / "models.json")
+        write_config(config_path, first="first:1")
+        reloads = []
+
+        async def on_reload():
+            reloads.append(True)
+
+        with patch.object(mcp_settings, "MODEL_CONFIG_PATH", config_path), \
+             patch.object(mcp_settings, "MODEL_CONFIG_WATCH", True), \
+             patch.object(mcp_settings, "MODEL_CONFIG_WATCH_DEBOUNCE_MS", 100):
+            loader = ConfigurationLoader()
+            loader.add_reload_callback(on_reload)
+            await loader.initialize()
+            await asyncio.sleep(0.2)
+            try:
+                with open(config_path, "w") as f:
+                    f.write("{not json")
+                await asyncio.sleep(0.6)
+                watcher_alive = not loader._file_watcher_task.done()
+            finally:
+                await loader.cleanup()
+
+        assert reloads == []
+        assert watcher_alive
+        assert loader._config_cache["models"][0]["config"]["model_name"] == "first:1"
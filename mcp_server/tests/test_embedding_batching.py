@@ -0,0 +1,161 @@
+"""
+Tests for dynamic batching of embedding requests.
+"""
+
+import pytest
+import asyncio
+import sys
+import os
+
+# Add the parent directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backends.base_backend import ModelBackend
+from schemas.mcp_schemas import InferenceType, ModelStatus
+from services.batching import EmbeddingBatcher, EmbeddingBatchScheduler
+
+
+class RecordingBackend(ModelBackend):
+    """Embedding backend that records the batches it is called with."""
+
+    def __init__(self, model_id: str = "tenant_1_test_embedder", fail: bool = False):
+        super().__init__(model_id, {})
+        self.status = ModelStatus.AVAILABLE
+        self.batches = []
+        self.fail = fail
+
+    async def initialize(self) -> None:
+        pass
+
+    async def health_check(self) -> bool:
+        return True
+
+    async def shutdown(self) -> None:
+        pass
+
+    def get_capabilities(self):
+        return [InferenceType.EMBEDDING]
+
+    async def generate_completion(self, prompt: str, **kwargs) -> str:
+        raise NotImplementedError
+
+    async def generate_chat_response(self, messages, **kwargs) -> str:
+        raise NotImplementedError
+
+    async def generate_embedding(self, text: str, **kwargs):
+        return [float(len(text)), 1.0]
+
+    async def generate_embeddings_batch(self, texts, **kwargs):
+        self.batches.append(list(texts))
+        if self.fail:
+            raise RuntimeError("backend unavailable")
+        return [[float(len(text)), float(index)] for index, text in enumerate(texts)]
+
+
+class TestEmbeddingBatcher:
+    """Test coalescing of concurrent embedding requests."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_batch(self):
+        """Concurrent requests within the wait window are sent as one batch."""
+        backend = RecordingBackend()
+        batcher = EmbeddingBatcher(backend, max_batch_size=32, max_wait_ms=50)
+
+        results = await asyncio.gather(
+            batcher.embed(["a"]),
+            batcher.embed(["bb", "ccc"]),
+            batcher.embed(["dddd"])
+        )
+        await batcher.close()
+
+        assert backend.batches == [["a", "bb", "ccc", "dddd"]]
+        assert [[vector[0] for vector in result] for result in results] == [[1.0], [2.0, 3.0], [4.0]]
+        assert batcher.metrics.batches == 1
+        assert batcher.metrics.requests == 3
+
+    @pytest.mark.asyncio
+    async def test_full_batch_dispatches_without_splitting_requests(self):
+        """A request that would overflow the batch waits for the next one."""
+        backend = RecordingBackend()
+        batcher = EmbeddingBatcher(backend, max_batch_size=3, max_wait_ms=50)
+
+        results = await asyncio.gather(
+            batcher.embed(["a", "b"]),
+            batcher.embed(["c", "d"]),
+            batcher.embed(["e"])
+        )
+        await batcher.close()
+
+        assert backend.batches == [["a", "b"], ["c", "d", "e"]]
+        assert [len(result) for result in results] == [2, 2, 1]
+        assert batcher.metrics.max_batch_size == 3
+
+    @pytest.mark.asyncio
+    async def test_backend_error_reaches_every_caller(self):
+        """A failed batch fails all requests in it."""
+        batcher = EmbeddingBatcher(RecordingBackend(fail=True), max_batch_size=8, max_wait_ms=20)
+
+        results = await asyncio.gather(
+            batcher.embed(["a"]), batcher.embed(["b"]), return_exceptions=True
+        )
+        await batcher.close()
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert batcher.metrics.failed_batches == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_request_is_skipped(self):
+        """A caller that gave up is dropped from its batch."""
+        backend = RecordingBackend()
+        batcher = EmbeddingBatcher(backend, max_batch_size=8, max_wait_ms=50)
+
+        abandoned = asyncio.ensure_future(batcher.embed(["gone"]))
+        await asyncio.sleep(0)
+        abandoned.cancel()
+        result = await batcher.embed(["kept"])
+        await batcher.close()
+
+        assert backend.batches == [["kept"]]
+        assert len(result) == 1
+
+
+class TestEmbeddingBatchScheduler:
+    """Test the per-model batcher registry."""
+
+    @pytest.mark.asyncio
+    async def test_stats_are_scoped_to_models(self):
+        """Stats only include the requested models."""
+        scheduler = EmbeddingBatchScheduler()
+        first = RecordingBackend("tenant_1_embedder")
+        second = RecordingBackend("tenant_2_embedder")
+
+        await scheduler.embed(first, ["a"])
+        await scheduler.embed(second, ["b"])
+        stats = scheduler.get_stats(model_ids=["tenant_1_embedder"])
+        await scheduler.close()
+
+        assert list(stats) == ["tenant_1_embedder"]
+        assert stats["tenant_1_embedder"]["texts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_new_backend_gets_new_batcher(self):
+        """A re-registered model does not reuse the old backend's batcher."""
+        scheduler = EmbeddingBatchScheduler()
+        old = RecordingBackend()
+        new = RecordingBackend()
+
+        await scheduler.embed(old, ["a"])
+        await scheduler.embed(new, ["b"])
+        await scheduler.close()
+
+        assert old.batches == [["a"]]
+        assert new.batches == [["b"]]
+
+    @pytest.mark.asyncio
+    async def test_default_batch_method_embeds_each_text(self):
+        """Backends without a batch override fall back to per-text embedding."""
+        backend = RecordingBackend()
+
+        result = await ModelBackend.generate_embeddings_batch(backend, ["ab", "c"])
+
+        assert result == [[2.0, 1.0], [1.0, 1.0]]
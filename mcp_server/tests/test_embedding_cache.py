@@ -0,0 +1,161 @@
+"""
+Tests for the content-addressed embedding cache.
+"""
+
+import pytest
+import sys
+import os
+import time
+from array import array
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Add the parent directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backends.base_backend import ModelBackend
+from schemas.mcp_schemas import InferenceType, ModelStatus
+from services.embedding_cache import EmbeddingCache, SQLiteVectorStore, text_digest
+from services.inference import InferenceService
+from config.settings import mcp_settings
+
+
+class CountingBackend(ModelBackend):
+    """Embedding backend that counts the texts it embeds."""
+
+    def __init__(self, model_id: str = "tenant_1_huggingface_embedder", config=None):
+        super().__init__(model_id, config or {"model_name": "mini-lm"})
+        self.status = ModelStatus.AVAILABLE
+        self.embedded = []
+
+    async def initialize(self) -> None:
+        pass
+
+    async def health_check(self) -> bool:
+        return True
+
+    async def shutdown(self) -> None:
+        pass
+
+    def get_capabilities(self):
+        return [InferenceType.EMBEDDING]
+
+    async def generate_completion(self, prompt: str, **kwargs) -> str:
+        raise NotImplementedError
+
+    async def generate_chat_response(self, messages, **kwargs) -> str:
+        raise NotImplementedError
+
+    async def generate_embedding(self, text: str, **kwargs):
+        self.embedded.append(text)
+        return [float(len(text)), 0.5]
+
+
+def key(tenant_id: str, text: str, model_id: str = "model", version: str = "v1"):
+    return (tenant_id, model_id, version, text_digest(text))
+
+
+class TestEmbeddingCache:
+    """Test the in-memory and SQLite tiers."""
+
+    @pytest.mark.asyncio
+    async def test_memory_tier_is_bounded_lru(self):
+        """The least recently used entry is evicted first."""
+        cache = EmbeddingCache(max_entries=2)
+        await cache.put_many({key("t1", "a"): array('f', [1.0]), key("t1", "b"): array('f', [2.0])})
+        await cache.get_many([key("t1", "a")])
+        await cache.put_many({key("t1", "c"): array('f', [3.0])})
+
+        found = await cache.get_many([key("t1", "a"), key("t1", "b"), key("t1", "c")])
+
+        assert set(found) == {key("t1", "a"), key("t1", "c")}
+
+    @pytest.mark.asyncio
+    async def test_tenants_do_not_share_entries(self):
+        """The same text and model cached for one tenant misses for another."""
+        cache = EmbeddingCache()
+        await cache.put_many({key("t1", "same text"): array('f', [1.0])})
+
+        assert await cache.get_many([key("t2", "same text")]) == {}
+        assert cache.get_stats(tenant_id="t2")["misses"] == 1
+        assert cache.get_stats(tenant_id="t1")["lookups"] == 0
+
+    @pytest.mark.asyncio
+    async def test_disk_tier_survives_restart(self, tmp_path):
+        """Vectors written to SQLite are served by a fresh cache and promoted to memory."""
+        path = str(tmp_path / "embeddings.db")
+        first = EmbeddingCache(store=SQLiteVectorStore(path, retention_seconds=3600))
+        await first.put_many({key("t1", "note"): array('f', [0.25, 0.5])})
+        first.close()
+
+        second = EmbeddingCache(store=SQLiteVectorStore(path, retention_seconds=3600))
+        found = await second.get_many([key("t1", "note")])
+        again = await second.get_many([key("t1", "note")])
+        second.close()
+
+        assert found[key("t1", "note")].tolist() == [0.25, 0.5]
+        assert again
+        stats = second.get_stats(tenant_id="t1")
+        assert (stats["disk_hits"], stats["memory_hits"]) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_disk_entries_expire_with_retention(self, tmp_path):
+        """Entries older than the retention period are not served."""
+        store = SQLiteVectorStore(str(tmp_path / "embeddings.db"), retention_seconds=60)
+        store.put_many({key("t1", "old"): array('f', [1.0])})
+
+        with patch("services.embedding_cache.time.time", return_value=time.time() + 120):
+            assert store.get_many([key("t1", "old")]) == {}
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_invalidate_model(self):
+        """Unregistering a model drops its vectors."""
+        cache = EmbeddingCache()
+        await cache.put_many({
+            key("t1", "a", model_id="gone"): array('f', [1.0]),
+            key("t1", "a", model_id="kept"): array('f', [1.0])
+        })
+
+        cache.invalidate_model("gone")
+
+        assert list(await cache.get_many([key("t1", "a", model_id="gone"), key("t1", "a", model_id="kept")])) == [
+            key("t1", "a", model_id="kept")
+        ]
+
+
+class TestInferenceCaching:
+    """Test that embedding inference reuses cached vectors."""
+
+    @pytest.fixture
+    def cache(self):
+        cache = EmbeddingCache()
+        with patch("services.inference.embedding_cache", cache), \
+             patch.object(mcp_settings, "EMBEDDING_BATCHING_ENABLED", False):
+            yield cache
+
+    @pytest.mark.asyncio
+    async def test_repeated_text_is_embedded_once(self, cache):
+        backend = CountingBackend()
+        service = InferenceService()
+        request = SimpleNamespace(tenant_id="tenant-1", text=["hello", "world", "hello"])
+
+        first = await service._process_embedding(backend, request)
+        second = await service._process_embedding(backend, request)
+
+        assert backend.embedded == ["hello", "world"]
+        assert first == second
+        assert first[0] == first[2] == [5.0, 0.5]
+        assert cache.get_stats(tenant_id="tenant-1")["hit_rate"] == pytest.approx(0.5)
+
+    @pytest.mark.asyncio
+    async def test_model_version_is_part_of_the_key(self, cache):
+        service = InferenceService()
+        request = SimpleNamespace(tenant_id="tenant-1", text="hello")
+        old = CountingBackend(config={"model_name": "mini-lm", "model_version": "1"})
+        new = CountingBackend(config={"model_name": "mini-lm", "model_version": "2"})
+
+        await service._process_embedding(old, request)
+        await service._process_embedding(new, request)
+
+        assert new.embedded == ["hello"]
@@ -0,0 +1,165 @@
+"""
+Tests for the shared per-host HTTP sessions used by model backends.
+"""
+
+import pytest
+import asyncio
+import sys
+import os
+from unittest.mock import patch
+
+import aiohttp
+from aiohttp import web
+
+# Add the parent directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backends.http_clients import HTTPClientRegistry, http_clients, request_timeout
+from backends.ollama_backend import OllamaBackend
+from config.settings import mcp_settings
+from services.auth import AuthService
+
+
+class OllamaStub:
+    """Local Ollama imitation that records which client connection each request used."""
+
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.peers = []
+        self.base_url = None
+
+    def _record(self, request):
+        self.peers.append(request.transport.get_extra_info("peername"))
+
+    async def version(self, request):
+        self._record(request)
+        return web.json_response({"version": "0.0.0-stub"})
+
+    async def tags(self, request):
+        self._record(request)
+        return web.json_response({"models": [{"name": "first"}, {"name": "second"}]})
+
+    async def generate(self, request):
+        self._record(request)
+        await asyncio.sleep(self.delay)
+        return web.json_response({"response": "ok", "done": True})
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/api/version", self.version)
+        app.router.add_get("/api/tags", self.tags)
+        app.router.add_post("/api/generate", self.generate)
+        return app
+
+
+class TestHTTPClientRegistry:
+    """Test session sharing and reference counting."""
+
+    @pytest.mark.asyncio
+    async def test_same_origin_shares_a_session(self):
+        registry = HTTPClientRegistry()
+
+        first = registry.acquire("http://ollama:11434/")
+        second = registry.acquire("http://ollama:11434")
+        other = registry.acquire("http://gpu-box:11434/")
+
+        assert first is second
+        assert other is not first
+        assert registry.get_stats() == {"http://ollama:11434": 2, "http://gpu-box:11434": 1}
+        await registry.close()
+
+    @pytest.mark.asyncio
+    async def test_session_closes_with_its_last_user(self):
+        registry = HTTPClientRegistry()
+        session = registry.acquire("http://ollama:11434")
+        registry.acquire("http://ollama:11434")
+
+        await registry.release(session)
+        assert not session.closed
+
+        await registry.release(session)
+        assert session.closed
+        assert registry.get_stats() == {}
+
+    @pytest.mark.asyncio
+    async def test_connector_uses_configured_limits(self):
+        registry = HTTPClientRegistry()
+
+        session = registry.acquire("http://ollama:11434")
+
+        assert session.connector.limit_per_host == mcp_settings.HTTP_MAX_CONNECTIONS_PER_HOST
+        assert session.timeout.connect == mcp_settings.HTTP_CONNECT_TIMEOUT_SECONDS
+        assert session.timeout.sock_read == mcp_settings.HTTP_READ_TIMEOUT_SECONDS
+        await registry.close()
+
+    @pytest.mark.asyncio
+    async def test_unshared_session_is_closed_on_release(self):
+        registry = HTTPClientRegistry()
+        session = aiohttp.ClientSession()
+
+        await registry.release(session)
+
+        assert session.closed
+
+
+class TestOllamaConnectionReuse:
+    """Test that models on one Ollama server share connections."""
+
+    @pytest.mark.asyncio
+    async def test_models_on_one_host_reuse_one_connection(self, stub_server):
+        async with stub_server(OllamaStub()) as stub:
+            first = OllamaBackend("tenant_1_ollama_first", {"base_url": stub.base_url, "model_name": "first"})
+            second = OllamaBackend("tenant_1_ollama_second", {"base_url": stub.base_url, "model_name": "second"})
+
+            await first.initialize()
+            await second.initialize()
+            await first.generate_completion("hi")
+            await second.generate_completion("hi")
+
+            assert first._session is second._session
+            assert len(stub.peers) == 6
+            assert len(set(stub.peers)) == 1
+
+            shared = first._session
+            await first.shutdown()
+            assert not shared.closed
+            await second.shutdown()
+            assert shared.closed
+            assert http_clients.get_stats() == {}
+
+
+class TestOllamaTimeouts:
+    """Test the timeouts applied to Ollama requests."""
+
+    @pytest.mark.asyncio
+    async def test_slow_generation_is_bounded_by_the_model_timeout(self, stub_server):
+        """A non-streaming generation may outlast the read timeout, up to the model's own timeout."""
+        async with stub_server(OllamaStub(delay=0.3)) as stub:
+            with patch.object(mcp_settings, "HTTP_READ_TIMEOUT_SECONDS", 0.1):
+                backend = OllamaBackend("tenant_1_ollama_first", {
+                    "base_url": stub.base_url, "model_name": "first", "timeout": 5, "max_retries": 1
+                })
+            await backend.initialize()
+
+            assert await backend.generate_completion("hi") == "ok"
+            await backend.shutdown()
+
+    def test_streaming_requests_keep_the_read_timeout(self):
+        assert request_timeout(120).sock_read == mcp_settings.HTTP_READ_TIMEOUT_SECONDS
+        assert request_timeout(120, streaming=False).sock_read is None
+        assert request_timeout(120, streaming=False).total == 120
+
+
+class TestBackendAPIClient:
+    """Test the pooled httpx client used to reach the main backend."""
+
+    @pytest.mark.asyncio
+    async def test_client_uses_configured_timeouts(self):
+        service = AuthService()
+
+        client = await service.get_backend_client()
+
+        assert client.timeout.connect == mcp_settings.HTTP_CONNECT_TIMEOUT_SECONDS
+        assert client.timeout.read == mcp_settings.HTTP_READ_TIMEOUT_SECONDS
+        assert client is await service.get_backend_client()
+        await service.cleanup()
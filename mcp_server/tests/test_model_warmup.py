@@ -0,0 +1,204 @@
+"""
+Tests for concurrent and lazy model initialization in the model registry.
+"""
+
+import pytest
+import asyncio
+import json
+import sys
+import os
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+# Add the parent directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backends.base_backend import ModelBackend
+from config.settings import mcp_settings
+from models.registry import ModelRegistry
+from schemas.mcp_schemas import CompletionRequest, InferenceType, ModelInfo, ModelStatus
+from services.inference import InferenceService
+
+
+class SlowBackend(ModelBackend):
+    """Backend whose initialization takes a while and can be told to fail."""
+
+    active = 0
+    max_active = 0
+    initialized = []
+
+    async def initialize(self) -> None:
+        cls = type(self)
+        cls.active += 1
+        cls.max_active = max(cls.max_active, cls.active)
+        try:
+            await asyncio.sleep(self.config.get("delay", 0.02))
+            if self.config.get("fail"):
+                raise RuntimeError("model server unreachable")
+        finally:
+            cls.active -= 1
+        cls.initialized.append(self.model_id)
+        self.status = ModelStatus.AVAILABLE
+
+    async def health_check(self) -> bool:
+        return self.status == ModelStatus.AVAILABLE
+
+    async def shutdown(self) -> None:
+        self.status = ModelStatus.UNAVAILABLE
+
+    def get_capabilities(self):
+        return [InferenceType.COMPLETION]
+
+    async def generate_completion(self, prompt: str, **kwargs) -> str:
+        return "ok"
+
+    async def generate_chat_response(self, messages, **kwargs) -> str:
+        return "ok"
+
+    async def generate_embedding(self, text: str, **kwargs):
+        raise NotImplementedError
+
+
+@pytest.fixture
+def registry(tmp_path):
+    SlowBackend.active = SlowBackend.max_active = 0
+    SlowBackend.initialized = []
+    registry = ModelRegistry()
+    registry._registry_path = str(tmp_path)
+    registry._backend_classes["slow"] = SlowBackend
+    return registry
+
+
+def add_model(registry: ModelRegistry, model_id: str, **config) -> None:
+    """Register a model the way the registry file would, without starting it."""
+    registry._models[model_id] = ModelInfo(
+        id=model_id,
+        name=model_id,
+        backend_type="slow",
+        status=ModelStatus.LOADING,
+        tenant_id="tenant_1"
+    )
+    with open(os.path.join(registry._registry_path, f"{model_id}.json"), "w") as f:
+        json.dump({"config": config}, f)
+
+
+class TestWarmUp:
+    """Test startup initialization of all models."""
+
+    @pytest.mark.asyncio
+    async def test_models_start_concurrently_within_the_limit(self, registry):
+        """Warm-up overlaps initializations but never runs more than the limit."""
+        model_ids = [f"tenant_1_slow_{index}" for index in range(6)]
+        for model_id in model_ids:
+            add_model(registry, model_id)
+
+        with patch.object(mcp_settings, "MODEL_INIT_CONCURRENCY", 2):
+            await registry.warm_up(model_ids)
+
+        assert SlowBackend.max_active == 2
+        assert set(registry._backends) == set(model_ids)
+        assert all(registry.get_model(model_id).status == ModelStatus.AVAILABLE for model_id in model_ids)
+
+    @pytest.mark.asyncio
+    async def test_one_failure_does_not_stop_the_others(self, registry):
+        add_model(registry, "tenant_1_slow_ok")
+        add_model(registry, "tenant_1_slow_broken", fail=True)
+
+        await registry.warm_up(["tenant_1_slow_ok", "tenant_1_slow_broken"])
+
+        assert list(registry._backends) == ["tenant_1_slow_ok"]
+        assert registry.get_model("tenant_1_slow_broken").status == ModelStatus.ERROR
+
+    @pytest.mark.asyncio
+    async def test_initialize_returns_before_background_warm_up_finishes(self, registry):
+        """Startup does not wait for models; they become available afterwards."""
+        add_model(registry, "tenant_1_slow_model", delay=0.1)
+
+        with patch("models.registry.config_loader.initialize", new_callable=AsyncMock), \
+             patch.object(registry, "_load_models_from_config", AsyncMock(return_value=[])), \
+             patch.object(registry, "_load_registry", AsyncMock()), \
+             patch.object(mcp_settings, "MODEL_LAZY_INIT", False), \
+             patch.object(mcp_settings, "MODEL_BACKGROUND_WARMUP", True):
+            await registry.initialize()
+            assert registry.get_model("tenant_1_slow_model").status == ModelStatus.LOADING
+
+            await registry._warmup_task
+
+        assert "tenant_1_slow_model" in registry._backends
+        await registry.close()
+
+    @pytest.mark.asyncio
+    async def test_lazy_mode_starts_nothing(self, registry):
+        add_model(registry, "tenant_1_slow_model")
+
+        with patch("models.registry.config_loader.initialize", new_callable=AsyncMock), \
+             patch.object(registry, "_load_models_from_config", AsyncMock(return_value=[])), \
+             patch.object(registry, "_load_registry", AsyncMock()), \
+             patch.object(mcp_settings, "MODEL_LAZY_INIT", True):
+            await registry.initialize()
+
+        assert registry._warmup_task is None
+        assert SlowBackend.initialized == []
+
+
+class TestEnsureBackend:
+    """Test on-demand initialization."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_initialization(self, registry):
+        add_model(registry, "tenant_1_slow_model")
+
+        backends = await asyncio.gather(*(registry.ensure_backend("tenant_1_slow_model") for _ in range(5)))
+
+        assert SlowBackend.initialized == ["tenant_1_slow_model"]
+        assert all(backend is backends[0] for backend in backends)
+        assert registry._init_tasks == {}
+
+    @pytest.mark.asyncio
+    async def test_failed_initialization_is_retried(self, registry):
+        add_model(registry, "tenant_1_slow_model", fail=True)
+
+        assert await registry.ensure_backend("tenant_1_slow_model") is None
+
+        add_model(registry, "tenant_1_slow_model")
+        assert await registry.ensure_backend("tenant_1_slow_model") is not None
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_abort_initialization(self, registry):
+        add_model(registry, "tenant_1_slow_model", delay=0.05)
+
+        impatient = asyncio.ensure_future(registry.ensure_backend("tenant_1_slow_model"))
+        await asyncio.sleep(0.01)
+        impatient.cancel()
+        backend = await registry.ensure_backend("tenant_1_slow_model")
+
+        assert backend is not None
+        assert SlowBackend.initialized == ["tenant_1_slow_model"]
+
+    @pytest.mark.asyncio
+    async def test_unknown_model(self, registry):
+        assert await registry.ensure_backend("tenant_1_missing") is None
+
+    @pytest.mark.asyncio
+    async def test_first_request_starts_a_lazy_model(self, registry):
+        """Inference waits for a model that has not been initialized yet."""
+        add_model(registry, "tenant_1_slow_model")
+        request = SimpleNamespace(model_id="tenant_1_slow_model", tenant_id="tenant_1")
+
+        with patch("services.inference.model_registry", registry):
+            backend = await InferenceService()._get_backend(request)
+
+        assert backend is registry._backends["tenant_1_slow_model"]
+
+    @pytest.mark.asyncio
+    async def test_completion_on_a_lazy_model(self, registry):
+        """A model with no capabilities until it starts still serves its first completion."""
+        add_model(registry, "tenant_1_slow_model")
+        request = CompletionRequest(model_id="tenant_1_slow_model", tenant_id="tenant_1", prompt="hello")
+
+        with patch("services.inference.model_registry", registry):
+            response = await InferenceService().completion(request)
+
+        assert response.text == "ok"
+        assert SlowBackend.initialized == ["tenant_1_slow_model"]
+        assert registry.get_model("tenant_1_slow_model").capabilities == [InferenceType.COMPLETION]
@@ -0,0 +1,154 @@
+"""
+Tests for the Ollama backend's chat API usage and conversation reuse.
+"""
+
+import pytest
+import json
+import sys
+import os
+
+import aiohttp
+from aiohttp import web
+
+# Add the parent directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backends.ollama_backend import OllamaBackend
+from schemas.mcp_schemas import ModelStatus
+
+
+class OllamaStub:
+    """Local HTTP server imitating Ollama's chat and generate APIs."""
+
+    def __init__(self):
+        self.requests = []
+        self.turn = 0
+        self.base_url = None
+
+    async def chat(self, request):
+        body = await request.json()
+        self.requests.append(("chat", body))
+        self.turn += 1
+        reply = {"role": "assistant", "content": f"reply {self.turn}"}
+        if not body["stream"]:
+            return web.json_response({"message": reply, "done": True})
+
+        response = web.StreamResponse()
+        await response.prepare(request)
+        for token in ("reply", f" {self.turn}"):
+            await response.write(json.dumps({"message": {"role": "assistant", "content": token}, "done": False}).encode() + b"\n")
+        await response.write(json.dumps({"message": {"role": "assistant", "content": ""}, "done": True}).encode() + b"\n")
+        return response
+
+    async def generate(self, request):
+        body = await request.json()
+        self.requests.append(("generate", body))
+        self.turn += 1
+        return web.json_response({"response": f"text {self.turn}", "done": True, "context": [self.turn] * 3})
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/api/chat", self.chat)
+        app.router.add_post("/api/generate", self.generate)
+        return app
+
+
+def make_backend(stub: OllamaStub, **config) -> OllamaBackend:
+    backend = OllamaBackend("tenant_1_ollama_stub", {
+        "base_url": stub.base_url, "model_name": "stub", "max_retries": 1, **config
+    })
+    backend._session = aiohttp.ClientSession()
+    backend.status = ModelStatus.AVAILABLE
+    return backend
+
+
+class TestChatAPI:
+    """Test that chat uses structured messages on api/chat."""
+
+    @pytest.mark.asyncio
+    async def test_chat_posts_structured_messages(self, stub_server):
+        async with stub_server(OllamaStub()) as stub:
+            backend = make_backend(stub, keep_alive="30m")
+            messages = [{"role": "system", "content": "Be brief."}, {"role": "user", "content": "Hi"}]
+
+            text = await backend.generate_chat_response(messages, temperature=0.2)
+            await backend.shutdown()
+
+        endpoint, body = stub.requests[0]
+        assert text == "reply 1"
+        assert endpoint == "chat"
+        assert body["messages"] == messages
+        assert body["keep_alive"] == "30m"
+        assert body["options"]["temperature"] == 0.2
+
+    @pytest.mark.asyncio
+    async def test_without_conversation_id_nothing_is_kept(self, stub_server):
+        async with stub_server(OllamaStub()) as stub:
+            backend = make_backend(stub)
+            await backend.generate_chat_response([{"role": "user", "content": "Hi"}])
+            await backend.generate_chat_response([{"role": "user", "content": "Again"}])
+            await backend.shutdown()
+
+        assert stub.requests[1][1]["messages"] == [{"role": "user", "content": "Again"}]
+        assert backend._conversations == {}
+
+
+class TestConversations:
+    """Test multi-turn reuse keyed by conversation id."""
+
+    @pytest.mark.asyncio
+    async def test_chat_history_is_kept_per_conversation(self, stub_server):
+        async with stub_server(OllamaStub()) as stub:
+            backend = make_backend(stub)
+            await backend.generate_chat_response([{"role": "user", "content": "Hi"}], conversation_id="c1")
+            await backend.generate_chat_response([{"role": "user", "content": "Other"}], conversation_id="c2")
+            await backend.generate_chat_response([{"role": "user", "content": "And?"}], conversation_id="c1")
+            await backend.shutdown()
+
+        assert stub.requests[2][1]["messages"] == [
+            {"role": "user", "content": "Hi"},
+            {"role": "assistant", "content": "reply 1"},
+            {"role": "user", "content": "And?"},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_streamed_reply_joins_the_conversation(self, stub_server):
+        async with stub_server(OllamaStub()) as stub:
+            backend = make_backend(stub)
+            chunks = [chunk async for chunk in backend.stream_chat_response(
+                [{"role": "user", "content": "Hi"}], conversation_id="c1"
+            )]
+            await backend.generate_chat_response([{"role": "user", "content": "More"}], conversation_id="c1")
+            await backend.shutdown()
+
+        assert chunks == ["reply", " 1"]
+        assert stub.requests[1][1]["messages"][1] == {"role": "assistant", "content": "reply 1"}
+
+    @pytest.mark.asyncio
+    async def test_completion_reuses_returned_context(self, stub_server):
+        async with stub_server(OllamaStub()) as stub:
+            backend = make_backend(stub)
+            await backend.generate_completion("Once upon a time", conversation_id="story")
+            await backend.generate_completion("Then", conversation_id="story")
+            await backend.shutdown()
+
+        assert "context" not in stub.requests[0][1]
+        assert stub.requests[1][1]["context"] == [1, 1, 1]
+        assert stub.requests[1][1]["prompt"] == "Then"
+
+    @pytest.mark.asyncio
+    async def test_conversations_are_bounded(self, stub_server):
+        async with stub_server(OllamaStub()) as stub:
+            backend = make_backend(stub, max_conversations=2)
+            for conversation_id in ("a", "b", "c"):
+                await backend.generate_chat_response([{"role": "user", "content": "Hi"}], conversation_id=conversation_id)
+            kept = list(backend._conversations)
+            await backend.shutdown()
+
+        assert kept == ["b", "c"]
+
+    def test_expired_conversation_starts_over(self):
+        backend = OllamaBackend("tenant_1_ollama_stub", {"conversation_ttl_seconds": 0})
+        backend._get_conversation("a").messages.append({"role": "user", "content": "Hi"})
+
+        assert backend._get_conversation("a").messages == []
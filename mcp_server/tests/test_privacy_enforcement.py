@@ -706,4 +706,35 @@ class TestPrivacyIntegration:
             assert privacy_enforcer._is_local_address(addr), f"{addr} should be identified as local"
         
         for addr in external_addresses:
-            assert not privacy_enforcer._is_local_address(addr), f"{addr} should be identified as external"
\ No newline at end of file
+            assert not privacy_enforcer._is_local_address(addr), f"{addr} should be identified as external"
+
+class TestLogRedactionOutput:
+    """Test that the prefiltered redaction matches applying each pattern in turn."""
+    
+    @staticmethod
+    def sequential(message):
+        for pattern in privacy_enforcer._compiled_patterns:
+            message = pattern.sub('[REDACTED]', message)
+        return message
+    
+    def test_overlapping_patterns_resolve_in_pattern_order(self):
+        """Matches of different patterns that overlap keep the sequential result."""
+        assert privacy_enforcer.sanitize_log_message("1.2.3.123-45-6789") == "1.2.3.[REDACTED]"
+        assert privacy_enforcer.sanitize_log_message("1234 5678 9012 3456@x.com") == "1234 5678 9012 [REDACTED]"
+    
+    def test_random_messages_match_sequential_redaction(self):
+        import random
+        rng = random.Random(7)
+        alphabet = "0123456789" * 3 + ".-@ _abcxyz" + "[]/:"
+        fragments = ["user@example.com", "123-45-6789", "4532 1234 5678 9012", "10.0.0.1", "model ok"]
+        
+        for _ in range(3000):
+            message = "".join(
+                rng.choice(fragments) if rng.random() < 0.2 else rng.choice(alphabet)
+                for _ in range(rng.randint(0, 40))
+            )
+            assert privacy_enforcer.sanitize_log_message(message) == self.sequential(message), message
+    
+    def test_clean_message_is_returned_unchanged(self):
+        message = "2026-10-18 12:00:00 INFO request 42 model=tenant_1_ollama_llama3 latency_ms=12.5"
+        assert privacy_enforcer.sanitize_log_message(message) is message
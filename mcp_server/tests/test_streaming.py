@@ -0,0 +1,326 @@
+"""
+Tests for token streaming from backends through the API and MCP protocol.
+"""
+
+import pytest
+import asyncio
+import json
+import sys
+import os
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import websockets
+from aiohttp import web
+from fastapi.testclient import TestClient
+
+# Add the parent directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backends.ollama_backend import OllamaBackend
+from core.protocol import MCPErrorCodes, MCPProtocolError, MCPProtocolHandler, MCPServer, STREAM_CHUNK_METHOD, STREAM_CANCEL_METHOD
+from main import app
+from schemas.mcp_schemas import ModelStatus
+from services.auth import TenantInfo, authenticate_connection, get_current_tenant
+from services.inference import InferenceService
+
+
+TOKENS = ["Hello", ",", " world", "!"]
+
+
+class OllamaStub:
+    """Local HTTP server answering /api/generate with an NDJSON token stream."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.requests = []
+        self.disconnected = asyncio.Event()
+        self.base_url = None
+
+    async def generate(self, request):
+        self.requests.append(await request.json())
+        response = web.StreamResponse()
+        await response.prepare(request)
+        try:
+            for token in TOKENS:
+                await response.write(json.dumps({"response": token, "done": False}).encode() + b"\n")
+                await asyncio.sleep(self.delay)
+            await response.write(json.dumps({"response": "", "done": True}).encode() + b"\n")
+        except (ConnectionResetError, asyncio.CancelledError):
+            self.disconnected.set()
+            raise
+        return response
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/api/generate", self.generate)
+        app.router.add_post("/api/chat", self.generate)
+        return app
+
+
+async def make_backend(stub: OllamaStub, stream: bool = True) -> OllamaBackend:
+    backend = OllamaBackend("tenant_1_ollama_stub", {
+        "base_url": stub.base_url, "model_name": "stub", "stream": stream, "max_retries": 1
+    })
+    import aiohttp
+    backend._session = aiohttp.ClientSession()
+    backend.status = ModelStatus.AVAILABLE
+    return backend
+
+
+class TestOllamaStreaming:
+    """Test streaming against a local Ollama stub."""
+
+    @pytest.mark.asyncio
+    async def test_tokens_are_yielded_as_they_arrive(self, stub_server):
+        async with stub_server(OllamaStub()) as stub:
+            backend = await make_backend(stub)
+            chunks = [chunk async for chunk in backend.stream_completion("Hi", max_tokens=8)]
+            await backend.shutdown()
+
+        assert chunks == TOKENS
+        assert stub.requests[0]["stream"] is True
+        assert stub.requests[0]["options"]["num_predict"] == 8
+
+    @pytest.mark.asyncio
+    async def test_non_streaming_caller_gets_joined_text(self, stub_server):
+        async with stub_server(OllamaStub()) as stub:
+            backend = await make_backend(stub)
+            text = await backend.generate_chat_response([{"role": "user", "content": "Hi"}])
+            await backend.shutdown()
+
+        assert text == "Hello, world!"
+
+    @pytest.mark.asyncio
+    async def test_closing_the_stream_stops_generation(self, stub_server):
+        async with stub_server(OllamaStub(delay=0.05)) as stub:
+            backend = await make_backend(stub)
+            chunks = backend.stream_completion("Hi")
+            assert await chunks.__anext__() == "Hello"
+            await chunks.aclose()
+
+            await asyncio.wait_for(stub.disconnected.wait(), timeout=2)
+            await backend.shutdown()
+
+
+class ListBackend:
+    """Backend stub streaming a fixed list of chunks."""
+
+    model_id = "tenant_1_stub"
+
+    def __init__(self):
+        self.closed = False
+
+    @asynccontextmanager
+    async def in_use(self):
+        yield
+
+    async def stream_completion(self, prompt, **kwargs):
+        try:
+            for token in TOKENS:
+                yield token
+        finally:
+            self.closed = True
+
+
+class TestInferenceStreaming:
+    """Test request tracking around streamed inference."""
+
+    @pytest.mark.asyncio
+    async def test_stream_is_tracked_until_closed(self):
+        service = InferenceService()
+        backend = ListBackend()
+        request = SimpleNamespace(
+            model_id="tenant_1_stub", tenant_id="tenant-1", prompt="Hi", conversation_id=None,
+            max_tokens=None, temperature=None, inference_type=SimpleNamespace(value="completion")
+        )
+
+        with patch.object(service, "_validate_request"), \
+             patch("services.inference.model_registry") as registry:
+            registry.get_model_backend.return_value = backend
+            chunks = await service.stream_completion(request)
+
+            assert await chunks.__anext__() == "Hello"
+            assert len(service._active_requests) == 1
+            await chunks.aclose()
+
+        assert service._active_requests == {}
+        assert backend.closed
+
+
+class TestProtocolStreaming:
+    """Test streamed notifications over the MCP protocol handler."""
+
+    def setup_method(self):
+        self.handler = MCPProtocolHandler()
+        self.sent = []
+
+    async def send(self, message: str) -> None:
+        self.sent.append(json.loads(message))
+
+    @staticmethod
+    def request(request_id: str = "req-1") -> str:
+        return json.dumps({"type": "request", "id": request_id, "method": "inference.stream", "params": {}})
+
+    @pytest.mark.asyncio
+    async def test_chunks_are_sent_as_notifications(self):
+        async def stream(params):
+            for token in TOKENS:
+                yield token
+
+        self.handler.register_stream_method("inference.stream", stream)
+        result = await self.handler._handle_request(json.loads(self.request()), self.send)
+
+        assert [message["method"] for message in self.sent] == [STREAM_CHUNK_METHOD] * len(TOKENS)
+        assert [message["params"]["text"] for message in self.sent] == TOKENS
+        assert result.result == {"text": "Hello, world!", "chunks": 4}
+
+    @pytest.mark.asyncio
+    async def test_cancel_notification_stops_the_stream(self):
+        closed = asyncio.Event()
+
+        async def stream(params):
+            try:
+                while True:
+                    yield "tick"
+                    await asyncio.sleep(0.01)
+            finally:
+                closed.set()
+
+        self.handler.register_stream_method("inference.stream", stream)
+        running = asyncio.ensure_future(self.handler._handle_request(json.loads(self.request()), self.send))
+        while not self.sent:
+            await asyncio.sleep(0.01)
+
+        await self.handler._handle_notification(
+            {"type": "notification", "method": STREAM_CANCEL_METHOD, "params": {"request_id": "req-1"}},
+            self.send
+        )
+
+        with pytest.raises(asyncio.CancelledError):
+            await running
+        assert closed.is_set()
+        assert self.handler._active_streams == {}
+
+
+class TestWebSocketStreaming:
+    """Test streamed inference over an MCP WebSocket connection."""
+
+    @staticmethod
+    def verified(tenant_id, user_token=None):
+        if tenant_id != "tenant-1":
+            raise MCPProtocolError(MCPErrorCodes.TENANT_ACCESS_DENIED, "Tenant access denied")
+        return TenantInfo(id="tenant-1", slug="tenant-1", name="Tenant 1")
+
+    @pytest.mark.asyncio
+    async def test_completion_stream_over_websocket(self):
+        service = InferenceService()
+        backend = ListBackend()
+        server = MCPServer(authenticate=authenticate_connection)
+        service.register_mcp_methods(server)
+
+        with patch.object(service, "_validate_request"), \
+             patch("services.inference.model_registry") as registry, \
+             patch("services.auth.auth_service.verify_tenant_access", side_effect=self.verified):
+            registry.get_model_backend.return_value = backend
+            async with websockets.serve(lambda connection: server.handle_connection(connection, None),
+                                        "127.0.0.1", 0) as ws_server:
+                port = ws_server.sockets[0].getsockname()[1]
+                async with websockets.connect(f"ws://127.0.0.1:{port}",
+                                              additional_headers={"X-Tenant-ID": "tenant-1"}) as client:
+                    # The connection's tenant wins over one sent in the params
+                    await client.send(json.dumps({
+                        "type": "request", "id": "req-1", "method": "inference.completion.stream",
+                        "params": {"model_id": "tenant_1_stub", "tenant_id": "tenant-2", "prompt": "Hi"}
+                    }))
+                    messages = [json.loads(await client.recv()) for _ in range(len(TOKENS) + 1)]
+
+        chunks, response = messages[:-1], messages[-1]
+        assert [message["method"] for message in chunks] == [STREAM_CHUNK_METHOD] * len(TOKENS)
+        assert [message["params"]["text"] for message in chunks] == TOKENS
+        assert response["id"] == "req-1"
+        assert response["result"] == {"text": "Hello, world!", "chunks": 4}
+        assert backend.closed
+        registry.get_model_backend.assert_called_once_with("tenant_1_stub", "tenant-1")
+
+    @pytest.mark.asyncio
+    async def test_unauthenticated_connection_is_refused(self):
+        server = MCPServer(authenticate=authenticate_connection)
+        InferenceService().register_mcp_methods(server)
+
+        with patch("services.auth.auth_service.verify_tenant_access", side_effect=self.verified):
+            async with websockets.serve(lambda connection: server.handle_connection(connection, None),
+                                        "127.0.0.1", 0) as ws_server:
+                port = ws_server.sockets[0].getsockname()[1]
+                async with websockets.connect(f"ws://127.0.0.1:{port}",
+                                              additional_headers={"X-Tenant-ID": "tenant-2"}) as client:
+                    with pytest.raises(websockets.ConnectionClosed) as closed:
+                        await client.recv()
+
+        assert closed.value.rcvd.code == 1008
+        assert not server._connections
+
+    def test_methods_need_an_authenticating_server(self):
+        with pytest.raises(ValueError):
+            InferenceService().register_mcp_methods(MCPServer())
+
+    @pytest.mark.asyncio
+    async def test_invalid_params_are_rejected(self):
+        server = MCPServer(authenticate=authenticate_connection)
+        InferenceService().register_mcp_methods(server)
+
+        response = json.loads(await server.protocol_handler.process_message(json.dumps({
+            "type": "request", "id": "req-1", "method": "inference.chat.stream", "params": {"model_id": "m"}
+        }), context={"tenant_id": "tenant-1"}))
+
+        assert response["code"] == -32602
+        assert response["data"] == {"errors": ["messages: Field required"]}
+
+
+class TestSSEEndpoints:
+    """Test the server-sent event responses."""
+
+    def setup_method(self):
+        app.dependency_overrides[get_current_tenant] = lambda: TenantInfo(
+            id="tenant-1", slug="tenant-1", name="Tenant 1", active=True
+        )
+        self.client = TestClient(app)
+
+    def teardown_method(self):
+        app.dependency_overrides.clear()
+
+    def test_completion_streams_token_and_done_events(self):
+        async def start(request):
+            async def chunks():
+                for token in TOKENS:
+                    yield token
+            return chunks()
+
+        with patch("api.endpoints.inference_service.stream_completion", side_effect=start):
+            response = self.client.post("/api/v1/inference/completion", json={
+                "model_id": "tenant_1_stub", "prompt": "Say hi", "stream": True
+            })
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = [block.split("\n") for block in response.text.strip().split("\n\n")]
+        names = [lines[0].removeprefix("event: ") for lines in events]
+        payloads = [json.loads(lines[1].removeprefix("data: ")) for lines in events]
+
+        assert names == ["token"] * len(TOKENS) + ["done"]
+        assert [payload["text"] for payload in payloads[:-1]] == TOKENS
+        assert payloads[-1]["usage"] == {"prompt_tokens": 2, "completion_tokens": 2, "total_tokens": 4}
+
+    def test_backend_failure_ends_with_error_event(self):
+        async def start(request):
+            async def chunks():
+                yield "partial"
+                raise RuntimeError("model crashed")
+            return chunks()
+
+        with patch("api.endpoints.inference_service.stream_chat", side_effect=start):
+            response = self.client.post("/api/v1/inference/chat", json={
+                "model_id": "tenant_1_stub", "messages": [{"role": "user", "content": "Hi"}], "stream": True
+            })
+
+        assert response.text.rstrip().split("\n\n")[-1].startswith("event: error")
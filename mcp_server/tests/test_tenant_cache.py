@@ -0,0 +1,173 @@
+"""
+Tests for the tenant verification cache in AuthService.
+"""
+
+import pytest
+import asyncio
+import sys
+import os
+from contextlib import asynccontextmanager
+from unittest.mock import patch
+
+from aiohttp import web
+
+# Add the parent directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from config.settings import mcp_settings
+from core.protocol import MCPProtocolError
+from services.auth import AuthService
+
+
+class BackendStub:
+    """Local imitation of the main backend's tenant-info endpoint."""
+
+    def __init__(self, tenants, delay: float = 0.0):
+        self.tenants = tenants
+        self.delay = delay
+        self.calls = []
+        self.failing = False
+        self.base_url = None
+
+    async def tenant_info(self, request):
+        tenant_id = request.headers["X-Tenant-ID"]
+        self.calls.append(tenant_id)
+        await asyncio.sleep(self.delay)
+        if self.failing:
+            return web.json_response({"detail": "boom"}, status=500)
+        if tenant_id not in self.tenants:
+            return web.json_response({"detail": "Tenant not found"}, status=404)
+        return web.json_response({"id": tenant_id, "slug": tenant_id, "name": self.tenants[tenant_id], "active": True})
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/api/v1/config/tenant-info", self.tenant_info)
+        return app
+
+
+@asynccontextmanager
+async def backend_and_service(stub_server):
+    """A running backend stub and an AuthService pointed at it."""
+    tenants = {"default": "Default Tenant", "tenant-a": "Tenant A", "tenant-b": "Tenant B"}
+    async with stub_server(BackendStub(tenants)) as backend:
+        with patch.object(mcp_settings, "BACKEND_API_URL", backend.base_url):
+            service = AuthService()
+            try:
+                yield backend, service
+            finally:
+                await service.cleanup()
+
+
+class TestTenantCache:
+    """Test coalescing, negative caching, stale refresh and eviction."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_share_one_backend_call(self, stub_server):
+        async with backend_and_service(stub_server) as (backend, service):
+            backend.delay = 0.05
+
+            tenants = await asyncio.gather(*(service.verify_tenant_access("tenant-a") for _ in range(10)))
+
+            assert backend.calls == ["tenant-a"]
+            assert {tenant.name for tenant in tenants} == {"Tenant A"}
+
+    @pytest.mark.asyncio
+    async def test_cached_tenant_skips_the_backend(self, stub_server):
+        async with backend_and_service(stub_server) as (backend, service):
+            await service.verify_tenant_access("tenant-a")
+            await service.verify_tenant_access("tenant-a")
+
+            assert backend.calls == ["tenant-a"]
+
+    @pytest.mark.asyncio
+    async def test_unknown_tenant_is_cached_as_unknown(self, stub_server):
+        """An unknown tenant falls back to default without asking the backend again."""
+        async with backend_and_service(stub_server) as (backend, service):
+            first = await service.verify_tenant_access("nobody")
+            second = await service.verify_tenant_access("nobody")
+
+            assert first.id == second.id == "default"
+            assert backend.calls == ["nobody", "default"]
+
+    @pytest.mark.asyncio
+    async def test_unknown_tenant_is_retried_after_negative_ttl(self, stub_server):
+        async with backend_and_service(stub_server) as (backend, service):
+            service._negative_cache_ttl = 0
+            await service.verify_tenant_access("tenant-new")
+            backend.tenants["tenant-new"] = "New Tenant"
+
+            tenant = await service.verify_tenant_access("tenant-new")
+
+            assert tenant.name == "New Tenant"
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_served_while_refreshing(self, stub_server):
+        async with backend_and_service(stub_server) as (backend, service):
+            await service.verify_tenant_access("tenant-a")
+            service._cache_ttl = 0
+            backend.tenants["tenant-a"] = "Renamed"
+            backend.delay = 0.05
+
+            stale = await asyncio.gather(*(service.verify_tenant_access("tenant-a") for _ in range(5)))
+            await asyncio.sleep(0.1)
+            service._cache_ttl = 300
+            fresh = await service.verify_tenant_access("tenant-a")
+
+            assert {tenant.name for tenant in stale} == {"Tenant A"}
+            assert fresh.name == "Renamed"
+            assert backend.calls == ["tenant-a", "tenant-a"]
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_the_stale_entry(self, stub_server):
+        async with backend_and_service(stub_server) as (backend, service):
+            await service.verify_tenant_access("tenant-a")
+            service._cache_ttl = 0
+            backend.failing = True
+
+            await service.verify_tenant_access("tenant-a")
+            await asyncio.sleep(0.05)
+            tenant = await service.verify_tenant_access("tenant-a")
+
+            assert tenant.name == "Tenant A"
+
+    @pytest.mark.asyncio
+    async def test_entries_past_the_stale_period_are_fetched_again(self, stub_server):
+        async with backend_and_service(stub_server) as (backend, service):
+            await service.verify_tenant_access("tenant-a")
+            service._cache_ttl = service._stale_ttl = 0
+            backend.tenants["tenant-a"] = "Renamed"
+
+            tenant = await service.verify_tenant_access("tenant-a")
+
+            assert tenant.name == "Renamed"
+
+    @pytest.mark.asyncio
+    async def test_cache_is_bounded_lru(self, stub_server):
+        async with backend_and_service(stub_server) as (backend, service):
+            service._max_cache_entries = 2
+            await service.verify_tenant_access("tenant-a")
+            await service.verify_tenant_access("tenant-b")
+            await service.verify_tenant_access("tenant-a")
+            await service.verify_tenant_access("default")
+
+            assert list(service._tenant_cache) == ["tenant-a", "default"]
+
+            await service.verify_tenant_access("tenant-b")
+            assert backend.calls.count("tenant-b") == 2
+
+    @pytest.mark.asyncio
+    async def test_backend_errors_are_shared_not_cached(self, stub_server):
+        """Every waiter sees the failure, and the next request asks again."""
+        async with backend_and_service(stub_server) as (backend, service):
+            backend.failing = True
+            backend.delay = 0.02
+
+            results = await asyncio.gather(
+                *(service.verify_tenant_access("default") for _ in range(3)), return_exceptions=True
+            )
+            backend.failing = False
+            tenant = await service.verify_tenant_access("default")
+
+            assert all(isinstance(result, MCPProtocolError) for result in results)
+            assert tenant.name == "Default Tenant"
+            assert backend.calls == ["default", "default"]